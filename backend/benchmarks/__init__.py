@@ -0,0 +1,2 @@
+# backend/benchmarks/__init__.py
+# Benchmarks do backend. Execute a partir da pasta backend, ex.: python -m benchmarks.busca
@@ -0,0 +1,167 @@
+# backend/benchmarks/admissao.py
+#
+# Teste de carga do controle de admissão (src/admissao.py) em sobrecarga. Sobe uma API
+# sintética num processo uvicorn separado, com o mesmo perfil da real: um executor com
+# MYSQL_EXECUTOR_WORKERS threads faz o papel do banco, leituras levam ~40 ms, inscrições
+# ~100 ms e exportações ~1 s. As requisições chegam em malha aberta (Poisson) a uma taxa
+# acima da capacidade, como num pico de inscrições, e o cliente desiste em 30 s (o timeout
+# do axios). A mesma carga roda sem e com o middleware; com ele, o p99 das respostas 200
+# fica limitado pelo prazo da fila e o excesso recebe 503 em milissegundos.
+# Não precisa de banco.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.admissao
+#   python -m benchmarks.admissao --taxa 300 --duracao 20
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks.banco import _porta_livre
+from benchmarks.carga import percentil
+
+TRABALHADORES = int(os.getenv("MYSQL_EXECUTOR_WORKERS", 10))
+
+# classe: (método, caminho, tempo de serviço simulado em s, fração da carga)
+PERFIL = {
+    "leitura": ("GET", "/api/oportunidades/", 0.04, 0.80),
+    "escrita": ("POST", "/api/inscricoes/", 0.10, 0.15),
+    "pesada": ("GET", "/api/exportacoes/oportunidades", 1.0, 0.05),
+}
+TIMEOUT_CLIENTE = 30.0
+
+
+def criar_app(com_admissao):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from fastapi import FastAPI
+
+    from src.admissao import ControleAdmissao, MiddlewareAdmissao
+
+    app = FastAPI()
+    executor = ThreadPoolExecutor(TRABALHADORES) # O "banco": no máximo TRABALHADORES consultas por vez
+
+    def rota(metodo, caminho, segundos):
+        async def endpoint():
+            await asyncio.get_running_loop().run_in_executor(executor, time.sleep, segundos)
+            return {"ok": True}
+        app.add_api_route(caminho, endpoint, methods=[metodo])
+
+    for metodo, caminho, segundos, _ in PERFIL.values():
+        rota(metodo, caminho, segundos)
+    if com_admissao:
+        app.add_middleware(MiddlewareAdmissao, controle=ControleAdmissao())
+    return app
+
+
+def servir(modo, porta):
+    import uvicorn
+
+    uvicorn.run(criar_app(modo == "com"), host="127.0.0.1", port=porta, log_level="warning",
+                access_log=False, backlog=4096)
+
+
+async def _requisicao(porta, metodo, caminho):
+    """
+    (status ou None se o cliente desistiu/falhou, segundos até a resposta)
+    """
+    inicio = time.perf_counter()
+    escritor = None
+    try:
+        async with asyncio.timeout(TIMEOUT_CLIENTE):
+            leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+            escritor.write(
+                f"{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\nContent-Length: 0\r\n"
+                "Connection: close\r\n\r\n".encode("ascii"))
+            linha = await leitor.readline()
+            await leitor.read()
+        return int(linha.split()[1]), time.perf_counter() - inicio
+    except (TimeoutError, OSError, IndexError, ValueError):
+        return None, time.perf_counter() - inicio
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+async def _carga(porta, taxa, duracao, semente):
+    aleatorio = random.Random(semente)
+    classes = list(PERFIL)
+    pesos = [PERFIL[classe][3] for classe in classes]
+    tarefas = []
+    fim = time.perf_counter() + duracao
+    proxima = time.perf_counter()
+    while proxima < fim:
+        await asyncio.sleep(max(0.0, proxima - time.perf_counter()))
+        classe = aleatorio.choices(classes, pesos)[0]
+        metodo, caminho, _, _ = PERFIL[classe]
+        tarefas.append((classe, asyncio.create_task(_requisicao(porta, metodo, caminho))))
+        proxima += aleatorio.expovariate(taxa)
+    return [(classe, *(await tarefa)) for classe, tarefa in tarefas]
+
+
+def _esperar_servidor(porta, processo, timeout=30):
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < timeout:
+        if processo.poll() is not None:
+            raise RuntimeError("O servidor do benchmark terminou durante a inicialização")
+        status, _ = asyncio.run(_requisicao(porta, "GET", PERFIL["leitura"][1]))
+        if status == 200:
+            return
+        time.sleep(0.05)
+    raise RuntimeError("O servidor do benchmark não respondeu a tempo")
+
+
+def medir(modo, taxa, duracao, semente=42):
+    porta = _porta_livre()
+    processo = subprocess.Popen([sys.executable, "-m", "benchmarks.admissao", "--servir", modo, "--porta", str(porta)])
+    try:
+        _esperar_servidor(porta, processo)
+        return asyncio.run(_carga(porta, taxa, duracao, semente))
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+
+
+def relatorio(modo, resultados):
+    def ms(valor):
+        return f"{valor * 1000:.0f}" if valor is not None else "-"
+
+    print(f"\n{modo} controle de admissão")
+    print(f"{'classe':<10}{'enviadas':>9}{'200':>7}{'503':>7}{'sem resp.':>10}"
+          f"{'p50 200 (ms)':>14}{'p99 200 (ms)':>14}{'p99 503 (ms)':>14}")
+    for classe in list(PERFIL) + ["total"]:
+        linhas = [r for r in resultados if classe in ("total", r[0])]
+        ok = sorted(duracao for _, status, duracao in linhas if status == 200)
+        recusadas = sorted(duracao for _, status, duracao in linhas if status == 503)
+        sem_resposta = sum(1 for _, status, _ in linhas if status is None)
+        print(f"{classe:<10}{len(linhas):>9}{len(ok):>7}{len(recusadas):>7}{sem_resposta:>10}"
+              f"{ms(percentil(ok, 50)):>14}{ms(percentil(ok, 99)):>14}{ms(percentil(recusadas, 99)):>14}")
+
+
+def main():
+    tempo_medio = sum(segundos * fracao for _, _, segundos, fracao in PERFIL.values())
+    capacidade = TRABALHADORES / tempo_medio
+
+    parser = argparse.ArgumentParser(description="Teste de carga do controle de admissão em sobrecarga")
+    parser.add_argument("--taxa", type=float, default=round(2 * capacidade),
+                        help="requisições por segundo (padrão: 2x a capacidade)")
+    parser.add_argument("--duracao", type=float, default=15.0)
+    parser.add_argument("--modos", nargs="+", choices=("sem", "com"), default=["sem", "com"])
+    parser.add_argument("--servir", choices=("sem", "com"), help=argparse.SUPPRESS)
+    parser.add_argument("--porta", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        return servir(args.servir, args.porta)
+    print(f"Capacidade simulada: ~{capacidade:.0f} req/s ({TRABALHADORES} trabalhadores); "
+          f"carga: {args.taxa:.0f} req/s por {args.duracao:.0f} s; cliente desiste em {TIMEOUT_CLIENTE:.0f} s")
+    for modo in args.modos:
+        relatorio(modo, medir(modo, args.taxa, args.duracao))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# backend/benchmarks/agenda.py
+#
+# Compara a verificação de conflito de horário e a consulta de período na árvore de
+# intervalos da agenda (src/agenda.py) com a varredura linear de todos os compromissos
+# do voluntário, com agendas sintéticas de alguns milhares de inscrições.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.agenda
+#   python -m benchmarks.agenda --tamanhos 1000 5000 20000 --consultas 2000
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from src.agenda import IndiceAgenda, compromisso, conflitam
+
+HOJE = date(2025, 1, 1)
+
+
+def gerar_linha(oportunidade_id, aleatorio, anos):
+    # Maioria de ações de um dia; algumas campanhas de semanas; algumas janelas noturnas
+    data_inicio = HOJE + timedelta(days=aleatorio.randrange(365 * anos))
+    duracao = 0 if aleatorio.random() < 0.8 else aleatorio.randrange(1, 30)
+    hora_inicio = aleatorio.choice([7, 8, 9, 13, 14, 18, 22])
+    horas = aleatorio.choice([1, 2, 3, 4])
+    return {
+        "inscricao_id": oportunidade_id,
+        "oportunidade_id": oportunidade_id,
+        "titulo": f"Ação {oportunidade_id}",
+        "status": "aprovada",
+        "data_inicio": data_inicio,
+        "data_termino": data_inicio + timedelta(days=duracao),
+        "hora_inicio": timedelta(hours=hora_inicio),
+        "hora_termino": timedelta(hours=(hora_inicio + horas) % 24),
+    }
+
+
+def varredura_conflitos(compromissos, candidato):
+    return [c for c in compromissos if conflitam(candidato, c)]
+
+
+def varredura_periodo(compromissos, de, ate):
+    return [c for c in compromissos if c.inicio <= ate and c.fim_efetivo >= de]
+
+
+def medir(funcao, consultas):
+    tempos = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        funcao(consulta)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da agenda de voluntários (conflitos de horário)")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 5_000, 20_000])
+    parser.add_argument("--consultas", type=int, default=1_000)
+    parser.add_argument("--anos", type=int, default=5, help="Período coberto pelas inscrições sintéticas")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    print(f"{'compromissos':<14}{'construção (ms)':>16}{'conflito varredura (µs)':>25}"
+          f"{'conflito árvore (µs)':>22}{'mês varredura (µs)':>20}{'mês árvore (µs)':>17}")
+    for tamanho in args.tamanhos:
+        linhas = [gerar_linha(i, aleatorio, args.anos) for i in range(1, tamanho + 1)]
+        indice = IndiceAgenda(ttl=3600, max_voluntarios=10)
+        inicio = time.perf_counter()
+        indice.no_periodo(1, HOJE, HOJE, lambda _vid: linhas) # Carrega e constrói a árvore
+        construcao = (time.perf_counter() - inicio) * 1000
+        compromissos = [compromisso(linha) for linha in linhas]
+
+        candidatos = [compromisso(gerar_linha(-i, aleatorio, args.anos)) for i in range(1, args.consultas + 1)]
+        meses = []
+        for _ in range(args.consultas):
+            de = HOJE + timedelta(days=aleatorio.randrange(365 * args.anos))
+            meses.append((de.toordinal(), (de + timedelta(days=30)).toordinal()))
+
+        carregar = lambda _vid: linhas
+        arvore = indice._indice(1, carregar)
+        # Mesmo resultado nas duas estratégias
+        for candidato in candidatos[:50]:
+            esperado = sorted(c.inscricao_id for c in varredura_conflitos(compromissos, candidato))
+            assert sorted(c.inscricao_id for c in indice.conflitos(1, candidato, carregar)) == esperado
+        for de, ate in meses[:50]:
+            esperado = sorted(c.inscricao_id for c in varredura_periodo(compromissos, de, ate))
+            assert sorted(c.inscricao_id for c in arvore.sobrepostos(de, ate)) == esperado
+
+        conflito_varredura = medir(lambda c: varredura_conflitos(compromissos, c), candidatos[:100])
+        conflito_arvore = medir(lambda c: indice.conflitos(1, c, carregar), candidatos)
+        mes_varredura = medir(lambda p: varredura_periodo(compromissos, *p), meses[:100])
+        mes_arvore = medir(lambda p: arvore.sobrepostos(*p), meses)
+        print(f"{tamanho:<14}{construcao:>16.2f}{conflito_varredura:>25.1f}"
+              f"{conflito_arvore:>22.1f}{mes_varredura:>20.1f}{mes_arvore:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# backend/benchmarks/banco.py
+#
+# MySQL descartável para os benchmarks: sobe um container Docker com a mesma imagem
+# do docker-compose, com os dados em tmpfs (nada fica gravado em disco), espera o
+# servidor aceitar conexões e remove o container ao final.
+#
+# Uso em código:
+#   with MySQLDescartavel() as banco:
+#       os.environ.update(banco.variaveis())
+
+import os
+import socket
+import subprocess
+import time
+import uuid
+
+import pymysql
+
+IMAGEM_PADRAO = "mysql:8.0"
+TIMEOUT_INICIALIZACAO = 180 # Segundos; a primeira inicialização do MySQL 8 é lenta
+# Durabilidade não importa num banco descartável; os números medem a API
+ARGUMENTOS_PADRAO = ("--innodb-flush-log-at-trx-commit=2", "--skip-log-bin")
+
+
+def _porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MySQLDescartavel:
+    def __init__(self, imagem=IMAGEM_PADRAO, banco="benchmark", senha="benchmark", porta=None,
+                 argumentos=ARGUMENTOS_PADRAO, rede=None):
+        self.imagem = imagem
+        self.banco = banco
+        self.senha = senha
+        self.porta = porta or _porta_livre()
+        self.argumentos = tuple(argumentos)
+        self.rede = rede # Rede Docker; os outros containers dela acessam este pelo `nome`
+        self.nome = f"tempo-bem-gasto-benchmark-{uuid.uuid4().hex[:8]}"
+        self._ativo = False
+
+    def variaveis(self):
+        """
+        Variáveis MYSQL_* para a API e os scripts apontarem para este banco.
+        """
+        return {
+            "MYSQL_HOST": "127.0.0.1",
+            "MYSQL_PORT": str(self.porta),
+            "MYSQL_USER": "root",
+            "MYSQL_PASSWORD": self.senha,
+            "MYSQL_DATABASE": self.banco,
+        }
+
+    def iniciar(self):
+        subprocess.run(
+            [
+                "docker", "run", "--detach", "--rm", "--name", self.nome,
+                "--env", f"MYSQL_ROOT_PASSWORD={self.senha}",
+                "--env", f"MYSQL_DATABASE={self.banco}",
+                "--publish", f"127.0.0.1:{self.porta}:3306",
+                "--tmpfs", "/var/lib/mysql",
+                *(["--network", self.rede] if self.rede else []),
+                self.imagem,
+                *self.argumentos,
+            ],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        self._ativo = True
+        self._esperar_pronto()
+        return self
+
+    def _esperar_pronto(self):
+        limite = time.monotonic() + TIMEOUT_INICIALIZACAO
+        while True:
+            try:
+                pymysql.connect(
+                    host="127.0.0.1", port=self.porta, user="root",
+                    password=self.senha, database=self.banco, connect_timeout=2,
+                ).close()
+                return
+            except pymysql.err.OperationalError:
+                if time.monotonic() > limite:
+                    raise RuntimeError(f"MySQL do container {self.nome} não ficou pronto a tempo")
+                time.sleep(1)
+
+    def parar(self):
+        if self._ativo:
+            subprocess.run(["docker", "rm", "--force", self.nome], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self._ativo = False
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *_):
+        self.parar()
+
+
+class BancoExistente:
+    """
+    Mesmo formato de MySQLDescartavel, para rodar a suíte contra um banco já configurado
+    pelas variáveis MYSQL_* (ex.: o MySQL do docker-compose).
+    """
+
+    def variaveis(self):
+        return {nome: os.environ[nome] for nome in (
+            "MYSQL_HOST", "MYSQL_PORT", "MYSQL_USER", "MYSQL_PASSWORD", "MYSQL_DATABASE",
+        ) if nome in os.environ}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
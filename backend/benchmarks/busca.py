@@ -0,0 +1,96 @@
+# backend/benchmarks/busca.py
+#
+# Compara a busca por índice invertido (src/search.py) com a varredura por substring
+# que o frontend faz hoje (applyFilter em OpportunityController.js).
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.busca
+#   python -m benchmarks.busca --tamanhos 10000 100000 --repeticoes 50
+
+import argparse
+import random
+import statistics
+import time
+
+from src.search import IndiceBusca
+
+PALAVRAS = (
+    "educação reforço escolar crianças adolescentes meio ambiente reciclagem plantio árvores "
+    "saúde hospital idosos acolhimento animais abrigo cães gatos alimentação cozinha "
+    "comunitária doação roupas campanha inverno música oficina artes teatro leitura "
+    "biblioteca alfabetização adultos tecnologia informática programação esporte futebol "
+    "natação limpeza praia mutirão construção reforma pintura horta orgânica cultura "
+    "tradução libras acessibilidade mentoria carreira finanças atendimento jurídico"
+).split()
+SILABAS = "ba be bi bo bu ca ce ci co cu da de di do du fa fe fi fo la le li lo lu ma me mi mo mu na ne ni no nu pa pe pi po pu ra re ri ro ru sa se si so su ta te ti to tu va ve vi vo".split()
+ONGS = [f"Instituto {p.capitalize()} {i}" for i, p in enumerate(PALAVRAS[:40])]
+CONSULTAS = ["educação", "educ", "crianças reforço", "meio ambiente", "horta orgânica", "bibli", "xyz"]
+
+
+def gerar_vocabulario(aleatorio, tamanho=5000):
+    # Palavras temáticas reais + palavras sintéticas, com frequência seguindo uma lei de Zipf
+    sinteticas = {
+        "".join(aleatorio.choices(SILABAS, k=aleatorio.randint(2, 4)))
+        for _ in range(tamanho)
+    }
+    vocabulario = PALAVRAS + sorted(sinteticas - set(PALAVRAS))
+    aleatorio.shuffle(vocabulario)
+    pesos = [1 / (posicao + 1) for posicao in range(len(vocabulario))]
+    return vocabulario, pesos
+
+
+def gerar_documentos(quantidade, semente=42):
+    aleatorio = random.Random(semente)
+    vocabulario, pesos = gerar_vocabulario(aleatorio)
+    documentos = []
+    for doc_id in range(1, quantidade + 1):
+        documentos.append((doc_id, {
+            "titulo": " ".join(aleatorio.choices(vocabulario, pesos, k=4)).capitalize(),
+            "descricao": " ".join(aleatorio.choices(vocabulario, pesos, k=40)),
+            "perfil_voluntario": " ".join(aleatorio.choices(vocabulario, pesos, k=10)),
+            "ong_nome": aleatorio.choice(ONGS),
+        }))
+    return documentos
+
+
+def varredura(documentos, texto):
+    # Mesma lógica de applyFilter: substring, sem ignorar acentos, só titulo e ong_nome
+    texto = texto.lower()
+    return [
+        doc_id for doc_id, doc in documentos
+        if texto in doc["titulo"].lower() or texto in doc["ong_nome"].lower()
+    ]
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    for tamanho in args.tamanhos:
+        documentos = gerar_documentos(tamanho)
+        indice = IndiceBusca()
+        inicio = time.perf_counter()
+        indice.recarregar(documentos)
+        construcao = time.perf_counter() - inicio
+        print(f"\n== {tamanho} oportunidades (construção do índice: {construcao:.2f}s) ==")
+        print(f"{'consulta':<20}{'varredura (ms)':>16}{'índice (ms)':>14}{'resultados':>12}")
+        for consulta in CONSULTAS:
+            tempo_varredura = medir(lambda: varredura(documentos, consulta), args.repeticoes)
+            tempo_indice = medir(lambda: indice.buscar(consulta, 20), args.repeticoes)
+            total, _ = indice.buscar(consulta, 20)
+            print(f"{consulta:<20}{tempo_varredura:>16.2f}{tempo_indice:>14.2f}{total:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+# backend/benchmarks/carga.py
+#
+# Driver de carga: para cada cenário (um endpoint da API), mantém N clientes
+# concorrentes fazendo requisições em sequência (HTTP keep-alive) durante um tempo
+# fixo e mede vazão e latência (p50/p95/p99). O resultado vai para um JSON e pode
+# ser comparado com uma linha de base: a execução falha se algum cenário ficar
+# pior que a base além da margem.
+#
+# Uso (a partir da pasta backend, com a API rodando sobre um banco com dados):
+#   python -m benchmarks.carga --url http://localhost:8000 --concorrencia 16 --duracao 10 \
+#       --saida resultados.json --baseline base.json --margem 0.2
+
+import argparse
+import http.client
+import json
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+
+class Cenario:
+    def __init__(self, nome, caminho, metodo="GET", corpo=None):
+        self.nome = nome
+        # caminho(aleatorio, ids) -> str; permite variar ids e parâmetros a cada requisição
+        self.caminho = caminho if callable(caminho) else (lambda aleatorio, ids: caminho)
+        self.metodo = metodo
+        self.corpo = corpo
+
+
+CONSULTAS_BUSCA = ["educação", "crianças reforço", "meio ambiente", "bibli", "horta", "música oficina"]
+
+
+def cenarios_padrao():
+    """
+    Cenários de leitura: não alteram o banco, então podem ser repetidos à vontade.
+    """
+    return [
+        Cenario("oportunidades_lista", "/api/oportunidades/?limite=20"),
+        Cenario("oportunidades_lista_filtrada", "/api/oportunidades/?limite=20&status_vaga=ativa&tipo_acao=educacao"),
+        Cenario("oportunidades_detalhe",
+                lambda aleatorio, ids: f"/api/oportunidades/{aleatorio.choice(ids['oportunidades'])}/"),
+        Cenario("oportunidades_busca",
+                lambda aleatorio, ids: f"/api/oportunidades/busca?q={aleatorio.choice(CONSULTAS_BUSCA)}&limite=20"),
+        Cenario("oportunidades_proximas",
+                lambda aleatorio, ids: "/api/oportunidades/proximas?lat={:.4f}&lon={:.4f}&raio_km=25".format(
+                    -23.55 + aleatorio.uniform(-0.3, 0.3), -46.63 + aleatorio.uniform(-0.3, 0.3))),
+        Cenario("oportunidades_candidatos",
+                lambda aleatorio, ids: f"/api/oportunidades/{aleatorio.choice(ids['oportunidades'])}/candidatos?k=20"),
+        Cenario("oportunidades_lote",
+                lambda aleatorio, ids: "/api/oportunidades/?ids=" + ",".join(
+                    str(id_) for id_ in aleatorio.sample(ids["oportunidades"], min(50, len(ids["oportunidades"]))))),
+        Cenario("voluntarios_lista", "/api/voluntarios/?limite=50"),
+        Cenario("voluntarios_lote",
+                lambda aleatorio, ids: "/api/voluntarios/?ids=" + ",".join(
+                    str(id_) for id_ in aleatorio.sample(ids["voluntarios"], min(50, len(ids["voluntarios"]))))),
+        Cenario("voluntarios_recomendacoes",
+                lambda aleatorio, ids: f"/api/voluntarios/{aleatorio.choice(ids['voluntarios'])}/recomendacoes?k=20"),
+        Cenario("inscricoes_por_oportunidade",
+                lambda aleatorio, ids: f"/api/inscricoes/?oportunidade_id={aleatorio.choice(ids['oportunidades'])}&limite=50"),
+    ]
+
+
+def _conexao(destino, timeout=30):
+    return http.client.HTTPConnection(destino.hostname, destino.port or 80, timeout=timeout)
+
+
+def amostrar_ids(url, quantidade=200):
+    """
+    Ids reais de oportunidades e voluntários (via API) para os cenários com {id}.
+    """
+    destino = urlsplit(url)
+    ids = {}
+    for chave, caminho in (("oportunidades", "/api/oportunidades/"), ("voluntarios", "/api/voluntarios/")):
+        conexao = _conexao(destino)
+        conexao.request("GET", f"{caminho}?limite={quantidade}")
+        resposta = conexao.getresponse()
+        linhas = json.loads(resposta.read())
+        conexao.close()
+        ids[chave] = [linha["id"] for linha in linhas] or [1]
+    return ids
+
+
+def percentil(ordenados, p):
+    # Nearest-rank: menor valor com pelo menos p% das amostras até ele
+    if not ordenados:
+        return None
+    posicao = max(0, min(len(ordenados) - 1, int(-(-p * len(ordenados) // 100)) - 1))
+    return ordenados[posicao]
+
+
+def medir_cenario(url, cenario, ids, concorrencia, duracao, aquecimento=1.0, semente=42):
+    destino = urlsplit(url)
+    latencias = [[] for _ in range(concorrencia)]
+    erros = [0] * concorrencia
+    status = [{} for _ in range(concorrencia)]
+    inicio_medicao = time.perf_counter() + aquecimento
+    fim = inicio_medicao + duracao
+
+    def cliente(indice):
+        aleatorio = random.Random(semente + indice)
+        conexao = _conexao(destino)
+        corpo = json.dumps(cenario.corpo) if cenario.corpo is not None else None
+        cabecalhos = {"Content-Type": "application/json"} if corpo else {}
+        while True:
+            antes = time.perf_counter()
+            if antes >= fim:
+                break
+            try:
+                conexao.request(cenario.metodo, cenario.caminho(aleatorio, ids), body=corpo, headers=cabecalhos)
+                resposta = conexao.getresponse()
+                resposta.read()
+                codigo = resposta.status
+            except (OSError, http.client.HTTPException):
+                conexao.close()
+                conexao = _conexao(destino)
+                codigo = None
+            depois = time.perf_counter()
+            if antes < inicio_medicao: # Requisições do aquecimento não entram na conta
+                continue
+            status[indice][codigo] = status[indice].get(codigo, 0) + 1
+            if codigo is None or codigo >= 400:
+                erros[indice] += 1
+            else:
+                latencias[indice].append(depois - antes)
+        conexao.close()
+
+    threads = [threading.Thread(target=cliente, args=(indice,)) for indice in range(concorrencia)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ordenadas = sorted(latencia for lista in latencias for latencia in lista)
+    contagem_status = {}
+    for parcial in status:
+        for codigo, quantidade in parcial.items():
+            contagem_status[str(codigo)] = contagem_status.get(str(codigo), 0) + quantidade
+
+    def ms(valor):
+        return round(valor * 1000, 3) if valor is not None else None
+
+    return {
+        "requisicoes": len(ordenadas) + sum(erros),
+        "erros": sum(erros),
+        "status": contagem_status,
+        "vazao_rps": round(len(ordenadas) / duracao, 2),
+        "p50_ms": ms(percentil(ordenadas, 50)),
+        "p95_ms": ms(percentil(ordenadas, 95)),
+        "p99_ms": ms(percentil(ordenadas, 99)),
+        "max_ms": ms(ordenadas[-1] if ordenadas else None),
+    }
+
+
+def executar(url, cenarios, concorrencia, duracao, aquecimento=1.0):
+    ids = amostrar_ids(url)
+    resultados = {}
+    for cenario in cenarios:
+        resultado = medir_cenario(url, cenario, ids, concorrencia, duracao, aquecimento)
+        resultados[cenario.nome] = resultado
+        print(
+            f"  {cenario.nome:<32}{resultado['vazao_rps']:>10.1f} req/s"
+            f"  p50 {resultado['p50_ms'] or 0:>8.2f} ms  p95 {resultado['p95_ms'] or 0:>8.2f} ms"
+            f"  p99 {resultado['p99_ms'] or 0:>8.2f} ms  erros {resultado['erros']}"
+        )
+    return resultados
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def relatorio(resultados, concorrencia, duracao, extras=None):
+    return {
+        "meta": {
+            "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _commit_atual(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "concorrencia": concorrencia,
+            "duracao_s": duracao,
+            **(extras or {}),
+        },
+        "cenarios": resultados,
+    }
+
+
+# Métricas comparadas com a linha de base: (chave, True se maior é pior)
+METRICAS_COMPARADAS = (("p95_ms", True), ("p99_ms", True), ("vazao_rps", False))
+
+
+def comparar(atual, base, margem):
+    """
+    Retorna a lista de regressões (textos) do relatório `atual` em relação à `base`.
+    Cenários presentes em só um dos dois são ignorados.
+    """
+    regressoes = []
+    for nome, resultado in atual["cenarios"].items():
+        referencia = base.get("cenarios", {}).get(nome)
+        if not referencia:
+            continue
+        if resultado["erros"] > referencia.get("erros", 0) and resultado["erros"] > resultado["requisicoes"] * 0.01:
+            regressoes.append(f"{nome}: {resultado['erros']} erros (base: {referencia.get('erros', 0)})")
+        for chave, maior_e_pior in METRICAS_COMPARADAS:
+            valor, valor_base = resultado.get(chave), referencia.get(chave)
+            if valor is None or not valor_base:
+                continue
+            limite = valor_base * (1 + margem) if maior_e_pior else valor_base * (1 - margem)
+            if (valor > limite) if maior_e_pior else (valor < limite):
+                regressoes.append(f"{nome}: {chave} {valor} (base {valor_base}, limite {limite:.2f})")
+    return regressoes
+
+
+def gravar_e_comparar(relatorio_atual, saida, baseline, margem):
+    """
+    Grava o JSON de resultados e, se houver linha de base, devolve o código de saída (0 ou 1).
+    """
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio_atual, arquivo, ensure_ascii=False, indent=2)
+    print(f"Resultados gravados em {saida}")
+    if not baseline:
+        return 0
+    with open(baseline, encoding="utf-8") as arquivo:
+        base = json.load(arquivo)
+    regressoes = comparar(relatorio_atual, base, margem)
+    if regressoes:
+        print(f"FALHOU: {len(regressoes)} regressão(ões) acima da margem de {margem:.0%}:")
+        for regressao in regressoes:
+            print(f"  - {regressao}")
+        return 1
+    print(f"OK: dentro da margem de {margem:.0%} da linha de base ({baseline})")
+    return 0
+
+
+def adicionar_argumentos(parser):
+    parser.add_argument("--concorrencia", type=int, default=8)
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos medidos por cenário")
+    parser.add_argument("--aquecimento", type=float, default=1.0, help="segundos descartados por cenário")
+    parser.add_argument("--cenarios", nargs="+", help="nomes dos cenários (padrão: todos)")
+    parser.add_argument("--saida", default="resultados_benchmark.json")
+    parser.add_argument("--baseline", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--margem", type=float, default=0.2, help="piora tolerada em relação à base (0.2 = 20%%)")
+
+
+def selecionar_cenarios(nomes):
+    cenarios = cenarios_padrao()
+    if not nomes:
+        return cenarios
+    desconhecidos = set(nomes) - {cenario.nome for cenario in cenarios}
+    if desconhecidos:
+        raise SystemExit(f"Cenários desconhecidos: {', '.join(sorted(desconhecidos))}")
+    return [cenario for cenario in cenarios if cenario.nome in nomes]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Driver de carga da API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    print(f"Carga em {args.url}: {args.concorrencia} clientes, {args.duracao:g}s por cenário")
+    resultados = executar(args.url, selecionar_cenarios(args.cenarios), args.concorrencia, args.duracao, args.aquecimento)
+    sys.exit(gravar_e_comparar(
+        relatorio(resultados, args.concorrencia, args.duracao, {"url": args.url}),
+        args.saida, args.baseline, args.margem,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# backend/benchmarks/dados.py
+#
+# Gerador de dados sintéticos para os benchmarks: preenche ongs, oportunidades,
+# voluntarios e inscricoes com volume proporcional à escala (escala 1 = 200 ONGs,
+# 5 mil oportunidades, 20 mil voluntários e 50 mil inscrições). Com a mesma semente,
+# os dados gerados são sempre os mesmos.
+# O esquema precisa estar migrado (python -m src.migrations).
+#
+# Uso (a partir da pasta backend, com as variáveis MYSQL_* configuradas):
+#   python -m benchmarks.dados --escala 0.5
+#   python -m benchmarks.dados --escala 1 --limpar   # apaga os dados existentes antes
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+import pymysql
+
+from src.geocoding import ARQUIVO_MUNICIPIOS
+
+VOLUME_POR_ESCALA = {
+    "ongs": 200,
+    "oportunidades": 5_000,
+    "voluntarios": 20_000,
+    "inscricoes": 50_000,
+}
+TAMANHO_LOTE = 1000
+
+PALAVRAS = (
+    "educação reforço escolar crianças adolescentes meio ambiente reciclagem plantio árvores "
+    "saúde hospital idosos acolhimento animais abrigo cães gatos alimentação cozinha "
+    "comunitária doação roupas campanha inverno música oficina artes teatro leitura "
+    "biblioteca alfabetização adultos tecnologia informática programação esporte futebol"
+).split()
+TIPOS_ACAO = ["educacao", "saude", "meio_ambiente", "animais", "cultura", "assistencia_social", "esporte"]
+STATUS_VAGA = ["ativa"] * 8 + ["inativa", "encerrada"]
+STATUS_INSCRICAO = ["pendente"] * 5 + ["aprovada"] * 3 + ["rejeitada", "cancelada"]
+DISPONIBILIDADES = [
+    "", "segunda e quarta à noite", "fins de semana de manhã", "seg a sex 14h-18h",
+    "terça 09:00 às 12:00, sábado tarde", "qualquer dia", "sábado", "dias úteis à noite",
+]
+TABELAS = ("inscricoes_arquivo", "inscricoes", "oportunidades_arquivo", "oportunidades", "voluntarios", "ongs") # ordem segura para apagar
+
+
+def conectar():
+    """
+    Conexão própria (sem o pool da API), lida das variáveis MYSQL_* no momento da chamada.
+    """
+    return pymysql.connect(
+        host=os.getenv("MYSQL_HOST"),
+        port=int(os.getenv("MYSQL_PORT", 3306)),
+        user=os.getenv("MYSQL_USER"),
+        password=os.getenv("MYSQL_PASSWORD"),
+        database=os.getenv("MYSQL_DATABASE"),
+        cursorclass=pymysql.cursors.DictCursor,
+    )
+
+
+def _municipios():
+    with open(ARQUIVO_MUNICIPIOS, encoding="utf-8") as entrada:
+        return [
+            (linha["nome"], linha["uf"], float(linha["latitude"]), float(linha["longitude"]))
+            for linha in csv.DictReader(entrada)
+        ]
+
+
+def _frase(aleatorio, palavras):
+    return " ".join(aleatorio.choices(PALAVRAS, k=palavras))
+
+
+def _endereco(aleatorio, municipios):
+    nome, uf, latitude, longitude = aleatorio.choice(municipios)
+    return (
+        f"Rua {aleatorio.choice(PALAVRAS).capitalize()}, {aleatorio.randint(1, 3000)} - {nome}/{uf}",
+        round(latitude + aleatorio.gauss(0, 0.05), 6),
+        round(longitude + aleatorio.gauss(0, 0.05), 6),
+    )
+
+
+def _inserir(cursor, sql, linhas):
+    ids = []
+    for inicio in range(0, len(linhas), TAMANHO_LOTE):
+        lote = linhas[inicio:inicio + TAMANHO_LOTE]
+        cursor.executemany(sql, lote)
+        # INSERT multi-linha: ids consecutivos a partir do lastrowid
+        ids.extend(range(cursor.lastrowid, cursor.lastrowid + len(lote)))
+    return ids
+
+
+def limpar(conn):
+    with conn.cursor() as cursor:
+        for tabela in TABELAS:
+            cursor.execute(f"DELETE FROM {tabela}")
+    conn.commit()
+
+
+def gerar(conn, escala=1.0, semente=42):
+    """
+    Insere os dados sintéticos e retorna a quantidade inserida por tabela.
+    """
+    aleatorio = random.Random(semente)
+    municipios = _municipios()
+    volume = {tabela: max(1, int(quantidade * escala)) for tabela, quantidade in VOLUME_POR_ESCALA.items()}
+    # Sufixo para e-mails/CPFs únicos mesmo gerando mais de uma vez no mesmo banco
+    sufixo = f"{semente}-{int(time.time())}"
+    base_cpf = int(time.time()) % 1000
+
+    with conn.cursor() as cursor:
+        ongs = []
+        for i in range(volume["ongs"]):
+            endereco, latitude, longitude = _endereco(aleatorio, municipios)
+            ongs.append((
+                f"Instituto {aleatorio.choice(PALAVRAS).capitalize()} {i} {sufixo}",
+                f"ong{i}.{sufixo}@benchmark.com", "benchmark", endereco, latitude, longitude,
+                _frase(aleatorio, 15),
+            ))
+        ids_ongs = _inserir(cursor,
+            "INSERT INTO ongs (nome, email, senha, endereco, latitude, longitude, descricao) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)", ongs)
+
+        oportunidades = []
+        inicio_publicacao = datetime(2024, 1, 1)
+        for _ in range(volume["oportunidades"]):
+            endereco, latitude, longitude = _endereco(aleatorio, municipios)
+            data_inicio = date(2025, 1, 1) + timedelta(days=aleatorio.randint(0, 365))
+            hora = aleatorio.randint(7, 19)
+            oportunidades.append((
+                _frase(aleatorio, 4).capitalize(), _frase(aleatorio, 40), aleatorio.choice(ids_ongs),
+                endereco, latitude, longitude,
+                data_inicio, data_inicio + timedelta(days=aleatorio.choice([0, 1, 2, 30, 90])),
+                f"{hora:02d}:00", f"{hora + aleatorio.randint(1, 4):02d}:00",
+                _frase(aleatorio, 10), aleatorio.choice([None, 5, 10, 20, 50, 100]),
+                aleatorio.choice(STATUS_VAGA), aleatorio.choice(TIPOS_ACAO),
+                inicio_publicacao + timedelta(minutes=aleatorio.randint(0, 60 * 24 * 600)),
+            ))
+        ids_oportunidades = _inserir(cursor,
+            "INSERT INTO oportunidades (titulo, descricao, ong_id, endereco, latitude, longitude, "
+            "data_inicio, data_termino, hora_inicio, hora_termino, perfil_voluntario, num_vagas, "
+            "status_vaga, tipo_acao, data_publicacao) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", oportunidades)
+
+        voluntarios = []
+        for i in range(volume["voluntarios"]):
+            endereco, latitude, longitude = _endereco(aleatorio, municipios)
+            voluntarios.append((
+                f"Voluntário {i}", f"voluntario{i}.{sufixo}@benchmark.com", "benchmark",
+                endereco, latitude, longitude,
+                date(1960, 1, 1) + timedelta(days=aleatorio.randint(0, 16000)),
+                f"{base_cpf:03d}{i:08d}",
+                ", ".join(aleatorio.sample(PALAVRAS, aleatorio.randint(1, 5))),
+                aleatorio.choice(DISPONIBILIDADES),
+            ))
+        ids_voluntarios = _inserir(cursor,
+            "INSERT INTO voluntarios (nome, email, senha, endereco, latitude, longitude, "
+            "data_nascimento, cpf, interesses, disponibilidade) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)", voluntarios)
+
+        # Pares (oportunidade, voluntário) únicos, concentrados nas oportunidades mais populares
+        acumulados = list(itertools.accumulate(1 / (posicao + 1) ** 0.5 for posicao in range(len(ids_oportunidades))))
+        pares = set()
+        for _ in range(3): # Pares repetidos são descartados; algumas rodadas completam o volume
+            faltam = volume["inscricoes"] - len(pares)
+            if faltam <= 0:
+                break
+            sorteadas = aleatorio.choices(ids_oportunidades, cum_weights=acumulados, k=faltam)
+            pares.update((oportunidade_id, aleatorio.choice(ids_voluntarios)) for oportunidade_id in sorteadas)
+        inscricoes = [
+            (oportunidade_id, voluntario_id, aleatorio.choice(STATUS_INSCRICAO), _frase(aleatorio, 8))
+            for oportunidade_id, voluntario_id in sorted(pares)
+        ]
+        _inserir(cursor,
+            "INSERT INTO inscricoes (oportunidade_id, voluntario_id, status_inscricao, mensagem) "
+            "VALUES (%s, %s, %s, %s)", inscricoes)
+
+        # Mesma contabilidade de vagas da migração 0004
+        cursor.execute("""
+            UPDATE oportunidades o SET vagas_ocupadas = (
+                SELECT COUNT(*) FROM inscricoes i
+                WHERE i.oportunidade_id = o.id AND i.status_inscricao IN ('pendente', 'aprovada')
+            )
+        """)
+    conn.commit()
+    return {
+        "ongs": len(ids_ongs),
+        "oportunidades": len(ids_oportunidades),
+        "voluntarios": len(ids_voluntarios),
+        "inscricoes": len(inscricoes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de dados sintéticos")
+    parser.add_argument("--escala", type=float, default=1.0)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--limpar", action="store_true", help="apaga os dados existentes antes de gerar")
+    args = parser.parse_args()
+
+    conn = conectar()
+    try:
+        if args.limpar:
+            limpar(conn)
+        inicio = time.perf_counter()
+        quantidades = gerar(conn, args.escala, args.semente)
+        print(f"Dados gerados em {time.perf_counter() - inicio:.1f}s: {quantidades}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
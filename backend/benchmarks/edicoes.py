@@ -0,0 +1,148 @@
+# backend/benchmarks/edicoes.py
+#
+# Latência das edições de oportunidades sob disputa: cria algumas oportunidades e põe
+# N editores simultâneos para, em laço, ler o detalhe (ETag) e gravar num_vagas + 1 com
+# PATCH e If-Match. Um 412 faz o editor ler de novo e repetir, como o frontend faria.
+# Ao final, num_vagas de cada oportunidade precisa ser o inicial mais o número de PATCHes
+# aceitos: nenhuma edição perdida. Com --sem-if-match os editores gravam às cegas e as
+# edições perdidas aparecem na conta.
+# Precisa da API rodando com um banco de testes (os dados ficam gravados).
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.edicoes --url http://localhost:8000 --editores 32 --oportunidades 4 --duracao 10
+#   python -m benchmarks.edicoes --editores 32 --oportunidades 4 --sem-if-match
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+VAGAS_INICIAIS = 1000
+
+
+def requisicao(conexao, metodo, caminho, corpo=None, cabecalhos=None):
+    cabecalhos = dict(cabecalhos or {})
+    if corpo is not None:
+        cabecalhos["Content-Type"] = "application/json"
+    conexao.request(metodo, caminho, body=json.dumps(corpo) if corpo is not None else None, headers=cabecalhos)
+    resposta = conexao.getresponse()
+    dados = resposta.read()
+    return resposta.status, resposta.getheader("ETag"), json.loads(dados) if dados else None
+
+
+def conectar(destino):
+    return http.client.HTTPConnection(destino.hostname, destino.port or 80, timeout=120)
+
+
+def criar_oportunidades(destino, quantidade):
+    conexao = conectar(destino)
+    try:
+        ids = []
+        for i in range(quantidade):
+            status, _, corpo = requisicao(conexao, "POST", "/api/oportunidades/", {
+                "titulo": f"Benchmark de edições {int(time.time())}-{i}",
+                "descricao": "Oportunidade criada pelo benchmark de edições concorrentes.",
+                "ong_nome": "ONG Benchmark",
+                "endereco": "Rua do Benchmark, 100 - São Paulo/SP",
+                "num_vagas": VAGAS_INICIAIS,
+                "status_vaga": "ativa",
+                "tipo_acao": "educacao",
+            })
+            if status >= 400:
+                raise RuntimeError(f"Falha ao criar a oportunidade: {status} {corpo}")
+            ids.append(corpo["id"])
+        return ids
+    finally:
+        conexao.close()
+
+
+def percentil(valores, p):
+    return valores[min(len(valores) - 1, int(len(valores) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência das edições concorrentes (If-Match/412)")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--editores", type=int, default=32)
+    parser.add_argument("--oportunidades", type=int, default=4, help="Menos oportunidades = mais disputa")
+    parser.add_argument("--duracao", type=float, default=10)
+    parser.add_argument("--sem-if-match", action="store_true", help="Grava sem If-Match (última escrita vence)")
+    args = parser.parse_args()
+
+    destino = urlsplit(args.url)
+    ids = criar_oportunidades(destino, args.oportunidades)
+    barreira = threading.Barrier(args.editores)
+    fim = [0.0]
+
+    def editar(editor):
+        oportunidade_id = ids[editor % len(ids)]
+        caminho = f"/api/oportunidades/{oportunidade_id}/"
+        latencias, codigos, tentativas = [], Counter(), []
+        conexao = conectar(destino)
+        try:
+            barreira.wait()
+            while time.perf_counter() < fim[0]:
+                # Uma edição completa: lê, grava; repete a leitura a cada 412
+                for tentativa in range(1, 101):
+                    _, etag, atual = requisicao(conexao, "GET", caminho)
+                    cabecalhos = {} if args.sem_if_match else {"If-Match": etag}
+                    inicio = time.perf_counter()
+                    status, _, _ = requisicao(conexao, "PATCH", caminho, {"num_vagas": atual["num_vagas"] + 1}, cabecalhos)
+                    latencias.append(time.perf_counter() - inicio)
+                    codigos[status] += 1
+                    if status != 412:
+                        tentativas.append(tentativa)
+                        break
+        finally:
+            conexao.close()
+        return oportunidade_id, latencias, codigos, tentativas
+
+    # O relógio começa quando todos passam da barreira
+    fim[0] = time.perf_counter() + args.duracao + 1
+    with ThreadPoolExecutor(max_workers=args.editores) as executor:
+        resultados = list(executor.map(editar, range(args.editores)))
+
+    latencias = sorted(latencia for _, lista, _, _ in resultados for latencia in lista)
+    codigos = sum((c for _, _, c, _ in resultados), Counter())
+    tentativas = [t for _, _, _, lista in resultados for t in lista]
+    aceitas = Counter()
+    for oportunidade_id, _, c, _ in resultados:
+        aceitas[oportunidade_id] += c[200]
+
+    conexao = conectar(destino)
+    try:
+        perdidas = 0
+        for oportunidade_id in ids:
+            _, _, atual = requisicao(conexao, "GET", f"/api/oportunidades/{oportunidade_id}/")
+            perdidas += VAGAS_INICIAIS + aceitas[oportunidade_id] - atual["num_vagas"]
+    finally:
+        conexao.close()
+
+    modo = "sem If-Match" if args.sem_if_match else "com If-Match"
+    print(f"{args.editores} editores em {args.oportunidades} oportunidade(s), {modo}, {args.duracao:g} s")
+    print(f"  PATCHes por status: {dict(sorted(codigos.items()))} ({codigos[200] / args.duracao:.0f} edições/s)")
+    print(f"  latência do PATCH: p50 {percentil(latencias, 0.5):.1f} ms | p95 {percentil(latencias, 0.95):.1f} ms"
+          f" | p99 {percentil(latencias, 0.99):.1f} ms")
+    if tentativas:
+        print(f"  tentativas por edição: média {statistics.mean(tentativas):.2f} | máx {max(tentativas)}")
+    print(f"  edições perdidas: {perdidas}")
+
+    erros = []
+    if set(codigos) - {200, 412}:
+        erros.append("houve respostas diferentes de 200/412")
+    if perdidas and not args.sem_if_match:
+        erros.append(f"{perdidas} edição(ões) perdida(s) com If-Match")
+    if erros:
+        print("FALHOU: " + "; ".join(erros))
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
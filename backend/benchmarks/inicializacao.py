@@ -0,0 +1,87 @@
+# backend/benchmarks/inicializacao.py
+#
+# Cold start da API: tempo desde o lançamento do processo (uvicorn main:api) até a
+# primeira resposta 200 num caminho, para cada modo de MIGRACOES_NO_STARTUP, além do
+# tempo de `import main` sozinho. Cada medição usa um processo novo.
+# Sem as variáveis MYSQL_*, só o modo `nenhum` com um caminho que não usa o banco
+# (o padrão, "/") consegue responder.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.inicializacao --modos nenhum
+#   python -m benchmarks.inicializacao --modos aplicar verificar nenhum \
+#       --caminho "/api/oportunidades/?limite=1" --repeticoes 5
+
+import argparse
+import http.client
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.banco import _porta_livre
+
+DIRETORIO_BACKEND = Path(__file__).resolve().parent.parent
+MODOS = ("aplicar", "verificar", "nenhum")
+
+
+def medir_import(repeticoes):
+    codigo = "import time; inicio = time.perf_counter(); import main; print(time.perf_counter() - inicio)"
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, "-c", codigo], cwd=DIRETORIO_BACKEND, capture_output=True, text=True, check=True,
+        ).stdout
+        tempos.append(float(saida.strip().splitlines()[-1]))
+    return statistics.median(tempos) * 1000
+
+
+def medir_cold_start(modo, caminho, timeout=60):
+    """
+    Segundos do Popen até a primeira resposta 200 em `caminho`.
+    """
+    porta = _porta_livre()
+    ambiente = {**os.environ, "MIGRACOES_NO_STARTUP": modo}
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:api", "--host", "127.0.0.1", "--port", str(porta),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=DIRETORIO_BACKEND, env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - inicio < timeout:
+            if processo.poll() is not None:
+                raise RuntimeError(f"A API terminou durante a inicialização (modo {modo}, código {processo.returncode})")
+            try:
+                conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=5)
+                conexao.request("GET", caminho)
+                if conexao.getresponse().status == 200:
+                    return time.perf_counter() - inicio
+                conexao.close()
+            except OSError:
+                pass
+            time.sleep(0.01)
+        raise RuntimeError(f"A API não respondeu 200 em {caminho} a tempo (modo {modo})")
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cold start da API")
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    parser.add_argument("--caminho", default="/", help="primeira requisição que precisa dar 200")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"import main: {medir_import(args.repeticoes):.0f} ms (mediana de {args.repeticoes})")
+    print(f"Até o primeiro 200 em {args.caminho}:")
+    print(f"{'modo':<12}{'mediana (ms)':>14}{'mín (ms)':>10}{'máx (ms)':>10}")
+    for modo in args.modos:
+        tempos = [medir_cold_start(modo, args.caminho) * 1000 for _ in range(args.repeticoes)]
+        print(f"{modo:<12}{statistics.median(tempos):>14.0f}{min(tempos):>10.0f}{max(tempos):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
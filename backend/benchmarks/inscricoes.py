@@ -0,0 +1,108 @@
+# backend/benchmarks/inscricoes.py
+#
+# Teste de concorrência das inscrições: cria uma oportunidade com poucas vagas e
+# dispara N inscrições de voluntários diferentes ao mesmo tempo via POST /api/inscricoes/.
+# Verifica que o número de inscrições aceitas (201) é exatamente o número de vagas,
+# que as demais receberam 409 e que o banco não ficou com mais inscrições que vagas.
+# Precisa da API rodando com um banco de testes (os dados ficam gravados).
+# A mesma garantia é conferida automaticamente em tests/test_inscricoes.py.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.inscricoes --url http://localhost:8000 --paralelas 500 --vagas 50
+
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+def requisicao(destino, metodo, caminho, corpo=None):
+    conexao = http.client.HTTPConnection(destino.hostname, destino.port or 80, timeout=120)
+    try:
+        cabecalhos = {"Content-Type": "application/json"} if corpo is not None else {}
+        conexao.request(metodo, caminho, body=json.dumps(corpo) if corpo is not None else None, headers=cabecalhos)
+        resposta = conexao.getresponse()
+        dados = resposta.read()
+        return resposta.status, json.loads(dados) if dados else None
+    finally:
+        conexao.close()
+
+
+def criar_oportunidade(destino, vagas):
+    status, corpo = requisicao(destino, "POST", "/api/oportunidades/", {
+        "titulo": f"Benchmark de inscrições {int(time.time())}",
+        "descricao": "Oportunidade criada pelo teste de concorrência das inscrições.",
+        "ong_nome": "ONG Benchmark",
+        "endereco": "Rua do Benchmark, 100 - São Paulo/SP",
+        "perfil_voluntario": "Qualquer pessoa",
+        "num_vagas": vagas,
+        "status_vaga": "ativa",
+        "tipo_acao": "educacao",
+    })
+    if status >= 400:
+        raise RuntimeError(f"Falha ao criar a oportunidade: {status} {corpo}")
+    return corpo["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de concorrência das inscrições")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--paralelas", type=int, default=500)
+    parser.add_argument("--vagas", type=int, default=50)
+    args = parser.parse_args()
+
+    destino = urlsplit(args.url)
+    oportunidade_id = criar_oportunidade(destino, args.vagas)
+    base_cpf = int(time.time() * 1000) % 10**8
+
+    # Todas as threads esperam na barreira para as requisições saírem juntas
+    barreira = threading.Barrier(args.paralelas)
+
+    def inscrever(i):
+        payload = {
+            "nome": f"Voluntário Benchmark {i}",
+            "nascimento": "2000-01-01",
+            "cpf": f"{base_cpf:08d}{i:03d}",
+            "mensagem": "Inscrição do teste de concorrência",
+            "oportunidade_id": oportunidade_id,
+        }
+        barreira.wait()
+        inicio = time.perf_counter()
+        status, _ = requisicao(destino, "POST", "/api/inscricoes/", payload)
+        return status, time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.paralelas) as executor:
+        resultados = list(executor.map(inscrever, range(args.paralelas)))
+    tempo_total = time.perf_counter() - inicio
+
+    codigos = Counter(status for status, _ in resultados)
+    latencias = sorted(duracao for _, duracao in resultados)
+    _, gravadas = requisicao(destino, "GET", f"/api/inscricoes/?oportunidade_id={oportunidade_id}")
+
+    print(f"Oportunidade {oportunidade_id}: {args.vagas} vagas, {args.paralelas} inscrições simultâneas")
+    print(f"  respostas por status: {dict(sorted(codigos.items()))}")
+    print(f"  inscrições gravadas:  {len(gravadas)}")
+    print(f"  tempo total: {tempo_total:.2f} s | p50: {latencias[len(latencias) // 2] * 1000:.0f} ms"
+          f" | máx: {latencias[-1] * 1000:.0f} ms")
+
+    erros = []
+    if codigos[201] != args.vagas:
+        erros.append(f"{codigos[201]} inscrições aceitas para {args.vagas} vagas")
+    if len(gravadas) > args.vagas:
+        erros.append(f"sobrelotação: {len(gravadas)} inscrições gravadas para {args.vagas} vagas")
+    if codigos[201] + codigos[409] != args.paralelas:
+        erros.append("houve respostas diferentes de 201/409")
+    if erros:
+        print("FALHOU: " + "; ".join(erros))
+        sys.exit(1)
+    print("OK: nenhuma sobrelotação")
+
+
+if __name__ == "__main__":
+    main()
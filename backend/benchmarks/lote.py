@@ -0,0 +1,76 @@
+# backend/benchmarks/lote.py
+#
+# Compara N criações de oportunidades via POST /api/oportunidades/ (uma requisição
+# por oportunidade) com uma única chamada a POST /api/oportunidades/lote.
+# Precisa da API rodando com um banco de testes (as oportunidades ficam gravadas).
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.lote --url http://localhost:8000 --quantidade 1000
+
+import argparse
+import http.client
+import json
+import time
+from urllib.parse import urlsplit
+
+
+def gerar_payloads(quantidade, prefixo):
+    return [
+        {
+            "titulo": f"{prefixo} oportunidade {i}",
+            "descricao": "Oportunidade gerada pelo benchmark de importação em lote.",
+            "ong_nome": f"ONG Benchmark {i % 20}",
+            "endereco": "Rua do Benchmark, 100 - São Paulo/SP",
+            "data_inicio": "01/08/2025",
+            "data_termino": "30/08/2025",
+            "hora_inicio": "09:00",
+            "hora_termino": "12:00",
+            "perfil_voluntario": "Pessoas pontuais e comunicativas",
+            "num_vagas": 10,
+            "status_vaga": "ativa",
+            "tipo_acao": "educacao",
+        }
+        for i in range(quantidade)
+    ]
+
+
+def post(conexao, caminho, corpo):
+    conexao.request("POST", caminho, body=json.dumps(corpo), headers={"Content-Type": "application/json"})
+    resposta = conexao.getresponse()
+    dados = resposta.read()
+    if resposta.status >= 400:
+        raise RuntimeError(f"POST {caminho} falhou com {resposta.status}: {dados[:200]!r}")
+    return json.loads(dados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de importação em lote de oportunidades")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--quantidade", type=int, default=1000)
+    args = parser.parse_args()
+
+    destino = urlsplit(args.url)
+    conexao = http.client.HTTPConnection(destino.hostname, destino.port or 80, timeout=120)
+
+    # Uma requisição (e uma transação) por oportunidade, com conexão HTTP keep-alive
+    individuais = gerar_payloads(args.quantidade, "individual")
+    inicio = time.perf_counter()
+    for payload in individuais:
+        post(conexao, "/api/oportunidades/", payload)
+    tempo_individual = time.perf_counter() - inicio
+
+    lote = gerar_payloads(args.quantidade, "lote")
+    inicio = time.perf_counter()
+    resultado = post(conexao, "/api/oportunidades/lote", lote)
+    tempo_lote = time.perf_counter() - inicio
+    conexao.close()
+
+    print(f"{args.quantidade} POSTs individuais: {tempo_individual:.2f}s "
+          f"({args.quantidade / tempo_individual:.0f} oportunidades/s)")
+    print(f"1 POST em lote:        {tempo_lote:.2f}s "
+          f"({resultado['inseridas'] / tempo_lote:.0f} oportunidades/s, {resultado['falhas']} falhas)")
+    print(f"Aceleração: {tempo_individual / tempo_lote:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# backend/benchmarks/matching.py
+#
+# Mede o motor de matching (src/matching.py) com dados sintéticos: tempo de carga,
+# latência de candidatos (oportunidade -> voluntários) e recomendações
+# (voluntário -> oportunidades), e o custo de uma atualização incremental.
+# Para referência, compara com a mesma pontuação calculada linha a linha em Python.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.matching
+#   python -m benchmarks.matching --voluntarios 100000 --oportunidades 5000 --k 20
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from src.matching import (
+    PESO_DISPONIBILIDADE, PESO_TEXTO, MotorMatching,
+)
+
+INTERESSES = (
+    "educação reforço escolar crianças adolescentes meio ambiente reciclagem plantio árvores "
+    "saúde hospital idosos acolhimento animais abrigo cães gatos alimentação cozinha "
+    "comunitária doação roupas música oficina artes teatro leitura biblioteca alfabetização "
+    "tecnologia informática programação esporte futebol limpeza praia construção horta"
+).split()
+TIPOS_ACAO = ["educacao", "saude", "meio ambiente", "animais", "cultura", "assistencia social", "esporte"]
+DISPONIBILIDADES = [
+    "", "segunda e quarta à noite", "fins de semana de manhã", "seg a sex 14h-18h",
+    "terça 09:00 às 12:00, sábado tarde", "qualquer dia", "sábado", "dias úteis à noite",
+]
+
+
+def gerar_voluntarios(quantidade, aleatorio):
+    return [
+        {
+            "id": voluntario_id,
+            "interesses": ", ".join(aleatorio.sample(INTERESSES, aleatorio.randint(1, 5))),
+            "disponibilidade": aleatorio.choice(DISPONIBILIDADES),
+        }
+        for voluntario_id in range(1, quantidade + 1)
+    ]
+
+
+def gerar_oportunidades(quantidade, aleatorio):
+    oportunidades = []
+    for oportunidade_id in range(1, quantidade + 1):
+        inicio = date(2025, 8, 1) + timedelta(days=aleatorio.randint(0, 60))
+        hora = aleatorio.randint(7, 19)
+        oportunidades.append({
+            "id": oportunidade_id,
+            "titulo": " ".join(aleatorio.sample(INTERESSES, 3)).capitalize(),
+            "descricao": " ".join(aleatorio.choices(INTERESSES, k=20)),
+            "perfil_voluntario": " ".join(aleatorio.sample(INTERESSES, 4)),
+            "tipo_acao": aleatorio.choice(TIPOS_ACAO),
+            "status_vaga": "ativa",
+            "data_inicio": inicio,
+            "data_termino": inicio + timedelta(days=aleatorio.choice([0, 1, 2, 30])),
+            "hora_inicio": timedelta(hours=hora),
+            "hora_termino": timedelta(hours=hora + aleatorio.randint(1, 4)),
+        })
+    return oportunidades
+
+
+def candidatos_python(motor, oportunidade_id, k):
+    # Mesma pontuação, uma linha por vez e sem NumPy nas operações por voluntário
+    texto, bits, horas = motor.oportunidades.vetor(oportunidade_id)
+    texto = texto.tolist()
+    bits = [int(palavra) for palavra in bits]
+    matriz = motor.voluntarios
+    pontos = []
+    for linha in range(matriz.tamanho):
+        afinidade = min(max(sum(a * b for a, b in zip(matriz.texto[linha].tolist(), texto)), 0.0), 1.0)
+        comuns = sum(bin(int(a) & b).count("1") for a, b in zip(matriz.bits[:, linha], bits))
+        pontos.append((PESO_TEXTO * afinidade + PESO_DISPONIBILIDADE * min(comuns / max(horas, 1), 1.0), linha))
+    pontos.sort(reverse=True)
+    return pontos[:k]
+
+
+def percentis(tempos):
+    tempos = sorted(tempos)
+    return (
+        statistics.median(tempos) * 1000,
+        tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))] * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do motor de matching")
+    parser.add_argument("--voluntarios", type=int, default=100_000)
+    parser.add_argument("--oportunidades", type=int, default=5_000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--referencia", type=int, default=3, help="consultas na versão em Python puro")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    voluntarios = gerar_voluntarios(args.voluntarios, aleatorio)
+    oportunidades = gerar_oportunidades(args.oportunidades, aleatorio)
+
+    motor = MotorMatching()
+    inicio = time.perf_counter()
+    motor.recarregar(voluntarios, oportunidades)
+    carga = time.perf_counter() - inicio
+    memoria = sum(
+        array.nbytes
+        for matriz in (motor.voluntarios, motor.oportunidades)
+        for array in (matriz.texto, matriz.bits, matriz.horas, matriz.ids, matriz.validas)
+    )
+    print(f"{args.voluntarios} voluntários, {args.oportunidades} oportunidades")
+    print(f"  carga: {carga:.2f} s | memória dos vetores: {memoria / 2**20:.1f} MB")
+
+    tempos = []
+    for _ in range(args.consultas):
+        oportunidade_id = aleatorio.randint(1, args.oportunidades)
+        inicio = time.perf_counter()
+        motor.candidatos(oportunidade_id, args.k)
+        tempos.append(time.perf_counter() - inicio)
+    p50, p95 = percentis(tempos)
+    print(f"  candidatos (k={args.k}):    p50 {p50:.2f} ms | p95 {p95:.2f} ms")
+
+    tempos = []
+    for _ in range(args.consultas):
+        voluntario_id = aleatorio.randint(1, args.voluntarios)
+        inicio = time.perf_counter()
+        motor.recomendacoes(voluntario_id, args.k)
+        tempos.append(time.perf_counter() - inicio)
+    p50, p95 = percentis(tempos)
+    print(f"  recomendações (k={args.k}): p50 {p50:.2f} ms | p95 {p95:.2f} ms")
+
+    tempos = []
+    for voluntario in voluntarios[: args.consultas]:
+        voluntario = {**voluntario, "interesses": voluntario["interesses"] + ", leitura"}
+        inicio = time.perf_counter()
+        motor.atualizar_voluntario(voluntario["id"], voluntario)
+        tempos.append(time.perf_counter() - inicio)
+    p50, _ = percentis(tempos)
+    print(f"  atualização incremental de um voluntário: p50 {p50:.3f} ms")
+
+    if args.referencia:
+        tempos = []
+        for _ in range(args.referencia):
+            oportunidade_id = aleatorio.randint(1, args.oportunidades)
+            inicio = time.perf_counter()
+            esperado = candidatos_python(motor, oportunidade_id, args.k)
+            tempos.append(time.perf_counter() - inicio)
+            obtido = motor.candidatos(oportunidade_id, args.k)
+            # Mesmas pontuações (empates podem trocar a ordem dos ids)
+            assert np.allclose([p for p, _ in esperado][: len(obtido)], [p for _, p, _, _ in obtido], atol=1e-3)
+        print(f"  candidatos em Python puro (referência): {statistics.median(tempos) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
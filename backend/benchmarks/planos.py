@@ -0,0 +1,136 @@
+# backend/benchmarks/planos.py
+#
+# Confere os planos de execução (EXPLAIN) das consultas principais da API.
+# Falha (código de saída 1) se alguma consulta fizer varredura completa (type=ALL)
+# na tabela principal ou não usar o índice esperado.
+#
+# O otimizador do MySQL prefere varrer tabelas muito pequenas, então rode contra
+# um banco com volume representativo (ex.: preenchido pelo gerador de dados sintéticos).
+#
+# Uso (a partir da pasta backend, com as variáveis MYSQL_* configuradas):
+#   python -m benchmarks.planos
+# A mesma conferência roda como teste (tests/test_planos.py), num MySQL descartável
+# preenchido com os dados sintéticos:
+#   python -m pytest tests/test_planos.py
+
+import sys
+from datetime import date, datetime
+
+from src.arquivo import SQL_LOTE_OPORTUNIDADES
+from src.database import get_connection
+
+COLUNAS_LISTA = """
+    o.id, o.data_publicacao, o.titulo, o.descricao, o.ong_id, ongs.nome AS ong_nome, o.endereco,
+    o.data_inicio, o.data_termino, o.hora_inicio, o.hora_termino,
+    o.perfil_voluntario, o.num_vagas, o.status_vaga, o.tipo_acao
+"""
+
+# (descrição, SQL, parâmetros, alias da tabela principal, índices aceitos)
+CONSULTAS = [
+    (
+        "listagem padrão (primeira página)",
+        f"SELECT {COLUNAS_LISTA} FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id "
+        "ORDER BY o.data_publicacao DESC, o.id DESC LIMIT %s",
+        (21,), "o", {"idx_oportunidades_publicacao"},
+    ),
+    (
+        "listagem padrão (página seguinte, keyset)",
+        f"SELECT {COLUNAS_LISTA} FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id "
+        "WHERE (o.data_publicacao < %s OR (o.data_publicacao = %s AND o.id < %s)) "
+        "ORDER BY o.data_publicacao DESC, o.id DESC LIMIT %s",
+        (datetime(2030, 1, 1), datetime(2030, 1, 1), 1, 21), "o",
+        {"idx_oportunidades_publicacao", "PRIMARY"},
+    ),
+    (
+        "listagem por status_vaga",
+        f"SELECT {COLUNAS_LISTA} FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id "
+        "WHERE o.status_vaga = %s ORDER BY o.data_publicacao DESC, o.id DESC LIMIT %s",
+        ("ativa", 21), "o", {"idx_oportunidades_status_publicacao"},
+    ),
+    (
+        "listagem por ONG",
+        f"SELECT {COLUNAS_LISTA} FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id "
+        "WHERE o.ong_id = %s ORDER BY o.data_publicacao DESC, o.id DESC LIMIT %s",
+        (1, 21), "o", {"idx_oportunidades_ong_publicacao"},
+    ),
+    (
+        "faixa de data de início",
+        f"SELECT {COLUNAS_LISTA} FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id "
+        "WHERE o.data_inicio >= %s AND o.data_inicio <= %s",
+        (date(2025, 1, 1), date(2025, 1, 7)), "o", {"idx_oportunidades_inicio"},
+    ),
+    (
+        "detalhe da oportunidade",
+        f"SELECT {COLUNAS_LISTA} FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id WHERE o.id = %s",
+        (1,), "o", {"PRIMARY"},
+    ),
+    (
+        "ONG pelo nome (criação de oportunidade)",
+        "SELECT id FROM ongs WHERE nome = %s",
+        ("ONG 1",), "ongs", {"idx_ongs_nome"},
+    ),
+    (
+        "inscrições do voluntário",
+        "SELECT i.id AS inscricao_id, i.oportunidade_id, o.titulo AS oportunidade_titulo, "
+        "i.data_inscricao, i.status_inscricao FROM inscricoes i "
+        "JOIN oportunidades o ON i.oportunidade_id = o.id "
+        "WHERE i.voluntario_id = %s ORDER BY i.data_inscricao DESC",
+        (1,), "i", {"idx_inscricoes_voluntario_data"},
+    ),
+    (
+        "painel da ONG (resumo)",
+        "SELECT g.id, g.nome, p.* FROM ongs g LEFT JOIN painel_ongs p ON p.ong_id = g.id WHERE g.id = %s",
+        (1,), "p", {"PRIMARY"},
+    ),
+    (
+        "painel da ONG (atividade recente)",
+        "SELECT id, tipo, descricao, oportunidade_id, inscricao_id, criado_em FROM atividade_ongs "
+        "WHERE ong_id = %s ORDER BY id DESC LIMIT %s",
+        (1, 10), "atividade_ongs", {"idx_atividade_ongs_ong"},
+    ),
+    (
+        "lote do arquivamento (oportunidades)",
+        SQL_LOTE_OPORTUNIDADES,
+        {"desde": 0, "corte": date(2025, 1, 1), "lote": 500}, "oportunidades", {"idx_oportunidades_status_id"},
+    ),
+]
+
+
+def conferir_planos(conn):
+    problemas = []
+    with conn.cursor() as cursor:
+        for descricao, sql, parametros, tabela, indices in CONSULTAS:
+            cursor.execute("EXPLAIN " + sql, parametros)
+            plano = cursor.fetchall()
+            principal = next((linha for linha in plano if linha["table"] == tabela), None)
+            if principal is None:
+                problemas.append(f"{descricao}: tabela {tabela} não aparece no plano")
+                continue
+            situacao = "ok"
+            if principal["type"] == "ALL":
+                situacao = "VARREDURA COMPLETA"
+            elif principal["key"] not in indices:
+                situacao = f"índice inesperado (esperado: {', '.join(sorted(indices))})"
+            if situacao != "ok":
+                problemas.append(f"{descricao}: {situacao}")
+            print(f"{descricao:<45} type={principal['type']:<8} key={principal['key']!s:<40} "
+                  f"rows={principal['rows']:<8} {situacao}")
+    return problemas
+
+
+def main():
+    conn = get_connection()
+    try:
+        problemas = conferir_planos(conn)
+    finally:
+        conn.close()
+    if problemas:
+        print("\nProblemas encontrados:")
+        for problema in problemas:
+            print(f"  - {problema}")
+        sys.exit(1)
+    print("\nTodos os planos usam os índices esperados.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# backend/benchmarks/proximidade.py
+#
+# Compara a busca por raio na grade em memória (src/spatial.py) com a varredura
+# linear (distância para todos os pontos), com pontos sintéticos espalhados em
+# torno dos municípios do gazetteer.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.proximidade
+#   python -m benchmarks.proximidade --tamanhos 10000 100000 --raios 2 10 50
+
+import argparse
+import csv
+import random
+import statistics
+import time
+
+from src.geocoding import ARQUIVO_MUNICIPIOS
+from src.spatial import IndiceEspacial, distancia_km
+
+
+def carregar_centros():
+    with open(ARQUIVO_MUNICIPIOS, encoding="utf-8") as entrada:
+        return [(float(linha["latitude"]), float(linha["longitude"])) for linha in csv.DictReader(entrada)]
+
+
+def gerar_pontos(quantidade, centros, aleatorio):
+    # Concentração maior nas primeiras cidades (capitais), como no cadastro real
+    pesos = [1 / (posicao + 1) for posicao in range(len(centros))]
+    pontos = []
+    for ponto_id in range(1, quantidade + 1):
+        lat, lon = aleatorio.choices(centros, pesos)[0]
+        pontos.append((ponto_id, lat + aleatorio.gauss(0, 0.15), lon + aleatorio.gauss(0, 0.15)))
+    return pontos
+
+
+def varredura(pontos, lat, lon, raio_km, limite):
+    encontrados = []
+    for ponto_id, lat_ponto, lon_ponto in pontos:
+        distancia = distancia_km(lat, lon, lat_ponto, lon_ponto)
+        if distancia <= raio_km:
+            encontrados.append((distancia, ponto_id))
+    encontrados.sort()
+    return encontrados[:limite]
+
+
+def medir(funcao, consultas):
+    tempos = []
+    for consulta in consultas:
+        inicio = time.perf_counter()
+        funcao(*consulta)
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da busca por proximidade")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--raios", type=float, nargs="+", default=[2, 10, 50])
+    parser.add_argument("--consultas", type=int, default=30)
+    parser.add_argument("--limite", type=int, default=50)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    centros = carregar_centros()
+    for tamanho in args.tamanhos:
+        pontos = gerar_pontos(tamanho, centros, aleatorio)
+        indice = IndiceEspacial()
+        inicio = time.perf_counter()
+        indice.recarregar(pontos)
+        construcao = time.perf_counter() - inicio
+        print(f"\n== {tamanho} pontos (construção da grade: {construcao:.2f}s) ==")
+        print(f"{'raio (km)':<12}{'varredura (ms)':>16}{'grade (ms)':>14}{'no raio':>10}")
+        for raio in args.raios:
+            consultas = [
+                (lat + aleatorio.gauss(0, 0.1), lon + aleatorio.gauss(0, 0.1), raio)
+                for lat, lon in aleatorio.choices(centros, k=args.consultas)
+            ]
+            # Mesmo resultado nas duas estratégias
+            lat, lon, _ = consultas[0]
+            esperado = [(ponto_id, round(d, 3)) for d, ponto_id in varredura(pontos, lat, lon, raio, args.limite)]
+            assert indice.proximos(lat, lon, raio, args.limite) == esperado
+
+            tempo_varredura = medir(lambda la, lo, r: varredura(pontos, la, lo, r, args.limite), consultas[:5])
+            tempo_grade = medir(lambda la, lo, r: indice.proximos(la, lo, r, args.limite), consultas)
+            no_raio = statistics.median(len(indice.proximos(la, lo, r)) for la, lo, r in consultas)
+            print(f"{raio:<12g}{tempo_varredura:>16.2f}{tempo_grade:>14.2f}{no_raio:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
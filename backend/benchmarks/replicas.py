@@ -0,0 +1,318 @@
+# backend/benchmarks/replicas.py
+#
+# Verificação de ponta a ponta das leituras em réplica (src/replicas.py) com dois MySQL
+# locais: um primário e uma réplica ligada a ele por replicação GTID. Sobe a API com
+# MYSQL_REPLICAS apontando para a réplica e confere, pelos contadores de /api/estatisticas
+# e pelo conteúdo das respostas:
+#   1. leituras sem escrita recente vão para a réplica;
+#   2. read-your-writes: com a réplica atrasada de propósito (SOURCE_DELAY), quem acabou
+#      de se inscrever vê a inscrição (leitura no primário pelo cookie tbg_escrita),
+#      enquanto um cliente sem o cookie ainda recebe o dado antigo da réplica;
+#   3. com a replicação parada (STOP REPLICA) a réplica sai do rodízio e as leituras
+#      voltam ao primário, sem erro para o cliente; com START REPLICA ela volta;
+#   4. com o container da réplica derrubado, as leituras continuam respondendo pelo primário.
+# Sai com código 1 se alguma verificação falhar.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.replicas                    # dois containers Docker descartáveis
+#   python -m benchmarks.replicas --bancos-existentes
+#       # usa MYSQL_* (primário) e MYSQL_REPLICAS (uma réplica já replicando dele; o usuário
+#       # precisa de REPLICATION_SLAVE_ADMIN na réplica). A verificação 4 é pulada.
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pymysql
+import pymysql.cursors
+
+from benchmarks.banco import BancoExistente, MySQLDescartavel, _porta_livre
+from benchmarks.suite import _esperar_api
+
+DIRETORIO_BACKEND = Path(__file__).resolve().parent.parent
+
+ATRASO_REPLICACAO = 2  # SOURCE_DELAY da verificação 2, em segundos
+AMBIENTE_API = {
+    "REPLICAS_ATRASO_MAXIMO": "5",  # Acima do SOURCE_DELAY: a réplica atrasada continua no rodízio
+    "REPLICAS_INTERVALO_SAUDE": "0.5",
+    "REPLICAS_JANELA_ESCRITA": "8",
+    "ADMISSAO_ATIVA": "0",
+    "MIGRACOES_NO_STARTUP": "verificar",
+}
+ARGUMENTOS_GTID = ("--innodb-flush-log-at-trx-commit=2", "--gtid-mode=ON", "--enforce-gtid-consistency=ON")
+
+
+class Cliente:
+    """
+    Cliente HTTP mínimo que guarda o cookie tbg_escrita, como o navegador faria.
+    """
+
+    def __init__(self, porta, com_cookies=True):
+        self.porta = porta
+        self.com_cookies = com_cookies
+        self.cookies = {}
+
+    def requisicao(self, metodo, caminho, corpo=None):
+        conexao = http.client.HTTPConnection("127.0.0.1", self.porta, timeout=30)
+        try:
+            cabecalhos = {"Content-Type": "application/json"} if corpo is not None else {}
+            if self.cookies:
+                cabecalhos["Cookie"] = "; ".join(f"{nome}={valor}" for nome, valor in self.cookies.items())
+            conexao.request(metodo, caminho, body=json.dumps(corpo) if corpo is not None else None, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            if self.com_cookies:
+                for cabecalho in resposta.headers.get_all("set-cookie") or []:
+                    nome, _, valor = cabecalho.split(";")[0].partition("=")
+                    self.cookies[nome.strip()] = valor
+            dados = resposta.read()
+            return resposta.status, json.loads(dados) if dados else None
+        finally:
+            conexao.close()
+
+
+def _conectar(parametros):
+    return pymysql.connect(**parametros, autocommit=True, cursorclass=pymysql.cursors.DictCursor)
+
+
+def _executar(parametros, *comandos):
+    conn = _conectar(parametros)
+    try:
+        with conn.cursor() as cursor:
+            for sql in comandos:
+                cursor.execute(sql)
+    finally:
+        conn.close()
+
+
+def _parametros(variaveis):
+    return dict(host=variaveis["MYSQL_HOST"], port=int(variaveis["MYSQL_PORT"]), user=variaveis["MYSQL_USER"],
+                password=variaveis["MYSQL_PASSWORD"], database=variaveis["MYSQL_DATABASE"])
+
+
+def _zerar_gtids(parametros):
+    # RESET MASTER foi renomeado no MySQL 8.4
+    try:
+        _executar(parametros, "RESET BINARY LOGS AND GTIDS")
+    except pymysql.err.ProgrammingError:
+        _executar(parametros, "RESET MASTER")
+
+
+def configurar_replicacao(primario, replica):
+    """
+    Liga a réplica ao primário (containers na mesma rede Docker). Os dois acabaram de
+    ser criados com o mesmo banco vazio, então basta zerar os GTIDs da inicialização.
+    """
+    for banco in (primario, replica):
+        _zerar_gtids(_parametros(banco.variaveis()))
+    _executar(
+        _parametros(replica.variaveis()),
+        f"CHANGE REPLICATION SOURCE TO SOURCE_HOST='{primario.nome}', SOURCE_PORT=3306, "
+        f"SOURCE_USER='root', SOURCE_PASSWORD='{primario.senha}', SOURCE_AUTO_POSITION=1, "
+        "GET_SOURCE_PUBLIC_KEY=1",
+        "START REPLICA",
+    )
+
+
+def esperar(condicao, timeout, descricao):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicao():
+            return
+        time.sleep(0.2)
+    raise RuntimeError(f"Tempo esgotado esperando {descricao}")
+
+
+def estatisticas(cliente):
+    _, corpo = cliente.requisicao("GET", "/api/estatisticas")
+    replicas = corpo["replicas"]
+    replica = next(iter(replicas["replicas"].values()))
+    return {
+        "leituras_replica": replica["leituras"],
+        "saudavel": replica["saudavel"],
+        "erro": replica["erro"],
+        "primario_apos_escrita": replicas["leituras_primario_apos_escrita"],
+        "fallbacks": replicas["fallbacks_primario"],
+    }
+
+
+def ids_inscritos(cliente, voluntario_id):
+    status, corpo = cliente.requisicao("GET", f"/api/voluntarios/{voluntario_id}/inscricoes")
+    if status != 200:
+        raise RuntimeError(f"GET das inscrições respondeu {status}: {corpo}")
+    return {linha["oportunidade_id"] for linha in corpo}
+
+
+def criar_oportunidade(cliente, titulo):
+    status, corpo = cliente.requisicao("POST", "/api/oportunidades/", {
+        "titulo": titulo,
+        "descricao": "Oportunidade criada pela verificação das réplicas.",
+        "ong_nome": "ONG Réplicas",
+        "endereco": "Rua do Benchmark, 100 - São Paulo/SP",
+        "perfil_voluntario": "Qualquer pessoa",
+        "num_vagas": 10,
+        "status_vaga": "ativa",
+        "tipo_acao": "educacao",
+    })
+    if status >= 400:
+        raise RuntimeError(f"Falha ao criar a oportunidade: {status} {corpo}")
+    return corpo["id"]
+
+
+def inscrever(cliente, cpf, oportunidade_id):
+    status, corpo = cliente.requisicao("POST", "/api/inscricoes/", {
+        "nome": "Voluntária Réplicas", "nascimento": "1990-05-20", "cpf": cpf,
+        "mensagem": "Inscrição da verificação das réplicas", "oportunidade_id": oportunidade_id,
+    })
+    if status >= 400:
+        raise RuntimeError(f"Falha na inscrição: {status} {corpo}")
+
+
+def verificar(porta, primario, replica, replica_descartavel, leituras):
+    resultados = []
+
+    def registrar(nome, ok, detalhe):
+        resultados.append((nome, ok, detalhe))
+        print(f"  [{'OK' if ok else 'FALHOU'}] {nome}: {detalhe}")
+
+    anonimo = Cliente(porta, com_cookies=False)
+    esperar(lambda: estatisticas(anonimo)["saudavel"], 30, "a réplica ficar saudável")
+
+    # Dados de partida, replicados antes de começar a medir
+    cpf = f"{int(time.time() * 1000) % 10**11:011d}"
+    oportunidade_a = criar_oportunidade(anonimo, f"Réplicas A {uuid.uuid4().hex[:6]}")
+    oportunidade_b = criar_oportunidade(anonimo, f"Réplicas B {uuid.uuid4().hex[:6]}")
+    inscrever(anonimo, cpf, oportunidade_a)
+    conn = _conectar(primario)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id FROM voluntarios WHERE cpf = %s", (cpf,))
+            voluntario_id = cursor.fetchone()["id"]
+    finally:
+        conn.close()
+    esperar(lambda: oportunidade_a in ids_inscritos(anonimo, voluntario_id), 30, "a replicação dos dados iniciais")
+
+    # 1. Leituras sem escrita recente vão para a réplica
+    antes = estatisticas(anonimo)
+    for _ in range(leituras):
+        ids_inscritos(anonimo, voluntario_id)
+    depois = estatisticas(anonimo)
+    na_replica = depois["leituras_replica"] - antes["leituras_replica"]
+    registrar("leituras_na_replica", na_replica >= leituras,
+              f"{na_replica} de {leituras} leituras atendidas pela réplica")
+
+    # 2. Read-your-writes com a réplica atrasada
+    _executar(replica, "STOP REPLICA SQL_THREAD",
+              f"CHANGE REPLICATION SOURCE TO SOURCE_DELAY={ATRASO_REPLICACAO}", "START REPLICA SQL_THREAD")
+    esperar(lambda: estatisticas(anonimo)["saudavel"], 30, "a réplica voltar ao rodízio")
+    navegador = Cliente(porta)
+    antes = estatisticas(anonimo)
+    inscrever(navegador, cpf, oportunidade_b)
+    vista_com_cookie = oportunidade_b in ids_inscritos(navegador, voluntario_id)
+    vista_sem_cookie = oportunidade_b in ids_inscritos(anonimo, voluntario_id)
+    depois = estatisticas(anonimo)
+    registrar("read_your_writes", vista_com_cookie and depois["primario_apos_escrita"] > antes["primario_apos_escrita"],
+              f"quem escreveu {'viu' if vista_com_cookie else 'NÃO viu'} a própria inscrição; "
+              f"sem o cookie a réplica {'já tinha' if vista_sem_cookie else 'ainda não tinha'} o dado")
+    inicio = time.monotonic()
+    esperar(lambda: oportunidade_b in ids_inscritos(anonimo, voluntario_id), 30, "a réplica alcançar o primário")
+    print(f"         réplica convergiu {time.monotonic() - inicio:.1f}s depois da escrita")
+    _executar(replica, "STOP REPLICA SQL_THREAD", "CHANGE REPLICATION SOURCE TO SOURCE_DELAY=0",
+              "START REPLICA SQL_THREAD")
+
+    # 3. Replicação parada: a réplica sai do rodízio
+    _executar(replica, "STOP REPLICA")
+    esperar(lambda: not estatisticas(anonimo)["saudavel"], 10, "a réplica sair do rodízio")
+    antes = estatisticas(anonimo)
+    respostas = [anonimo.requisicao("GET", f"/api/voluntarios/{voluntario_id}/inscricoes")[0] for _ in range(leituras)]
+    depois = estatisticas(anonimo)
+    registrar("replicacao_parada", respostas.count(200) == leituras and
+              depois["fallbacks"] - antes["fallbacks"] >= leituras and
+              depois["leituras_replica"] == antes["leituras_replica"],
+              f"{respostas.count(200)} de {leituras} leituras com 200 pelo primário; erro: {depois['erro']}")
+    _executar(replica, "START REPLICA")
+    esperar(lambda: estatisticas(anonimo)["saudavel"], 10, "a réplica voltar depois do START REPLICA")
+    registrar("replica_volta", True, "réplica de volta ao rodízio após START REPLICA")
+
+    # 4. Réplica fora do ar
+    if replica_descartavel is None:
+        print("  [--] replica_fora: pulada com bancos existentes")
+        return resultados
+    replica_descartavel.parar()
+    esperar(lambda: not estatisticas(anonimo)["saudavel"], 10, "a réplica derrubada sair do rodízio")
+    respostas = [anonimo.requisicao("GET", f"/api/voluntarios/{voluntario_id}/inscricoes")[0] for _ in range(leituras)]
+    registrar("replica_fora", respostas.count(200) == leituras,
+              f"{respostas.count(200)} de {leituras} leituras com 200 com a réplica fora do ar")
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificação das leituras em réplica com dois MySQL")
+    parser.add_argument("--bancos-existentes", action="store_true",
+                        help="usa MYSQL_* e MYSQL_REPLICAS em vez de containers")
+    parser.add_argument("--imagem", default="mysql:8.0")
+    parser.add_argument("--leituras", type=int, default=20, help="leituras por verificação")
+    args = parser.parse_args()
+
+    rede = None
+    if args.bancos_existentes:
+        primario_banco = BancoExistente()
+        replicas = os.environ.get("MYSQL_REPLICAS", "")
+        if not replicas:
+            raise SystemExit("Defina MYSQL_REPLICAS com a réplica a verificar")
+        replica_descartavel = None
+    else:
+        rede = f"tempo-bem-gasto-replicas-{uuid.uuid4().hex[:8]}"
+        subprocess.run(["docker", "network", "create", rede], check=True, stdout=subprocess.DEVNULL)
+        primario_banco = MySQLDescartavel(imagem=args.imagem, argumentos=(*ARGUMENTOS_GTID, "--server-id=1"), rede=rede)
+        replica_descartavel = MySQLDescartavel(imagem=args.imagem, argumentos=(*ARGUMENTOS_GTID, "--server-id=2"),
+                                               rede=rede)
+    try:
+        with primario_banco:
+            if replica_descartavel is not None:
+                replica_descartavel.iniciar()
+                configurar_replicacao(primario_banco, replica_descartavel)
+                replicas = f"127.0.0.1:{replica_descartavel.porta}"
+            ambiente = {**os.environ, **primario_banco.variaveis(), **AMBIENTE_API, "MYSQL_REPLICAS": replicas}
+            subprocess.run([sys.executable, "-m", "src.migrations"], cwd=DIRETORIO_BACKEND, env=ambiente, check=True)
+
+            # Parâmetros da réplica do mesmo jeito que a API os interpreta
+            os.environ.update(primario_banco.variaveis())
+            from src.replicas import interpretar_replicas
+            _, parametros_replica = interpretar_replicas(replicas)[0]
+            parametros_replica.pop("cursorclass")
+
+            porta = _porta_livre()
+            api = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:api", "--host", "127.0.0.1", "--port", str(porta),
+                 "--log-level", "warning", "--no-access-log"],
+                cwd=DIRETORIO_BACKEND, env=ambiente,
+            )
+            try:
+                _esperar_api(porta, api)
+                print(f"API em 127.0.0.1:{porta}, réplica {replicas}")
+                resultados = verificar(porta, _parametros(primario_banco.variaveis()), parametros_replica,
+                                       replica_descartavel, args.leituras)
+            finally:
+                api.terminate()
+                api.wait(timeout=30)
+    finally:
+        if replica_descartavel is not None:
+            replica_descartavel.parar()
+        if rede:
+            subprocess.run(["docker", "network", "rm", rede], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    falhas = [nome for nome, ok, _ in resultados if not ok]
+    if falhas:
+        print(f"FALHOU: {', '.join(falhas)}")
+        sys.exit(1)
+    print("OK: leituras na réplica, read-your-writes e fallback para o primário")
+
+
+if __name__ == "__main__":
+    main()
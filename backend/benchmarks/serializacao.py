@@ -0,0 +1,91 @@
+# backend/benchmarks/serializacao.py
+#
+# Custo de serializar a listagem de oportunidades com linhas sintéticas no formato
+# que o banco devolve: validação + dump do Pydantic (o que o response_model fazia)
+# contra o caminho rápido de src/serializacao.py, com e sem projeção de campos, e
+# o tamanho da resposta sem compressão, com gzip e com brotli (se instalado).
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.serializacao
+#   python -m benchmarks.serializacao --linhas 5000 --repeticoes 20
+
+import argparse
+import gzip
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks.dados import PALAVRAS, STATUS_VAGA, TIPOS_ACAO
+from src.compressao import COMPRESSAO_NIVEL_GZIP, COMPRESSAO_QUALIDADE_BROTLI, brotli
+from src.models import OportunidadeResponse
+from src.serializacao import CAMPOS_OPORTUNIDADE, interpretar_campos, orjson, serializar_linhas
+
+CAMPOS_PROJETADOS = "titulo,ong_nome,data_inicio,status_vaga" # O que a tela de lista mostra
+
+
+def gerar_linhas(quantidade, aleatorio):
+    def frase(palavras):
+        return " ".join(aleatorio.choices(PALAVRAS, k=palavras))
+
+    inicio = datetime(2024, 1, 1)
+    return [
+        {
+            "id": i, "data_publicacao": inicio + timedelta(minutes=aleatorio.randint(0, 500_000)),
+            "titulo": frase(4).capitalize(), "descricao": frase(40), "ong_id": aleatorio.randint(1, 200),
+            "ong_nome": f"Instituto {frase(1).capitalize()}", "endereco": f"Rua {frase(2)}, {i}",
+            "data_inicio": "10/03/2025", "data_termino": "12/03/2025", "hora_inicio": "09:00",
+            "hora_termino": "12:00", "perfil_voluntario": frase(10), "num_vagas": aleatorio.choice([None, 10, 20]),
+            "status_vaga": aleatorio.choice(STATUS_VAGA), "tipo_acao": aleatorio.choice(TIPOS_ACAO),
+        }
+        for i in range(1, quantidade + 1)
+    ]
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da serialização da listagem de oportunidades")
+    parser.add_argument("--linhas", type=int, default=5000)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    linhas = gerar_linhas(args.linhas, random.Random(42))
+    adaptador = TypeAdapter(List[OportunidadeResponse])
+    projetados = interpretar_campos(CAMPOS_PROJETADOS)
+
+    estrategias = [
+        ("pydantic (validação + dump)", lambda: adaptador.dump_json(adaptador.validate_python(linhas))),
+        ("caminho rápido", lambda: serializar_linhas(linhas, CAMPOS_OPORTUNIDADE)),
+        (f"caminho rápido, campos={CAMPOS_PROJETADOS}", lambda: serializar_linhas(linhas, projetados)),
+    ]
+    referencia = estrategias[0][1]()
+    assert estrategias[1][1]() == referencia, "o caminho rápido deve gerar o mesmo JSON que o Pydantic"
+
+    print(f"{args.linhas} linhas; encoder: {'orjson' if orjson else 'json (biblioteca padrão)'}")
+    print(f"{'estratégia':<62}{'ms':>9}{'bytes':>11}{'gzip':>10}{'gzip ms':>9}{'br':>10}{'br ms':>8}")
+    for nome, funcao in estrategias:
+        tempo, corpo = medir(funcao, args.repeticoes)
+        tempo_gzip, comprimido = medir(lambda: gzip.compress(corpo, COMPRESSAO_NIVEL_GZIP), args.repeticoes)
+        colunas = f"{nome:<62}{tempo:>9.1f}{len(corpo):>11}{len(comprimido):>10}{tempo_gzip:>9.1f}"
+        if brotli is not None:
+            tempo_br, comprimido_br = medir(
+                lambda: brotli.compress(corpo, quality=COMPRESSAO_QUALIDADE_BROTLI), args.repeticoes)
+            colunas += f"{len(comprimido_br):>10}{tempo_br:>8.1f}"
+        else:
+            colunas += f"{'-':>10}{'-':>8}"
+        print(colunas)
+
+
+if __name__ == "__main__":
+    main()
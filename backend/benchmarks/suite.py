@@ -0,0 +1,97 @@
+# backend/benchmarks/suite.py
+#
+# Suíte de benchmark reprodutível, de ponta a ponta:
+#   1. sobe um MySQL descartável em Docker (ou usa o banco das variáveis MYSQL_*);
+#   2. aplica as migrações e gera os dados sintéticos na escala pedida;
+#   3. sobe a API (uvicorn main:api) apontando para esse banco;
+#   4. roda o driver de carga, grava o JSON e compara com a linha de base.
+# Sai com código 1 se alguma métrica piorar além da margem.
+#
+# Uso (a partir da pasta backend):
+#   python -m benchmarks.suite --escala 0.2 --concorrencia 16 --duracao 10
+#   python -m benchmarks.suite --baseline benchmarks/base.json --margem 0.2
+#   python -m benchmarks.suite --banco-existente   # usa MYSQL_* em vez do container
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks import carga, dados
+from benchmarks.banco import BancoExistente, MySQLDescartavel
+
+DIRETORIO_BACKEND = Path(__file__).resolve().parent.parent
+
+
+def _esperar_api(porta, processo, timeout=60):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"A API terminou durante a inicialização (código {processo.returncode})")
+        try:
+            conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=2)
+            conexao.request("GET", "/")
+            if conexao.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("A API não respondeu a tempo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmark da API")
+    parser.add_argument("--escala", type=float, default=0.2, help="volume de dados (1 = 5 mil oportunidades)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--banco-existente", action="store_true", help="usa o banco das variáveis MYSQL_*")
+    parser.add_argument("--sem-dados", action="store_true", help="não gera dados (banco já preenchido)")
+    parser.add_argument("--imagem", default="mysql:8.0")
+    parser.add_argument("--porta-api", type=int, default=8765)
+    carga.adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    banco = BancoExistente() if args.banco_existente else MySQLDescartavel(imagem=args.imagem)
+    with banco:
+        ambiente = {**os.environ, **banco.variaveis()}
+        # Migrações e dados em processos/conexões próprios, lendo as variáveis deste banco
+        subprocess.run([sys.executable, "-m", "src.migrations"], cwd=DIRETORIO_BACKEND, env=ambiente, check=True)
+        quantidades = None
+        if not args.sem_dados:
+            os.environ.update(banco.variaveis())
+            conn = dados.conectar()
+            try:
+                inicio = time.perf_counter()
+                quantidades = dados.gerar(conn, args.escala, args.semente)
+                print(f"Dados gerados em {time.perf_counter() - inicio:.1f}s: {quantidades}")
+            finally:
+                conn.close()
+
+        api = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:api", "--host", "127.0.0.1",
+             "--port", str(args.porta_api), "--log-level", "warning", "--no-access-log"],
+            cwd=DIRETORIO_BACKEND, env=ambiente,
+        )
+        try:
+            _esperar_api(args.porta_api, api)
+            url = f"http://127.0.0.1:{args.porta_api}"
+            print(f"Carga em {url}: {args.concorrencia} clientes, {args.duracao:g}s por cenário")
+            resultados = carga.executar(
+                url, carga.selecionar_cenarios(args.cenarios), args.concorrencia, args.duracao, args.aquecimento
+            )
+        finally:
+            api.terminate()
+            api.wait(timeout=30)
+
+    extras = {"escala": args.escala, "semente": args.semente, "dados": quantidades,
+              "banco": "existente" if args.banco_existente else args.imagem}
+    sys.exit(carga.gravar_e_comparar(
+        carga.relatorio(resultados, args.concorrencia, args.duracao, extras),
+        args.saida, args.baseline, args.margem,
+    ))
+
+
+if __name__ == "__main__":
+    main()
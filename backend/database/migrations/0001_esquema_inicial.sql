@@ -1,19 +1,7 @@
--- backend/database/schema.sql
+-- backend/database/migrations/0001_esquema_inicial.sql
+-- Esquema base (equivalente ao antigo database/schema.sql, sem os DROP TABLE).
+-- CREATE TABLE IF NOT EXISTS: bancos criados pelo schema.sql antigo adotam esta versão sem mudanças.
 
--- NOTA: As linhas CREATE DATABASE e USE site_voluntariado foram removidas.
--- As tabelas serão criadas diretamente no banco de dados "railway" fornecido pelo Railway.
-
--- ===================================================================
--- GARANTIR UM ESTADO LIMPO: REMOVER TABELAS EXISTENTES (na ordem inversa das dependências)
--- ===================================================================
-DROP TABLE IF EXISTS inscricoes;
-DROP TABLE IF EXISTS oportunidades;
-DROP TABLE IF EXISTS voluntarios;
-DROP TABLE IF EXISTS ongs;
-
--- ===================================================================
--- 2) Tabela de ONGs
--- ===================================================================
 CREATE TABLE IF NOT EXISTS ongs (
     id INT AUTO_INCREMENT PRIMARY KEY,
     nome VARCHAR(255) NOT NULL,
@@ -25,9 +13,6 @@ CREATE TABLE IF NOT EXISTS ongs (
     data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- ===================================================================
--- 3) Tabela de Oportunidades
--- ===================================================================
 CREATE TABLE IF NOT EXISTS oportunidades (
     id INT AUTO_INCREMENT PRIMARY KEY,
     ong_id INT NOT NULL,
@@ -47,9 +32,6 @@ CREATE TABLE IF NOT EXISTS oportunidades (
     FOREIGN KEY (ong_id) REFERENCES ongs(id) ON DELETE CASCADE
 );
 
--- ===================================================================
--- 4) Tabela de Voluntários
--- ===================================================================
 CREATE TABLE IF NOT EXISTS voluntarios (
     id INT AUTO_INCREMENT PRIMARY KEY,
     nome VARCHAR(255) NOT NULL,
@@ -64,9 +46,6 @@ CREATE TABLE IF NOT EXISTS voluntarios (
     data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- ===================================================================
--- 5) Tabela de Inscrições
--- ===================================================================
 CREATE TABLE IF NOT EXISTS inscricoes (
     id INT AUTO_INCREMENT PRIMARY KEY,
     oportunidade_id INT NOT NULL,
@@ -0,0 +1,17 @@
+-- backend/database/migrations/0002_indices_consultas.sql
+-- Índices para os caminhos quentes da API.
+
+-- criar_oportunidade e a importação em lote buscam a ONG pelo nome
+CREATE INDEX idx_ongs_nome ON ongs (nome);
+
+-- Listagem padrão: ORDER BY data_publicacao DESC, id DESC com paginação por chave
+CREATE INDEX idx_oportunidades_publicacao ON oportunidades (data_publicacao, id);
+
+-- Listagem filtrada por status_vaga, na mesma ordem
+CREATE INDEX idx_oportunidades_status_publicacao ON oportunidades (status_vaga, data_publicacao, id);
+
+-- Listagem filtrada por ONG, na mesma ordem (também atende a chave estrangeira ong_id)
+CREATE INDEX idx_oportunidades_ong_publicacao ON oportunidades (ong_id, data_publicacao, id);
+
+-- consultar_inscricoes_por_voluntario: WHERE voluntario_id = ? ORDER BY data_inscricao DESC
+CREATE INDEX idx_inscricoes_voluntario_data ON inscricoes (voluntario_id, data_inscricao);
@@ -0,0 +1,44 @@
+-- backend/database/migrations/0003_datas_tipadas.sql
+-- Converte data_inicio/data_termino (VARCHAR "DD/MM/AAAA") para DATE e
+-- hora_inicio/hora_termino (VARCHAR "HH:MM") para TIME. A API continua usando
+-- os formatos de texto; a conversão é feita em src/datas.py.
+-- Valores vazios, fora do formato ou inexistentes (31/02, 25:99) viram NULL.
+
+ALTER TABLE oportunidades
+    ADD COLUMN data_inicio_nova DATE NULL,
+    ADD COLUMN data_termino_nova DATE NULL,
+    ADD COLUMN hora_inicio_nova TIME NULL,
+    ADD COLUMN hora_termino_nova TIME NULL;
+
+-- Só converte o que é data/hora de verdade: em modo estrito, STR_TO_DATE('31/02/2024')
+-- ou CAST('25:99:00' AS TIME) num UPDATE é erro, e a migração pararia com as colunas
+-- novas já criadas. O mês e a hora vão no REGEXP; o dia é conferido contra o último dia
+-- do mês (LAST_DAY) num CASE interno, que só é avaliado com mês e ano válidos.
+UPDATE oportunidades SET
+    data_inicio_nova = CASE WHEN data_inicio REGEXP '^[0-9]{2}/(0[1-9]|1[0-2])/[1-9][0-9]{3}$' THEN
+        CASE WHEN CAST(LEFT(data_inicio, 2) AS UNSIGNED) BETWEEN 1
+                  AND DAY(LAST_DAY(CONCAT(SUBSTRING(data_inicio, 7, 4), '-', SUBSTRING(data_inicio, 4, 2), '-01')))
+            THEN STR_TO_DATE(data_inicio, '%d/%m/%Y') END END,
+    data_termino_nova = CASE WHEN data_termino REGEXP '^[0-9]{2}/(0[1-9]|1[0-2])/[1-9][0-9]{3}$' THEN
+        CASE WHEN CAST(LEFT(data_termino, 2) AS UNSIGNED) BETWEEN 1
+                  AND DAY(LAST_DAY(CONCAT(SUBSTRING(data_termino, 7, 4), '-', SUBSTRING(data_termino, 4, 2), '-01')))
+            THEN STR_TO_DATE(data_termino, '%d/%m/%Y') END END,
+    hora_inicio_nova = CASE WHEN hora_inicio REGEXP '^([01][0-9]|2[0-3]):[0-5][0-9]$'
+        THEN CAST(CONCAT(hora_inicio, ':00') AS TIME) END,
+    hora_termino_nova = CASE WHEN hora_termino REGEXP '^([01][0-9]|2[0-3]):[0-5][0-9]$'
+        THEN CAST(CONCAT(hora_termino, ':00') AS TIME) END;
+
+ALTER TABLE oportunidades
+    DROP COLUMN data_inicio,
+    DROP COLUMN data_termino,
+    DROP COLUMN hora_inicio,
+    DROP COLUMN hora_termino;
+
+ALTER TABLE oportunidades
+    RENAME COLUMN data_inicio_nova TO data_inicio,
+    RENAME COLUMN data_termino_nova TO data_termino,
+    RENAME COLUMN hora_inicio_nova TO hora_inicio,
+    RENAME COLUMN hora_termino_nova TO hora_termino;
+
+-- Filtro por faixa de data de início (inicio_de / inicio_ate)
+CREATE INDEX idx_oportunidades_inicio ON oportunidades (data_inicio, id);
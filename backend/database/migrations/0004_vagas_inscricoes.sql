@@ -0,0 +1,19 @@
+-- backend/database/migrations/0004_vagas_inscricoes.sql
+-- Contabilidade de vagas: vagas_ocupadas é incrementada/decrementada de forma atômica
+-- pelas rotas de inscrição (UPDATE condicional na linha da oportunidade, sem lock de tabela).
+-- Inscrições 'pendente' e 'aprovada' ocupam vaga; 'rejeitada' e 'cancelada' não.
+
+ALTER TABLE oportunidades
+    ADD COLUMN vagas_ocupadas INT NOT NULL DEFAULT 0;
+
+UPDATE oportunidades o SET vagas_ocupadas = (
+    SELECT COUNT(*) FROM inscricoes i
+    WHERE i.oportunidade_id = o.id AND i.status_inscricao IN ('pendente', 'aprovada')
+);
+
+-- Mensagem de motivação enviada pelo voluntário no formulário de inscrição
+ALTER TABLE inscricoes
+    ADD COLUMN mensagem TEXT NULL;
+
+-- Listagem de inscrições por oportunidade, em ordem de id
+CREATE INDEX idx_inscricoes_oportunidade_id ON inscricoes (oportunidade_id, id);
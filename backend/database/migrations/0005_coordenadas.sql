@@ -0,0 +1,16 @@
+-- backend/database/migrations/0005_coordenadas.sql
+-- Coordenadas geográficas dos endereços, preenchidas pelo geocodificador (src/geocoding.py)
+-- quando o endereço é gravado. NULL = endereço ainda não geocodificado ou não reconhecido.
+-- Linhas já existentes: python -m src.geocoding --preencher
+
+ALTER TABLE oportunidades
+    ADD COLUMN latitude DECIMAL(9,6) NULL,
+    ADD COLUMN longitude DECIMAL(9,6) NULL;
+
+ALTER TABLE ongs
+    ADD COLUMN latitude DECIMAL(9,6) NULL,
+    ADD COLUMN longitude DECIMAL(9,6) NULL;
+
+ALTER TABLE voluntarios
+    ADD COLUMN latitude DECIMAL(9,6) NULL,
+    ADD COLUMN longitude DECIMAL(9,6) NULL;
@@ -0,0 +1,245 @@
+-- backend/database/migrations/0006_painel_ongs.sql
+-- Painel da ONG (GET /api/ongs/{id}/painel) servido de uma tabela de resumo:
+-- painel_ongs guarda, por ONG, as contagens de oportunidades por status_vaga, de
+-- inscrições por status_inscricao e as vagas ofertadas/preenchidas. Triggers nas
+-- tabelas de origem aplicam só a diferença de cada escrita, então ler o painel custa
+-- uma busca por chave primária, qualquer que seja o tamanho das tabelas.
+-- atividade_ongs é o log de eventos recentes do painel (índice por ONG e id).
+--
+-- Exclusões em cascata (FOREIGN KEY ... ON DELETE CASCADE) não disparam triggers no
+-- MySQL: por isso os triggers BEFORE DELETE em oportunidades e voluntarios descontam
+-- as inscrições que a cascata vai apagar.
+-- Com binary log ligado, criar triggers exige SUPER ou log_bin_trust_function_creators=1.
+-- Se os contadores divergirem (ex.: escrita manual com os triggers desligados):
+--   python -m src.painel --recalcular
+
+CREATE TABLE IF NOT EXISTS painel_ongs (
+    ong_id INT PRIMARY KEY,
+    oportunidades_ativa INT NOT NULL DEFAULT 0,
+    oportunidades_inativa INT NOT NULL DEFAULT 0,
+    oportunidades_encerrada INT NOT NULL DEFAULT 0,
+    oportunidades_em_edicao INT NOT NULL DEFAULT 0,
+    inscricoes_pendente INT NOT NULL DEFAULT 0,
+    inscricoes_aprovada INT NOT NULL DEFAULT 0,
+    inscricoes_rejeitada INT NOT NULL DEFAULT 0,
+    inscricoes_cancelada INT NOT NULL DEFAULT 0,
+    -- Só oportunidades com num_vagas definido (NULL = sem limite de vagas)
+    vagas_ofertadas INT NOT NULL DEFAULT 0,
+    vagas_preenchidas INT NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (ong_id) REFERENCES ongs(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS atividade_ongs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    ong_id INT NOT NULL,
+    tipo VARCHAR(40) NOT NULL,
+    oportunidade_id INT NULL, -- sem chave estrangeira: o histórico sobrevive à exclusão
+    inscricao_id INT NULL,
+    descricao VARCHAR(255) NOT NULL,
+    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_atividade_ongs_ong (ong_id, id),
+    FOREIGN KEY (ong_id) REFERENCES ongs(id) ON DELETE CASCADE
+);
+
+DELIMITER $$
+
+-- ---------------------------------------------------------------------
+-- oportunidades
+-- ---------------------------------------------------------------------
+CREATE TRIGGER trg_painel_oportunidades_insert AFTER INSERT ON oportunidades
+FOR EACH ROW
+BEGIN
+    INSERT INTO painel_ongs (ong_id, oportunidades_ativa, oportunidades_inativa, oportunidades_encerrada,
+                             oportunidades_em_edicao, vagas_ofertadas, vagas_preenchidas)
+    VALUES (NEW.ong_id, NEW.status_vaga = 'ativa', NEW.status_vaga = 'inativa', NEW.status_vaga = 'encerrada',
+            NEW.status_vaga = 'em_edicao', COALESCE(NEW.num_vagas, 0),
+            IF(NEW.num_vagas IS NULL, 0, NEW.vagas_ocupadas))
+    ON DUPLICATE KEY UPDATE
+        oportunidades_ativa = oportunidades_ativa + (NEW.status_vaga = 'ativa'),
+        oportunidades_inativa = oportunidades_inativa + (NEW.status_vaga = 'inativa'),
+        oportunidades_encerrada = oportunidades_encerrada + (NEW.status_vaga = 'encerrada'),
+        oportunidades_em_edicao = oportunidades_em_edicao + (NEW.status_vaga = 'em_edicao'),
+        vagas_ofertadas = vagas_ofertadas + COALESCE(NEW.num_vagas, 0),
+        vagas_preenchidas = vagas_preenchidas + IF(NEW.num_vagas IS NULL, 0, NEW.vagas_ocupadas);
+    INSERT INTO atividade_ongs (ong_id, tipo, oportunidade_id, descricao)
+    VALUES (NEW.ong_id, 'oportunidade_criada', NEW.id, LEFT(CONCAT('Oportunidade publicada: ', NEW.titulo), 255));
+END$$
+
+CREATE TRIGGER trg_painel_oportunidades_update AFTER UPDATE ON oportunidades
+FOR EACH ROW
+BEGIN
+    -- vagas_ocupadas muda a cada inscrição: só mexe no painel se algo contado mudou
+    IF NOT (OLD.ong_id <=> NEW.ong_id AND OLD.status_vaga <=> NEW.status_vaga
+            AND OLD.num_vagas <=> NEW.num_vagas AND OLD.vagas_ocupadas <=> NEW.vagas_ocupadas) THEN
+        UPDATE painel_ongs SET
+            oportunidades_ativa = oportunidades_ativa - (OLD.status_vaga = 'ativa'),
+            oportunidades_inativa = oportunidades_inativa - (OLD.status_vaga = 'inativa'),
+            oportunidades_encerrada = oportunidades_encerrada - (OLD.status_vaga = 'encerrada'),
+            oportunidades_em_edicao = oportunidades_em_edicao - (OLD.status_vaga = 'em_edicao'),
+            vagas_ofertadas = vagas_ofertadas - COALESCE(OLD.num_vagas, 0),
+            vagas_preenchidas = vagas_preenchidas - IF(OLD.num_vagas IS NULL, 0, OLD.vagas_ocupadas)
+        WHERE ong_id = OLD.ong_id;
+        INSERT INTO painel_ongs (ong_id, oportunidades_ativa, oportunidades_inativa, oportunidades_encerrada,
+                                 oportunidades_em_edicao, vagas_ofertadas, vagas_preenchidas)
+        VALUES (NEW.ong_id, NEW.status_vaga = 'ativa', NEW.status_vaga = 'inativa', NEW.status_vaga = 'encerrada',
+                NEW.status_vaga = 'em_edicao', COALESCE(NEW.num_vagas, 0),
+                IF(NEW.num_vagas IS NULL, 0, NEW.vagas_ocupadas))
+        ON DUPLICATE KEY UPDATE
+            oportunidades_ativa = oportunidades_ativa + (NEW.status_vaga = 'ativa'),
+            oportunidades_inativa = oportunidades_inativa + (NEW.status_vaga = 'inativa'),
+            oportunidades_encerrada = oportunidades_encerrada + (NEW.status_vaga = 'encerrada'),
+            oportunidades_em_edicao = oportunidades_em_edicao + (NEW.status_vaga = 'em_edicao'),
+            vagas_ofertadas = vagas_ofertadas + COALESCE(NEW.num_vagas, 0),
+            vagas_preenchidas = vagas_preenchidas + IF(NEW.num_vagas IS NULL, 0, NEW.vagas_ocupadas);
+    END IF;
+    IF NOT (OLD.status_vaga <=> NEW.status_vaga) THEN
+        INSERT INTO atividade_ongs (ong_id, tipo, oportunidade_id, descricao)
+        VALUES (NEW.ong_id, 'oportunidade_status', NEW.id,
+                LEFT(CONCAT('Oportunidade ', NEW.status_vaga, ': ', NEW.titulo), 255));
+    END IF;
+END$$
+
+CREATE TRIGGER trg_painel_oportunidades_delete BEFORE DELETE ON oportunidades
+FOR EACH ROW
+BEGIN
+    -- BEFORE: as inscrições apagadas pela cascata ainda estão visíveis aqui
+    UPDATE painel_ongs p
+    JOIN (
+        SELECT COALESCE(SUM(status_inscricao = 'pendente'), 0) AS pendente,
+               COALESCE(SUM(status_inscricao = 'aprovada'), 0) AS aprovada,
+               COALESCE(SUM(status_inscricao = 'rejeitada'), 0) AS rejeitada,
+               COALESCE(SUM(status_inscricao = 'cancelada'), 0) AS cancelada
+        FROM inscricoes WHERE oportunidade_id = OLD.id
+    ) i
+    SET p.oportunidades_ativa = p.oportunidades_ativa - (OLD.status_vaga = 'ativa'),
+        p.oportunidades_inativa = p.oportunidades_inativa - (OLD.status_vaga = 'inativa'),
+        p.oportunidades_encerrada = p.oportunidades_encerrada - (OLD.status_vaga = 'encerrada'),
+        p.oportunidades_em_edicao = p.oportunidades_em_edicao - (OLD.status_vaga = 'em_edicao'),
+        p.vagas_ofertadas = p.vagas_ofertadas - COALESCE(OLD.num_vagas, 0),
+        p.vagas_preenchidas = p.vagas_preenchidas - IF(OLD.num_vagas IS NULL, 0, OLD.vagas_ocupadas),
+        p.inscricoes_pendente = p.inscricoes_pendente - i.pendente,
+        p.inscricoes_aprovada = p.inscricoes_aprovada - i.aprovada,
+        p.inscricoes_rejeitada = p.inscricoes_rejeitada - i.rejeitada,
+        p.inscricoes_cancelada = p.inscricoes_cancelada - i.cancelada
+    WHERE p.ong_id = OLD.ong_id;
+    INSERT INTO atividade_ongs (ong_id, tipo, oportunidade_id, descricao)
+    VALUES (OLD.ong_id, 'oportunidade_removida', OLD.id, LEFT(CONCAT('Oportunidade removida: ', OLD.titulo), 255));
+END$$
+
+-- ---------------------------------------------------------------------
+-- inscricoes
+-- ---------------------------------------------------------------------
+CREATE TRIGGER trg_painel_inscricoes_insert AFTER INSERT ON inscricoes
+FOR EACH ROW
+BEGIN
+    DECLARE v_ong_id INT;
+    DECLARE v_titulo VARCHAR(255);
+    SELECT ong_id, titulo INTO v_ong_id, v_titulo FROM oportunidades WHERE id = NEW.oportunidade_id;
+    UPDATE painel_ongs SET
+        inscricoes_pendente = inscricoes_pendente + (NEW.status_inscricao = 'pendente'),
+        inscricoes_aprovada = inscricoes_aprovada + (NEW.status_inscricao = 'aprovada'),
+        inscricoes_rejeitada = inscricoes_rejeitada + (NEW.status_inscricao = 'rejeitada'),
+        inscricoes_cancelada = inscricoes_cancelada + (NEW.status_inscricao = 'cancelada')
+    WHERE ong_id = v_ong_id;
+    INSERT INTO atividade_ongs (ong_id, tipo, oportunidade_id, inscricao_id, descricao)
+    VALUES (v_ong_id, 'inscricao_recebida', NEW.oportunidade_id, NEW.id,
+            LEFT(CONCAT('Nova inscrição em: ', v_titulo), 255));
+END$$
+
+CREATE TRIGGER trg_painel_inscricoes_update AFTER UPDATE ON inscricoes
+FOR EACH ROW
+BEGIN
+    DECLARE v_ong_antiga INT;
+    DECLARE v_ong_nova INT;
+    DECLARE v_titulo VARCHAR(255);
+    IF NOT (OLD.status_inscricao <=> NEW.status_inscricao AND OLD.oportunidade_id <=> NEW.oportunidade_id) THEN
+        SELECT ong_id INTO v_ong_antiga FROM oportunidades WHERE id = OLD.oportunidade_id;
+        SELECT ong_id, titulo INTO v_ong_nova, v_titulo FROM oportunidades WHERE id = NEW.oportunidade_id;
+        UPDATE painel_ongs SET
+            inscricoes_pendente = inscricoes_pendente - (OLD.status_inscricao = 'pendente'),
+            inscricoes_aprovada = inscricoes_aprovada - (OLD.status_inscricao = 'aprovada'),
+            inscricoes_rejeitada = inscricoes_rejeitada - (OLD.status_inscricao = 'rejeitada'),
+            inscricoes_cancelada = inscricoes_cancelada - (OLD.status_inscricao = 'cancelada')
+        WHERE ong_id = v_ong_antiga;
+        UPDATE painel_ongs SET
+            inscricoes_pendente = inscricoes_pendente + (NEW.status_inscricao = 'pendente'),
+            inscricoes_aprovada = inscricoes_aprovada + (NEW.status_inscricao = 'aprovada'),
+            inscricoes_rejeitada = inscricoes_rejeitada + (NEW.status_inscricao = 'rejeitada'),
+            inscricoes_cancelada = inscricoes_cancelada + (NEW.status_inscricao = 'cancelada')
+        WHERE ong_id = v_ong_nova;
+        INSERT INTO atividade_ongs (ong_id, tipo, oportunidade_id, inscricao_id, descricao)
+        VALUES (v_ong_nova, CONCAT('inscricao_', NEW.status_inscricao), NEW.oportunidade_id, NEW.id,
+                LEFT(CONCAT('Inscrição ', NEW.status_inscricao, ' em: ', v_titulo), 255));
+    END IF;
+END$$
+
+CREATE TRIGGER trg_painel_inscricoes_delete AFTER DELETE ON inscricoes
+FOR EACH ROW
+BEGIN
+    UPDATE painel_ongs SET
+        inscricoes_pendente = inscricoes_pendente - (OLD.status_inscricao = 'pendente'),
+        inscricoes_aprovada = inscricoes_aprovada - (OLD.status_inscricao = 'aprovada'),
+        inscricoes_rejeitada = inscricoes_rejeitada - (OLD.status_inscricao = 'rejeitada'),
+        inscricoes_cancelada = inscricoes_cancelada - (OLD.status_inscricao = 'cancelada')
+    WHERE ong_id = (SELECT ong_id FROM oportunidades WHERE id = OLD.oportunidade_id);
+END$$
+
+-- ---------------------------------------------------------------------
+-- voluntarios: a exclusão apaga as inscrições em cascata, sem disparar triggers
+-- ---------------------------------------------------------------------
+CREATE TRIGGER trg_painel_voluntarios_delete BEFORE DELETE ON voluntarios
+FOR EACH ROW
+BEGIN
+    UPDATE painel_ongs p
+    JOIN (
+        SELECT o.ong_id,
+               SUM(i.status_inscricao = 'pendente') AS pendente,
+               SUM(i.status_inscricao = 'aprovada') AS aprovada,
+               SUM(i.status_inscricao = 'rejeitada') AS rejeitada,
+               SUM(i.status_inscricao = 'cancelada') AS cancelada
+        FROM inscricoes i
+        JOIN oportunidades o ON o.id = i.oportunidade_id
+        WHERE i.voluntario_id = OLD.id
+        GROUP BY o.ong_id
+    ) d ON d.ong_id = p.ong_id
+    SET p.inscricoes_pendente = p.inscricoes_pendente - d.pendente,
+        p.inscricoes_aprovada = p.inscricoes_aprovada - d.aprovada,
+        p.inscricoes_rejeitada = p.inscricoes_rejeitada - d.rejeitada,
+        p.inscricoes_cancelada = p.inscricoes_cancelada - d.cancelada;
+END$$
+
+DELIMITER ;
+
+-- Carga inicial a partir dos dados existentes (mesma consulta de src/painel.py)
+INSERT INTO painel_ongs (ong_id, oportunidades_ativa, oportunidades_inativa, oportunidades_encerrada,
+                         oportunidades_em_edicao, vagas_ofertadas, vagas_preenchidas,
+                         inscricoes_pendente, inscricoes_aprovada, inscricoes_rejeitada, inscricoes_cancelada)
+SELECT g.id,
+       COALESCE(o.ativa, 0), COALESCE(o.inativa, 0), COALESCE(o.encerrada, 0), COALESCE(o.em_edicao, 0),
+       COALESCE(o.ofertadas, 0), COALESCE(o.preenchidas, 0),
+       COALESCE(i.pendente, 0), COALESCE(i.aprovada, 0), COALESCE(i.rejeitada, 0), COALESCE(i.cancelada, 0)
+FROM ongs g
+LEFT JOIN (
+    SELECT ong_id,
+           SUM(status_vaga = 'ativa') AS ativa, SUM(status_vaga = 'inativa') AS inativa,
+           SUM(status_vaga = 'encerrada') AS encerrada, SUM(status_vaga = 'em_edicao') AS em_edicao,
+           SUM(COALESCE(num_vagas, 0)) AS ofertadas,
+           SUM(IF(num_vagas IS NULL, 0, vagas_ocupadas)) AS preenchidas
+    FROM oportunidades GROUP BY ong_id
+) o ON o.ong_id = g.id
+LEFT JOIN (
+    SELECT op.ong_id,
+           SUM(ins.status_inscricao = 'pendente') AS pendente, SUM(ins.status_inscricao = 'aprovada') AS aprovada,
+           SUM(ins.status_inscricao = 'rejeitada') AS rejeitada, SUM(ins.status_inscricao = 'cancelada') AS cancelada
+    FROM inscricoes ins JOIN oportunidades op ON op.id = ins.oportunidade_id
+    GROUP BY op.ong_id
+) i ON i.ong_id = g.id
+ON DUPLICATE KEY UPDATE
+    oportunidades_ativa = VALUES(oportunidades_ativa), oportunidades_inativa = VALUES(oportunidades_inativa),
+    oportunidades_encerrada = VALUES(oportunidades_encerrada), oportunidades_em_edicao = VALUES(oportunidades_em_edicao),
+    vagas_ofertadas = VALUES(vagas_ofertadas), vagas_preenchidas = VALUES(vagas_preenchidas),
+    inscricoes_pendente = VALUES(inscricoes_pendente), inscricoes_aprovada = VALUES(inscricoes_aprovada),
+    inscricoes_rejeitada = VALUES(inscricoes_rejeitada), inscricoes_cancelada = VALUES(inscricoes_cancelada);
@@ -0,0 +1,133 @@
+-- backend/database/migrations/0007_arquivo.sql
+-- Arquivo das linhas frias (src/arquivo.py): oportunidades encerradas há mais de
+-- ARQUIVO_IDADE_DIAS, com as inscrições delas, e inscrições rejeitadas/canceladas antigas
+-- saem das tabelas quentes para oportunidades_arquivo e inscricoes_arquivo. As rotas de
+-- leitura só consultam as quentes, a menos que o cliente peça ?incluir_arquivo=1.
+--
+-- O painel das ONGs continua contando as linhas arquivadas (totais da vida da ONG):
+-- o arquivamento roda com @tbg_arquivamento = 1 e os triggers de DELETE do painel
+-- ignoram as exclusões feitas assim. Exclusões normais de uma oportunidade ou de um
+-- voluntário também descontam e apagam as inscrições deles que estão no arquivo.
+
+CREATE TABLE IF NOT EXISTS oportunidades_arquivo (
+    id INT PRIMARY KEY, -- mesmo id da tabela quente
+    ong_id INT NOT NULL,
+    titulo VARCHAR(255) NOT NULL,
+    tipo_acao VARCHAR(100) NULL,
+    endereco VARCHAR(255) NOT NULL,
+    perfil_voluntario TEXT,
+    descricao TEXT NOT NULL,
+    num_vagas INT,
+    status_vaga ENUM('ativa', 'inativa', 'encerrada', 'em_edicao') DEFAULT 'encerrada',
+    data_publicacao TIMESTAMP NULL,
+    data_inicio DATE NULL,
+    data_termino DATE NULL,
+    hora_inicio TIME NULL,
+    hora_termino TIME NULL,
+    vagas_ocupadas INT NOT NULL DEFAULT 0,
+    latitude DECIMAL(9,6) NULL,
+    longitude DECIMAL(9,6) NULL,
+    arquivada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    -- Mesmos caminhos da listagem quente (ordem por data_publicacao, id)
+    INDEX idx_oportunidades_arquivo_publicacao (data_publicacao, id),
+    INDEX idx_oportunidades_arquivo_ong_publicacao (ong_id, data_publicacao, id),
+    FOREIGN KEY (ong_id) REFERENCES ongs(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS inscricoes_arquivo (
+    id INT PRIMARY KEY, -- mesmo id da tabela quente
+    oportunidade_id INT NOT NULL, -- sem chave estrangeira: a oportunidade pode estar em qualquer das duas tabelas
+    voluntario_id INT NOT NULL,
+    data_inscricao TIMESTAMP NULL,
+    status_inscricao ENUM('pendente', 'aprovada', 'rejeitada', 'cancelada') DEFAULT 'pendente',
+    mensagem TEXT NULL,
+    arquivada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    INDEX idx_inscricoes_arquivo_voluntario_data (voluntario_id, data_inscricao),
+    INDEX idx_inscricoes_arquivo_oportunidade_id (oportunidade_id, id),
+    FOREIGN KEY (voluntario_id) REFERENCES voluntarios(id) ON DELETE CASCADE
+);
+
+-- Seleção dos lotes de src/arquivo.py: oportunidades encerradas por data de término
+CREATE INDEX idx_oportunidades_status_termino ON oportunidades (status_vaga, data_termino, id);
+
+DROP TRIGGER IF EXISTS trg_painel_oportunidades_delete;
+DROP TRIGGER IF EXISTS trg_painel_inscricoes_delete;
+
+DELIMITER $$
+
+CREATE TRIGGER trg_painel_oportunidades_delete BEFORE DELETE ON oportunidades
+FOR EACH ROW
+BEGIN
+    -- Arquivamento: a oportunidade continua contando no painel
+    IF @tbg_arquivamento IS NULL THEN
+        -- BEFORE: as inscrições apagadas pela cascata ainda estão visíveis aqui
+        UPDATE painel_ongs p
+        JOIN (
+            SELECT COALESCE(SUM(status_inscricao = 'pendente'), 0) AS pendente,
+                   COALESCE(SUM(status_inscricao = 'aprovada'), 0) AS aprovada,
+                   COALESCE(SUM(status_inscricao = 'rejeitada'), 0) AS rejeitada,
+                   COALESCE(SUM(status_inscricao = 'cancelada'), 0) AS cancelada
+            FROM (
+                SELECT status_inscricao FROM inscricoes WHERE oportunidade_id = OLD.id
+                UNION ALL
+                SELECT status_inscricao FROM inscricoes_arquivo WHERE oportunidade_id = OLD.id
+            ) todas
+        ) i
+        SET p.oportunidades_ativa = p.oportunidades_ativa - (OLD.status_vaga = 'ativa'),
+            p.oportunidades_inativa = p.oportunidades_inativa - (OLD.status_vaga = 'inativa'),
+            p.oportunidades_encerrada = p.oportunidades_encerrada - (OLD.status_vaga = 'encerrada'),
+            p.oportunidades_em_edicao = p.oportunidades_em_edicao - (OLD.status_vaga = 'em_edicao'),
+            p.vagas_ofertadas = p.vagas_ofertadas - COALESCE(OLD.num_vagas, 0),
+            p.vagas_preenchidas = p.vagas_preenchidas - IF(OLD.num_vagas IS NULL, 0, OLD.vagas_ocupadas),
+            p.inscricoes_pendente = p.inscricoes_pendente - i.pendente,
+            p.inscricoes_aprovada = p.inscricoes_aprovada - i.aprovada,
+            p.inscricoes_rejeitada = p.inscricoes_rejeitada - i.rejeitada,
+            p.inscricoes_cancelada = p.inscricoes_cancelada - i.cancelada
+        WHERE p.ong_id = OLD.ong_id;
+        -- O arquivo não tem chave estrangeira para oportunidades: faz o papel da cascata
+        DELETE FROM inscricoes_arquivo WHERE oportunidade_id = OLD.id;
+        INSERT INTO atividade_ongs (ong_id, tipo, oportunidade_id, descricao)
+        VALUES (OLD.ong_id, 'oportunidade_removida', OLD.id, LEFT(CONCAT('Oportunidade removida: ', OLD.titulo), 255));
+    END IF;
+END$$
+
+CREATE TRIGGER trg_painel_inscricoes_delete AFTER DELETE ON inscricoes
+FOR EACH ROW
+BEGIN
+    IF @tbg_arquivamento IS NULL THEN
+        UPDATE painel_ongs SET
+            inscricoes_pendente = inscricoes_pendente - (OLD.status_inscricao = 'pendente'),
+            inscricoes_aprovada = inscricoes_aprovada - (OLD.status_inscricao = 'aprovada'),
+            inscricoes_rejeitada = inscricoes_rejeitada - (OLD.status_inscricao = 'rejeitada'),
+            inscricoes_cancelada = inscricoes_cancelada - (OLD.status_inscricao = 'cancelada')
+        WHERE ong_id = (SELECT ong_id FROM oportunidades WHERE id = OLD.oportunidade_id);
+    END IF;
+END$$
+
+-- A cascata de voluntarios para inscricoes_arquivo não dispara triggers: desconta
+-- aqui as inscrições arquivadas, como trg_painel_voluntarios_delete faz com as quentes
+CREATE TRIGGER trg_arquivo_voluntarios_delete BEFORE DELETE ON voluntarios
+FOR EACH ROW FOLLOWS trg_painel_voluntarios_delete
+BEGIN
+    UPDATE painel_ongs p
+    JOIN (
+        SELECT COALESCE(o.ong_id, oa.ong_id) AS ong_id,
+               SUM(i.status_inscricao = 'pendente') AS pendente,
+               SUM(i.status_inscricao = 'aprovada') AS aprovada,
+               SUM(i.status_inscricao = 'rejeitada') AS rejeitada,
+               SUM(i.status_inscricao = 'cancelada') AS cancelada
+        FROM inscricoes_arquivo i
+        LEFT JOIN oportunidades o ON o.id = i.oportunidade_id
+        LEFT JOIN oportunidades_arquivo oa ON oa.id = i.oportunidade_id
+        WHERE i.voluntario_id = OLD.id
+        GROUP BY COALESCE(o.ong_id, oa.ong_id)
+    ) d ON d.ong_id = p.ong_id
+    SET p.inscricoes_pendente = p.inscricoes_pendente - d.pendente,
+        p.inscricoes_aprovada = p.inscricoes_aprovada - d.aprovada,
+        p.inscricoes_rejeitada = p.inscricoes_rejeitada - d.rejeitada,
+        p.inscricoes_cancelada = p.inscricoes_cancelada - d.cancelada;
+END$$
+
+DELIMITER ;
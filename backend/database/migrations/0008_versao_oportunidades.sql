@@ -0,0 +1,10 @@
+-- backend/database/migrations/0008_versao_oportunidades.sql
+-- Versão da linha para controle de concorrência otimista nas edições (PUT/PATCH):
+-- cada edição faz versao = versao + 1 no mesmo UPDATE e, com If-Match, só altera a
+-- linha se a versão ainda é a que o cliente leu. O ETag do detalhe carrega a versão.
+-- Reservas de vaga (vagas_ocupadas) não mudam a versão: não são edições da ONG.
+
+ALTER TABLE oportunidades ADD COLUMN versao INT UNSIGNED NOT NULL DEFAULT 1;
+
+-- O arquivo guarda as mesmas colunas da tabela quente (src/arquivo.py)
+ALTER TABLE oportunidades_arquivo ADD COLUMN versao INT UNSIGNED NOT NULL DEFAULT 1;
@@ -0,0 +1,11 @@
+-- backend/database/migrations/0009_precisao_geocodificacao.sql
+-- Precisão das coordenadas de cada oportunidade, como o geocodificador informou
+-- ("municipio", "uf"...). O gazetteer padrão só conhece os maiores municípios e põe os
+-- demais no centroide do estado: a busca por proximidade devolve a precisão junto com a
+-- distância. NULL = sem coordenadas ou ainda não geocodificada com a precisão.
+-- Linhas já existentes: python -m src.geocoding --preencher
+
+ALTER TABLE oportunidades ADD COLUMN precisao_geo VARCHAR(20) NULL;
+
+-- O arquivo guarda as mesmas colunas da tabela quente (src/arquivo.py)
+ALTER TABLE oportunidades_arquivo ADD COLUMN precisao_geo VARCHAR(20) NULL;
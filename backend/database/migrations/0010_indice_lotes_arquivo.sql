@@ -0,0 +1,12 @@
+-- backend/database/migrations/0010_indice_lotes_arquivo.sql
+-- Índice dos lotes de oportunidades do arquivamento (SQL_LOTE_OPORTUNIDADES em
+-- src/arquivo.py): status_vaga = 'encerrada' AND id > último, ORDER BY id LIMIT lote.
+-- O (status_vaga, data_termino, id) da migração 0007 não servia: o corte é sobre
+-- COALESCE(data_termino, DATE(data_publicacao)), que nenhum índice atende, e a ordem
+-- por id obrigava a reordenar todas as encerradas a cada lote. Com (status_vaga, id),
+-- cada lote continua de onde o anterior parou, já na ordem, e o corte por data é
+-- conferido só nas linhas lidas.
+
+DROP INDEX idx_oportunidades_status_termino ON oportunidades;
+
+CREATE INDEX idx_oportunidades_status_id ON oportunidades (status_vaga, id);
@@ -1,27 +1,47 @@
 # backend/main.py
 
 import os
-from fastapi import FastAPI, HTTPException, status, Query
-from fastapi.responses import JSONResponse
+import logging
+from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 # from dotenv import load_dotenv # Mantenha esta linha comentada se o Railway injeta as variáveis
 
 # === Importações Modulares ===
 # Importa as funções de conexão e validação de variáveis de ambiente do módulo database.py
-# AGORA TAMBÉM IMPORTA Base e engine para a criação de tabelas
-from src.database import Base, engine
-# Importa os modelos Pydantic (necessário apenas para DadosInscricao se for usar aqui)
-from src.models import DadosInscricao # Importa apenas o que é usado NESTE arquivo
+from src.logs import configurar_logs
+configurar_logs() # Antes dos demais imports: nível e formato valem para todos os loggers
+from src.database import run_db, shutdown_db, pool_stats
+from src.compressao import MiddlewareCompressao
+from src.admissao import MiddlewareAdmissao, controle_admissao
+from src.replicas import MiddlewareLeituraAposEscrita, roteador_replicas, replicas_stats
+from src.metrics import MiddlewareMetricas, registro as registro_metricas, TIPO_CONTEUDO as TIPO_METRICAS
+from src.migrations import aplicar_migracoes, verificar_versao
+from src.cache import cache_oportunidades
+from src.vagas import controle_vagas
+from src.agenda import indice_agenda
+from src.eventos import broker_oportunidades
+from src.arquivo import iniciar_agendamento as iniciar_arquivamento, parar_agendamento as parar_arquivamento
+from src.pagination import HEADER_PROXIMO_CURSOR
 
 # Importa os roteadores de cada módulo.
-# Atenção: As rotas de Inscrições NÃO estão sendo incluídas aqui por enquanto.
-from src.routes.opportunity_routes import router as opportunity_router
+from src.routes.opportunity_routes import router as opportunity_router, remover_arquivadas
 from src.routes.volunteer_routes import router as volunteer_router
+from src.routes.export_routes import router as export_router
+from src.routes.inscription_routes import router as inscription_router
+from src.routes.ong_routes import router as ong_router
 
 # load_dotenv() # Carrega variáveis de ambiente do arquivo .env - MANTENHA COMENTADA PARA DEPLOY NO RAILWAY
 
+logger = logging.getLogger(__name__)
+
 api = FastAPI() # Cria a instância principal da aplicação FastAPI
 
+# Read-your-writes com réplicas (src/replicas.py): quem escreveu há pouco lê do primário
+api.add_middleware(MiddlewareLeituraAposEscrita)
+# Controle de admissão: limites de concorrência por classe de rota e 503 rápido em
+# sobrecarga (src/admissao.py). Adicionado antes do CORS para ficar por dentro dele.
+api.add_middleware(MiddlewareAdmissao)
 # Configuração do Middleware CORS
 api.add_middleware(
     CORSMiddleware,
@@ -29,22 +49,52 @@ api.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[HEADER_PROXIMO_CURSOR, "Retry-After"], # Permite ao frontend ler o cursor da próxima página e o Retry-After do 503
 )
+# Compressão gzip/br das respostas acima de COMPRESSAO_MINIMO_BYTES (src/compressao.py)
+api.add_middleware(MiddlewareCompressao)
+# Latência por rota, requisições em andamento e status (GET /metrics). Adicionado por
+# último para ficar por fora do CORS e medir a requisição inteira.
+api.add_middleware(MiddlewareMetricas)
+
+# === EVENTO DE STARTUP: ESQUEMA DO BANCO DE DADOS ===
+# MIGRACOES_NO_STARTUP escolhe o que o boot faz com o banco:
+#   aplicar   (padrão) aplica as migrações pendentes (lock nomeado + DDL se houver);
+#   verificar só confere a versão em schema_version (uma leitura) e falha se o banco
+#             estiver atrás; as migrações rodam antes do deploy (python -m src.migrations);
+#   nenhum    não toca no banco: pool e conexões só são criados na primeira requisição.
+# Em deploys com scale-to-zero, `verificar` ou `nenhum` encurtam o cold start.
+MIGRACOES_NO_STARTUP = os.getenv("MIGRACOES_NO_STARTUP", "aplicar").lower()
 
-# === EVENTO DE STARTUP: CRIAÇÃO DE TABELAS DO BANCO DE DADOS ===
 @api.on_event("startup")
 async def startup_event():
-    print("Iniciando evento de startup do FastAPI: Verificando e criando tabelas do banco de dados...")
+    # Arquivamento periódico das linhas frias, se ARQUIVO_INTERVALO_HORAS > 0 (src/arquivo.py)
+    iniciar_arquivamento(ao_arquivar=remover_arquivadas)
+    if MIGRACOES_NO_STARTUP == "nenhum":
+        logger.info("Startup sem acesso ao banco (MIGRACOES_NO_STARTUP=nenhum)")
+        return
     try:
-        # Cria todas as tabelas definidas nos modelos que usam 'Base'
-        # Isso só criará as tabelas se elas ainda não existirem
-        Base.metadata.create_all(bind=engine)
-        print("Tabelas criadas ou já existentes no banco de dados com sucesso.")
-    except Exception as e:
-        print(f"ERRO CRÍTICO: Falha durante a criação/verificação das tabelas no startup: {e}")
+        if MIGRACOES_NO_STARTUP == "verificar":
+            atual, esperada = await run_db(verificar_versao)
+            logger.info("Esquema do banco na versão %s (esperada: %s)", atual, esperada)
+            return
+        logger.info("Iniciando evento de startup do FastAPI: aplicando migrações pendentes do banco de dados")
+        # Aplica as migrações versionadas de database/migrations (ver src/migrations.py).
+        # Só executa o que ainda não está registrado na tabela schema_version.
+        aplicadas = await run_db(aplicar_migracoes)
+        logger.info("Esquema do banco atualizado. Migrações aplicadas agora: %s", aplicadas or "nenhuma")
+    except Exception:
+        logger.critical("Falha ao preparar o esquema do banco no startup", exc_info=True)
         # É importante que a aplicação falhe ao iniciar se o DB for essencial e não estiver acessível
         raise # Relaça a exceção para que o deploy no Railway indique a falha se o DB não for acessível
 
+# === EVENTO DE SHUTDOWN: LIBERA O EXECUTOR E AS CONEXÕES DO POOL ===
+@api.on_event("shutdown")
+async def shutdown_event():
+    parar_arquivamento()
+    shutdown_db()
+    roteador_replicas.parar()
+
 # === Inclusão dos Roteadores Modulares ===
 # Inclui os roteadores de cada módulo na aplicação principal.
 # O prefixo '/api' é adicionado aqui para todas as rotas desses roteadores.
@@ -52,14 +102,16 @@ async def startup_event():
 # Ex: Rotas de volunteer_routes.py (prefixo /voluntarios) se tornam /api/voluntarios
 api.include_router(opportunity_router, prefix="/api") # Inclui rotas de Oportunidades com prefixo /api
 api.include_router(volunteer_router, prefix="/api")   # Inclui rotas de Voluntários com prefixo /api
+api.include_router(export_router, prefix="/api")      # Inclui rotas de Exportação (streaming) com prefixo /api
+api.include_router(inscription_router, prefix="/api") # Inclui rotas de Inscrições com prefixo /api
+api.include_router(ong_router, prefix="/api")         # Inclui rotas de ONGs (painel) com prefixo /api
 
 # =========================================================
 # Endpoints que Permanecem no main.py (Inscrições, por exemplo)
 # Se houver erros aqui, vamos removê-los temporariamente para focar.
 # =========================================================
 
-# NOTA: O endpoint /inscricoes foi removido para resolver o 'finally' problemático e focar na entrega.
-# Se precisar dele no futuro, ele pode ser movido para 'src/routes/inscricoes_routes.py' e incluído aqui.
+# NOTA: O endpoint /inscricoes agora fica em 'src/routes/inscription_routes.py' (incluído acima).
 
 # Exemplo de um endpoint raiz ou de saúde (opcional, mas bom ter)
 @api.get("/")
@@ -67,4 +119,73 @@ async def read_root():
     """
     Endpoint de raiz da API.
     """
-    return {"message": "Bem-vindo à API Tempo Bem Gasto! (Versão Focada)"}
\ No newline at end of file
+    return {"message": "Bem-vindo à API Tempo Bem Gasto! (Versão Focada)"}
+
+# Contadores de desempenho: cache de respostas de oportunidades e pool de conexões
+@api.get("/api/estatisticas")
+async def estatisticas():
+    """
+    Endpoint de diagnóstico com acertos/falhas do cache e estatísticas do pool.
+    """
+    return {
+        "cache_oportunidades": cache_oportunidades.estatisticas(),
+        "pool_conexoes": pool_stats(),
+        "replicas": replicas_stats(),
+        "inscricoes_recusadas_sem_banco": controle_vagas.recusas_rapidas,
+        "eventos_oportunidades": broker_oportunidades.estatisticas(),
+        "admissao": controle_admissao.estatisticas(),
+        "agenda": indice_agenda.estatisticas(),
+    }
+
+
+def _metricas_do_processo():
+    """
+    Pools de conexões (primário e réplicas), cache, feed de eventos e controle de admissão lidos no momento da coleta (mesmos números de /api/estatisticas).
+    """
+    amostras = []
+    pool = pool_stats()
+    if pool:
+        for chave in ("size", "idle", "in_use", "max_size"):
+            amostras.append((f"db_pool_{chave}", "gauge", f"Pool de conexões: {chave}.", pool[chave]))
+        for chave in ("checkouts", "misses", "waits", "timeouts", "discarded"):
+            amostras.append((f"db_pool_{chave}_total", "counter", f"Pool de conexões: {chave}.", pool[chave]))
+        amostras.append(("db_pool_wait_seconds_total", "counter",
+                         "Tempo total esperando uma conexão livre.", pool["wait_time_seconds"]))
+    replicas = replicas_stats()
+    if replicas:
+        amostras += [
+            ("db_replicas_leituras_primario_total", "counter",
+             "Leituras enviadas ao primário por escrita recente do cliente.", replicas["leituras_primario_apos_escrita"]),
+            ("db_replicas_fallbacks_total", "counter",
+             "Leituras enviadas ao primário por falta de réplica saudável.", replicas["fallbacks_primario"]),
+            ("db_replicas_saudaveis", "gauge", "Réplicas recebendo leituras.",
+             sum(1 for replica in replicas["replicas"].values() if replica["saudavel"])),
+        ]
+    cache = cache_oportunidades.estatisticas()
+    amostras += [
+        ("cache_oportunidades_entradas", "gauge", "Respostas no cache de oportunidades.", cache["entradas"]),
+        ("cache_oportunidades_acertos_total", "counter", "Acertos do cache de oportunidades.", cache["acertos"]),
+        ("cache_oportunidades_falhas_total", "counter", "Falhas do cache de oportunidades.", cache["falhas"]),
+        ("inscricoes_recusadas_sem_banco_total", "counter",
+         "Inscrições recusadas sem consultar o banco (vaga esgotada).", controle_vagas.recusas_rapidas),
+    ]
+    eventos = broker_oportunidades.estatisticas()
+    amostras += [
+        ("eventos_oportunidades_conexoes", "gauge", "Clientes conectados ao feed de mudanças.", eventos["assinantes"]),
+        ("eventos_oportunidades_publicados_total", "counter", "Eventos publicados no feed de mudanças.", eventos["publicados"]),
+        ("eventos_oportunidades_desconectados_lentos_total", "counter",
+         "Clientes desconectados por deixar o buffer de eventos encher.", eventos["desconectados_lentos"]),
+    ]
+    for nome, classe in controle_admissao.estatisticas()["classes"].items():
+        amostras += [
+            (f"admissao_{nome}_em_andamento", "gauge", f"Requisições da classe {nome} em execução.", classe["em_andamento"]),
+            (f"admissao_{nome}_na_fila", "gauge", f"Requisições da classe {nome} esperando vaga.", classe["na_fila"]),
+        ]
+    return amostras
+
+registro_metricas.registrar_coletor(_metricas_do_processo)
+
+# Métricas no formato texto do Prometheus (fora do prefixo /api, como o scraper espera)
+@api.get("/metrics", include_in_schema=False)
+async def metricas():
+    return Response(content=registro_metricas.exposicao(), media_type=TIPO_METRICAS)
@@ -0,0 +1,260 @@
+# backend/src/admissao.py
+#
+# Controle de admissão: limita quantas requisições de cada classe de rota rodam ao
+# mesmo tempo e segura as demais numa fila limitada. Quando a espera estimada na fila
+# passa do prazo, a requisição é recusada na hora com 503 + Retry-After, em vez de
+# esperar atrás das conexões do banco até o cliente desistir (timeout de 30 s do axios)
+# e o servidor gastar trabalho numa resposta que ninguém vai receber.
+#
+# Classes (a primeira regra que casar com método e caminho decide):
+#   leitura  GETs comuns: baratas, têm prioridade quando uma vaga é liberada;
+#   escrita  POST/PUT/PATCH/DELETE;
+#   pesada   exportações CSV e importação em lote.
+# Caminhos de diagnóstico, o feed SSE (conexão longa) e preflights CORS não passam pelo controle.
+#
+#   ADMISSAO_LIMITE_TOTAL (padrão MYSQL_EXECUTOR_WORKERS), ADMISSAO_LIMITE_LEITURA,
+#   ADMISSAO_LIMITE_ESCRITA, ADMISSAO_LIMITE_PESADA (por classe), ADMISSAO_FILA_MAXIMA
+#   (por classe, padrão 200), ADMISSAO_PRAZO_SEGUNDOS (padrão 5), ADMISSAO_ATIVA (padrão 1)
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+
+from .database import MYSQL_EXECUTOR_WORKERS
+from .metrics import Contador, Histograma, registro
+
+ADMISSAO_ATIVA = os.getenv("ADMISSAO_ATIVA", "1") != "0"
+# Padrão: uma vaga por thread do executor do banco. Admitir mais só criaria uma segunda
+# fila, sem prioridade nem prazo, dentro do executor
+ADMISSAO_LIMITE_TOTAL = int(os.getenv("ADMISSAO_LIMITE_TOTAL", MYSQL_EXECUTOR_WORKERS))
+ADMISSAO_FILA_MAXIMA = int(os.getenv("ADMISSAO_FILA_MAXIMA", 200))
+ADMISSAO_PRAZO_SEGUNDOS = float(os.getenv("ADMISSAO_PRAZO_SEGUNDOS", 5))
+
+LEITURA, ESCRITA, PESADA = "leitura", "escrita", "pesada"
+
+# (métodos ou None para qualquer um, prefixo do caminho, classe); None como classe = sem controle
+REGRAS = (
+    ({"OPTIONS"}, "", None),
+    (None, "/metrics", None),
+    (None, "/api/estatisticas", None),
+    (None, "/api/oportunidades/eventos", None),
+    (None, "/docs", None),
+    (None, "/openapi.json", None),
+    (None, "/api/exportacoes/", PESADA),
+    ({"POST"}, "/api/oportunidades/lote", PESADA),
+    ({"POST", "PUT", "PATCH", "DELETE"}, "/", ESCRITA),
+    (None, "/api/", LEITURA),
+)
+
+# Tempo médio de serviço inicial de cada classe (s), até existir medição
+TEMPO_INICIAL = {LEITURA: 0.02, ESCRITA: 0.1, PESADA: 2.0}
+_SUAVIZACAO = 0.2 # Peso da última medição na média móvel exponencial
+
+MENSAGEM_SOBRECARGA = b'{"detail":"Servidor sobrecarregado. Tente novamente em instantes."}'
+
+recusas = registro.registrar(Contador(
+    "admissao_recusas_total", "Requisições recusadas com 503 pelo controle de admissão, por classe e motivo.",
+    ("classe", "motivo")))
+espera_fila = registro.registrar(Histograma(
+    "admissao_espera_seconds", "Tempo na fila do controle de admissão até a requisição ser admitida.",
+    ("classe",), (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)))
+
+
+def classificar(metodo, caminho):
+    for metodos, prefixo, classe in REGRAS:
+        if (metodos is None or metodo in metodos) and caminho.startswith(prefixo):
+            return classe
+    return None
+
+
+class _Classe:
+    def __init__(self, nome, limite, prioridade):
+        self.nome = nome
+        self.limite = limite
+        self.prioridade = prioridade # Menor número é atendido primeiro
+        self.em_andamento = 0
+        self.fila = deque() # (future da vaga, instante em que entrou na fila)
+        self.tempo_medio = TEMPO_INICIAL[nome]
+        self.admitidas = 0
+
+
+class ControleAdmissao:
+    """
+    Estado do controle, usado só dentro do event loop (sem locks): vagas em uso por
+    classe e no total, e uma fila FIFO por classe. Vaga liberada vai para a fila da
+    classe de maior prioridade que ainda tenha limite disponível.
+    """
+
+    def __init__(self, limite_total=ADMISSAO_LIMITE_TOTAL, limites=None,
+                 fila_maxima=ADMISSAO_FILA_MAXIMA, prazo=ADMISSAO_PRAZO_SEGUNDOS):
+        limites = limites or {}
+        # As leituras não ocupam todas as vagas: sempre sobra espaço para as escritas
+        # (inscrições). Exportações usam o que as duas deixarem livre e, em sobrecarga,
+        # são as primeiras a receber 503
+        padrao = {
+            LEITURA: max(1, limite_total * 3 // 4),
+            ESCRITA: max(1, limite_total // 2),
+            PESADA: max(1, limite_total // 8),
+        }
+        self.limite_total = limite_total
+        self.fila_maxima = fila_maxima
+        self.prazo = prazo
+        self.em_andamento = 0
+        self.classes = {}
+        for prioridade, nome in enumerate((LEITURA, ESCRITA, PESADA)):
+            limite = limites.get(nome) or int(os.getenv(f"ADMISSAO_LIMITE_{nome.upper()}", padrao[nome]))
+            self.classes[nome] = _Classe(nome, limite, prioridade)
+        self._por_prioridade = sorted(self.classes.values(), key=lambda classe: classe.prioridade)
+
+    def _tem_vaga(self, classe):
+        return classe.em_andamento < classe.limite and self.em_andamento < self.limite_total
+
+    def _ocupar(self, classe):
+        classe.em_andamento += 1
+        classe.admitidas += 1
+        self.em_andamento += 1
+
+    def espera_estimada(self, classe):
+        """
+        Segundos estimados até uma nova requisição da classe ser admitida: a fila à frente
+        dela vezes o tempo médio de serviço, dividido pelas vagas que sobram para a classe
+        depois da demanda (em andamento + na fila) das classes de maior prioridade. Sem vaga
+        sobrando (ex.: ADMISSAO_LIMITE_LEITURA igual ao total, com as leituras no limite), a
+        primeira da classe ainda entra na fila e pega a próxima vaga liberada que as classes
+        de cima não usarem (o prazo limita a espera); com a fila dela já ocupada, a espera é
+        infinita. Se a primeira da fila já espera há mais tempo que a estimativa, vale a
+        idade dela: quem chega agora não vai esperar menos.
+        """
+        livres = self.limite_total
+        for outra in self._por_prioridade:
+            if outra.prioridade < classe.prioridade:
+                livres -= min(outra.limite, outra.em_andamento + len(outra.fila))
+        vagas = min(classe.limite, livres)
+        if vagas <= 0:
+            return math.inf if classe.fila else classe.tempo_medio
+        espera = (len(classe.fila) + 1) * classe.tempo_medio / vagas
+        if classe.fila:
+            espera = max(espera, time.perf_counter() - classe.fila[0][1])
+        return espera
+
+    async def entrar(self, nome_classe):
+        """
+        Ocupa uma vaga da classe, esperando na fila se preciso. Devolve None se foi
+        admitida ou (motivo, retry_after_segundos) se deve ser recusada.
+        """
+        classe = self.classes[nome_classe]
+        if self._tem_vaga(classe) and not classe.fila:
+            self._ocupar(classe)
+            return None
+        espera = self.espera_estimada(classe)
+        if len(classe.fila) >= self.fila_maxima:
+            return "fila_cheia", espera
+        if espera > self.prazo:
+            return "prazo", espera
+
+        vaga = asyncio.get_running_loop().create_future()
+        inicio = time.perf_counter()
+        item = (vaga, inicio)
+        classe.fila.append(item)
+        try:
+            await asyncio.wait_for(asyncio.shield(vaga), self.prazo)
+        except asyncio.TimeoutError:
+            if not vaga.done():
+                # A estimativa errou para menos: melhor recusar do que passar do prazo
+                classe.fila.remove(item)
+                return "prazo", self.espera_estimada(classe)
+        except asyncio.CancelledError:
+            # Cliente desconectou enquanto esperava: devolve a vaga se ela já tinha chegado
+            if vaga.done():
+                self.sair(nome_classe, None)
+            else:
+                classe.fila.remove(item)
+            raise
+        espera_fila.observar(time.perf_counter() - inicio, nome_classe)
+        return None
+
+    def sair(self, nome_classe, duracao):
+        classe = self.classes[nome_classe]
+        classe.em_andamento -= 1
+        self.em_andamento -= 1
+        if duracao is not None:
+            classe.tempo_medio += _SUAVIZACAO * (duracao - classe.tempo_medio)
+        self._despachar()
+
+    def _despachar(self):
+        for classe in self._por_prioridade:
+            while classe.fila and self._tem_vaga(classe):
+                self._ocupar(classe)
+                vaga, _ = classe.fila.popleft()
+                vaga.set_result(True)
+
+    def estatisticas(self):
+        return {
+            "em_andamento": self.em_andamento,
+            "limite_total": self.limite_total,
+            "classes": {
+                nome: {
+                    "em_andamento": classe.em_andamento,
+                    "limite": classe.limite,
+                    "na_fila": len(classe.fila),
+                    "admitidas": classe.admitidas,
+                    "tempo_medio_ms": round(classe.tempo_medio * 1000, 2),
+                }
+                for nome, classe in self.classes.items()
+            },
+        }
+
+
+class MiddlewareAdmissao:
+    """
+    Middleware ASGI do controle de admissão. Fica por dentro do CORS, para que o 503
+    chegue ao navegador com os headers CORS e o frontend consiga ler o Retry-After.
+    """
+
+    def __init__(self, app, controle=None):
+        self.app = app
+        self.controle = controle or controle_admissao
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ADMISSAO_ATIVA:
+            return await self.app(scope, receive, send)
+        classe = classificar(scope["method"], scope["path"])
+        if classe is None:
+            return await self.app(scope, receive, send)
+
+        recusa = await self.controle.entrar(classe)
+        if recusa is not None:
+            motivo, espera = recusa
+            recusas.inc(classe, motivo)
+            return await self._recusar(send, espera)
+
+        inicio = time.perf_counter()
+        concluida = False
+        try:
+            await self.app(scope, receive, send)
+            concluida = True
+        finally:
+            # Só requisições completas entram na média de tempo de serviço
+            self.controle.sair(classe, time.perf_counter() - inicio if concluida else None)
+
+    @staticmethod
+    async def _recusar(send, espera):
+        # Limitado ao prazo: a sobrecarga costuma passar antes do que a fila atual sugere
+        # (e a espera é infinita quando a classe está sem vagas)
+        retry_after = str(max(1, math.ceil(min(espera, ADMISSAO_PRAZO_SEGUNDOS)))).encode("ascii")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(MENSAGEM_SOBRECARGA)).encode("ascii")),
+                (b"retry-after", retry_after),
+            ],
+        })
+        await send({"type": "http.response.body", "body": MENSAGEM_SOBRECARGA})
+
+
+# Controle do processo (um único worker do uvicorn)
+controle_admissao = ControleAdmissao()
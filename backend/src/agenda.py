@@ -0,0 +1,314 @@
+# backend/src/agenda.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, time as hora, timedelta
+
+from .datas import formatar_data, formatar_hora
+
+# Agenda de cada voluntário em memória: as inscrições que ocupam vaga (pendente/aprovada)
+# com o período (data_inicio..data_termino) e a janela diária (hora_inicio..hora_termino)
+# da oportunidade. Sustenta a verificação de conflito de horário na inscrição e a rota
+# GET /api/voluntarios/{id}/agenda.
+#
+# Escritas deste processo atualizam ou descartam a agenda na hora; o TTL limita por
+# quanto tempo uma inscrição feita por outro processo pode passar despercebida.
+AGENDA_TTL_SEGUNDOS = float(os.getenv("AGENDA_TTL_SEGUNDOS", 120))
+AGENDA_MAX_VOLUNTARIOS = int(os.getenv("AGENDA_MAX_VOLUNTARIOS", 10000))
+AGENDA_BLOQUEAR_CONFLITOS = os.getenv("AGENDA_BLOQUEAR_CONFLITOS", "1") not in ("0", "false", "False")
+
+MINUTOS_DIA = 24 * 60
+
+SQL_COMPROMISSOS = """
+    SELECT i.id AS inscricao_id, i.oportunidade_id, i.status_inscricao AS status,
+           o.titulo, o.data_inicio, o.data_termino, o.hora_inicio, o.hora_termino
+    FROM inscricoes i
+    JOIN oportunidades o ON o.id = i.oportunidade_id
+    WHERE i.voluntario_id = %s AND i.status_inscricao IN ('pendente', 'aprovada')
+"""
+
+
+def _minutos(valor):
+    # TIME chega do PyMySQL como timedelta; nas escritas da API, como time
+    if isinstance(valor, timedelta):
+        return int(valor.total_seconds()) // 60
+    if isinstance(valor, hora):
+        return valor.hour * 60 + valor.minute
+    return None
+
+
+class Compromisso:
+    """
+    Uma inscrição na agenda. Datas viram ordinais (date.toordinal) e horas, minutos desde
+    00:00. Janela que termina antes (ou na hora) em que começa atravessa a meia-noite:
+    minuto_fim passa de 1440 e o último dia ocupado (fim_efetivo) é o seguinte ao término.
+    Sem as duas horas, o compromisso aparece na agenda mas não entra em conflitos.
+    """
+
+    __slots__ = ("inscricao_id", "oportunidade_id", "titulo", "status", "linha",
+                 "inicio", "fim", "minuto_inicio", "minuto_fim", "fim_efetivo")
+
+    def __init__(self, linha):
+        self.inscricao_id = linha.get("inscricao_id")
+        self.oportunidade_id = linha["oportunidade_id"]
+        self.titulo = linha.get("titulo")
+        self.status = linha.get("status")
+        self.linha = linha
+        data_inicio, data_termino = linha["data_inicio"], linha.get("data_termino")
+        self.inicio = data_inicio.toordinal()
+        self.fim = data_termino.toordinal() if isinstance(data_termino, date) and data_termino >= data_inicio else self.inicio
+        self.minuto_inicio = _minutos(linha.get("hora_inicio"))
+        self.minuto_fim = _minutos(linha.get("hora_termino"))
+        if self.minuto_inicio is None or self.minuto_fim is None:
+            self.minuto_inicio = self.minuto_fim = None
+        elif self.minuto_fim <= self.minuto_inicio:
+            self.minuto_fim += MINUTOS_DIA
+        self.fim_efetivo = self.fim + 1 if self.minuto_fim is not None and self.minuto_fim > MINUTOS_DIA else self.fim
+
+    def descricao(self):
+        periodo = formatar_data(self.linha["data_inicio"])
+        if self.fim != self.inicio:
+            periodo += f" a {formatar_data(self.linha['data_termino'])}"
+        if self.minuto_inicio is not None:
+            periodo += f", {formatar_hora(self.linha['hora_inicio'])}-{formatar_hora(self.linha['hora_termino'])}"
+        return f"{self.titulo} ({periodo})"
+
+    def como_dict(self, conflitos=()):
+        return {
+            "inscricao_id": self.inscricao_id,
+            "oportunidade_id": self.oportunidade_id,
+            "titulo": self.titulo,
+            "status": self.status,
+            "data_inicio": formatar_data(self.linha["data_inicio"]),
+            "data_termino": formatar_data(self.linha.get("data_termino")),
+            "hora_inicio": formatar_hora(self.linha.get("hora_inicio")),
+            "hora_termino": formatar_hora(self.linha.get("hora_termino")),
+            "conflitos": list(conflitos),
+        }
+
+
+def compromisso(linha):
+    """
+    Compromisso de uma linha de oportunidade/inscrição, ou None se a oportunidade não tem
+    data de início (não dá para posicioná-la na agenda).
+    """
+    if not isinstance(linha.get("data_inicio"), date):
+        return None
+    return Compromisso(linha)
+
+
+def conflitam(a, b):
+    """
+    True se algum dia de a e algum dia de b ocupam o mesmo minuto. Como cada janela dura no
+    máximo 24 h, só os deslocamentos de -1, 0 e +1 dia entre os dois podem se sobrepor.
+    """
+    if a.minuto_inicio is None or b.minuto_inicio is None:
+        return False
+    for desloc in (-1, 0, 1):
+        minutos = desloc * MINUTOS_DIA
+        if a.minuto_inicio < b.minuto_fim + minutos and b.minuto_inicio + minutos < a.minuto_fim:
+            # Existe dia d de a com d + desloc dentro do período de b?
+            if max(a.inicio, b.inicio - desloc) <= min(a.fim, b.fim - desloc):
+                return True
+    return False
+
+
+class ArvoreIntervalos:
+    """
+    Árvore de intervalos estática e implícita sobre os compromissos ordenados por
+    (inicio, fim_efetivo): o nó de [lo, hi) é o meio do trecho e maximo[meio] guarda o maior
+    fim_efetivo da subárvore. Uma consulta descarta subárvores que terminam antes do
+    período e não desce à direita de um nó que começa depois dele: O(log n + k).
+    """
+
+    __slots__ = ("compromissos", "inicios", "fins", "maximo")
+
+    def __init__(self, compromissos):
+        self.compromissos = sorted(compromissos, key=lambda c: (c.inicio, c.fim_efetivo))
+        self.inicios = [c.inicio for c in self.compromissos]
+        self.fins = [c.fim_efetivo for c in self.compromissos]
+        self.maximo = list(self.fins)
+        self._construir(0, len(self.compromissos))
+
+    def _construir(self, lo, hi):
+        if lo >= hi:
+            return -1
+        meio = (lo + hi) // 2
+        maximo = max(self.fins[meio], self._construir(lo, meio), self._construir(meio + 1, hi))
+        self.maximo[meio] = maximo
+        return maximo
+
+    def sobrepostos(self, de, ate):
+        """
+        Compromissos cujo período [inicio, fim_efetivo] intersecta [de, ate] (ordinais).
+        """
+        inicios, fins, maximo, compromissos = self.inicios, self.fins, self.maximo, self.compromissos
+        encontrados = []
+        pilha = [(0, len(compromissos))]
+        while pilha:
+            lo, hi = pilha.pop()
+            if lo >= hi:
+                continue
+            meio = (lo + hi) // 2
+            if maximo[meio] < de:
+                continue
+            pilha.append((lo, meio))
+            if inicios[meio] <= ate:
+                if fins[meio] >= de:
+                    encontrados.append(compromissos[meio])
+                pilha.append((meio + 1, hi))
+        return encontrados
+
+    def __len__(self):
+        return len(self.compromissos)
+
+
+class AgendaVoluntario:
+    __slots__ = ("compromissos", "arvore", "expira_em")
+
+    def __init__(self, compromissos, expira_em):
+        self.compromissos = {c.inscricao_id: c for c in compromissos} # inscricao_id -> Compromisso
+        self.arvore = None # Reconstruída na próxima consulta depois de cada mudança
+        self.expira_em = expira_em
+
+    def indice(self):
+        if self.arvore is None:
+            self.arvore = ArvoreIntervalos(self.compromissos.values())
+        return self.arvore
+
+
+class IndiceAgenda:
+    """
+    Agendas dos voluntários consultados recentemente (LRU com até max_voluntarios),
+    carregadas sob demanda com a função `carregar(voluntario_id) -> linhas`.
+    """
+
+    def __init__(self, ttl=AGENDA_TTL_SEGUNDOS, max_voluntarios=AGENDA_MAX_VOLUNTARIOS):
+        self.ttl = ttl
+        self.max_voluntarios = max_voluntarios
+        self._agendas = OrderedDict() # voluntario_id -> AgendaVoluntario
+        self._por_oportunidade = {} # oportunidade_id -> {voluntario_id}
+        self._lock = threading.Lock()
+        self.carregamentos = 0
+        self.consultas = 0
+        self.conflitos_detectados = 0
+
+    def _indexar(self, voluntario_id, compromissos):
+        for c in compromissos:
+            self._por_oportunidade.setdefault(c.oportunidade_id, set()).add(voluntario_id)
+
+    def _desindexar(self, voluntario_id, agenda):
+        for c in agenda.compromissos.values():
+            voluntarios = self._por_oportunidade.get(c.oportunidade_id)
+            if voluntarios is not None:
+                voluntarios.discard(voluntario_id)
+                if not voluntarios:
+                    del self._por_oportunidade[c.oportunidade_id]
+
+    def _descartar(self, voluntario_id):
+        agenda = self._agendas.pop(voluntario_id, None)
+        if agenda is not None:
+            self._desindexar(voluntario_id, agenda)
+
+    def _indice(self, voluntario_id, carregar, recarregar=False):
+        with self._lock:
+            self.consultas += 1
+            agenda = self._agendas.get(voluntario_id)
+            if not recarregar and agenda is not None and agenda.expira_em > time.monotonic():
+                self._agendas.move_to_end(voluntario_id)
+                return agenda.indice()
+
+        # Carrega fora do lock: a consulta ao banco não segura as agendas dos outros voluntários
+        compromissos = [c for c in map(compromisso, carregar(voluntario_id)) if c is not None]
+        agenda = AgendaVoluntario(compromissos, time.monotonic() + self.ttl)
+        with self._lock:
+            self.carregamentos += 1
+            self._descartar(voluntario_id)
+            self._agendas[voluntario_id] = agenda
+            self._indexar(voluntario_id, compromissos)
+            while len(self._agendas) > self.max_voluntarios:
+                antigo, agenda_antiga = self._agendas.popitem(last=False)
+                self._desindexar(antigo, agenda_antiga)
+            return agenda.indice()
+
+    def conflitos(self, voluntario_id, candidato, carregar, recarregar=False):
+        """
+        Compromissos do voluntário que conflitam com o candidato (outra oportunidade).
+        Com `recarregar`, a agenda vem do `carregar` mesmo que esteja no cache (que pode não
+        ter inscrições de outros processos): é o que a inscrição usa, dentro da transação.
+        """
+        if candidato is None or candidato.minuto_inicio is None:
+            return []
+        arvore = self._indice(voluntario_id, carregar, recarregar)
+        encontrados = [
+            c for c in arvore.sobrepostos(candidato.inicio, candidato.fim_efetivo)
+            if c.oportunidade_id != candidato.oportunidade_id and conflitam(candidato, c)
+        ]
+        if encontrados:
+            with self._lock:
+                self.conflitos_detectados += 1
+        return encontrados
+
+    def no_periodo(self, voluntario_id, de, ate, carregar):
+        """
+        Itens da agenda que tocam [de, ate] (datas; None = sem limite), em ordem cronológica,
+        cada um com as oportunidades da agenda com que conflita.
+        """
+        arvore = self._indice(voluntario_id, carregar)
+        de = de.toordinal() if de else 0
+        ate = ate.toordinal() if ate else date.max.toordinal() + 1
+        itens = sorted(arvore.sobrepostos(de, ate), key=lambda c: (c.inicio, c.minuto_inicio or 0, c.inscricao_id))
+        return [
+            c.como_dict(
+                outro.oportunidade_id for outro in arvore.sobrepostos(c.inicio, c.fim_efetivo)
+                if outro is not c and conflitam(c, outro)
+            )
+            for c in itens
+        ]
+
+    def registrar(self, voluntario_id, novo):
+        """
+        Inscrição nova (já commitada). Agendas ainda não carregadas ficam para a próxima consulta.
+        """
+        if novo is None:
+            return
+        with self._lock:
+            agenda = self._agendas.get(voluntario_id)
+            if agenda is None:
+                return
+            agenda.compromissos[novo.inscricao_id] = novo
+            agenda.arvore = None
+            self._indexar(voluntario_id, [novo])
+
+    def invalidar_voluntario(self, voluntario_id):
+        with self._lock:
+            self._descartar(voluntario_id)
+
+    def invalidar_oportunidade(self, oportunidade_id):
+        """
+        Período ou horário da oportunidade mudou (ou ela saiu): as agendas que a contêm são
+        recarregadas na próxima consulta.
+        """
+        with self._lock:
+            for voluntario_id in list(self._por_oportunidade.get(oportunidade_id, ())):
+                self._descartar(voluntario_id)
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "voluntarios": len(self._agendas),
+                "compromissos": sum(len(a.compromissos) for a in self._agendas.values()),
+                "consultas": self.consultas,
+                "carregamentos": self.carregamentos,
+                "conflitos_detectados": self.conflitos_detectados,
+            }
+
+
+def carregar_compromissos(cursor, voluntario_id):
+    cursor.execute(SQL_COMPROMISSOS, (voluntario_id,))
+    return cursor.fetchall()
+
+
+indice_agenda = IndiceAgenda()
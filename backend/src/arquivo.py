@@ -0,0 +1,273 @@
+# backend/src/arquivo.py
+#
+# Arquivamento das linhas frias (migração 0007). Move para oportunidades_arquivo e
+# inscricoes_arquivo:
+#   - oportunidades encerradas cuja data de término (ou de publicação, sem término) passou
+#     há mais de ARQUIVO_IDADE_DIAS, junto com todas as inscrições delas;
+#   - inscrições rejeitadas ou canceladas feitas há mais de ARQUIVO_IDADE_DIAS, mesmo de
+#     oportunidades que continuam nas tabelas quentes (elas não ocupam vaga).
+#
+# O trabalho é feito em lotes de ARQUIVO_LOTE linhas, cada lote numa transação curta
+# (copia, confere a contagem e apaga da tabela quente) em READ COMMITTED, que só trava
+# as linhas do lote. Entre os lotes há uma pausa de ARQUIVO_PAUSA_SEGUNDOS para não
+# disputar o banco com a API nem atrasar as réplicas. Interromper no meio não deixa
+# nada pela metade: um lote ou foi inteiro ou não foi, e a próxima execução continua
+# do que sobrou. Um lock nomeado impede duas execuções ao mesmo tempo.
+#
+# Uso (a partir da pasta backend):
+#   python -m src.arquivo                     # arquiva com ARQUIVO_IDADE_DIAS
+#   python -m src.arquivo --idade-dias 365 --lote 200
+#   python -m src.arquivo --simular           # só conta o que seria arquivado
+# A API também pode rodar o arquivamento sozinha a cada ARQUIVO_INTERVALO_HORAS (padrão 0,
+# desligado); assim os índices em memória e o feed de eventos ficam sabendo na hora.
+# Pela linha de comando, as oportunidades arquivadas somem das respostas em cache depois
+# do TTL, e dos índices de busca e proximidade no próximo restart da API.
+
+import argparse
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import pymysql.cursors
+
+from .database import MYSQL_DATABASE, MYSQL_HOST, MYSQL_PASSWORD, MYSQL_PORT, MYSQL_USER
+from .metrics import ConexaoMedida
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_IDADE_DIAS = int(os.getenv("ARQUIVO_IDADE_DIAS", 180))
+ARQUIVO_LOTE = int(os.getenv("ARQUIVO_LOTE", 500))
+ARQUIVO_PAUSA_SEGUNDOS = float(os.getenv("ARQUIVO_PAUSA_SEGUNDOS", 0.2))
+ARQUIVO_INTERVALO_HORAS = float(os.getenv("ARQUIVO_INTERVALO_HORAS", 0))
+
+NOME_LOCK = "tempo_bem_gasto_arquivo"
+
+COLUNAS_OPORTUNIDADE = (
+    "id, ong_id, titulo, tipo_acao, endereco, perfil_voluntario, descricao, num_vagas, status_vaga, "
+    "data_publicacao, data_inicio, data_termino, hora_inicio, hora_termino, vagas_ocupadas, latitude, longitude, precisao_geo, versao"
+)
+COLUNAS_INSCRICAO = "id, oportunidade_id, voluntario_id, data_inscricao, status_inscricao, mensagem"
+
+# Lotes a arquivar, em ordem de id a partir do último lote; %(desde)s é o id do último lote.
+# As oportunidades usam o índice (status_vaga, id) da migração 0010: o corte por data é
+# conferido linha a linha, sem reordenar as encerradas
+SQL_LOTE_OPORTUNIDADES = """
+    SELECT id FROM oportunidades
+    WHERE status_vaga = 'encerrada' AND id > %(desde)s
+      AND COALESCE(data_termino, DATE(data_publicacao)) < %(corte)s
+    ORDER BY id LIMIT %(lote)s
+"""
+SQL_LOTE_INSCRICOES = """
+    SELECT id FROM inscricoes
+    WHERE status_inscricao IN ('rejeitada', 'cancelada') AND id > %(desde)s
+      AND data_inscricao < %(corte)s
+    ORDER BY id LIMIT %(lote)s
+"""
+
+
+def unir_com_arquivo(ramos, ordem, limite=None):
+    """
+    Junta com UNION ALL as consultas [(sql, valores), ...] das tabelas quentes e de
+    arquivo (sem ORDER BY/LIMIT). Com `limite`, cada lado já vem ordenado e limitado
+    (cada um pelo próprio índice) antes da ordem e do limite finais. `ordem` usa os
+    nomes das colunas do resultado, que valem dentro e fora dos parênteses.
+    """
+    partes, valores = [], []
+    for sql, valores_ramo in ramos:
+        if limite is not None:
+            sql += f" ORDER BY {ordem} LIMIT %s"
+            valores_ramo = [*valores_ramo, limite]
+        partes.append(f"({sql})")
+        valores.extend(valores_ramo)
+    sql = " UNION ALL ".join(partes) + f" ORDER BY {ordem}"
+    if limite is not None:
+        sql += " LIMIT %s"
+        valores.append(limite)
+    return sql, valores
+
+
+def _conectar():
+    """
+    Conexão própria, fora do pool: a variável de sessão @tbg_arquivamento (que faz os
+    triggers do painel ignorarem as exclusões do arquivamento) não pode voltar ao pool.
+    """
+    return ConexaoMedida(
+        host=MYSQL_HOST, port=MYSQL_PORT, user=MYSQL_USER, password=MYSQL_PASSWORD, database=MYSQL_DATABASE,
+        cursorclass=pymysql.cursors.DictCursor,
+    )
+
+
+def _marcadores(ids):
+    return ", ".join(["%s"] * len(ids))
+
+
+def _copiar_e_apagar(cursor, tabela, colunas, condicao, ids):
+    """
+    INSERT ... SELECT no arquivo e DELETE na tabela quente das linhas `condicao` (com
+    os ids como parâmetros). A contagem copiada precisa bater com a apagada.
+    """
+    cursor.execute(
+        f"INSERT INTO {tabela}_arquivo ({colunas}) SELECT {colunas} FROM {tabela} WHERE {condicao}", ids)
+    copiadas = cursor.rowcount
+    cursor.execute(f"DELETE FROM {tabela} WHERE {condicao}", ids)
+    if cursor.rowcount != copiadas:
+        raise RuntimeError(f"{tabela}: {copiadas} linha(s) copiada(s) e {cursor.rowcount} apagada(s)")
+    return copiadas
+
+
+def _arquivar_lote_oportunidades(conn, cursor, ids):
+    marcadores = _marcadores(ids)
+    # Trava as oportunidades (e, pela chave estrangeira, novas inscrições nelas) e as
+    # inscrições atuais, para nenhuma escrita cair entre a cópia e a exclusão
+    cursor.execute(
+        f"SELECT id FROM oportunidades WHERE id IN ({marcadores}) AND status_vaga = 'encerrada' FOR UPDATE", ids)
+    ids = tuple(linha["id"] for linha in cursor.fetchall()) # Alguma pode ter sido reaberta
+    if not ids:
+        conn.rollback()
+        return (), 0
+    marcadores = _marcadores(ids)
+    cursor.execute(f"SELECT id FROM inscricoes WHERE oportunidade_id IN ({marcadores}) FOR UPDATE", ids)
+    inscricoes = _copiar_e_apagar(cursor, "inscricoes", COLUNAS_INSCRICAO, f"oportunidade_id IN ({marcadores})", ids)
+    _copiar_e_apagar(cursor, "oportunidades", COLUNAS_OPORTUNIDADE, f"id IN ({marcadores})", ids)
+    conn.commit()
+    return ids, inscricoes
+
+
+def _arquivar_lote_inscricoes(conn, cursor, ids):
+    marcadores = _marcadores(ids)
+    cursor.execute(
+        f"SELECT id FROM inscricoes WHERE id IN ({marcadores}) "
+        "AND status_inscricao IN ('rejeitada', 'cancelada') FOR UPDATE", ids)
+    ids = tuple(linha["id"] for linha in cursor.fetchall()) # Alguma pode ter sido reativada
+    if not ids:
+        conn.rollback()
+        return 0
+    copiadas = _copiar_e_apagar(cursor, "inscricoes", COLUNAS_INSCRICAO, f"id IN ({_marcadores(ids)})", ids)
+    conn.commit()
+    return copiadas
+
+
+def _lotes(conn, cursor, sql_lote, corte, lote, pausa, parar):
+    """
+    Ids de cada lote, em ordem crescente, continuando do último id do lote anterior.
+    """
+    desde = 0
+    while not (parar and parar.is_set()):
+        cursor.execute(sql_lote, {"desde": desde, "corte": corte, "lote": lote})
+        ids = tuple(linha["id"] for linha in cursor.fetchall())
+        conn.commit() # A leitura do lote não segura nada até o próximo
+        if not ids:
+            return
+        yield ids
+        desde = ids[-1]
+        if pausa:
+            time.sleep(pausa)
+
+
+def arquivar(idade_dias=ARQUIVO_IDADE_DIAS, lote=ARQUIVO_LOTE, pausa=ARQUIVO_PAUSA_SEGUNDOS,
+             simular=False, ao_arquivar=None, parar=None):
+    """
+    Arquiva o que passou de `idade_dias`. `ao_arquivar(ids)` é chamado depois do commit
+    de cada lote de oportunidades (para a API atualizar cache e índices em memória);
+    `parar` (threading.Event) interrompe entre um lote e outro.
+    Retorna as contagens, ou None se outra execução já estava rodando.
+    """
+    corte = date.today() - timedelta(days=idade_dias)
+    resultado = {"oportunidades": 0, "inscricoes_das_oportunidades": 0, "inscricoes_antigas": 0, "lotes": 0}
+    conn = _conectar()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, 0) AS obtido", (NOME_LOCK,))
+            if not cursor.fetchone()["obtido"]:
+                logger.info("Arquivamento já em andamento em outro processo")
+                return None
+            try:
+                if simular:
+                    return _contar(cursor, corte)
+                cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+                cursor.execute("SET @tbg_arquivamento = 1")
+                for ids in _lotes(conn, cursor, SQL_LOTE_OPORTUNIDADES, corte, lote, pausa, parar):
+                    arquivadas, inscricoes = _arquivar_lote_oportunidades(conn, cursor, ids)
+                    resultado["oportunidades"] += len(arquivadas)
+                    resultado["inscricoes_das_oportunidades"] += inscricoes
+                    resultado["lotes"] += 1
+                    if arquivadas and ao_arquivar:
+                        ao_arquivar(arquivadas)
+                corte_inscricoes = datetime.combine(corte, datetime.min.time())
+                for ids in _lotes(conn, cursor, SQL_LOTE_INSCRICOES, corte_inscricoes, lote, pausa, parar):
+                    resultado["inscricoes_antigas"] += _arquivar_lote_inscricoes(conn, cursor, ids)
+                    resultado["lotes"] += 1
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (NOME_LOCK,))
+        logger.info("Arquivamento concluído: %s", resultado)
+        return resultado
+    finally:
+        conn.close()
+
+
+def _contar(cursor, corte):
+    cursor.execute("""
+        SELECT COUNT(*) AS oportunidades FROM oportunidades o
+        WHERE o.status_vaga = 'encerrada' AND COALESCE(o.data_termino, DATE(o.data_publicacao)) < %s
+    """, (corte,))
+    oportunidades = cursor.fetchone()["oportunidades"]
+    cursor.execute("""
+        SELECT COUNT(*) AS total FROM inscricoes i
+        JOIN oportunidades o ON o.id = i.oportunidade_id
+        WHERE o.status_vaga = 'encerrada' AND COALESCE(o.data_termino, DATE(o.data_publicacao)) < %s
+    """, (corte,))
+    das_oportunidades = cursor.fetchone()["total"]
+    cursor.execute(
+        "SELECT COUNT(*) AS total FROM inscricoes WHERE status_inscricao IN ('rejeitada', 'cancelada') "
+        "AND data_inscricao < %s", (datetime.combine(corte, datetime.min.time()),))
+    return {"oportunidades": oportunidades, "inscricoes_das_oportunidades": das_oportunidades,
+            "inscricoes_antigas": cursor.fetchone()["total"], "lotes": 0}
+
+
+# ---------------------------------------------------------------------
+# Agendamento dentro da API (ARQUIVO_INTERVALO_HORAS > 0)
+# ---------------------------------------------------------------------
+_agendamento = None
+_parar_agendamento = threading.Event()
+
+
+def iniciar_agendamento(ao_arquivar=None, intervalo_horas=ARQUIVO_INTERVALO_HORAS):
+    global _agendamento
+    if intervalo_horas <= 0 or _agendamento is not None:
+        return
+
+    def executar():
+        # A primeira execução espera um intervalo: o startup não disputa o banco com ela
+        while not _parar_agendamento.wait(intervalo_horas * 3600):
+            try:
+                arquivar(ao_arquivar=ao_arquivar, parar=_parar_agendamento)
+            except Exception:
+                logger.exception("Erro no arquivamento agendado")
+
+    _agendamento = threading.Thread(target=executar, name="arquivamento", daemon=True)
+    _agendamento.start()
+
+
+def parar_agendamento():
+    _parar_agendamento.set()
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logs
+    configurar_logs()
+    parser = argparse.ArgumentParser(description="Arquiva oportunidades encerradas e inscrições antigas")
+    parser.add_argument("--idade-dias", type=int, default=ARQUIVO_IDADE_DIAS)
+    parser.add_argument("--lote", type=int, default=ARQUIVO_LOTE)
+    parser.add_argument("--pausa", type=float, default=ARQUIVO_PAUSA_SEGUNDOS, help="segundos entre lotes")
+    parser.add_argument("--simular", action="store_true", help="só conta o que seria arquivado")
+    args = parser.parse_args()
+    resultado = arquivar(args.idade_dias, args.lote, args.pausa, simular=args.simular)
+    if resultado is None:
+        print("Outro arquivamento está em andamento; nada foi feito")
+    else:
+        print(f"{'Seriam arquivadas' if args.simular else 'Arquivadas'}: {resultado}")
@@ -0,0 +1,179 @@
+# backend/src/cache.py
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import Response, status
+
+from .compressao import COMPRESSAO_MINIMO_BYTES, comprimir, escolher_codificacao
+
+CACHE_TTL_SEGUNDOS = float(os.getenv("CACHE_TTL_SEGUNDOS", 30))
+CACHE_MAX_ENTRADAS = int(os.getenv("CACHE_MAX_ENTRADAS", 256))
+
+
+class EntradaCache:
+    """
+    Resposta já serializada: corpo JSON em bytes, ETag forte e headers extras.
+    As versões comprimidas (gzip/br) são geradas no primeiro pedido de cada
+    codificação e reaproveitadas enquanto a entrada viver. Com `versao`, o ETag
+    começa pela versão da linha ("v3-...") e serve de If-Match nas edições.
+    """
+
+    __slots__ = ("corpo", "etag", "headers", "expira_em", "comprimidos")
+
+    def __init__(self, corpo, headers, expira_em, versao=None):
+        self.corpo = corpo
+        prefixo = f"v{versao}-" if versao is not None else ""
+        self.etag = '"' + prefixo + hashlib.blake2b(corpo, digest_size=16).hexdigest() + '"'
+        self.headers = headers
+        self.expira_em = expira_em
+        self.comprimidos = {}
+
+    def corpo_comprimido(self, codificacao):
+        # Corrida benigna: duas threads podem comprimir ao mesmo tempo; o resultado é igual
+        comprimido = self.comprimidos.get(codificacao)
+        if comprimido is None:
+            comprimido = self.comprimidos[codificacao] = comprimir(self.corpo, codificacao)
+        return comprimido
+
+
+class CacheRespostas:
+    """
+    Cache LRU com TTL, em memória e thread-safe, para respostas serializadas.
+
+    Cada invalidação incrementa `geracao`. Uma leitura que começou antes da
+    invalidação passa a geração que viu para guardar(); se ela mudou no meio do
+    caminho, o resultado (possivelmente desatualizado) não é armazenado.
+    """
+
+    def __init__(self, ttl=CACHE_TTL_SEGUNDOS, max_entradas=CACHE_MAX_ENTRADAS):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.geracao = 0
+        self.invalidada_em = float("-inf") # time.monotonic() da última invalidação
+        self.acertos = 0
+        self.falhas = 0
+        self.expiradas = 0
+        self.despejadas = 0
+        self.invalidacoes = 0
+
+    def obter(self, chave):
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is None:
+                self.falhas += 1
+                return None
+            if entrada.expira_em <= time.monotonic():
+                del self._entradas[chave]
+                self.expiradas += 1
+                self.falhas += 1
+                return None
+            self._entradas.move_to_end(chave)
+            self.acertos += 1
+            return entrada
+
+    def guardar(self, chave, corpo, headers=None, geracao=None, versao=None):
+        """
+        Armazena a resposta e devolve a EntradaCache (mesmo quando não armazena).
+        """
+        entrada = EntradaCache(corpo, headers or {}, time.monotonic() + self.ttl, versao)
+        with self._lock:
+            if geracao is not None and geracao != self.geracao:
+                return entrada
+            self._entradas[chave] = entrada
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.despejadas += 1
+        return entrada
+
+    def invalidar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.geracao += 1
+            self.invalidada_em = time.monotonic()
+            self.invalidacoes += 1
+
+    def estatisticas(self):
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "entradas": len(self._entradas),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": round(self.acertos / consultas, 4) if consultas else None,
+                "expiradas": self.expiradas,
+                "despejadas": self.despejadas,
+                "invalidacoes": self.invalidacoes,
+            }
+
+
+def _etag_confere(if_none_match, etag):
+    # Comparação fraca (RFC 9110): ignora o prefixo W/ dos ETags enviados pelo cliente
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidatos = (valor.strip() for valor in if_none_match.split(","))
+    return any(candidato.removeprefix("W/") == etag for candidato in candidatos)
+
+
+def etag_versao(versao):
+    """
+    ETag devolvido pelas edições: só a versão da linha ("v4").
+    """
+    return f'"v{versao}"'
+
+
+def versoes_do_if_match(if_match):
+    """
+    Versões aceitas por um header If-Match: None sem o header (edição incondicional),
+    "*" para qualquer versão, senão a lista de versões dos ETags enviados ("v3" ou o
+    ETag do detalhe, "v3-<hash>"). ETags fora desse formato não conferem com nenhuma.
+    """
+    if if_match is None:
+        return None
+    if if_match.strip() == "*":
+        return "*"
+    versoes = []
+    for valor in if_match.split(","):
+        # O ETag da resposta comprimida vem com W/; a versão é a mesma
+        valor = valor.strip().removeprefix("W/").strip('"')
+        numero = valor[1:].split("-", 1)[0]
+        if valor.startswith("v") and numero.isdigit():
+            versoes.append(int(numero))
+    return versoes
+
+
+def resposta_com_etag(request, entrada):
+    """
+    Monta a resposta HTTP a partir da entrada do cache: 304 sem corpo se o
+    If-None-Match do cliente confere com o ETag, senão 200 com o JSON serializado.
+    """
+    headers = {
+        **entrada.headers,
+        "ETag": entrada.etag,
+        # O navegador guarda a resposta, mas revalida com If-None-Match a cada uso
+        "Cache-Control": "no-cache",
+    }
+    if _etag_confere(request.headers.get("if-none-match"), entrada.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    codificacao = None
+    if len(entrada.corpo) >= COMPRESSAO_MINIMO_BYTES:
+        codificacao = escolher_codificacao(request.headers.get("accept-encoding", ""))
+    if codificacao:
+        # Já comprimido aqui: o MiddlewareCompressao vê o Content-Encoding e não mexe
+        headers.update({"Content-Encoding": codificacao, "Vary": "Accept-Encoding", "ETag": "W/" + entrada.etag})
+        return Response(content=entrada.corpo_comprimido(codificacao), media_type="application/json", headers=headers)
+    return Response(content=entrada.corpo, media_type="application/json", headers=headers)
+
+
+# Cache do processo para as leituras de oportunidades (lista e detalhe)
+cache_oportunidades = CacheRespostas()
@@ -0,0 +1,95 @@
+# backend/src/carregadores.py
+#
+# Carregadores por requisição: juntam as buscas de entidades relacionadas numa
+# única consulta `WHERE id IN (...)` e guardam o resultado enquanto a requisição
+# durar. Substituem o JOIN repetido por linha (o mesmo nome de ONG vindo N vezes)
+# e as N consultas de quem resolve uma entidade de cada vez.
+#
+# Também ficam aqui as listas de colunas e a carga em lote que mais de um roteador usa,
+# para que as respostas da mesma entidade tragam os mesmos campos em todas as rotas.
+
+from .datas import formatar_oportunidade
+from .pagination import na_ordem_dos_ids
+from .serializacao import CAMPOS_OPORTUNIDADE
+
+
+
+class CarregadorOngs:
+    """
+    Nomes de ONGs por id, buscados em lote no cursor da requisição.
+    Cada id é buscado no máximo uma vez por instância.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._nomes = {}
+
+    def nomes(self, ong_ids):
+        faltam = [ong_id for ong_id in dict.fromkeys(ong_ids) if ong_id not in self._nomes]
+        if faltam:
+            marcadores = ", ".join(["%s"] * len(faltam))
+            self._cursor.execute(f"SELECT id, nome FROM ongs WHERE id IN ({marcadores})", tuple(faltam))
+            for linha in self._cursor.fetchall():
+                self._nomes[linha["id"]] = linha["nome"]
+            for ong_id in faltam:
+                self._nomes.setdefault(ong_id, None) # Inexistente: não busca de novo
+        return self._nomes
+
+    def preencher(self, linhas, campo="ong_nome"):
+        """
+        Grava `campo` (nome da ONG) em cada linha a partir do seu ong_id. Devolve as linhas.
+        """
+        nomes = self.nomes(linha["ong_id"] for linha in linhas)
+        for linha in linhas:
+            linha[campo] = nomes.get(linha["ong_id"])
+        return linhas
+
+
+# Expressão SQL de cada campo da resposta das oportunidades (projeção com ?campos=)
+COLUNAS_LISTAGEM = {
+    "id": "o.id",
+    "titulo": "o.titulo",
+    "descricao": "o.descricao",
+    "ong_nome": "ongs.nome AS ong_nome", # Obtém o nome da ONG da tabela 'ongs'
+    "endereco": "o.endereco",
+    "data_inicio": "o.data_inicio",
+    "data_termino": "o.data_termino",
+    "hora_inicio": "o.hora_inicio",
+    "hora_termino": "o.hora_termino",
+    "perfil_voluntario": "o.perfil_voluntario",
+    "num_vagas": "o.num_vagas",
+    "status_vaga": "o.status_vaga",
+    "tipo_acao": "o.tipo_acao",
+    "data_publicacao": "o.data_publicacao",
+    "versao": "o.versao",
+}
+
+# Colunas de voluntário que saem da API (listagem, detalhe, lote e exportação): a senha nunca sai
+COLUNAS_VOLUNTARIOS = [
+    "id", "nome", "email", "telefone", "endereco", "data_nascimento", "cpf",
+    "interesses", "disponibilidade", "data_cadastro",
+]
+
+
+def carregar_oportunidades(cursor, ids, campos=CAMPOS_OPORTUNIDADE, carregador=None, incluir_arquivo=False):
+    """
+    Oportunidades com os ids dados, na ordem pedida, com um único `WHERE id IN (...)`.
+    O nome da ONG vem do carregador da requisição (uma consulta para todas as ONGs
+    distintas) em vez de um JOIN que repete o mesmo nome em cada linha.
+    Com `incluir_arquivo`, os ids que não estão na tabela quente são buscados no arquivo.
+    """
+    selecionados = [campo for campo in dict.fromkeys(("id", *campos)) if campo != "ong_nome"]
+    colunas = ", ".join(COLUNAS_LISTAGEM[campo] for campo in selecionados)
+    marcadores = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"SELECT {colunas}, o.ong_id FROM oportunidades o WHERE o.id IN ({marcadores})", tuple(ids))
+    encontradas = cursor.fetchall()
+    faltando = set(ids) - {linha["id"] for linha in encontradas} if incluir_arquivo else None
+    if faltando:
+        marcadores = ", ".join(["%s"] * len(faltando))
+        cursor.execute(f"SELECT {colunas}, o.ong_id FROM oportunidades_arquivo o WHERE o.id IN ({marcadores})",
+                       tuple(faltando))
+        encontradas = [*encontradas, *cursor.fetchall()]
+    linhas = na_ordem_dos_ids(encontradas, ids)
+    if "ong_nome" in campos:
+        (carregador or CarregadorOngs(cursor)).preencher(linhas)
+    return [formatar_oportunidade(linha) for linha in linhas]
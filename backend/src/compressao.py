@@ -0,0 +1,158 @@
+# backend/src/compressao.py
+#
+# Compressão das respostas (gzip e, se o pacote `brotli` estiver instalado, br)
+# conforme o Accept-Encoding do cliente. Respostas pequenas vão sem compressão:
+# abaixo de COMPRESSAO_MINIMO_BYTES o ganho não paga a CPU. Eventos SSE
+# (text/event-stream) nunca são comprimidos, para cada evento chegar na hora.
+#   COMPRESSAO_MINIMO_BYTES (padrão 1024), COMPRESSAO_NIVEL_GZIP (padrão 5),
+#   COMPRESSAO_QUALIDADE_BROTLI (padrão 4)
+
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError: # Dependência opcional: sem ela só gzip é oferecido
+    brotli = None
+
+COMPRESSAO_MINIMO_BYTES = int(os.getenv("COMPRESSAO_MINIMO_BYTES", 1024))
+COMPRESSAO_NIVEL_GZIP = int(os.getenv("COMPRESSAO_NIVEL_GZIP", 5))
+COMPRESSAO_QUALIDADE_BROTLI = int(os.getenv("COMPRESSAO_QUALIDADE_BROTLI", 4))
+
+# Tipos que não ganham nada (já comprimidos) ou não podem ser bufferizados
+TIPOS_SEM_COMPRESSAO = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+def escolher_codificacao(accept_encoding):
+    """
+    'br' ou 'gzip' conforme o Accept-Encoding (respeitando q=0), ou None.
+    """
+    aceitas = {}
+    for parte in accept_encoding.lower().split(","):
+        nome, _, parametros = parte.strip().partition(";")
+        qualidade = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                qualidade = float(parametros[2:])
+            except ValueError:
+                qualidade = 0.0
+        if nome:
+            aceitas[nome] = qualidade
+    curinga = aceitas.get("*", 0.0)
+    for codificacao in (("br", "gzip") if brotli is not None else ("gzip",)):
+        if aceitas.get(codificacao, curinga) > 0:
+            return codificacao
+    return None
+
+
+class _Compressor:
+    def __init__(self, codificacao):
+        if codificacao == "br":
+            self._objeto = brotli.Compressor(quality=COMPRESSAO_QUALIDADE_BROTLI)
+            self._comprimir = self._objeto.process
+            self._finalizar = self._objeto.finish
+        else:
+            self._objeto = zlib.compressobj(COMPRESSAO_NIVEL_GZIP, zlib.DEFLATED, 31) # wbits 31: formato gzip
+            self._comprimir = self._objeto.compress
+            self._finalizar = self._objeto.flush
+
+    def comprimir(self, dados):
+        return self._comprimir(dados)
+
+    def finalizar(self):
+        return self._finalizar()
+
+
+def comprimir(corpo, codificacao):
+    """
+    Corpo inteiro comprimido de uma vez (usado também pelo cache de respostas).
+    """
+    compressor = _Compressor(codificacao)
+    return compressor.comprimir(corpo) + compressor.finalizar()
+
+
+class MiddlewareCompressao:
+    """
+    Middleware ASGI. Respostas de um pedaço só são comprimidas de uma vez se passarem
+    do limite; respostas em streaming (ex.: exportação CSV) são comprimidas pedaço a pedaço.
+    """
+
+    def __init__(self, app, minimo=COMPRESSAO_MINIMO_BYTES):
+        self.app = app
+        self.minimo = minimo
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        accept_encoding = ""
+        for nome, valor in scope["headers"]:
+            if nome == b"accept-encoding":
+                accept_encoding = valor.decode("latin-1")
+                break
+        codificacao = escolher_codificacao(accept_encoding) if accept_encoding else None
+        if codificacao is None:
+            return await self.app(scope, receive, send)
+
+        inicio = None # Mensagem http.response.start retida até sabermos se vamos comprimir
+        compressor = None
+        repassar = False
+
+        async def send_comprimido(mensagem):
+            nonlocal inicio, compressor, repassar
+            if repassar:
+                return await send(mensagem)
+            if mensagem["type"] == "http.response.start":
+                headers = {nome.lower(): valor for nome, valor in mensagem.get("headers", [])}
+                tipo = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or tipo.startswith(TIPOS_SEM_COMPRESSAO):
+                    repassar = True
+                    return await send(mensagem)
+                inicio = mensagem
+                return
+            if mensagem["type"] != "http.response.body":
+                return await send(mensagem)
+
+            corpo = mensagem.get("body", b"")
+            mais = mensagem.get("more_body", False)
+            if compressor is None:
+                if not mais:
+                    if len(corpo) < self.minimo:
+                        # Pequena demais (ou 204/304 sem corpo): segue como está
+                        repassar = True
+                        await send(inicio)
+                        return await send(mensagem)
+                    # Corpo inteiro de uma vez: comprime e envia com o Content-Length novo
+                    compressor = True
+                    dados = comprimir(corpo, codificacao)
+                    await send(self._inicio_comprimido(inicio, codificacao, len(dados)))
+                    return await send({"type": "http.response.body", "body": dados})
+                compressor = _Compressor(codificacao)
+                await send(self._inicio_comprimido(inicio, codificacao, None))
+            dados = compressor.comprimir(corpo)
+            if not mais:
+                dados += compressor.finalizar()
+            await send({"type": "http.response.body", "body": dados, "more_body": mais})
+
+        await self.app(scope, receive, send_comprimido)
+
+    @staticmethod
+    def _inicio_comprimido(inicio, codificacao, tamanho):
+        headers = []
+        for nome, valor in inicio.get("headers", []):
+            nome_minusculo = nome.lower()
+            if nome_minusculo == b"content-length":
+                continue # O tamanho muda (em streaming, vai como chunked)
+            if nome_minusculo == b"etag" and not valor.startswith(b"W/"):
+                # A representação comprimida não é byte a byte a mesma: ETag passa a ser fraco
+                # (o If-None-Match continua conferindo, ver cache._etag_confere)
+                valor = b"W/" + valor
+            if nome_minusculo == b"vary":
+                continue
+            headers.append((nome, valor))
+        vary = [valor for nome, valor in inicio.get("headers", []) if nome.lower() == b"vary"]
+        headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+        headers.append((b"content-encoding", codificacao.encode("ascii")))
+        if tamanho is not None:
+            headers.append((b"content-length", str(tamanho).encode("ascii")))
+        return {**inicio, "headers": headers}
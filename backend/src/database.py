@@ -1,13 +1,20 @@
 # backend/src/database.py
 
 import os
+import asyncio
+import contextvars
+import logging
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pymysql
 import pymysql.cursors
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from .pool import ConnectionPool
+from .metrics import ConexaoMedida
 # from dotenv import load_dotenv # Comentado, conforme sua versão
 
+logger = logging.getLogger(__name__)
+
 # Definição das variáveis de ambiente do MySQL
 MYSQL_HOST = os.getenv("MYSQL_HOST")
 MYSQL_USER = os.getenv("MYSQL_USER")
@@ -16,42 +23,147 @@ MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
 # Certifique-se de que a porta aqui é 3306 para a conexão INTERNA
 MYSQL_PORT = int(os.getenv("MYSQL_PORT", 3306)) # Mude o default para 3306
 
+# Configuração do pool de conexões PyMySQL (usado por get_connection)
+MYSQL_POOL_MIN_SIZE = int(os.getenv("MYSQL_POOL_MIN_SIZE", 1))
+MYSQL_POOL_MAX_SIZE = int(os.getenv("MYSQL_POOL_MAX_SIZE", 10))
+MYSQL_POOL_RECYCLE = int(os.getenv("MYSQL_POOL_RECYCLE", 1800)) # Segundos; menor que o wait_timeout do MySQL
+MYSQL_POOL_PRE_PING = os.getenv("MYSQL_POOL_PRE_PING", "1") not in ("0", "false", "False")
+MYSQL_POOL_TIMEOUT = float(os.getenv("MYSQL_POOL_TIMEOUT", 10)) # Segundos esperando uma conexão livre
+
 # ---------------------------------------------------------------------
-# Configuração do SQLAlchemy
+# Configuração do SQLAlchemy (preguiçosa)
 # ---------------------------------------------------------------------
+# As rotas usam PyMySQL direto; o SQLAlchemy só é importado (cerca de 250 ms) e o
+# engine só é criado quando alguém acessa engine, SessionLocal, Base ou get_db().
+# Os nomes continuam importáveis: `from src.database import engine` dispara a criação.
 SQLALCHEMY_DATABASE_URL = (
     f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@"
     f"{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
 )
 
-# Cria o motor de banco de dados
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+_sqlalchemy = {}
+_sqlalchemy_lock = threading.Lock()
+
+def _objetos_sqlalchemy():
+    if not _sqlalchemy:
+        with _sqlalchemy_lock:
+            if not _sqlalchemy:
+                from sqlalchemy import create_engine
+                from sqlalchemy.orm import declarative_base, sessionmaker
+
+                engine = create_engine(SQLALCHEMY_DATABASE_URL) # Cria o motor de banco de dados
+                _sqlalchemy.update(
+                    engine=engine,
+                    # Configura a sessão de banco de dados
+                    SessionLocal=sessionmaker(autocommit=False, autoflush=False, bind=engine),
+                    # Base declarativa para seus modelos
+                    Base=declarative_base(),
+                )
+    return _sqlalchemy
+
+def __getattr__(nome):
+    # PEP 562: engine, SessionLocal e Base são criados no primeiro acesso
+    if nome in ("engine", "SessionLocal", "Base"):
+        return _objetos_sqlalchemy()[nome]
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+# ---------------------------------------------------------------------
+# Pool de conexões PyMySQL
+# ---------------------------------------------------------------------
+_pool = None
+_pool_lock = threading.Lock()
 
-# Configura a sessão de banco de dados
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def get_pool():
+    """
+    Retorna o pool de conexões do processo, criando-o na primeira chamada.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    dict(
+                        host=MYSQL_HOST,
+                        port=MYSQL_PORT,
+                        user=MYSQL_USER,
+                        password=MYSQL_PASSWORD,
+                        database=MYSQL_DATABASE,
+                        cursorclass=pymysql.cursors.DictCursor,
+                    ),
+                    min_size=MYSQL_POOL_MIN_SIZE,
+                    max_size=MYSQL_POOL_MAX_SIZE,
+                    recycle=MYSQL_POOL_RECYCLE,
+                    pre_ping=MYSQL_POOL_PRE_PING,
+                    timeout=MYSQL_POOL_TIMEOUT,
+                    connect=ConexaoMedida, # Mede o tempo de cada statement (src/metrics.py)
+                )
+    return _pool
 
-# Base declarativa para seus modelos
-Base = declarative_base()
+def pool_stats():
+    """
+    Estatísticas do pool (tamanho, ociosas, misses, tempo de espera...).
+    """
+    if _pool is None:
+        return None
+    return _pool.stats()
 
-# Função para obter uma conexão PyMySQL direta (se ainda usa em algum lugar)
+# Função para obter uma conexão PyMySQL do pool.
+# conn.close() devolve a conexão ao pool em vez de fechar o socket.
 def get_connection():
     try:
-        conn = pymysql.connect(
-            host=MYSQL_HOST,
-            port=MYSQL_PORT, # Use a variável já definida
-            user=MYSQL_USER,
-            password=MYSQL_PASSWORD,
-            database=MYSQL_DATABASE,
-            cursorclass=pymysql.cursors.DictCursor
-        )
-        return conn
+        return get_pool().acquire()
     except Exception as e:
-        print(f"Erro ao conectar ao banco de dados (get_connection): {e}")
+        logger.error("Erro ao conectar ao banco de dados (get_connection): %s", e)
         raise e
 
+# ---------------------------------------------------------------------
+# Executor dedicado ao banco de dados
+# ---------------------------------------------------------------------
+# O PyMySQL é bloqueante. As rotas são `async def`, então todo acesso ao banco
+# passa por run_db(), que executa a função num pool de threads limitado e libera
+# o event loop para atender outras requisições enquanto a query roda.
+# O executor tem o mesmo tamanho do pool de conexões: cada thread sempre
+# consegue uma conexão sem disputar o pool com as demais.
+MYSQL_EXECUTOR_WORKERS = int(os.getenv("MYSQL_EXECUTOR_WORKERS", MYSQL_POOL_MAX_SIZE))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MYSQL_EXECUTOR_WORKERS,
+                    thread_name_prefix="db",
+                )
+    return _executor
+
+async def run_db(func, *args, **kwargs):
+    """
+    Executa `func(*args, **kwargs)` (código síncrono com PyMySQL) no executor
+    do banco e aguarda o resultado sem bloquear o event loop.
+    """
+    loop = asyncio.get_running_loop()
+    # Copia o contexto da requisição (contextvars) para a thread, como asyncio.to_thread
+    contexto = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(contexto.run, func, *args, **kwargs))
+
+def shutdown_db():
+    """
+    Encerra o executor e fecha as conexões ociosas do pool (evento de shutdown).
+    """
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+    if _pool is not None:
+        _pool.close()
+
 # Função para obter uma sessão do SQLAlchemy (para uso com dependências no FastAPI)
 def get_db():
-    db = SessionLocal()
+    db = _objetos_sqlalchemy()["SessionLocal"]()
     try:
         yield db
     finally:
@@ -0,0 +1,77 @@
+# backend/src/datas.py
+
+from datetime import date, datetime, time, timedelta
+
+# A API continua trocando datas como "DD/MM/AAAA" e horas como "HH:MM";
+# no banco elas são DATE e TIME (migração 0003). Este módulo faz a conversão.
+FORMATO_DATA = "%d/%m/%Y"
+FORMATO_HORA = "%H:%M"
+
+CAMPOS_DATA = ("data_inicio", "data_termino")
+CAMPOS_HORA = ("hora_inicio", "hora_termino")
+
+
+def texto_para_data(texto):
+    """
+    "31/12/2025" -> date(2025, 12, 31). Vazio ou None -> None. Formato inválido -> ValueError.
+    """
+    if texto is None or texto == "":
+        return None
+    if isinstance(texto, date):
+        return texto
+    return datetime.strptime(texto, FORMATO_DATA).date()
+
+
+def texto_para_hora(texto):
+    """
+    "09:30" -> time(9, 30). Vazio ou None -> None. Formato inválido -> ValueError.
+    """
+    if texto is None or texto == "":
+        return None
+    if isinstance(texto, time):
+        return texto
+    return datetime.strptime(texto, FORMATO_HORA).time()
+
+
+def formatar_data(valor):
+    if isinstance(valor, date):
+        return valor.strftime(FORMATO_DATA)
+    return valor
+
+
+def formatar_hora(valor):
+    # O PyMySQL devolve colunas TIME como timedelta
+    if isinstance(valor, timedelta):
+        minutos = int(valor.total_seconds()) // 60
+        return f"{minutos // 60:02d}:{minutos % 60:02d}"
+    if isinstance(valor, time):
+        return valor.strftime(FORMATO_HORA)
+    return valor
+
+
+def formatar_oportunidade(linha):
+    """
+    Converte, no próprio dict, as colunas DATE/TIME de uma linha de oportunidade
+    para o formato de texto da API. Devolve a mesma linha.
+    """
+    for campo in CAMPOS_DATA:
+        if campo in linha:
+            linha[campo] = formatar_data(linha[campo])
+    for campo in CAMPOS_HORA:
+        if campo in linha:
+            linha[campo] = formatar_hora(linha[campo])
+    return linha
+
+
+def parametros_oportunidade(campos):
+    """
+    Converte os campos de data/hora de um dict vindo da API para gravação no banco.
+    """
+    convertidos = dict(campos)
+    for campo in CAMPOS_DATA:
+        if campo in convertidos:
+            convertidos[campo] = texto_para_data(convertidos[campo])
+    for campo in CAMPOS_HORA:
+        if campo in convertidos:
+            convertidos[campo] = texto_para_hora(convertidos[campo])
+    return convertidos
@@ -0,0 +1,203 @@
+# backend/src/eventos.py
+#
+# Feed de mudanças das oportunidades (GET /api/oportunidades/eventos, Server-Sent Events).
+# Os endpoints de escrita publicam deltas compactos (criada/atualizada/removida) depois
+# do commit e o broker do processo distribui cada evento para os clientes conectados,
+# que aplicam a mudança na lista que já têm em vez de buscá-la inteira de novo.
+#
+# - Cada evento recebe um número de sequência crescente; o id SSE é "<fluxo>:<seq>",
+#   onde `fluxo` identifica esta instância do processo (a sequência recomeça no restart).
+# - Os últimos EVENTOS_HISTORICO eventos ficam guardados: o cliente que reconecta com
+#   Last-Event-ID (o EventSource do navegador envia sozinho) recebe o que perdeu. Se o id
+#   for de outro fluxo ou já tiver saído do histórico, recebe `reset` e recarrega a lista.
+# - Cada cliente tem um buffer limitado (EVENTOS_BUFFER_CLIENTE). O cliente lento que deixa
+#   o buffer encher tem a conexão encerrada em vez de segurar memória do processo; o
+#   EventSource reconecta com o último id recebido e retoma do histórico.
+# - O quadro SSE de cada evento é montado uma vez na publicação e compartilhado por todos.
+#   EVENTOS_HISTORICO (padrão 1000), EVENTOS_BUFFER_CLIENTE (padrão 256),
+#   EVENTOS_MAX_ASSINANTES (padrão 1000), EVENTOS_HEARTBEAT_SEGUNDOS (padrão 15)
+
+import asyncio
+import os
+import threading
+import uuid
+from collections import deque
+
+from .serializacao import dumps
+
+EVENTOS_HISTORICO = int(os.getenv("EVENTOS_HISTORICO", 1000))
+EVENTOS_BUFFER_CLIENTE = int(os.getenv("EVENTOS_BUFFER_CLIENTE", 256))
+EVENTOS_MAX_ASSINANTES = int(os.getenv("EVENTOS_MAX_ASSINANTES", 1000))
+EVENTOS_HEARTBEAT_SEGUNDOS = float(os.getenv("EVENTOS_HEARTBEAT_SEGUNDOS", 15))
+EVENTOS_RETRY_MS = 2000 # Espera sugerida ao EventSource antes de reconectar
+
+# Mudança cujo conteúdo não foi publicado (ninguém ouvindo no momento): quem retomar
+# a partir de antes dela precisa recarregar a lista
+RESET = "reset"
+
+TRANSBORDO = object() # Colocado na fila quando o buffer do cliente estoura
+
+HEADERS_SSE = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no", # Sem buffer no nginx: cada evento sai na hora
+}
+
+
+class Evento:
+    __slots__ = ("seq", "tipo", "quadro")
+
+    def __init__(self, seq, tipo, quadro):
+        self.seq = seq
+        self.tipo = tipo
+        self.quadro = quadro
+
+
+def _quadro(id_evento, tipo, dados):
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (id_evento.encode(), tipo.encode(), dumps(dados))
+
+
+class Assinatura:
+    """
+    Um cliente conectado. A fila pertence ao event loop do cliente; as publicações
+    vêm das threads do executor do banco e chegam por call_soon_threadsafe.
+    """
+
+    def __init__(self, loop, tamanho_buffer, seq_inicial):
+        self.loop = loop
+        self.fila = asyncio.Queue(tamanho_buffer)
+        self.seq_inicial = seq_inicial
+        self.transbordou = False
+
+    def _entregar(self, evento):
+        # Executa no event loop do cliente
+        if self.transbordou:
+            return
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.transbordou = True
+            while not self.fila.empty():
+                self.fila.get_nowait()
+            self.fila.put_nowait(TRANSBORDO)
+
+    async def proximo(self, timeout):
+        """
+        Próximo evento, TRANSBORDO se o buffer estourou ou None se nada chegou em `timeout` segundos.
+        """
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BrokerEventos:
+    def __init__(self, historico=EVENTOS_HISTORICO, tamanho_buffer=EVENTOS_BUFFER_CLIENTE,
+                 max_assinantes=EVENTOS_MAX_ASSINANTES):
+        self.fluxo = uuid.uuid4().hex[:12]
+        self.tamanho_buffer = tamanho_buffer
+        self.max_assinantes = max_assinantes
+        self._historico = deque(maxlen=historico)
+        self._assinantes = set()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.publicados = 0
+        self.desconectados_lentos = 0
+
+    @property
+    def tem_assinantes(self):
+        return bool(self._assinantes)
+
+    def _seq_do_id(self, ultimo_id):
+        # "<fluxo>:<seq>" deste processo -> seq; qualquer outra coisa -> None
+        fluxo, _, seq = ultimo_id.partition(":")
+        if fluxo != self.fluxo or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publicar(self, tipo, dados):
+        """
+        Registra o evento e entrega para todos os assinantes. Pode ser chamado de qualquer thread.
+        """
+        with self._lock:
+            self._seq += 1
+            evento = Evento(self._seq, tipo, _quadro(f"{self.fluxo}:{self._seq}", tipo, dados))
+            self._historico.append(evento)
+            self.publicados += 1
+            assinantes = list(self._assinantes)
+        for assinatura in assinantes:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura._entregar, evento)
+            except RuntimeError: # Loop já encerrado (shutdown)
+                pass
+        return evento
+
+    def assinar(self, ultimo_id=None):
+        """
+        Registra um cliente (dentro do event loop). Retorna (assinatura, pendentes):
+        `pendentes` são os eventos do histórico depois de `ultimo_id`, ou None se não dá
+        para retomar (id de outro fluxo ou que já saiu do histórico).
+        Registro e leitura do histórico acontecem sob o mesmo lock, então nenhum evento
+        se perde nem chega duplicado entre o histórico e a fila.
+        Levanta OverflowError se o limite de assinantes foi atingido.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if len(self._assinantes) >= self.max_assinantes:
+                raise OverflowError("Limite de conexões do feed de eventos atingido")
+            pendentes = []
+            if ultimo_id:
+                desde = self._seq_do_id(ultimo_id)
+                mais_antigo = self._historico[0].seq if self._historico else self._seq + 1
+                if desde is None or desde > self._seq or desde < mais_antigo - 1:
+                    pendentes = None
+                else:
+                    pendentes = [evento for evento in self._historico if evento.seq > desde]
+            assinatura = Assinatura(loop, self.tamanho_buffer, self._seq)
+            self._assinantes.add(assinatura)
+        return assinatura, pendentes
+
+    def cancelar(self, assinatura):
+        with self._lock:
+            self._assinantes.discard(assinatura)
+            if assinatura.transbordou:
+                self.desconectados_lentos += 1
+
+    def estatisticas(self):
+        with self._lock:
+            return {
+                "fluxo": self.fluxo,
+                "ultimo_seq": self._seq,
+                "assinantes": len(self._assinantes),
+                "historico": len(self._historico),
+                "publicados": self.publicados,
+                "desconectados_lentos": self.desconectados_lentos,
+            }
+
+    async def transmitir(self, assinatura, pendentes, heartbeat=EVENTOS_HEARTBEAT_SEGUNDOS):
+        """
+        Corpo da resposta SSE de um cliente já registrado com assinar(). Termina quando o
+        cliente desconecta (o StreamingResponse cancela o gerador) ou quando o buffer estoura.
+        """
+        try:
+            yield b"retry: %d\n\n" % EVENTOS_RETRY_MS
+            if pendentes is None:
+                yield _quadro(f"{self.fluxo}:{assinatura.seq_inicial}", RESET, {"motivo": "historico"})
+            else:
+                # Vários resets seguidos no histórico valem por um: só o último importa
+                ultimo_reset = max((i for i, evento in enumerate(pendentes) if evento.tipo == RESET), default=0)
+                for evento in pendentes[ultimo_reset:]:
+                    yield evento.quadro
+            while True:
+                evento = await assinatura.proximo(heartbeat)
+                if evento is None:
+                    yield b": ping\n\n" # Mantém a conexão viva em proxies com timeout de leitura
+                elif evento is TRANSBORDO:
+                    return
+                else:
+                    yield evento.quadro
+        finally:
+            self.cancelar(assinatura)
+
+
+# Broker do processo para as mudanças de oportunidades
+broker_oportunidades = BrokerEventos()
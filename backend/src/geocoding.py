@@ -0,0 +1,229 @@
+# backend/src/geocoding.py
+#
+# Geocodificação dos endereços (texto livre) de oportunidades, ONGs e voluntários.
+# O geocodificador padrão é offline: usa o gazetteer em database/geocodificacao
+# (centroides de municípios) e as faixas de CEP por UF, então a precisão é de
+# município (ou de estado, no pior caso). Outro geocodificador pode ser plugado via
+# GEOCODIFICADOR=modulo:Classe (a classe precisa de um método geocodificar(endereco)).
+#
+# Limitação: o gazetteer só tem as capitais e os maiores municípios (cerca de 90). Um
+# endereço de outra cidade cai no centroide do estado (ex.: "Rua X, 13010-000", um CEP
+# de Campinas fora da faixa da capital, vai para o meio de SP, a centenas de km) e as
+# distâncias de /oportunidades/proximas perdem o sentido. Por isso a precisão é gravada
+# junto com as coordenadas das oportunidades e volta em cada resultado (`precisao`).
+# Para cobrir o país, troque o municipios.csv pela tabela completa do IBGE (mesmas colunas).
+#
+# Uso (a partir da pasta backend):
+#   python -m src.geocoding "Rua X, 100 - Campinas/SP"  # testa um endereço
+#   python -m src.geocoding --preencher                  # geocodifica as linhas sem coordenadas
+
+import csv
+import importlib
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+
+from .search import normalizar
+
+logger = logging.getLogger(__name__)
+
+ARQUIVO_MUNICIPIOS = Path(__file__).resolve().parent.parent / "database" / "geocodificacao" / "municipios.csv"
+
+# Faixas de CEP (5 primeiros dígitos) de cada UF, segundo a divisão dos Correios
+FAIXAS_CEP = (
+    (1000, 19999, "SP"), (20000, 28999, "RJ"), (29000, 29999, "ES"), (30000, 39999, "MG"),
+    (40000, 48999, "BA"), (49000, 49999, "SE"), (50000, 56999, "PE"), (57000, 57999, "AL"),
+    (58000, 58999, "PB"), (59000, 59999, "RN"), (60000, 63999, "CE"), (64000, 64999, "PI"),
+    (65000, 65999, "MA"), (66000, 68899, "PA"), (68900, 68999, "AP"), (69000, 69299, "AM"),
+    (69300, 69399, "RR"), (69400, 69899, "AM"), (69900, 69999, "AC"), (70000, 72799, "DF"),
+    (72800, 72999, "GO"), (73000, 73699, "DF"), (73700, 76799, "GO"), (76800, 76999, "RO"),
+    (77000, 77999, "TO"), (78000, 78899, "MT"), (79000, 79999, "MS"), (80000, 87999, "PR"),
+    (88000, 89999, "SC"), (90000, 99999, "RS"),
+)
+
+# Faixas de CEP das capitais (mais precisas que o centroide do estado)
+FAIXAS_CEP_CAPITAIS = (
+    (1000, 5999, "São Paulo", "SP"), (8000, 8499, "São Paulo", "SP"),
+    (20000, 23799, "Rio de Janeiro", "RJ"), (30000, 31999, "Belo Horizonte", "MG"),
+    (40000, 42599, "Salvador", "BA"), (50000, 52999, "Recife", "PE"),
+    (60000, 61599, "Fortaleza", "CE"), (70000, 72799, "Brasília", "DF"),
+    (80000, 82999, "Curitiba", "PR"), (90000, 91999, "Porto Alegre", "RS"),
+    (69000, 69099, "Manaus", "AM"), (66000, 66999, "Belém", "PA"),
+    (74000, 74899, "Goiânia", "GO"), (88000, 88099, "Florianópolis", "SC"),
+)
+
+# Centroides aproximados das UFs (último recurso)
+CENTROIDES_UF = {
+    "AC": (-9.02, -70.81), "AL": (-9.57, -36.78), "AP": (1.41, -51.77), "AM": (-3.42, -65.86),
+    "BA": (-12.58, -41.70), "CE": (-5.50, -39.32), "DF": (-15.80, -47.86), "ES": (-19.18, -40.31),
+    "GO": (-15.83, -49.84), "MA": (-4.96, -45.27), "MT": (-12.68, -56.92), "MS": (-20.77, -54.79),
+    "MG": (-18.51, -44.56), "PA": (-3.79, -52.48), "PB": (-7.24, -36.78), "PR": (-25.25, -52.02),
+    "PE": (-8.81, -36.95), "PI": (-7.72, -42.73), "RJ": (-22.25, -42.66), "RN": (-5.40, -36.95),
+    "RS": (-30.03, -53.50), "RO": (-11.51, -63.58), "RR": (2.74, -62.08), "SC": (-27.24, -50.22),
+    "SP": (-22.19, -48.79), "SE": (-10.57, -37.39), "TO": (-10.18, -48.30),
+}
+
+_CEP = re.compile(r"\b(\d{5})-?(\d{3})\b")
+# "Campinas/SP", "Campinas - SP", "Campinas, SP" (em texto normalizado). Só com o separador
+# explícito: uma palavra solta no fim ("Rua da Sé", "Rua do Pé") não é UF
+_UF_NO_FIM = re.compile(r"(?:/|\s-|,)\s*(" + "|".join(uf.lower() for uf in CENTROIDES_UF) + r")\s*$")
+
+
+class Coordenadas:
+    def __init__(self, latitude, longitude, precisao):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.precisao = precisao # "municipio" ou "uf"
+
+    def __repr__(self):
+        return f"Coordenadas({self.latitude}, {self.longitude}, {self.precisao!r})"
+
+
+class GeocodificadorGazetteer:
+    """
+    Geocodificador offline. Ordem de tentativa:
+    1. nome de município do gazetteer no endereço (desempate pela UF, se houver);
+    2. CEP de capital;
+    3. UF (do CEP ou do fim do endereço) -> centroide do estado.
+    Retorna None se nada for reconhecido.
+    """
+
+    def __init__(self, arquivo=ARQUIVO_MUNICIPIOS):
+        self._municipios = {} # nome normalizado -> {uf: (lat, lon)}
+        with open(arquivo, encoding="utf-8") as entrada:
+            for linha in csv.DictReader(entrada):
+                self._municipios.setdefault(normalizar(linha["nome"]), {})[linha["uf"]] = (
+                    float(linha["latitude"]), float(linha["longitude"])
+                )
+        # Nomes mais longos primeiro: "sao jose dos campos" antes de "sao jose"
+        nomes = sorted(self._municipios, key=len, reverse=True)
+        self._padrao_municipios = re.compile(r"\b(" + "|".join(re.escape(nome) for nome in nomes) + r")\b")
+
+    def _uf(self, texto, cep):
+        encontrado = _UF_NO_FIM.search(texto)
+        if encontrado:
+            return encontrado.group(1).upper()
+        if cep is not None:
+            for inicio, fim, uf in FAIXAS_CEP:
+                if inicio <= cep <= fim:
+                    return uf
+        return None
+
+    def geocodificar(self, endereco):
+        if not endereco:
+            return None
+        texto = normalizar(endereco).strip()
+        encontrado_cep = _CEP.search(texto)
+        cep = int(encontrado_cep.group(1)) if encontrado_cep else None
+        uf = self._uf(texto, cep)
+
+        # O último município citado costuma ser a cidade ("Rua São Paulo, 10 - Campinas/SP")
+        nomes = self._padrao_municipios.findall(texto)
+        for nome in reversed(nomes):
+            por_uf = self._municipios[nome]
+            if uf in por_uf:
+                return Coordenadas(*por_uf[uf], "municipio")
+            if uf is None and len(por_uf) == 1:
+                return Coordenadas(*next(iter(por_uf.values())), "municipio")
+
+        if cep is not None:
+            for inicio, fim, nome, uf_capital in FAIXAS_CEP_CAPITAIS:
+                if inicio <= cep <= fim:
+                    return Coordenadas(*self._municipios[normalizar(nome)][uf_capital], "municipio")
+
+        if uf is not None:
+            return Coordenadas(*CENTROIDES_UF[uf], "uf")
+        return None
+
+
+_geocodificador = None
+
+
+def obter_geocodificador():
+    """
+    Geocodificador do processo: o configurado em GEOCODIFICADOR (modulo:Classe) ou o gazetteer.
+    """
+    global _geocodificador
+    if _geocodificador is None:
+        caminho = os.getenv("GEOCODIFICADOR")
+        if caminho:
+            nome_modulo, nome_classe = caminho.split(":", 1)
+            _geocodificador = getattr(importlib.import_module(nome_modulo), nome_classe)()
+        else:
+            _geocodificador = GeocodificadorGazetteer()
+    return _geocodificador
+
+
+def localizar_endereco(endereco):
+    """
+    (latitude, longitude, precisao) do endereço, ou (None, None, None) se não for possível
+    geocodificar. A precisão é a do geocodificador ("municipio", "uf"...), se ele informar.
+    Falhas do geocodificador não impedem a gravação: a linha fica sem coordenadas.
+    """
+    try:
+        resultado = obter_geocodificador().geocodificar(endereco)
+    except Exception as e:
+        logger.exception("Erro ao geocodificar endereço")
+        return None, None, None
+    if resultado is None:
+        return None, None, None
+    return resultado.latitude, resultado.longitude, getattr(resultado, "precisao", None)
+
+
+# Tabelas com endereço e coordenadas (migração 0005); as oportunidades guardam também a
+# precisão (migração 0009)
+TABELAS_COM_ENDERECO = ("oportunidades", "ongs", "voluntarios")
+TABELAS_COM_PRECISAO = ("oportunidades",)
+
+
+def preencher_coordenadas(tamanho_lote=500):
+    """
+    Geocodifica as linhas com endereço e sem coordenadas (ou sem precisão, nas tabelas que
+    a guardam). Retorna {tabela: linhas atualizadas}.
+    """
+    from .database import get_connection
+
+    atualizadas = {}
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            for tabela in TABELAS_COM_ENDERECO:
+                com_precisao = tabela in TABELAS_COM_PRECISAO
+                pendente = "precisao_geo IS NULL" if com_precisao else "latitude IS NULL"
+                total = 0
+                ultimo_id = 0
+                while True:
+                    cursor.execute(
+                        f"SELECT id, endereco FROM {tabela} "
+                        f"WHERE id > %s AND {pendente} AND endereco IS NOT NULL AND endereco <> '' "
+                        "ORDER BY id LIMIT %s",
+                        (ultimo_id, tamanho_lote),
+                    )
+                    linhas = cursor.fetchall()
+                    if not linhas:
+                        break
+                    ultimo_id = linhas[-1]["id"]
+                    valores = []
+                    for linha in linhas:
+                        latitude, longitude, precisao = localizar_endereco(linha["endereco"])
+                        if latitude is not None:
+                            valores.append((latitude, longitude, *((precisao,) if com_precisao else ()), linha["id"]))
+                    if valores:
+                        colunas = "latitude = %s, longitude = %s" + (", precisao_geo = %s" if com_precisao else "")
+                        cursor.executemany(f"UPDATE {tabela} SET {colunas} WHERE id = %s", valores)
+                        conn.commit()
+                        total += len(valores)
+                atualizadas[tabela] = total
+        return atualizadas
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--preencher"]:
+        print(f"Coordenadas preenchidas: {preencher_coordenadas()}")
+    else:
+        for endereco in sys.argv[1:]:
+            print(f"{endereco!r}: {obter_geocodificador().geocodificar(endereco)}")
@@ -0,0 +1,55 @@
+# backend/src/logs.py
+#
+# Configuração do logging da aplicação. Os módulos usam
+# `logger = logging.getLogger(__name__)` e este módulo só decide nível e formato:
+#   LOG_LEVEL  = DEBUG | INFO | WARNING | ERROR (padrão: INFO)
+#   LOG_FORMAT = texto | json (padrão: texto; json para agregadores de log)
+# Mensagens abaixo do nível não são formatadas nem escritas, então logger.debug()
+# no caminho quente custa só a checagem de nível.
+
+import json
+import logging
+import os
+import sys
+import time
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "texto").lower()
+
+# Atributos padrão de um LogRecord; o resto veio de `extra=` e entra no JSON
+_ATRIBUTOS_PADRAO = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class FormatadorJSON(logging.Formatter):
+    """
+    Uma linha JSON por registro, com os campos passados em `extra=`.
+    """
+
+    def format(self, record):
+        dados = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "nivel": record.levelname,
+            "logger": record.name,
+            "mensagem": record.getMessage(),
+        }
+        for chave, valor in vars(record).items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith("_"):
+                dados[chave] = valor
+        if record.exc_info:
+            dados["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+
+def configurar_logs(nivel=LOG_LEVEL, formato=LOG_FORMAT):
+    """
+    Instala um handler em stderr no logger raiz. Chamado uma vez pelo main.py;
+    os loggers do uvicorn têm handlers próprios e não são afetados.
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    if formato == "json":
+        handler.setFormatter(FormatadorJSON())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    raiz = logging.getLogger()
+    raiz.handlers = [handler]
+    raiz.setLevel(nivel)
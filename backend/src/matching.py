@@ -0,0 +1,497 @@
+# backend/src/matching.py
+
+import os
+import re
+import threading
+import zlib
+from datetime import date, time, timedelta
+
+import numpy as np
+
+from .search import normalizar, tokenizar
+
+# =========================================================
+# Vetores de características
+# =========================================================
+# Cada voluntário e cada oportunidade vira um vetor com duas partes:
+#   - texto: bag-of-words com feature hashing (interesses do voluntário; tipo_acao,
+#     perfil_voluntario, titulo e descricao da oportunidade), normalizado para que o
+#     produto escalar seja a similaridade do cosseno;
+#   - disponibilidade: mapa de bits de 7 dias x 24 horas (168 bits em 3 uint64).
+# As matrizes ficam em memória e a pontuação é calculada em blocos com NumPy.
+
+# Dimensões do vetor de texto. Com hashing com sinal, colisões tendem a se cancelar;
+# 128 dimensões custam 51 MB para 100 mil voluntários.
+DIMENSOES_TEXTO = int(os.getenv("MATCHING_DIMENSOES", 128))
+
+# Peso de cada parte na pontuação final (0 a 1)
+PESO_TEXTO = 0.7
+PESO_DISPONIBILIDADE = 0.3
+
+# Peso de cada campo da oportunidade no vetor de texto
+PESOS_CAMPOS_OPORTUNIDADE = {
+    "tipo_acao": 2.0,
+    "perfil_voluntario": 1.5,
+    "titulo": 1.0,
+    "descricao": 0.5,
+}
+
+# Radical grosseiro: "educacao", "educacional" e "educativo" casam pelos 6 primeiros caracteres
+TAMANHO_RADICAL = 6
+
+# Linhas pontuadas por vez: limita o tamanho dos arrays temporários
+TAMANHO_BLOCO = 32768
+
+DIAS_SEMANA = 7
+HORAS_DIA = 24
+PALAVRAS_DISPONIBILIDADE = 3 # 168 bits em 3 uint64
+
+
+def _radical(token):
+    return token[:TAMANHO_RADICAL]
+
+
+def vetor_texto(campos, dimensoes=DIMENSOES_TEXTO):
+    """
+    campos: iterável de (texto, peso). Retorna um vetor float32 de norma 1 (ou zero).
+    """
+    vetor = np.zeros(dimensoes, dtype=np.float32)
+    for texto, peso in campos:
+        for token in tokenizar(texto):
+            hash_token = zlib.crc32(_radical(token).encode())
+            sinal = 1.0 if hash_token & 0x80000000 else -1.0
+            vetor[hash_token % dimensoes] += sinal * peso
+    norma = np.linalg.norm(vetor)
+    if norma:
+        vetor /= norma
+    return vetor
+
+
+def _bits(dias, horas):
+    """
+    Mapa de bits (3 uint64) com os pares (dia, hora) do produto dias x horas.
+    Dias: 0 = segunda ... 6 = domingo (mesma convenção de date.weekday()).
+    """
+    palavras = [0] * PALAVRAS_DISPONIBILIDADE
+    for dia in dias:
+        for hora in horas:
+            posicao = dia * HORAS_DIA + hora
+            palavras[posicao // 64] |= 1 << (posicao % 64)
+    return np.array(palavras, dtype=np.uint64)
+
+
+TODOS_OS_BITS = _bits(range(DIAS_SEMANA), range(HORAS_DIA))
+
+
+def _contar_bits(palavras):
+    return int(np.bitwise_count(palavras).sum())
+
+
+# ---------------------------------------------------------
+# Disponibilidade do voluntário (texto livre)
+# ---------------------------------------------------------
+# Exemplos aceitos: "segunda e quarta à noite", "fins de semana de manhã",
+# "seg a sex 14h-18h", "terça 09:00 às 12:00, sábado tarde", "qualquer dia".
+# Sem menção a dias vale a semana inteira; sem menção a horários, o dia inteiro.
+# Texto vazio ou não reconhecido = sem restrição declarada.
+
+_DIAS = {
+    "segunda": 0, "seg": 0, "terca": 1, "ter": 1, "quarta": 2, "qua": 2,
+    "quinta": 3, "qui": 3, "sexta": 4, "sex": 4, "sabado": 5, "sab": 5,
+    "domingo": 6, "dom": 6,
+}
+_PERIODOS = {
+    "madrugada": range(0, 6),
+    "manha": range(6, 12),
+    "tarde": range(12, 18),
+    "noite": range(18, 24),
+    "integral": range(6, 24),
+}
+_EXPRESSOES_DIAS = (
+    (re.compile(r"\b(fins?|finais) de semana\b"), (5, 6)),
+    (re.compile(r"\bdias? ute?is\b|\bdurante a semana\b"), (0, 1, 2, 3, 4)),
+    (re.compile(r"\btodos os dias\b|\bqualquer dia\b|\bdiariamente\b"), tuple(range(DIAS_SEMANA))),
+)
+# "seg", "terças", "quinta-feira"... (abreviações só como palavra inteira: "ter" não casa "terapia")
+_NOME_DIA = r"\b(segunda|terca|quarta|quinta|sexta|sabado|domingo|seg|ter|qua|qui|sex|sab|dom)(?:s|-feiras?)?\b"
+_INTERVALO_DIAS = re.compile(_NOME_DIA + r"\s*(?:a|ate|-)\s*" + _NOME_DIA)
+_DIA = re.compile(_NOME_DIA)
+_INTERVALO_HORAS = re.compile(
+    r"\b(\d{1,2})(?:[:h](\d{2})?)?\s*(?:h\b)?\s*(?:-|a|as|ate)\s*(\d{1,2})(?:[:h](\d{2})?)?\s*h?\b"
+)
+_PERIODO = re.compile(r"\b(madrugada|manhas?|tardes?|noites?|integral)\b")
+_CLAUSULAS = re.compile(r"[,;/|\n]+")
+
+
+def _dias_da_clausula(texto):
+    dias = set()
+    for expressao, valores in _EXPRESSOES_DIAS:
+        if expressao.search(texto):
+            dias.update(valores)
+    for inicio, fim in _INTERVALO_DIAS.findall(texto):
+        primeiro, ultimo = _DIAS[inicio], _DIAS[fim]
+        dias.update(range(primeiro, ultimo + 1) if primeiro <= ultimo else (*range(primeiro, 7), *range(0, ultimo + 1)))
+    for nome in _DIA.findall(texto):
+        dias.add(_DIAS[nome])
+    return dias
+
+
+def _horas_intervalo(inicio, fim):
+    """
+    Horas cheias que intersectam [inicio, fim) (minutos desde 00:00).
+    Se fim <= inicio, o intervalo atravessa a meia-noite.
+    """
+    if fim <= inicio:
+        fim += 24 * 60
+    return {hora % HORAS_DIA for hora in range(inicio // 60, -(-fim // 60))}
+
+
+def _horas_da_clausula(texto):
+    horas = set()
+    for h1, m1, h2, m2 in _INTERVALO_HORAS.findall(texto):
+        inicio = int(h1) * 60 + int(m1 or 0)
+        fim = int(h2) * 60 + int(m2 or 0)
+        if inicio < 24 * 60 and fim <= 24 * 60:
+            horas.update(_horas_intervalo(inicio, fim))
+    for periodo in _PERIODO.findall(texto):
+        horas.update(_PERIODOS[periodo.rstrip("s")])
+    return horas
+
+
+def bits_disponibilidade_voluntario(texto):
+    texto = normalizar(texto)
+    clausulas = [(_dias_da_clausula(c), _horas_da_clausula(c)) for c in _CLAUSULAS.split(texto)]
+    todos_dias = set().union(*(dias for dias, _ in clausulas)) if clausulas else set()
+    todas_horas = set().union(*(horas for _, horas in clausulas)) if clausulas else set()
+    if not todos_dias and not todas_horas:
+        return TODOS_OS_BITS.copy()
+
+    bits = np.zeros(PALAVRAS_DISPONIBILIDADE, dtype=np.uint64)
+    for dias, horas in clausulas:
+        if not dias and not horas:
+            continue
+        # "segunda, terça e quarta de manhã": a cláusula sem horário herda os do texto
+        dias = dias or todos_dias or range(DIAS_SEMANA)
+        horas = horas or todas_horas or range(HORAS_DIA)
+        bits |= _bits(dias, horas)
+    return bits
+
+
+# ---------------------------------------------------------
+# Horário da oportunidade (colunas DATE/TIME)
+# ---------------------------------------------------------
+
+def _minutos(valor):
+    # TIME chega do PyMySQL como timedelta; nas escritas da API, como time
+    if isinstance(valor, timedelta):
+        return int(valor.total_seconds()) // 60
+    if isinstance(valor, time):
+        return valor.hour * 60 + valor.minute
+    return None
+
+
+def bits_horario_oportunidade(data_inicio, data_termino, hora_inicio, hora_termino):
+    if isinstance(data_inicio, date) and isinstance(data_termino, date) and data_termino >= data_inicio:
+        if (data_termino - data_inicio).days >= DIAS_SEMANA - 1:
+            dias = range(DIAS_SEMANA)
+        else:
+            dias = {(data_inicio + timedelta(days=d)).weekday() for d in range((data_termino - data_inicio).days + 1)}
+    elif isinstance(data_inicio, date):
+        dias = {data_inicio.weekday()}
+    else:
+        dias = range(DIAS_SEMANA)
+
+    inicio, fim = _minutos(hora_inicio), _minutos(hora_termino)
+    if inicio is not None and fim is not None:
+        horas = _horas_intervalo(inicio, fim)
+    elif inicio is not None:
+        horas = {inicio // 60}
+    else:
+        horas = range(HORAS_DIA)
+    return _bits(dias, horas)
+
+
+def caracteristicas_voluntario(linha, dimensoes=DIMENSOES_TEXTO):
+    return (
+        vetor_texto([(linha.get("interesses"), 1.0)], dimensoes),
+        bits_disponibilidade_voluntario(linha.get("disponibilidade")),
+    )
+
+
+def caracteristicas_oportunidade(linha, dimensoes=DIMENSOES_TEXTO):
+    return (
+        vetor_texto([(linha.get(campo), peso) for campo, peso in PESOS_CAMPOS_OPORTUNIDADE.items()], dimensoes),
+        bits_horario_oportunidade(
+            linha.get("data_inicio"), linha.get("data_termino"),
+            linha.get("hora_inicio"), linha.get("hora_termino"),
+        ),
+    )
+
+
+# =========================================================
+# Matrizes e pontuação
+# =========================================================
+
+class MatrizCaracteristicas:
+    """
+    Vetores de uma entidade (voluntários ou oportunidades) em arrays NumPy contíguos,
+    com mapeamento id -> linha. Linhas removidas são reaproveitadas; a capacidade dobra
+    quando acaba. Não é thread-safe: o MotorMatching serializa o acesso.
+    """
+
+    def __init__(self, dimensoes, capacidade=1024):
+        self.dimensoes = dimensoes
+        self.linhas = {}  # id -> linha
+        self._livres = []
+        self.tamanho = 0  # linhas em uso no topo dos arrays (inclui removidas)
+        self._alocar(capacidade)
+
+    def _alocar(self, capacidade):
+        self.texto = np.zeros((capacidade, self.dimensoes), dtype=np.float32)
+        # Uma linha por palavra de 64 bits: cada AND/popcount percorre memória contígua
+        self.bits = np.zeros((PALAVRAS_DISPONIBILIDADE, capacidade), dtype=np.uint64)
+        self.horas = np.zeros(capacidade, dtype=np.float32)   # bits ligados (para normalizar)
+        self.ids = np.zeros(capacidade, dtype=np.int64)
+        self.validas = np.zeros(capacidade, dtype=bool)       # linha em uso e elegível
+
+    def _crescer(self):
+        antigos = (self.texto, self.bits, self.horas, self.ids, self.validas)
+        self._alocar(len(self.ids) * 2)
+        for novo, antigo in zip((self.texto, self.horas, self.ids, self.validas), antigos[:1] + antigos[2:]):
+            novo[: len(antigo)] = antigo
+        self.bits[:, : antigos[1].shape[1]] = antigos[1]
+
+    def __len__(self):
+        return len(self.linhas)
+
+    def __contains__(self, entidade_id):
+        return entidade_id in self.linhas
+
+    def definir(self, entidade_id, texto, bits, elegivel=True):
+        linha = self.linhas.get(entidade_id)
+        if linha is None:
+            if self._livres:
+                linha = self._livres.pop()
+            else:
+                if self.tamanho == len(self.ids):
+                    self._crescer()
+                linha = self.tamanho
+                self.tamanho += 1
+            self.linhas[entidade_id] = linha
+        self.texto[linha] = texto
+        self.bits[:, linha] = bits
+        self.horas[linha] = _contar_bits(bits)
+        self.ids[linha] = entidade_id
+        self.validas[linha] = elegivel
+
+    def remover(self, entidade_id):
+        linha = self.linhas.pop(entidade_id, None)
+        if linha is not None:
+            self.validas[linha] = False
+            self._livres.append(linha)
+
+    def vetor(self, entidade_id):
+        linha = self.linhas[entidade_id]
+        return self.texto[linha], self.bits[:, linha].copy(), self.horas[linha]
+
+
+class MotorMatching:
+    """
+    Pontuação voluntário x oportunidade:
+        PESO_TEXTO * cosseno(texto) + PESO_DISPONIBILIDADE * fração das horas da oportunidade
+        em que o voluntário declarou disponibilidade.
+
+    - candidatos(oportunidade_id, k): melhores voluntários para uma oportunidade;
+    - recomendacoes(voluntario_id, k): melhores oportunidades (ativas) para um voluntário.
+    Atualizações são incrementais (uma linha por escrita) e thread-safe.
+    """
+
+    def __init__(self, dimensoes=DIMENSOES_TEXTO):
+        self.dimensoes = dimensoes
+        self.voluntarios = MatrizCaracteristicas(dimensoes)
+        self.oportunidades = MatrizCaracteristicas(dimensoes)
+        self._lock = threading.RLock()
+        self.carregado = False
+        self._carregando = False
+
+    # -----------------------------------------------------------------
+    # Escrita
+    # -----------------------------------------------------------------
+    def atualizar_voluntario(self, voluntario_id, linha):
+        texto, bits = caracteristicas_voluntario(linha, self.dimensoes)
+        with self._lock:
+            self.voluntarios.definir(voluntario_id, texto, bits)
+
+    def remover_voluntario(self, voluntario_id):
+        with self._lock:
+            self.voluntarios.remover(voluntario_id)
+
+    def atualizar_oportunidade(self, oportunidade_id, linha):
+        texto, bits = caracteristicas_oportunidade(linha, self.dimensoes)
+        # Só oportunidades ativas são recomendadas; as demais continuam tendo candidatos
+        elegivel = linha.get("status_vaga", "ativa") == "ativa"
+        with self._lock:
+            self.oportunidades.definir(oportunidade_id, texto, bits, elegivel)
+
+    def remover_oportunidade(self, oportunidade_id):
+        with self._lock:
+            self.oportunidades.remover(oportunidade_id)
+
+    @property
+    def ativo(self):
+        # Mesma semântica de IndiceBusca.ativo
+        return self.carregado or self._carregando
+
+    def garantir_carregado(self, carregar):
+        """
+        Na primeira chamada, carrega as matrizes com `carregar()`, que devolve
+        (linhas de voluntários, linhas de oportunidades). Como em IndiceBusca, o lock
+        fica retido durante a carga.
+        """
+        if self.carregado:
+            return
+        with self._lock:
+            if self.carregado:
+                return
+            self._carregando = True
+            try:
+                self.recarregar(*carregar())
+            finally:
+                self._carregando = False
+
+    def recarregar(self, voluntarios, oportunidades):
+        with self._lock:
+            self.voluntarios = MatrizCaracteristicas(self.dimensoes, max(1024, len(voluntarios)))
+            self.oportunidades = MatrizCaracteristicas(self.dimensoes, max(1024, len(oportunidades)))
+            for linha in voluntarios:
+                self.atualizar_voluntario(linha["id"], linha)
+            for linha in oportunidades:
+                self.atualizar_oportunidade(linha["id"], linha)
+            self.carregado = True
+
+    # -----------------------------------------------------------------
+    # Leitura
+    # -----------------------------------------------------------------
+    def candidatos(self, oportunidade_id, k=20, excluir=()):
+        """
+        Retorna [(voluntario_id, pontuacao, afinidade, compatibilidade_horario), ...]
+        ou None se a oportunidade não estiver no motor.
+        """
+        with self._lock:
+            if oportunidade_id not in self.oportunidades:
+                return None
+            texto, bits, horas = self.oportunidades.vetor(oportunidade_id)
+            # Fração das horas desta oportunidade cobertas por cada voluntário
+            return self._melhores(self.voluntarios, texto, bits, lambda _: max(horas, 1.0), k, excluir)
+
+    def recomendacoes(self, voluntario_id, k=20, excluir=()):
+        """
+        Retorna [(oportunidade_id, pontuacao, afinidade, compatibilidade_horario), ...]
+        ou None se o voluntário não estiver no motor.
+        """
+        with self._lock:
+            if voluntario_id not in self.voluntarios:
+                return None
+            texto, bits, _ = self.voluntarios.vetor(voluntario_id)
+            # Fração das horas de cada oportunidade cobertas pelo voluntário
+            matriz = self.oportunidades
+            return self._melhores(matriz, texto, bits, lambda bloco: np.maximum(matriz.horas[bloco], 1.0), k, excluir)
+
+    @staticmethod
+    def _melhores(matriz, texto, bits, horas_referencia, k, excluir):
+        excluidas = np.zeros(matriz.tamanho, dtype=bool)
+        excluidas[[matriz.linhas[i] for i in excluir if i in matriz.linhas]] = True
+        selecionadas = []  # por bloco: (linhas, pontos, afinidade, horario) dos k melhores
+        for inicio in range(0, matriz.tamanho, TAMANHO_BLOCO):
+            bloco = slice(inicio, min(inicio + TAMANHO_BLOCO, matriz.tamanho))
+            afinidade = np.clip(matriz.texto[bloco] @ texto, 0.0, 1.0)
+            # Soma em uint8: no máximo 168 bits em comum
+            comuns = np.bitwise_count(matriz.bits[0, bloco] & bits[0])
+            for palavra in range(1, PALAVRAS_DISPONIBILIDADE):
+                comuns += np.bitwise_count(matriz.bits[palavra, bloco] & bits[palavra])
+            horario = np.minimum(comuns / horas_referencia(bloco), 1.0)
+            pontos = PESO_TEXTO * afinidade + PESO_DISPONIBILIDADE * horario
+            pontos[~matriz.validas[bloco] | excluidas[bloco]] = -np.inf
+            if len(pontos) > k:
+                melhores = np.argpartition(pontos, -k)[-k:]
+            else:
+                melhores = np.arange(len(pontos))
+            selecionadas.append((melhores + inicio, pontos[melhores], afinidade[melhores], horario[melhores]))
+        if not selecionadas:
+            return []
+
+        linhas, pontos, afinidade, horario = (np.concatenate(partes) for partes in zip(*selecionadas))
+        resultado = []
+        for posicao in np.argsort(-pontos, kind="stable")[:k]:
+            if not pontos[posicao] > 0: # Excluídos (-inf) ou sem nada em comum
+                break
+            resultado.append((
+                int(matriz.ids[linhas[posicao]]),
+                round(float(pontos[posicao]), 4),
+                round(float(afinidade[posicao]), 4),
+                round(float(horario[posicao]), 4),
+            ))
+        return resultado
+
+
+# Motor do processo (carregado sob demanda pelas rotas)
+motor_matching = MotorMatching()
+
+
+# =========================================================
+# Integração com o banco
+# =========================================================
+
+SQL_VOLUNTARIOS_MATCHING = "SELECT id, interesses, disponibilidade FROM voluntarios"
+SQL_OPORTUNIDADES_MATCHING = """
+    SELECT id, titulo, descricao, perfil_voluntario, tipo_acao, status_vaga,
+           data_inicio, data_termino, hora_inicio, hora_termino
+    FROM oportunidades
+"""
+
+
+def carregar_motor(conn):
+    """
+    Carrega o motor na primeira chamada (no-op depois disso).
+    """
+    def carregar():
+        with conn.cursor() as cursor:
+            cursor.execute(SQL_VOLUNTARIOS_MATCHING)
+            voluntarios = cursor.fetchall()
+            cursor.execute(SQL_OPORTUNIDADES_MATCHING)
+            oportunidades = cursor.fetchall()
+        return voluntarios, oportunidades
+
+    motor_matching.garantir_carregado(carregar)
+
+
+def atualizar_oportunidade_matching(cursor, oportunidade_id):
+    """
+    Relê a oportunidade após uma escrita e atualiza (ou remove) seus vetores.
+    Retorna True se a oportunidade existe.
+    """
+    if not motor_matching.ativo:
+        return False
+    cursor.execute(SQL_OPORTUNIDADES_MATCHING + " WHERE id = %s", (oportunidade_id,))
+    linha = cursor.fetchone()
+    if linha:
+        motor_matching.atualizar_oportunidade(oportunidade_id, linha)
+    else:
+        motor_matching.remover_oportunidade(oportunidade_id)
+    return linha is not None
+
+
+def atualizar_voluntario_matching(cursor, voluntario_id):
+    """
+    Relê o voluntário após uma escrita e atualiza (ou remove) seus vetores.
+    Retorna True se o voluntário existe.
+    """
+    if not motor_matching.ativo:
+        return False
+    cursor.execute(SQL_VOLUNTARIOS_MATCHING + " WHERE id = %s", (voluntario_id,))
+    linha = cursor.fetchone()
+    if linha:
+        motor_matching.atualizar_voluntario(voluntario_id, linha)
+    else:
+        motor_matching.remover_voluntario(voluntario_id)
+    return linha is not None
@@ -0,0 +1,252 @@
+# backend/src/metrics.py
+#
+# Métricas do processo no formato texto do Prometheus (GET /metrics):
+#   - MiddlewareMetricas: latência por rota (histograma), requisições em andamento
+#     e contagem por status;
+#   - ConexaoMedida: conexão PyMySQL que mede o tempo de cada statement SQL
+#     (rotulado por operação e tabela) e registra as consultas lentas no log;
+#   - coletores: valores lidos no momento da coleta (pool de conexões, cache...).
+# Implementação própria e sem dependências: contadores em memória protegidos por lock.
+
+import logging
+from bisect import bisect_left
+import os
+import re
+import threading
+import time
+
+import pymysql.connections
+
+logger = logging.getLogger(__name__)
+
+# Statements mais lentos que isso (ms) vão para o log como WARNING; 0 desativa
+SQL_LENTA_MS = float(os.getenv("METRICAS_SQL_LENTA_MS", 500))
+
+LIMITES_HTTP = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_SQL = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+TIPO_CONTEUDO = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(nomes, valores, extra=""):
+    pares = [f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _numero(valor):
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class _Metrica:
+    tipo = None
+
+    def __init__(self, nome, ajuda, rotulos=()):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def cabecalho(self):
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, *rotulos, quantidade=1):
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + quantidade
+
+    def linhas(self):
+        with self._lock:
+            itens = list(self._valores.items())
+        return [f"{self.nome}{_rotulos(self.rotulos, chave)} {_numero(valor)}" for chave, valor in sorted(itens)]
+
+
+class Medidor(Contador):
+    tipo = "gauge"
+
+    def dec(self, *rotulos, quantidade=1):
+        self.inc(*rotulos, quantidade=-quantidade)
+
+
+class Histograma(_Metrica):
+    """
+    Histograma cumulativo: contagem por limite (le), soma e total por combinação de rótulos.
+    """
+
+    tipo = "histogram"
+
+    def __init__(self, nome, ajuda, rotulos=(), limites=LIMITES_HTTP):
+        super().__init__(nome, ajuda, rotulos)
+        self.limites = tuple(sorted(limites))
+
+    def observar(self, valor, *rotulos):
+        with self._lock:
+            serie = self._valores.get(rotulos)
+            if serie is None:
+                # [contagem por faixa..., faixa +Inf, soma]
+                serie = self._valores[rotulos] = [0] * (len(self.limites) + 1) + [0.0]
+            serie[bisect_left(self.limites, valor)] += 1 # primeira faixa com valor <= le
+            serie[-1] += valor
+
+    def linhas(self):
+        with self._lock:
+            itens = [(chave, list(serie)) for chave, serie in self._valores.items()]
+        linhas = []
+        for chave, serie in sorted(itens):
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + (float("inf"),), serie):
+                acumulado += quantidade
+                le = 'le="' + _numero(limite) + '"'
+                linhas.append(f"{self.nome}_bucket{_rotulos(self.rotulos, chave, le)} {acumulado}")
+            linhas.append(f"{self.nome}_sum{_rotulos(self.rotulos, chave)} {_numero(round(serie[-1], 6))}")
+            linhas.append(f"{self.nome}_count{_rotulos(self.rotulos, chave)} {acumulado}")
+        return linhas
+
+
+class RegistroMetricas:
+    def __init__(self):
+        self._metricas = []
+        self._coletores = []
+
+    def registrar(self, metrica):
+        self._metricas.append(metrica)
+        return metrica
+
+    def registrar_coletor(self, coletor):
+        """
+        `coletor()` devolve uma lista de (nome, tipo, ajuda, valor), calculada a cada coleta.
+        """
+        self._coletores.append(coletor)
+
+    def exposicao(self):
+        linhas = []
+        for metrica in self._metricas:
+            linhas.extend(metrica.cabecalho())
+            linhas.extend(metrica.linhas())
+        for coletor in self._coletores:
+            try:
+                amostras = coletor()
+            except Exception:
+                logger.exception("Erro no coletor de métricas %s", getattr(coletor, "__name__", coletor))
+                continue
+            for nome, tipo, ajuda, valor in amostras:
+                if valor is None:
+                    continue
+                linhas.extend((f"# HELP {nome} {ajuda}", f"# TYPE {nome} {tipo}", f"{nome} {_numero(valor)}"))
+        return "\n".join(linhas) + "\n"
+
+
+registro = RegistroMetricas()
+
+requisicoes_total = registro.registrar(Contador(
+    "http_requests_total", "Requisições HTTP atendidas, por método, rota e status.", ("metodo", "rota", "status")))
+requisicoes_em_andamento = registro.registrar(Medidor(
+    "http_requests_in_progress", "Requisições HTTP em andamento.", ("metodo",)))
+duracao_requisicoes = registro.registrar(Histograma(
+    "http_request_duration_seconds", "Latência das requisições HTTP até o fim da resposta.",
+    ("metodo", "rota"), LIMITES_HTTP))
+duracao_sql = registro.registrar(Histograma(
+    "db_query_duration_seconds", "Tempo de execução dos statements SQL, por operação e tabela.",
+    ("operacao", "tabela"), LIMITES_SQL))
+erros_sql = registro.registrar(Contador(
+    "db_query_errors_total", "Statements SQL que terminaram em erro, por operação e tabela.",
+    ("operacao", "tabela")))
+
+
+# ---------------------------------------------------------------------
+# Middleware HTTP
+# ---------------------------------------------------------------------
+ROTA_DESCONHECIDA = "desconhecida" # 404 de varredura não cria uma série por caminho
+
+
+class MiddlewareMetricas:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware, que bufferiza e custa uma task por
+    requisição). A rota é o template (/api/oportunidades/{oportunidade_id}/), para que
+    o número de séries não cresça com os ids.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metodo = scope["method"]
+        status_resposta = 500
+
+        async def send_medido(mensagem):
+            nonlocal status_resposta
+            if mensagem["type"] == "http.response.start":
+                status_resposta = mensagem["status"]
+            await send(mensagem)
+
+        requisicoes_em_andamento.inc(metodo)
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_medido)
+        finally:
+            duracao = time.perf_counter() - inicio
+            requisicoes_em_andamento.dec(metodo)
+            # O roteador do FastAPI grava a rota encontrada no próprio scope
+            rota = getattr(scope.get("route"), "path", ROTA_DESCONHECIDA)
+            duracao_requisicoes.observar(duracao, metodo, rota)
+            requisicoes_total.inc(metodo, rota, str(status_resposta))
+
+
+# ---------------------------------------------------------------------
+# Tempo por statement SQL
+# ---------------------------------------------------------------------
+_OPERACAO = re.compile(r"^\s*(?:/\*.*?\*/\s*)?(\w+)", re.S)
+_TABELA = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN|TABLE)\s+`?(\w+)`?", re.I)
+
+
+def rotulo_sql(sql):
+    """
+    (operação, tabela) de um statement, ex.: ('SELECT', 'oportunidades').
+    Só olha o começo do texto: o SQL já vem com os parâmetros interpolados.
+    """
+    inicio = sql[:400]
+    operacao = _OPERACAO.match(inicio)
+    tabela = _TABELA.search(inicio)
+    return (
+        operacao.group(1).upper() if operacao else "?",
+        tabela.group(1).lower() if tabela else "-",
+    )
+
+
+class ConexaoMedida(pymysql.connections.Connection):
+    """
+    Conexão PyMySQL que mede cada statement. Todo cursor (buffered ou unbuffered,
+    execute ou executemany) passa por Connection.query(); em cursores unbuffered o
+    tempo vai até a chegada do cabeçalho do resultado, não até a última linha.
+    """
+
+    def query(self, sql, unbuffered=False):
+        inicio = time.perf_counter()
+        texto = sql if isinstance(sql, str) else sql.decode("utf-8", "replace")
+        rotulo = rotulo_sql(texto)
+        try:
+            return super().query(sql, unbuffered)
+        except Exception:
+            erros_sql.inc(*rotulo)
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            duracao_sql.observar(duracao, *rotulo)
+            if SQL_LENTA_MS and duracao * 1000 >= SQL_LENTA_MS:
+                # Só operação e tabela: o texto já tem os valores (CPF, e-mail, senha...)
+                logger.warning("Consulta lenta (%.0f ms): %s %s", duracao * 1000, *rotulo,
+                               extra={"duracao_ms": round(duracao * 1000, 1)})
@@ -0,0 +1,188 @@
+# backend/src/migrations.py
+#
+# Migrações versionadas do esquema MySQL.
+# Cada arquivo em database/migrations/NNNN_descricao.sql é uma versão; as versões
+# aplicadas ficam registradas na tabela schema_version.
+#
+# Uso (a partir da pasta backend):
+#   python -m src.migrations           # aplica as migrações pendentes
+#   python -m src.migrations --status  # mostra a versão atual e as pendentes
+
+import logging
+import re
+import sys
+from pathlib import Path
+
+from .database import get_connection
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO_MIGRACOES = Path(__file__).resolve().parent.parent / "database" / "migrations"
+
+# Lock nomeado do MySQL: impede que dois processos (ex.: réplicas subindo juntas)
+# apliquem a mesma migração ao mesmo tempo
+NOME_LOCK = "tempo_bem_gasto_migracoes"
+TIMEOUT_LOCK = 120
+
+_ARQUIVO_MIGRACAO = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+class Migracao:
+    def __init__(self, versao, nome, caminho):
+        self.versao = versao
+        self.nome = nome
+        self.caminho = caminho
+
+    def statements(self):
+        return dividir_statements(self.caminho.read_text(encoding="utf-8"))
+
+
+def migracoes_disponiveis():
+    """
+    Lista as migrações do diretório, ordenadas por versão.
+    """
+    migracoes = []
+    for caminho in sorted(DIRETORIO_MIGRACOES.glob("*.sql")):
+        encontrado = _ARQUIVO_MIGRACAO.match(caminho.name)
+        if encontrado:
+            migracoes.append(Migracao(int(encontrado.group(1)), encontrado.group(2), caminho))
+    return migracoes
+
+
+def versao_esperada():
+    migracoes = migracoes_disponiveis()
+    return migracoes[-1].versao if migracoes else 0
+
+
+def dividir_statements(sql):
+    """
+    Divide um script em statements. Linhas de comentário (--) são ignoradas e,
+    como no cliente mysql, `DELIMITER $$` troca o separador (necessário para
+    triggers e procedures com BEGIN ... END).
+    Ponto e vírgula dentro de strings não é tratado: evite-os nas migrações.
+    """
+    statements = []
+    delimitador = ";"
+    atual = []
+    for linha in sql.splitlines():
+        limpa = linha.strip()
+        if not limpa or limpa.startswith("--"):
+            continue
+        if limpa.upper().startswith("DELIMITER "):
+            delimitador = limpa.split(None, 1)[1]
+            continue
+        atual.append(linha)
+        if limpa.endswith(delimitador):
+            texto = "\n".join(atual).rstrip()
+            statements.append(texto[: -len(delimitador)].strip())
+            atual = []
+    resto = "\n".join(atual).strip()
+    if resto:
+        statements.append(resto)
+    return [statement for statement in statements if statement]
+
+
+def _garantir_tabela_versao(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versao INT PRIMARY KEY,
+            nome VARCHAR(255) NOT NULL,
+            aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def versao_atual(conn):
+    """
+    Maior versão registrada em schema_version (0 se a tabela não existir).
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT COUNT(*) AS existe FROM information_schema.tables
+            WHERE table_schema = DATABASE() AND table_name = 'schema_version'
+        """)
+        if not cursor.fetchone()["existe"]:
+            return 0
+        cursor.execute("SELECT COALESCE(MAX(versao), 0) AS versao FROM schema_version")
+        return cursor.fetchone()["versao"]
+
+
+def aplicar_migracoes():
+    """
+    Aplica, em ordem, as migrações com versão maior que a registrada no banco.
+    Retorna a lista de versões aplicadas.
+
+    DDL no MySQL faz commit implícito, então uma migração não é atômica: se um
+    statement falhar, a versão não é registrada e o erro é relançado para correção manual.
+    """
+    aplicadas = []
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT GET_LOCK(%s, %s) AS obtido", (NOME_LOCK, TIMEOUT_LOCK))
+            if not cursor.fetchone()["obtido"]:
+                raise RuntimeError("Não foi possível obter o lock de migrações")
+            try:
+                _garantir_tabela_versao(cursor)
+                conn.commit()
+                atual = versao_atual(conn)
+                for migracao in migracoes_disponiveis():
+                    if migracao.versao <= atual:
+                        continue
+                    logger.info("Aplicando migração %04d_%s", migracao.versao, migracao.nome)
+                    for statement in migracao.statements():
+                        cursor.execute(statement)
+                    cursor.execute(
+                        "INSERT INTO schema_version (versao, nome) VALUES (%s, %s)",
+                        (migracao.versao, migracao.nome),
+                    )
+                    conn.commit()
+                    aplicadas.append(migracao.versao)
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (NOME_LOCK,))
+        return aplicadas
+    finally:
+        conn.close()
+
+
+def verificar_versao():
+    """
+    Checagem barata para o startup: uma leitura de schema_version, sem lock e sem DDL.
+    Levanta RuntimeError se o banco estiver atrás das migrações deste código.
+    Retorna (versão do banco, versão esperada).
+    """
+    conn = get_connection()
+    try:
+        atual = versao_atual(conn)
+    finally:
+        conn.close()
+    esperada = versao_esperada()
+    if atual < esperada:
+        raise RuntimeError(
+            f"Banco na versão {atual}, código espera {esperada}: rode `python -m src.migrations`"
+        )
+    if atual > esperada:
+        logger.warning("Banco na versão %s, mais nova que a deste código (%s)", atual, esperada)
+    return atual, esperada
+
+
+def _status():
+    conn = get_connection()
+    try:
+        atual = versao_atual(conn)
+    finally:
+        conn.close()
+    print(f"Versão do banco: {atual} (esperada: {versao_esperada()})")
+    for migracao in migracoes_disponiveis():
+        marcador = "x" if migracao.versao <= atual else " "
+        print(f"  [{marcador}] {migracao.versao:04d}_{migracao.nome}")
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logs
+    configurar_logs()
+    if "--status" in sys.argv[1:]:
+        _status()
+    else:
+        versoes = aplicar_migracoes()
+        print(f"Migrações aplicadas: {versoes or 'nenhuma'}")
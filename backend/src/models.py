@@ -1,8 +1,9 @@
 # backend/src/models.py
 
-from pydantic import BaseModel, Field
-from typing import Optional # Keep Optional for nullable fields
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional # Keep Optional for nullable fields
 from datetime import datetime # Import datetime for data_publicacao type hint
+from .datas import texto_para_data, texto_para_hora
 
 class DadosInscricao(BaseModel):
     nome: str
@@ -10,9 +11,33 @@ class DadosInscricao(BaseModel):
     cpf: str
     mensagem: str
     oportunidade_id: int
+    voluntario_id: Optional[int] = None # Se ausente, o voluntário é identificado pelo CPF
+
+# Modelo para alteração do status de uma inscrição (PATCH /inscricoes/{id}/)
+class AtualizacaoInscricao(BaseModel):
+    status: str = Field(..., pattern="^(pendente|aprovada|rejeitada|cancelada)$")
+
+# Validação dos campos de data e hora das oportunidades (colunas DATE/TIME no banco).
+# A API continua usando texto: datas DD/MM/AAAA e horas HH:MM; string vazia vira None.
+class ValidaDataHora(BaseModel):
+    @field_validator("data_inicio", "data_termino", check_fields=False)
+    @classmethod
+    def validar_data(cls, valor):
+        if valor in (None, ""):
+            return None
+        texto_para_data(valor) # Levanta ValueError (HTTP 422) se não estiver em DD/MM/AAAA
+        return valor
+
+    @field_validator("hora_inicio", "hora_termino", check_fields=False)
+    @classmethod
+    def validar_hora(cls, valor):
+        if valor in (None, ""):
+            return None
+        texto_para_hora(valor) # Levanta ValueError (HTTP 422) se não estiver em HH:MM
+        return valor
 
 # Modelo de Oportunidade (AGORA COM NOVOS CAMPOS DE DATA E HORA)
-class OportunidadeONG(BaseModel):
+class OportunidadeONG(ValidaDataHora):
     id: Optional[int] = None # Adicionar id opcional para quando a vaga já existe
     titulo: str
     descricao: str
@@ -32,7 +57,7 @@ class OportunidadeONG(BaseModel):
     data_publicacao: Optional[datetime] = None # Renomeado e tipado para corresponder ao schema.sql, e opcional para PUT/PATCH
 
 # Modelo para Edição Parcial de Oportunidade (AGORA COM NOVOS CAMPOS DE DATA E HORA)
-class OportunidadeUpdate(BaseModel):
+class OportunidadeUpdate(ValidaDataHora):
     titulo: Optional[str] = None
     descricao: Optional[str] = None
     endereco: Optional[str] = None
@@ -52,10 +77,63 @@ class OportunidadeUpdate(BaseModel):
 class OportunidadeResponse(OportunidadeONG):
     id: int # ID é obrigatório no retorno
     data_publicacao: datetime # data_publicacao é obrigatória e tipada como datetime no retorno
+    versao: Optional[int] = None # Versão da linha (If-Match nas edições; migração 0008)
 
     class Config:
         # Pydantic v2 uses `from_attributes = True`
         # Pydantic v1 uses `orm_mode = True`
         # Check your Pydantic version if you get an error
         from_attributes = True
-        # or orm_mode = True # Uncomment if you are using Pydantic v1
\ No newline at end of file
+        # or orm_mode = True # Uncomment if you are using Pydantic v1
+
+# --- Modelos de resposta da busca textual de oportunidades ---
+class OportunidadeBuscaItem(OportunidadeResponse):
+    relevancia: float # Pontuação BM25 do resultado (maior = mais relevante)
+
+class ResultadoBusca(BaseModel):
+    total: int # Total de oportunidades que casam com a consulta (todas as páginas)
+    itens: List[OportunidadeBuscaItem]
+
+# --- Modelo de resposta da busca por proximidade ---
+class OportunidadeProxima(OportunidadeResponse):
+    distancia_km: float # Distância do ponto consultado até a oportunidade
+    # Precisão das coordenadas da oportunidade ("municipio" ou "uf"): com "uf", a distância
+    # é até o centroide do estado e pode errar por centenas de km
+    precisao: Optional[str] = None
+
+# --- Modelos do painel da ONG (GET /ongs/{id}/painel) ---
+class ContagemOportunidades(BaseModel):
+    ativa: int
+    inativa: int
+    encerrada: int
+    em_edicao: int
+    total: int
+
+class ContagemInscricoes(BaseModel):
+    pendente: int
+    aprovada: int
+    rejeitada: int
+    cancelada: int
+    total: int
+
+class VagasPainel(BaseModel):
+    ofertadas: int # Soma de num_vagas das oportunidades com limite de vagas
+    preenchidas: int # Vagas ocupadas nessas oportunidades
+    taxa_ocupacao: Optional[float] = None # preenchidas / ofertadas (None sem vagas ofertadas)
+
+class AtividadeOng(BaseModel):
+    id: int
+    tipo: str
+    descricao: str
+    oportunidade_id: Optional[int] = None
+    inscricao_id: Optional[int] = None
+    criado_em: datetime
+
+class PainelOng(BaseModel):
+    ong_id: int
+    ong_nome: str
+    oportunidades: ContagemOportunidades
+    inscricoes: ContagemInscricoes
+    vagas: VagasPainel
+    atividade_recente: List[AtividadeOng]
+    atualizado_em: Optional[datetime] = None
@@ -0,0 +1,76 @@
+# backend/src/pagination.py
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+# Header onde as listagens paginadas devolvem o cursor da próxima página.
+# O corpo da resposta continua sendo a lista pura, então clientes antigos não mudam.
+HEADER_PROXIMO_CURSOR = "X-Proximo-Cursor"
+
+LIMITE_MAXIMO = 200
+
+
+def codificar_cursor(*valores):
+    """
+    Gera um cursor opaco (base64 url-safe) a partir da chave de ordenação da última linha.
+    Datas são serializadas em ISO 8601.
+    """
+    normalizados = [v.isoformat() if isinstance(v, datetime) else v for v in valores]
+    bruto = json.dumps(normalizados, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor, tipos):
+    """
+    Decodifica um cursor gerado por codificar_cursor().
+    `tipos` indica o tipo de cada posição (datetime ou int). Cursor inválido vira HTTP 400.
+    """
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+        if len(valores) != len(tipos):
+            raise ValueError("quantidade de campos inesperada")
+        return tuple(
+            datetime.fromisoformat(v) if tipo is datetime else tipo(v)
+            for v, tipo in zip(valores, tipos)
+        )
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor de paginação inválido")
+
+
+def fatiar_pagina(linhas, limite, chave):
+    """
+    Recebe até `limite + 1` linhas (a linha extra só indica que há próxima página)
+    e devolve (linhas_da_pagina, proximo_cursor).
+    """
+    if limite is None or len(linhas) <= limite:
+        return linhas, None
+    pagina = linhas[:limite]
+    return pagina, codificar_cursor(*chave(pagina[-1]))
+
+
+def interpretar_ids(texto, maximo=LIMITE_MAXIMO):
+    """
+    "3,1,2" -> (3, 1, 2) para as consultas em lote (?ids=). Repetidos são ignorados
+    (vale a primeira ocorrência). Id inválido ou mais de `maximo` ids vira HTTP 400.
+    """
+    try:
+        ids = tuple(dict.fromkeys(int(parte) for parte in texto.split(",") if parte.strip()))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'ids' deve ser uma lista de inteiros separados por vírgula")
+    if not ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'ids' não pode ser vazio")
+    if len(ids) > maximo:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"No máximo {maximo} ids por consulta")
+    return ids
+
+
+def na_ordem_dos_ids(linhas, ids):
+    """
+    Reordena as linhas de um `WHERE id IN (...)` na ordem pedida; ids inexistentes ficam de fora.
+    """
+    por_id = {linha["id"]: linha for linha in linhas}
+    return [por_id[id_] for id_ in ids if id_ in por_id]
@@ -0,0 +1,113 @@
+# backend/src/painel.py
+#
+# Tabela de resumo do painel das ONGs (migração 0006). Os triggers mantêm
+# painel_ongs em dia a cada escrita; recalcular() refaz tudo a partir das tabelas
+# de origem, para corrigir divergências (ex.: escritas feitas com os triggers desligados).
+# As linhas arquivadas (migração 0007) continuam contando no painel.
+#
+# Uso (a partir da pasta backend):
+#   python -m src.painel --recalcular
+
+import logging
+import sys
+
+from .database import get_connection
+
+logger = logging.getLogger(__name__)
+
+STATUS_VAGA = ("ativa", "inativa", "encerrada", "em_edicao")
+STATUS_INSCRICAO = ("pendente", "aprovada", "rejeitada", "cancelada")
+
+# Consulta da carga inicial da migração 0006, somando as tabelas de arquivo (0007)
+SQL_RECALCULO = """
+INSERT INTO painel_ongs (ong_id, oportunidades_ativa, oportunidades_inativa, oportunidades_encerrada,
+                         oportunidades_em_edicao, vagas_ofertadas, vagas_preenchidas,
+                         inscricoes_pendente, inscricoes_aprovada, inscricoes_rejeitada, inscricoes_cancelada)
+SELECT g.id,
+       COALESCE(o.ativa, 0), COALESCE(o.inativa, 0), COALESCE(o.encerrada, 0), COALESCE(o.em_edicao, 0),
+       COALESCE(o.ofertadas, 0), COALESCE(o.preenchidas, 0),
+       COALESCE(i.pendente, 0), COALESCE(i.aprovada, 0), COALESCE(i.rejeitada, 0), COALESCE(i.cancelada, 0)
+FROM ongs g
+LEFT JOIN (
+    SELECT ong_id,
+           SUM(status_vaga = 'ativa') AS ativa, SUM(status_vaga = 'inativa') AS inativa,
+           SUM(status_vaga = 'encerrada') AS encerrada, SUM(status_vaga = 'em_edicao') AS em_edicao,
+           SUM(COALESCE(num_vagas, 0)) AS ofertadas,
+           SUM(IF(num_vagas IS NULL, 0, vagas_ocupadas)) AS preenchidas
+    FROM (
+        SELECT ong_id, status_vaga, num_vagas, vagas_ocupadas FROM oportunidades
+        UNION ALL
+        SELECT ong_id, status_vaga, num_vagas, vagas_ocupadas FROM oportunidades_arquivo
+    ) todas
+    GROUP BY ong_id
+) o ON o.ong_id = g.id
+LEFT JOIN (
+    SELECT COALESCE(op.ong_id, opa.ong_id) AS ong_id,
+           SUM(ins.status_inscricao = 'pendente') AS pendente, SUM(ins.status_inscricao = 'aprovada') AS aprovada,
+           SUM(ins.status_inscricao = 'rejeitada') AS rejeitada, SUM(ins.status_inscricao = 'cancelada') AS cancelada
+    FROM (
+        SELECT oportunidade_id, status_inscricao FROM inscricoes
+        UNION ALL
+        SELECT oportunidade_id, status_inscricao FROM inscricoes_arquivo
+    ) ins
+    LEFT JOIN oportunidades op ON op.id = ins.oportunidade_id
+    LEFT JOIN oportunidades_arquivo opa ON opa.id = ins.oportunidade_id
+    GROUP BY COALESCE(op.ong_id, opa.ong_id)
+) i ON i.ong_id = g.id
+ON DUPLICATE KEY UPDATE
+    oportunidades_ativa = VALUES(oportunidades_ativa), oportunidades_inativa = VALUES(oportunidades_inativa),
+    oportunidades_encerrada = VALUES(oportunidades_encerrada), oportunidades_em_edicao = VALUES(oportunidades_em_edicao),
+    vagas_ofertadas = VALUES(vagas_ofertadas), vagas_preenchidas = VALUES(vagas_preenchidas),
+    inscricoes_pendente = VALUES(inscricoes_pendente), inscricoes_aprovada = VALUES(inscricoes_aprovada),
+    inscricoes_rejeitada = VALUES(inscricoes_rejeitada), inscricoes_cancelada = VALUES(inscricoes_cancelada)
+"""
+
+
+def recalcular():
+    """
+    Regrava painel_ongs de todas as ONGs. Retorna o número de ONGs processadas.
+    """
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS total FROM ongs")
+            total = cursor.fetchone()["total"]
+            cursor.execute(SQL_RECALCULO)
+        conn.commit()
+        logger.info("Painel recalculado para %s ONG(s)", total)
+        return total
+    finally:
+        conn.close()
+
+
+def montar_painel(linha, atividades):
+    """
+    Linha de ongs LEFT JOIN painel_ongs + atividades recentes -> resposta do endpoint.
+    ONG sem linha no resumo (nenhuma oportunidade ainda) fica com tudo zerado.
+    """
+    oportunidades = {status: linha.get(f"oportunidades_{status}") or 0 for status in STATUS_VAGA}
+    inscricoes = {status: linha.get(f"inscricoes_{status}") or 0 for status in STATUS_INSCRICAO}
+    ofertadas = linha.get("vagas_ofertadas") or 0
+    preenchidas = linha.get("vagas_preenchidas") or 0
+    return {
+        "ong_id": linha["id"],
+        "ong_nome": linha["nome"],
+        "oportunidades": {**oportunidades, "total": sum(oportunidades.values())},
+        "inscricoes": {**inscricoes, "total": sum(inscricoes.values())},
+        "vagas": {
+            "ofertadas": ofertadas,
+            "preenchidas": preenchidas,
+            "taxa_ocupacao": round(preenchidas / ofertadas, 4) if ofertadas else None,
+        },
+        "atividade_recente": atividades,
+        "atualizado_em": linha.get("atualizado_em"),
+    }
+
+
+if __name__ == "__main__":
+    from .logs import configurar_logs
+    configurar_logs()
+    if sys.argv[1:] == ["--recalcular"]:
+        print(f"ONGs recalculadas: {recalcular()}")
+    else:
+        print("Uso: python -m src.painel --recalcular")
@@ -0,0 +1,243 @@
+# backend/src/pool.py
+
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeoutError(Exception):
+    """Levantada quando nenhuma conexão fica livre dentro do timeout de checkout."""
+
+
+class PooledConnection:
+    """
+    Envelopa uma conexão PyMySQL emprestada do pool.
+    Tudo é repassado para a conexão real, exceto close(), que devolve a conexão ao pool
+    em vez de encerrar o socket. Assim as rotas continuam usando o padrão
+    `conn = get_connection()` ... `finally: conn.close()` sem alterações.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._release(self._raw, self._created_at)
+
+    def discard(self):
+        """
+        Fecha o socket em vez de devolver a conexão ao pool. Útil quando a conexão
+        ficou num estado que não vale a pena recuperar (ex.: cursor unbuffered
+        abandonado no meio do resultado).
+        """
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._drop(self._raw)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões PyMySQL limitado e thread-safe.
+
+    - min_size: conexões abertas na primeira utilização e mantidas ociosas.
+    - max_size: limite de conexões simultâneas (protege o max_connections do MySQL).
+    - recycle: idade máxima (segundos) de uma conexão antes de ser reaberta; 0 desativa.
+    - pre_ping: faz conn.ping() no checkout para descartar sockets mortos.
+    - timeout: tempo máximo (segundos) esperando uma conexão livre.
+    - connect: função/classe que abre a conexão física (padrão: pymysql.connect).
+    """
+
+    def __init__(self, connect_kwargs, min_size=1, max_size=10, recycle=3600,
+                 pre_ping=True, timeout=10.0, connect=pymysql.connect):
+        if max_size < 1:
+            raise ValueError("max_size deve ser >= 1")
+        self._connect_kwargs = connect_kwargs
+        self._connect = connect
+        self.min_size = max(0, min(min_size, max_size))
+        self.max_size = max_size
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.timeout = timeout
+
+        self._idle = deque()  # (conexão, criada_em)
+        self._size = 0        # conexões existentes (ociosas + emprestadas)
+        self._cond = threading.Condition()
+        self._filled = False
+
+        # Contadores expostos por stats()
+        self._checkouts = 0
+        self._misses = 0          # checkouts que não encontraram conexão ociosa
+        self._waits = 0           # checkouts que precisaram esperar o pool liberar
+        self._wait_time = 0.0     # soma do tempo de espera (segundos)
+        self._timeouts = 0
+        self._discarded = 0       # conexões descartadas (recycle, ping falho, erro)
+
+    # -----------------------------------------------------------------
+    # Criação / descarte de conexões físicas
+    # -----------------------------------------------------------------
+    def _open(self):
+        return self._connect(**self._connect_kwargs), time.monotonic()
+
+    def _discard(self, raw):
+        self._discarded += 1
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _fill(self):
+        # Reserva as vagas sob o lock e abre min_size conexões fora dele; chamado uma vez.
+        with self._cond:
+            count = max(0, min(self.min_size, self.max_size - self._size))
+            self._size += count
+        opened = []
+        try:
+            for _ in range(count):
+                opened.append(self._open())
+        finally:
+            with self._cond:
+                self._size -= count - len(opened)
+                self._idle.extend(opened)
+                self._cond.notify_all()
+
+    def _expired(self, created_at):
+        return self.recycle > 0 and (time.monotonic() - created_at) > self.recycle
+
+    def _alive(self, raw):
+        if not self.pre_ping:
+            return True
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    # -----------------------------------------------------------------
+    # Checkout / devolução
+    # -----------------------------------------------------------------
+    def acquire(self, timeout=None):
+        """Empresta uma conexão do pool, abrindo uma nova se houver capacidade."""
+        if not self._filled:
+            with self._cond:
+                fill = not self._filled
+                self._filled = True
+            if fill and self.min_size:
+                self._fill()
+
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = 0.0
+        with self._cond:
+            self._checkouts += 1
+            if not self._idle:
+                self._misses += 1
+
+        while True:
+            item = None
+            reserve = False
+            with self._cond:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        self._waits += 1
+                        self._wait_time += waited
+                        raise PoolTimeoutError(
+                            f"Nenhuma conexão livre no pool após {timeout:.1f}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    started = time.monotonic()
+                    self._cond.wait(remaining)
+                    waited += time.monotonic() - started
+                if waited:
+                    self._waits += 1
+                    self._wait_time += waited
+                if self._idle:
+                    item = self._idle.pop()  # LIFO: reaproveita a conexão mais "quente"
+                else:
+                    self._size += 1
+                    reserve = True
+
+            if reserve:
+                # Abre a conexão fora do lock; se falhar, libera a vaga reservada.
+                try:
+                    raw, created_at = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                return PooledConnection(self, raw, created_at)
+
+            raw, created_at = item
+            if self._expired(created_at) or not self._alive(raw):
+                self._drop(raw)
+                # Tenta de novo; o tempo já esperado continua contando para o deadline.
+                waited = 0.0
+                continue
+            return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at):
+        # Desfaz qualquer transação pendente para não vazar estado entre requisições.
+        healthy = raw.open
+        if healthy:
+            try:
+                raw.rollback()
+            except Exception:
+                healthy = False
+        if not healthy or self._expired(created_at):
+            self._drop(raw)
+            return
+        with self._cond:
+            self._idle.append((raw, created_at))
+            self._cond.notify()
+
+    def _drop(self, raw):
+        self._discard(raw)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def close(self):
+        """Fecha todas as conexões ociosas (as emprestadas fecham ao serem devolvidas)."""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._filled = False
+        for raw, _ in idle:
+            try:
+                raw.close()
+            except Exception:
+                pass
+
+    def in_use(self):
+        """Conexões emprestadas agora, lido sem lock (aproximado; serve para comparar pools)."""
+        return self._size - len(self._idle)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "checkouts": self._checkouts,
+                "misses": self._misses,
+                "waits": self._waits,
+                "wait_time_seconds": round(self._wait_time, 6),
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+            }
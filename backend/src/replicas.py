@@ -0,0 +1,296 @@
+# backend/src/replicas.py
+#
+# Leituras em réplicas do MySQL (read/write splitting). As escritas e tudo que não
+# pede explicitamente uma conexão de leitura continuam no primário (get_connection);
+# os handlers só de leitura usam get_connection_leitura(), que escolhe uma réplica
+# saudável, a menos carregada (empate: rodízio), ou cai no primário quando:
+#   - não há réplicas configuradas, ou nenhuma está saudável;
+#   - a réplica está atrasada mais que REPLICAS_ATRASO_MAXIMO segundos, com a
+#     replicação parada, ou não aceita conexão;
+#   - o cliente escreveu há menos de REPLICAS_JANELA_ESCRITA segundos (read-your-writes):
+#     toda escrita bem-sucedida devolve o cookie `tbg_escrita`, que expira após a janela.
+# A saúde é verificada por uma thread em segundo plano a cada REPLICAS_INTERVALO_SAUDE
+# segundos (SHOW REPLICA STATUS; o usuário precisa do privilégio REPLICATION CLIENT
+# para o atraso ser medido, sem ele só a conexão é verificada).
+#
+#   MYSQL_REPLICAS  réplicas separadas por vírgula, cada uma como host[:porta] ou
+#                   usuario:senha@host:porta/banco; o que faltar vem das MYSQL_* do primário
+#   REPLICAS_ATRASO_MAXIMO (padrão 2), REPLICAS_INTERVALO_SAUDE (padrão 1),
+#   REPLICAS_JANELA_ESCRITA (padrão 5; deve cobrir o atraso máximo mais um intervalo)
+
+import contextvars
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from urllib.parse import unquote, urlsplit
+
+import pymysql
+import pymysql.cursors
+
+from .database import (
+    MYSQL_DATABASE, MYSQL_HOST, MYSQL_PASSWORD, MYSQL_POOL_MAX_SIZE, MYSQL_POOL_PRE_PING,
+    MYSQL_POOL_RECYCLE, MYSQL_POOL_TIMEOUT, MYSQL_PORT, MYSQL_USER, get_connection,
+)
+from .metrics import ConexaoMedida
+from .pool import ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+MYSQL_REPLICAS = os.getenv("MYSQL_REPLICAS", "")
+REPLICAS_ATRASO_MAXIMO = float(os.getenv("REPLICAS_ATRASO_MAXIMO", 2))
+REPLICAS_INTERVALO_SAUDE = float(os.getenv("REPLICAS_INTERVALO_SAUDE", 1))
+REPLICAS_JANELA_ESCRITA = float(os.getenv("REPLICAS_JANELA_ESCRITA", 5))
+
+COOKIE_ESCRITA = "tbg_escrita"
+METODOS_LEITURA = ("GET", "HEAD")
+ER_ACESSO_NEGADO = 1227 # Falta o privilégio REPLICATION CLIENT
+
+# Verdadeiro durante a requisição de um cliente que escreveu há pouco. O run_db copia
+# o contexto para a thread do executor, então o valor chega aos handlers síncronos.
+_ler_do_primario = contextvars.ContextVar("ler_do_primario", default=False)
+
+
+def interpretar_replicas(texto):
+    """
+    "r1:3306,usuario:senha@r2:3307/banco" -> [(nome, parâmetros do pymysql.connect), ...]
+    """
+    replicas = []
+    for item in filter(None, (parte.strip() for parte in texto.split(","))):
+        url = urlsplit(item if "://" in item else "mysql://" + item)
+        parametros = dict(
+            host=url.hostname or MYSQL_HOST,
+            port=url.port or MYSQL_PORT,
+            user=unquote(url.username) if url.username else MYSQL_USER,
+            password=unquote(url.password) if url.password is not None else MYSQL_PASSWORD,
+            database=url.path.lstrip("/") or MYSQL_DATABASE,
+            cursorclass=pymysql.cursors.DictCursor,
+        )
+        replicas.append((f"{parametros['host']}:{parametros['port']}", parametros))
+    return replicas
+
+
+class Replica:
+    def __init__(self, nome, parametros):
+        self.nome = nome
+        self.parametros = parametros
+        self.pool = ConnectionPool(
+            parametros,
+            min_size=0, # Nada é aberto antes da primeira verificação de saúde
+            max_size=MYSQL_POOL_MAX_SIZE,
+            recycle=MYSQL_POOL_RECYCLE,
+            pre_ping=MYSQL_POOL_PRE_PING,
+            timeout=MYSQL_POOL_TIMEOUT,
+            connect=ConexaoMedida,
+        )
+        self.saudavel = False # Só recebe leituras depois de passar por uma verificação
+        self.atraso = None    # Segundos atrás do primário; None se não medido
+        self.erro = None
+        self.leituras = 0
+        self.falhas = 0
+        self._monitor = None  # Conexão própria da verificação de saúde, fora do pool
+
+    def _status_replicacao(self, cursor):
+        # SHOW REPLICA STATUS existe a partir do MySQL 8.0.22; antes (e no MariaDB), SLAVE
+        for sql in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+            try:
+                cursor.execute(sql)
+                return cursor.fetchone() # None: o servidor não é réplica de ninguém
+            except pymysql.err.ProgrammingError:
+                continue
+            except pymysql.err.MySQLError as e:
+                if e.args and e.args[0] == ER_ACESSO_NEGADO:
+                    return None
+                raise
+        return None
+
+    def verificar(self, atraso_maximo):
+        """
+        Atualiza saudavel/atraso/erro. Chamado só pela thread de monitoramento.
+        """
+        estava_saudavel = self.saudavel
+        try:
+            if self._monitor is None or not self._monitor.open:
+                self._monitor = pymysql.connect(**self.parametros, connect_timeout=2, read_timeout=2, write_timeout=2)
+            with self._monitor.cursor() as cursor:
+                status = self._status_replicacao(cursor)
+            if status is None:
+                self.atraso, self.erro, self.saudavel = None, None, True
+            else:
+                atraso = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+                if atraso is None:
+                    self.atraso, self.erro, self.saudavel = None, "replicação parada", False
+                else:
+                    self.atraso = float(atraso)
+                    self.erro = None if self.atraso <= atraso_maximo else f"atraso de {self.atraso:.0f}s"
+                    self.saudavel = self.erro is None
+        except Exception as e:
+            self.saudavel, self.erro = False, str(e)
+            if self._monitor is not None:
+                try:
+                    self._monitor.close()
+                except Exception:
+                    pass
+                self._monitor = None
+        if estava_saudavel and not self.saudavel:
+            logger.warning("Réplica %s fora do rodízio: %s", self.nome, self.erro)
+        elif self.saudavel and not estava_saudavel:
+            logger.info("Réplica %s disponível para leituras", self.nome)
+
+    def marcar_falha(self, erro):
+        # Falha ao emprestar conexão: sai do rodízio até a próxima verificação bem-sucedida
+        self.falhas += 1
+        self.saudavel, self.erro = False, str(erro)
+        logger.warning("Réplica %s falhou; leituras voltam ao primário: %s", self.nome, erro)
+
+    def estatisticas(self):
+        pool = self.pool.stats()
+        return {
+            "saudavel": self.saudavel,
+            "atraso_segundos": self.atraso,
+            "erro": self.erro,
+            "leituras": self.leituras,
+            "falhas": self.falhas,
+            "em_uso": pool["in_use"],
+            "conexoes": pool["size"],
+        }
+
+
+class RoteadorReplicas:
+    def __init__(self, replicas, atraso_maximo=REPLICAS_ATRASO_MAXIMO, intervalo=REPLICAS_INTERVALO_SAUDE):
+        self.replicas = [Replica(nome, parametros) for nome, parametros in replicas]
+        self.atraso_maximo = atraso_maximo
+        self.intervalo = intervalo
+        self.leituras_primario = 0 # Leituras que foram ao primário por escolha (escrita recente)
+        self.fallbacks = 0         # Leituras que foram ao primário por falta de réplica saudável
+        self._rodizio = itertools.count()
+        self._monitor = None
+        self._monitor_lock = threading.Lock()
+        self._parar = threading.Event()
+
+    @property
+    def ativo(self):
+        return bool(self.replicas)
+
+    def iniciar_monitor(self):
+        if self._monitor is not None or not self.ativo:
+            return
+        with self._monitor_lock:
+            if self._monitor is None:
+                self._monitor = threading.Thread(target=self._monitorar, name="replicas-saude", daemon=True)
+                self._monitor.start()
+
+    def _monitorar(self):
+        while True:
+            for replica in self.replicas:
+                replica.verificar(self.atraso_maximo)
+            if self._parar.wait(self.intervalo):
+                return
+
+    def parar(self):
+        self._parar.set()
+        for replica in self.replicas:
+            replica.pool.close()
+
+    def escolher(self):
+        """
+        Réplica saudável com menos conexões emprestadas; no empate, rodízio.
+        """
+        saudaveis = [replica for replica in self.replicas if replica.saudavel]
+        if not saudaveis:
+            return None
+        deslocamento = next(self._rodizio)
+        ordem = saudaveis[deslocamento % len(saudaveis):] + saudaveis[:deslocamento % len(saudaveis)]
+        return min(ordem, key=lambda replica: replica.pool.in_use())
+
+    def conexao_leitura(self):
+        if not self.ativo:
+            return get_connection()
+        if _ler_do_primario.get():
+            self.leituras_primario += 1
+            return get_connection()
+        self.iniciar_monitor()
+        replica = self.escolher()
+        if replica is not None:
+            try:
+                conn = replica.pool.acquire()
+                replica.leituras += 1
+                return conn
+            except Exception as e:
+                replica.marcar_falha(e)
+        self.fallbacks += 1
+        return get_connection()
+
+    def estatisticas(self):
+        if not self.ativo:
+            return None
+        return {
+            "leituras_primario_apos_escrita": self.leituras_primario,
+            "fallbacks_primario": self.fallbacks,
+            "replicas": {replica.nome: replica.estatisticas() for replica in self.replicas},
+        }
+
+
+# Roteador do processo, configurado por MYSQL_REPLICAS
+roteador_replicas = RoteadorReplicas(interpretar_replicas(MYSQL_REPLICAS))
+
+
+def get_connection_leitura():
+    """
+    Conexão para handlers que só leem: réplica quando possível, primário caso contrário.
+    Mesmo uso de get_connection(): conn.close() devolve a conexão ao pool de origem.
+    """
+    return roteador_replicas.conexao_leitura()
+
+
+def replicas_stats():
+    return roteador_replicas.estatisticas()
+
+
+def _escreveu_recentemente(scope):
+    for nome, valor in scope["headers"]:
+        if nome == b"cookie":
+            for parte in valor.decode("latin-1").split(";"):
+                chave, _, momento = parte.strip().partition("=")
+                if chave == COOKIE_ESCRITA:
+                    try:
+                        return time.time() - float(momento) < REPLICAS_JANELA_ESCRITA
+                    except ValueError:
+                        return False
+    return False
+
+
+class MiddlewareLeituraAposEscrita:
+    """
+    Middleware ASGI do read-your-writes: marca as respostas de escritas bem-sucedidas
+    com o cookie `tbg_escrita` e faz as leituras de quem o envia (dentro da janela)
+    irem ao primário. Sem réplicas configuradas, só repassa a requisição.
+    """
+
+    def __init__(self, app, roteador=None):
+        self.app = app
+        self.roteador = roteador or roteador_replicas
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.roteador.ativo:
+            return await self.app(scope, receive, send)
+
+        if scope["method"] in METODOS_LEITURA:
+            if not _escreveu_recentemente(scope):
+                return await self.app(scope, receive, send)
+            marcador = _ler_do_primario.set(True)
+            try:
+                return await self.app(scope, receive, send)
+            finally:
+                _ler_do_primario.reset(marcador)
+
+        async def send_com_cookie(mensagem):
+            if mensagem["type"] == "http.response.start" and mensagem["status"] < 400:
+                cookie = (f"{COOKIE_ESCRITA}={time.time():.3f}; Max-Age={math.ceil(REPLICAS_JANELA_ESCRITA)}; "
+                          "Path=/; SameSite=Lax; HttpOnly")
+                mensagem = {**mensagem, "headers": [*mensagem.get("headers", []), (b"set-cookie", cookie.encode("latin-1"))]}
+            await send(mensagem)
+
+        await self.app(scope, receive, send_com_cookie)
@@ -0,0 +1,200 @@
+# backend/src/routes/export_routes.py
+
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+import pymysql.cursors
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from ..carregadores import COLUNAS_VOLUNTARIOS # A senha nunca sai na exportação
+from ..database import get_connection, run_db
+from ..datas import formatar_oportunidade
+
+router = APIRouter(
+    prefix="/exportacoes", # Prefixo para todas as rotas de exportação
+    tags=["Exportações"]
+)
+
+# Linhas lidas do servidor MySQL por vez; cada lote vira um chunk da resposta
+TAMANHO_LOTE = 500
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# =========================================================
+# Streaming de resultados
+# =========================================================
+# As exportações usam um cursor unbuffered (SSDictCursor): o MySQL envia as linhas
+# conforme são lidas, em vez de o PyMySQL carregar o resultado inteiro na memória.
+# Cada lote é serializado e enviado ao cliente antes de o próximo ser lido, então o
+# uso de memória não depende do número de linhas.
+
+def _valor_json(valor):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, timedelta): # Colunas TIME chegam como timedelta
+        segundos = int(valor.total_seconds())
+        return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}"
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+def _valor_csv(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, (datetime, date, timedelta, Decimal)):
+        return _valor_json(valor)
+    return valor
+
+def _lote_ndjson(linhas):
+    return "".join(
+        json.dumps(linha, ensure_ascii=False, default=_valor_json) + "\n" for linha in linhas
+    ).encode()
+
+def _lote_csv(linhas, colunas, cabecalho=False):
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    if cabecalho:
+        escritor.writerow(colunas)
+    for linha in linhas:
+        escritor.writerow([_valor_csv(linha[coluna]) for coluna in colunas])
+    return buffer.getvalue().encode()
+
+async def _transmitir(sql, valores, colunas, formato, transformar=None):
+    # O cabeçalho do CSV sai antes mesmo de a query ser enviada ao banco
+    if formato == "csv":
+        yield _lote_csv([], colunas, cabecalho=True)
+
+    conn = await run_db(get_connection)
+    cursor = None
+    concluido = False
+    try:
+        cursor = conn.cursor(pymysql.cursors.SSDictCursor)
+        await run_db(cursor.execute, sql, valores)
+        while True:
+            linhas = await run_db(cursor.fetchmany, TAMANHO_LOTE)
+            if not linhas:
+                break
+            if transformar:
+                linhas = [transformar(linha) for linha in linhas]
+            yield _lote_ndjson(linhas) if formato == "ndjson" else _lote_csv(linhas, colunas)
+        concluido = True
+    finally:
+        # Limpeza síncrona: se o cliente desconectou, a tarefa está sendo cancelada e
+        # não pode mais aguardar o executor. Um cursor unbuffered abandonado no meio
+        # deixaria o socket com linhas pendentes, então a conexão é descartada.
+        if concluido:
+            cursor.close()
+            conn.close()
+        else:
+            conn.discard()
+
+def _resposta(nome, sql, valores, colunas, formato, transformar=None):
+    return StreamingResponse(
+        _transmitir(sql, valores, colunas, formato, transformar),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome}.{formato}"'},
+    )
+
+# =========================================================
+# Endpoints de Exportação
+# =========================================================
+
+COLUNAS_OPORTUNIDADES = [
+    "id", "data_publicacao", "titulo", "descricao", "ong_id", "ong_nome", "endereco",
+    "data_inicio", "data_termino", "hora_inicio", "hora_termino",
+    "perfil_voluntario", "num_vagas", "status_vaga", "tipo_acao",
+]
+
+@router.get("/oportunidades") # Rota: /exportacoes/oportunidades
+async def exportar_oportunidades(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    ong_id: Optional[int] = None,
+):
+    """
+    Endpoint GET que exporta oportunidades em NDJSON ou CSV, em streaming.
+    """
+    sql = """
+        SELECT
+            o.id, o.data_publicacao, o.titulo, o.descricao, o.ong_id,
+            ongs.nome AS ong_nome,
+            o.endereco,
+            o.data_inicio, o.data_termino, o.hora_inicio, o.hora_termino,
+            o.perfil_voluntario, o.num_vagas, o.status_vaga, o.tipo_acao
+        FROM oportunidades o
+        JOIN ongs ON o.ong_id = ongs.id
+    """
+    valores = []
+    if ong_id is not None:
+        sql += " WHERE o.ong_id = %s"
+        valores.append(ong_id)
+    sql += " ORDER BY o.id"
+    # Datas e horas no mesmo formato de texto da API (DD/MM/AAAA e HH:MM)
+    return _resposta("oportunidades", sql, tuple(valores), COLUNAS_OPORTUNIDADES, formato, formatar_oportunidade)
+
+@router.get("/voluntarios") # Rota: /exportacoes/voluntarios
+async def exportar_voluntarios(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    ong_id: Optional[int] = None,
+):
+    """
+    Endpoint GET que exporta voluntários em NDJSON ou CSV, em streaming.
+    Com `ong_id`, exporta apenas voluntários inscritos em oportunidades da ONG.
+    """
+    sql = f"SELECT {', '.join('v.' + coluna for coluna in COLUNAS_VOLUNTARIOS)} FROM voluntarios v"
+    valores = []
+    if ong_id is not None:
+        sql += """
+            WHERE EXISTS (
+                SELECT 1 FROM inscricoes i
+                JOIN oportunidades o ON i.oportunidade_id = o.id
+                WHERE i.voluntario_id = v.id AND o.ong_id = %s
+            )
+        """
+        valores.append(ong_id)
+    sql += " ORDER BY v.id"
+    return _resposta("voluntarios", sql, tuple(valores), COLUNAS_VOLUNTARIOS, formato)
+
+COLUNAS_INSCRICOES = [
+    "id", "oportunidade_id", "oportunidade_titulo", "voluntario_id",
+    "voluntario_nome", "voluntario_email", "data_inscricao", "status_inscricao",
+]
+
+@router.get("/inscricoes") # Rota: /exportacoes/inscricoes
+async def exportar_inscricoes(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    ong_id: Optional[int] = None,
+    oportunidade_id: Optional[int] = None,
+):
+    """
+    Endpoint GET que exporta inscrições em NDJSON ou CSV, em streaming.
+    Pode ser filtrado por ONG e/ou oportunidade.
+    """
+    sql = """
+        SELECT
+            i.id, i.oportunidade_id, o.titulo AS oportunidade_titulo, i.voluntario_id,
+            v.nome AS voluntario_nome, v.email AS voluntario_email,
+            i.data_inscricao, i.status_inscricao
+        FROM inscricoes i
+        JOIN oportunidades o ON i.oportunidade_id = o.id
+        JOIN voluntarios v ON i.voluntario_id = v.id
+    """
+    condicoes = []
+    valores = []
+    if ong_id is not None:
+        condicoes.append("o.ong_id = %s")
+        valores.append(ong_id)
+    if oportunidade_id is not None:
+        condicoes.append("i.oportunidade_id = %s")
+        valores.append(oportunidade_id)
+    if condicoes:
+        sql += " WHERE " + " AND ".join(condicoes)
+    sql += " ORDER BY i.id"
+    return _resposta("inscricoes", sql, tuple(valores), COLUNAS_INSCRICOES, formato)
@@ -0,0 +1,418 @@
+# backend/src/routes/inscription_routes.py
+
+import logging
+from datetime import date
+from typing import Optional
+
+import pymysql
+from fastapi import APIRouter, HTTPException, status, Query, Response
+
+from ..database import get_connection, run_db
+from ..arquivo import unir_com_arquivo
+from ..datas import texto_para_data
+from ..models import DadosInscricao, AtualizacaoInscricao
+from ..pagination import HEADER_PROXIMO_CURSOR, LIMITE_MAXIMO, decodificar_cursor, fatiar_pagina
+from ..vagas import controle_vagas
+from ..matching import motor_matching
+from ..agenda import AGENDA_BLOQUEAR_CONFLITOS, carregar_compromissos, compromisso, indice_agenda
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/inscricoes", # Prefixo para todas as rotas de inscrições
+    tags=["Inscrições"]
+)
+
+# Status de inscrição que ocupam uma vaga da oportunidade
+STATUS_OCUPAM_VAGA = ("pendente", "aprovada")
+
+ER_DUP_ENTRY = 1062
+ER_NO_REFERENCED_ROW = 1452 # Chave estrangeira sem linha correspondente
+
+# =========================================================
+# Reserva de vagas
+# =========================================================
+# A vaga é reservada com um UPDATE condicional na linha da oportunidade:
+#   vagas_ocupadas = vagas_ocupadas + 1 WHERE ... vagas_ocupadas < num_vagas
+# O InnoDB trava só essa linha até o commit, então inscrições simultâneas na mesma
+# oportunidade são serializadas sem lock de tabela e nunca passam de num_vagas.
+# Inscrições em oportunidades diferentes só disputam um lock quando são do mesmo
+# voluntário: a linha dele (_travar_voluntario), para a verificação de conflito de horário.
+
+def _reservar_vaga(cursor, oportunidade_id: int):
+    cursor.execute(
+        """UPDATE oportunidades SET vagas_ocupadas = vagas_ocupadas + 1
+        WHERE id = %s AND status_vaga = 'ativa'
+          AND (num_vagas IS NULL OR vagas_ocupadas < num_vagas)""",
+        (oportunidade_id,)
+    )
+    if cursor.rowcount == 1:
+        return
+    # Nenhuma linha alterada: descobre o motivo para responder com o erro certo
+    cursor.execute("SELECT status_vaga FROM oportunidades WHERE id = %s", (oportunidade_id,))
+    oportunidade = cursor.fetchone()
+    if not oportunidade:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
+    if oportunidade["status_vaga"] != "ativa":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Oportunidade não está aceitando inscrições")
+    controle_vagas.marcar_esgotada(oportunidade_id)
+    raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Não há mais vagas para esta oportunidade")
+
+def _liberar_vaga(cursor, oportunidade_id: int):
+    cursor.execute(
+        "UPDATE oportunidades SET vagas_ocupadas = vagas_ocupadas - 1 WHERE id = %s AND vagas_ocupadas > 0",
+        (oportunidade_id,)
+    )
+
+def _data_nascimento(texto: str):
+    # O formulário envia AAAA-MM-DD (input type="date"); aceita também DD/MM/AAAA
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        try:
+            return texto_para_data(texto)
+        except ValueError:
+            return None
+
+def _resolver_voluntario(cursor, dados: DadosInscricao):
+    """
+    Retorna o id do voluntário da inscrição. Sem voluntario_id no payload, procura pelo CPF
+    e, se não existir, cria um cadastro mínimo (mesma abordagem de criar_oportunidade com ONGs).
+    """
+    if dados.voluntario_id is not None:
+        return dados.voluntario_id
+    cursor.execute("SELECT id FROM voluntarios WHERE cpf = %s", (dados.cpf,))
+    existente = cursor.fetchone()
+    if existente:
+        return existente["id"]
+    cpf_digitos = "".join(c for c in dados.cpf if c.isdigit())
+    cursor.execute(
+        "INSERT INTO voluntarios (nome, email, senha, cpf, data_nascimento) VALUES (%s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)",
+        (dados.nome, f"{cpf_digitos}@temp.com", "temp_pass", dados.cpf, _data_nascimento(dados.nascimento))
+    )
+    if cursor.rowcount == 1 and motor_matching.ativo:
+        # Cadastro mínimo (rowcount 1 = inserido): sem interesses nem disponibilidade declarados
+        motor_matching.atualizar_voluntario(cursor.lastrowid, {})
+    return cursor.lastrowid
+
+def _inscricao_existente(cursor, oportunidade_id: int, voluntario_id: int):
+    cursor.execute(
+        "SELECT id, status_inscricao FROM inscricoes WHERE oportunidade_id = %s AND voluntario_id = %s",
+        (oportunidade_id, voluntario_id)
+    )
+    return cursor.fetchone()
+
+def _travar_voluntario(cursor, voluntario_id: int):
+    """
+    Trava a linha do voluntário até o commit: inscrições simultâneas do mesmo voluntário
+    (em oportunidades diferentes) passam pela verificação de agenda uma de cada vez.
+    Precisa vir antes de qualquer leitura da transação, para que a leitura seguinte já
+    enxergue a inscrição que a outra acabou de commitar.
+    """
+    cursor.execute("SELECT id FROM voluntarios WHERE id = %s FOR UPDATE", (voluntario_id,))
+    if not cursor.fetchone():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voluntário não encontrado")
+
+def _verificar_agenda(cursor, oportunidade_id: int, voluntario_id: int):
+    """
+    Compromisso da oportunidade pedida (para registrar na agenda depois do commit). Com
+    AGENDA_BLOQUEAR_CONFLITOS, recusa com 409 se o horário dela conflita com outra
+    inscrição pendente ou aprovada do voluntário. A agenda é lida do banco nesta transação
+    (com o voluntário já travado por _travar_voluntario), não do cache, que pode não ter
+    inscrições feitas por outro processo.
+    """
+    cursor.execute(
+        "SELECT titulo, data_inicio, data_termino, hora_inicio, hora_termino FROM oportunidades WHERE id = %s",
+        (oportunidade_id,)
+    )
+    linha = cursor.fetchone()
+    if not linha:
+        return None # _reservar_vaga responde o 404
+    candidato = compromisso({**linha, "oportunidade_id": oportunidade_id, "status": "pendente"})
+    if AGENDA_BLOQUEAR_CONFLITOS:
+        conflitos = indice_agenda.conflitos(
+            voluntario_id, candidato, lambda vid: carregar_compromissos(cursor, vid), recarregar=True)
+        if conflitos:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Conflito de horário com: " + "; ".join(c.descricao() for c in conflitos)
+            )
+    return candidato
+
+def _resposta_existente(response: Response, inscricao: dict):
+    # Reenvio da mesma inscrição: responde com a inscrição existente (idempotente)
+    response.status_code = status.HTTP_200_OK
+    return {
+        "success": True,
+        "id": inscricao["id"],
+        "status": inscricao["status_inscricao"],
+        "ja_inscrito": True,
+    }
+
+# =========================================================
+# Endpoints de Inscrições
+# =========================================================
+# Cada endpoint `async` delega o trabalho com PyMySQL (bloqueante) para a função
+# síncrona `_<nome>` correspondente, executada via run_db() no executor do banco.
+
+def _criar_inscricao(dados: DadosInscricao, response: Response):
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            voluntario_id = _resolver_voluntario(cursor, dados)
+            conn.commit()
+            _travar_voluntario(cursor, voluntario_id)
+
+            # Caminho barato para reenvios: não toca na linha da oportunidade
+            existente = _inscricao_existente(cursor, dados.oportunidade_id, voluntario_id)
+            if existente and existente["status_inscricao"] != "cancelada":
+                return _resposta_existente(response, existente)
+
+            candidato = _verificar_agenda(cursor, dados.oportunidade_id, voluntario_id)
+            _reservar_vaga(cursor, dados.oportunidade_id)
+            if existente:
+                # Voluntário que tinha cancelado se inscreve de novo. A condição no status faz
+                # só uma de duas reinscrições simultâneas vencer; a outra desfaz a vaga reservada
+                cursor.execute(
+                    "UPDATE inscricoes SET status_inscricao = 'pendente', mensagem = %s, "
+                    "data_inscricao = CURRENT_TIMESTAMP WHERE id = %s AND status_inscricao = 'cancelada'",
+                    (dados.mensagem, existente["id"])
+                )
+                if cursor.rowcount == 0:
+                    conn.rollback()
+                    return _resposta_existente(
+                        response, _inscricao_existente(cursor, dados.oportunidade_id, voluntario_id)
+                    )
+                inscricao_id = existente["id"]
+            else:
+                try:
+                    cursor.execute(
+                        "INSERT INTO inscricoes (oportunidade_id, voluntario_id, mensagem) VALUES (%s, %s, %s)",
+                        (dados.oportunidade_id, voluntario_id, dados.mensagem)
+                    )
+                except pymysql.err.IntegrityError as e:
+                    if e.args[0] == ER_NO_REFERENCED_ROW:
+                        # voluntario_id inexistente (ou a oportunidade apagada depois da reserva)
+                        detalhe = "Voluntário não encontrado" if "voluntario_id" in str(e) else "Oportunidade não encontrada"
+                        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detalhe)
+                    if e.args[0] != ER_DUP_ENTRY:
+                        raise
+                    # Outra requisição do mesmo voluntário venceu a corrida: desfaz a reserva
+                    conn.rollback()
+                    return _resposta_existente(
+                        response, _inscricao_existente(cursor, dados.oportunidade_id, voluntario_id)
+                    )
+                inscricao_id = cursor.lastrowid
+            conn.commit()
+            if candidato is not None:
+                candidato.inscricao_id = inscricao_id
+                indice_agenda.registrar(voluntario_id, candidato)
+            return {"success": True, "id": inscricao_id, "status": "pendente", "ja_inscrito": False}
+    except HTTPException as he:
+        if conn:
+            conn.rollback()
+        raise he
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        logger.exception("Erro ao criar inscrição")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+def _recusar_esgotada(dados: DadosInscricao, response: Response):
+    """
+    Oportunidade marcada como esgotada: sem transação nem lock na linha dela, só confere se
+    é o reenvio de uma inscrição que já ocupa vaga (devolve a existente, como
+    _criar_inscricao); senão, 409.
+    """
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            voluntario_id = dados.voluntario_id
+            if voluntario_id is None:
+                cursor.execute("SELECT id FROM voluntarios WHERE cpf = %s", (dados.cpf,))
+                voluntario = cursor.fetchone()
+                voluntario_id = voluntario["id"] if voluntario else None
+            existente = None
+            if voluntario_id is not None:
+                existente = _inscricao_existente(cursor, dados.oportunidade_id, voluntario_id)
+        if existente and existente["status_inscricao"] != "cancelada":
+            return _resposta_existente(response, existente)
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Não há mais vagas para esta oportunidade")
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao conferir inscrição em oportunidade esgotada")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED) # Rota: /inscricoes/
+async def criar_inscricao(dados: DadosInscricao, response: Response):
+    """
+    Endpoint POST para inscrever um voluntário numa oportunidade.
+    Reserva uma vaga de forma atômica e responde 409 quando não há mais vagas ou quando
+    o horário conflita com outra inscrição pendente/aprovada do voluntário.
+    Reenviar a mesma inscrição (mesma oportunidade e voluntário) devolve a existente com 200,
+    também depois que a oportunidade esgotou.
+    """
+    # Oportunidade já conhecida como esgotada: recusa sem reservar nada, com uma consulta
+    # só para reconhecer reenvios
+    if controle_vagas.esgotada(dados.oportunidade_id):
+        return await run_db(_recusar_esgotada, dados, response)
+    return await run_db(_criar_inscricao, dados, response)
+
+def _atualizar_status_inscricao(inscricao_id: int, novo_status: str):
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            # O voluntário de uma inscrição não muda: lido antes, numa transação à parte, para
+            # travar o voluntário antes da inscrição (mesma ordem de _criar_inscricao)
+            cursor.execute("SELECT voluntario_id FROM inscricoes WHERE id = %s", (inscricao_id,))
+            inscricao = cursor.fetchone()
+            if not inscricao:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inscrição não encontrada")
+            conn.commit()
+            _travar_voluntario(cursor, inscricao["voluntario_id"])
+
+            cursor.execute(
+                "SELECT oportunidade_id, voluntario_id, status_inscricao FROM inscricoes WHERE id = %s FOR UPDATE",
+                (inscricao_id,)
+            )
+            inscricao = cursor.fetchone()
+            if not inscricao:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Inscrição não encontrada")
+
+            oportunidade_id = inscricao["oportunidade_id"]
+            ocupava = inscricao["status_inscricao"] in STATUS_OCUPAM_VAGA
+            ocupa = novo_status in STATUS_OCUPAM_VAGA
+            if ocupa and not ocupava:
+                # Reativar (cancelada/rejeitada -> pendente/aprovada) volta para a agenda:
+                # mesma verificação de conflito da inscrição nova
+                _verificar_agenda(cursor, oportunidade_id, inscricao["voluntario_id"])
+                _reservar_vaga(cursor, oportunidade_id)
+            elif ocupava and not ocupa:
+                _liberar_vaga(cursor, oportunidade_id)
+
+            cursor.execute(
+                "UPDATE inscricoes SET status_inscricao = %s WHERE id = %s",
+                (novo_status, inscricao_id)
+            )
+            conn.commit()
+            if ocupava and not ocupa:
+                controle_vagas.liberar(oportunidade_id)
+            if ocupava != ocupa:
+                # Entrou ou saiu da agenda: recarregada na próxima consulta
+                indice_agenda.invalidar_voluntario(inscricao["voluntario_id"])
+            return {"success": True, "id": inscricao_id, "status": novo_status}
+    except HTTPException as he:
+        if conn:
+            conn.rollback()
+        raise he
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        logger.exception("Erro ao atualizar status da inscrição")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.patch("/{inscricao_id}/", response_model=dict) # Rota: /inscricoes/{inscricao_id}/
+async def atualizar_status_inscricao(inscricao_id: int, dados: AtualizacaoInscricao):
+    """
+    Endpoint PATCH para alterar o status de uma inscrição (aprovar, rejeitar, cancelar...).
+    Rejeitar ou cancelar libera a vaga; reativar uma inscrição precisa de vaga livre e,
+    como uma inscrição nova, responde 409 se o horário conflita com a agenda do voluntário.
+    """
+    return await run_db(_atualizar_status_inscricao, inscricao_id, dados.status)
+
+def _consultar_inscricoes(oportunidade_id: Optional[int], voluntario_id: Optional[int],
+                          limite: Optional[int], cursor_pagina: Optional[str], incluir_arquivo: bool = False):
+    conn = None
+    try:
+        condicoes = []
+        valores = []
+        if oportunidade_id is not None:
+            condicoes.append("i.oportunidade_id = %s")
+            valores.append(oportunidade_id)
+        if voluntario_id is not None:
+            condicoes.append("i.voluntario_id = %s")
+            valores.append(voluntario_id)
+        # Paginação por chave (keyset) no id, em ordem crescente
+        if cursor_pagina:
+            (ultimo_id,) = decodificar_cursor(cursor_pagina, (int,))
+            condicoes.append("i.id > %s")
+            valores.append(ultimo_id)
+
+        sql = """
+            SELECT
+                i.id, i.oportunidade_id, o.titulo AS oportunidade_titulo,
+                i.voluntario_id, v.nome AS voluntario_nome,
+                i.data_inscricao, i.status_inscricao, i.mensagem
+            FROM inscricoes i
+            JOIN oportunidades o ON i.oportunidade_id = o.id
+            JOIN voluntarios v ON i.voluntario_id = v.id
+        """
+        where = " WHERE " + " AND ".join(condicoes) if condicoes else ""
+        # Uma linha extra indica se existe próxima página
+        limite_sql = limite + 1 if limite is not None else None
+        if incluir_arquivo:
+            # Os ids do arquivo são os da tabela quente: a ordem por id continua valendo
+            sql_arquivo = """
+                SELECT
+                    i.id, i.oportunidade_id, COALESCE(o.titulo, oa.titulo) AS oportunidade_titulo,
+                    i.voluntario_id, v.nome AS voluntario_nome,
+                    i.data_inscricao, i.status_inscricao, i.mensagem
+                FROM inscricoes_arquivo i
+                LEFT JOIN oportunidades o ON i.oportunidade_id = o.id
+                LEFT JOIN oportunidades_arquivo oa ON i.oportunidade_id = oa.id
+                JOIN voluntarios v ON i.voluntario_id = v.id
+            """
+            sql, valores = unir_com_arquivo([(sql + where, valores), (sql_arquivo + where, valores)], "id", limite_sql)
+        else:
+            sql += where + " ORDER BY i.id"
+            if limite_sql is not None:
+                sql += " LIMIT %s"
+                valores.append(limite_sql)
+
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            cursor.execute(sql, tuple(valores))
+            linhas = cursor.fetchall()
+        return fatiar_pagina(linhas, limite, lambda linha: (linha["id"],))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao consultar inscrições")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.get("/") # Rota: /inscricoes/
+async def consultar_inscricoes(
+    response: Response,
+    oportunidade_id: Optional[int] = None,
+    voluntario_id: Optional[int] = None,
+    limite: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    incluir_arquivo: bool = False,
+):
+    """
+    Endpoint GET para listar inscrições, com filtros opcionais por oportunidade e voluntário.
+    Com `limite`, a resposta é paginada por cursor (header X-Proximo-Cursor).
+    As inscrições arquivadas só vêm com `incluir_arquivo=1`.
+    """
+    linhas, proximo_cursor = await run_db(
+        _consultar_inscricoes, oportunidade_id, voluntario_id, limite, cursor, incluir_arquivo)
+    if proximo_cursor:
+        response.headers[HEADER_PROXIMO_CURSOR] = proximo_cursor
+    return linhas
@@ -0,0 +1,71 @@
+# backend/src/routes/ong_routes.py
+
+import logging
+
+from fastapi import APIRouter, HTTPException, status, Query
+
+from ..database import get_connection, run_db
+from ..models import PainelOng
+from ..painel import montar_painel
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/ongs",
+    tags=["ONGs"]
+)
+
+LIMITE_ATIVIDADE_MAXIMO = 50
+
+# =========================================================
+# Painel da ONG
+# =========================================================
+# Os números vêm da tabela de resumo painel_ongs, mantida pelos triggers da
+# migração 0006: a leitura é uma busca por chave primária mais as últimas linhas
+# de atividade_ongs pelo índice (ong_id, id), sem varrer oportunidades/inscricoes.
+
+def _painel_ong(ong_id: int, limite_atividade: int):
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            cursor.execute(
+                """SELECT g.id, g.nome, p.*
+                FROM ongs g
+                LEFT JOIN painel_ongs p ON p.ong_id = g.id
+                WHERE g.id = %s""",
+                (ong_id,),
+            )
+            linha = cursor.fetchone()
+            if linha is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="ONG não encontrada")
+            cursor.execute(
+                """SELECT id, tipo, descricao, oportunidade_id, inscricao_id, criado_em
+                FROM atividade_ongs
+                WHERE ong_id = %s
+                ORDER BY id DESC
+                LIMIT %s""",
+                (ong_id, limite_atividade),
+            )
+            atividades = cursor.fetchall()
+        return montar_painel(linha, atividades)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao montar o painel da ONG")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.get("/{ong_id}/painel", response_model=PainelOng)
+async def painel_ong(
+    ong_id: int,
+    atividades: int = Query(10, ge=0, le=LIMITE_ATIVIDADE_MAXIMO),
+):
+    """
+    Painel da ONG: oportunidades por status_vaga, inscrições por status_inscricao,
+    vagas preenchidas x ofertadas e as `atividades` mais recentes (padrão 10).
+    O custo não depende do tamanho das tabelas de oportunidades e inscrições.
+    """
+    return await run_db(_painel_ong, ong_id, atividades)
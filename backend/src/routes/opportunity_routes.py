@@ -1,17 +1,36 @@
 # backend/src/routes/opportunity_routes.py
 
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi.responses import JSONResponse
-from typing import List # Essencial para o 'response_model=List[...]'
-from datetime import datetime # Necessário para o tipo datetime em OportunidadeResponse
+import logging
+import time
+from fastapi import APIRouter, Body, Header, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Any, List, Optional # Essencial para o 'response_model=List[...]'
+from pydantic import TypeAdapter, ValidationError
+from datetime import date, datetime # Necessário para o tipo datetime em OportunidadeResponse
 
 # Importar os modelos corretos
 # Certifique-se de que OportunidadeONG e OportunidadeUpdate estão definidos corretamente
 # OportunidadeONG para POST (criação)
 # OportunidadeUpdate para PATCH (atualização parcial) - deve ter campos Optional
 # OportunidadeResponse para GET (resposta)
-from ..models import OportunidadeONG, OportunidadeUpdate, OportunidadeResponse
-from ..database import get_connection
+from ..models import OportunidadeONG, OportunidadeUpdate, OportunidadeResponse, ResultadoBusca, OportunidadeProxima
+from ..database import get_connection, run_db
+from ..replicas import REPLICAS_JANELA_ESCRITA, get_connection_leitura
+from ..pagination import HEADER_PROXIMO_CURSOR, LIMITE_MAXIMO, decodificar_cursor, fatiar_pagina, interpretar_ids
+from ..carregadores import COLUNAS_LISTAGEM, carregar_oportunidades
+from ..search import indice_oportunidades
+from ..cache import cache_oportunidades, etag_versao, resposta_com_etag, versoes_do_if_match
+from ..datas import formatar_oportunidade, parametros_oportunidade, texto_para_data, texto_para_hora
+from ..vagas import controle_vagas
+from ..matching import motor_matching, carregar_motor, atualizar_oportunidade_matching
+from ..geocoding import localizar_endereco
+from ..spatial import indice_proximidade
+from ..serializacao import CAMPOS_OPORTUNIDADE, interpretar_campos, serializar_linhas
+from ..eventos import HEADERS_SSE, RESET, broker_oportunidades
+from ..arquivo import unir_com_arquivo
+from ..agenda import indice_agenda
+
+logger = logging.getLogger(__name__)
 
 # Define o roteador para oportunidades.
 router = APIRouter(
@@ -19,80 +38,474 @@ router = APIRouter(
     tags=["Oportunidades"]
 )
 
+# Serializador usado para gravar a resposta do detalhe no cache já em JSON
+# (a listagem usa o caminho rápido de src/serializacao.py)
+_OPORTUNIDADE = TypeAdapter(OportunidadeResponse)
+
+def _serializar(adaptador, dados):
+    # Valida e serializa como o response_model faria (campos extras, como ong_id, ficam de fora)
+    return adaptador.dump_json(adaptador.validate_python(dados))
+
 # =========================================================
 # Endpoints de Oportunidades
 # =========================================================
+# Cada endpoint `async` delega o trabalho com PyMySQL (bloqueante) para a função
+# síncrona `_<nome>` correspondente, executada via run_db() no executor do banco.
+
+def _conexao_leitura():
+    """
+    Conexão das leituras que vão para o cache de respostas: réplica quando possível.
+    Logo depois de uma escrita (REPLICAS_JANELA_ESCRITA), a réplica pode ainda não ter
+    a mudança e a resposta antiga ficaria no cache para todos até o TTL: lê do primário.
+    """
+    if time.monotonic() - cache_oportunidades.invalidada_em < REPLICAS_JANELA_ESCRITA:
+        return get_connection()
+    return get_connection_leitura()
+
+def _consultar_oportunidades(filtros: dict, limite: Optional[int], cursor_pagina: Optional[str],
+                             campos=CAMPOS_OPORTUNIDADE, incluir_arquivo: bool = False):
+    conn = None
+    try:
+        condicoes = []
+        valores = []
+        if filtros.get("status_vaga"):
+            condicoes.append("o.status_vaga = %s")
+            valores.append(filtros["status_vaga"])
+        if filtros.get("tipo_acao"):
+            condicoes.append("o.tipo_acao = %s")
+            valores.append(filtros["tipo_acao"])
+        if filtros.get("ong_id") is not None:
+            condicoes.append("o.ong_id = %s")
+            valores.append(filtros["ong_id"])
+        if filtros.get("publicada_de"):
+            condicoes.append("o.data_publicacao >= %s")
+            valores.append(filtros["publicada_de"])
+        if filtros.get("publicada_ate"):
+            condicoes.append("o.data_publicacao <= %s")
+            valores.append(filtros["publicada_ate"])
+        if filtros.get("inicio_de"):
+            condicoes.append("o.data_inicio >= %s")
+            valores.append(filtros["inicio_de"])
+        if filtros.get("inicio_ate"):
+            condicoes.append("o.data_inicio <= %s")
+            valores.append(filtros["inicio_ate"])
+        # Paginação por chave (keyset) em (data_publicacao, id), do mais recente para o mais antigo
+        if cursor_pagina:
+            ultima_publicacao, ultimo_id = decodificar_cursor(cursor_pagina, (datetime, int))
+            condicoes.append("(o.data_publicacao < %s OR (o.data_publicacao = %s AND o.id < %s))")
+            valores.extend([ultima_publicacao, ultima_publicacao, ultimo_id])
+
+        # id e data_publicacao sempre vêm do banco: são a chave da paginação.
+        # Sem ong_nome, o JOIN é dispensado (ong_id é NOT NULL com chave estrangeira).
+        selecionados = dict.fromkeys(("id", "data_publicacao", *campos))
+        def consulta(tabela):
+            sql = f"SELECT {', '.join(COLUNAS_LISTAGEM[campo] for campo in selecionados)} FROM {tabela} o"
+            if "ong_nome" in selecionados:
+                sql += " JOIN ongs ON o.ong_id = ongs.id"
+            if condicoes:
+                sql += " WHERE " + " AND ".join(condicoes)
+            return sql
+        # Uma linha extra indica se existe próxima página
+        limite_sql = limite + 1 if limite is not None else None
+        # Ordem estável: o id desempata publicações com o mesmo timestamp
+        if incluir_arquivo:
+            sql, valores = unir_com_arquivo(
+                [(consulta("oportunidades"), valores), (consulta("oportunidades_arquivo"), valores)],
+                "data_publicacao DESC, id DESC", limite_sql)
+        else:
+            sql = consulta("oportunidades") + " ORDER BY o.data_publicacao DESC, o.id DESC"
+            if limite_sql is not None:
+                sql += " LIMIT %s"
+                valores.append(limite_sql)
+
+        conn = _conexao_leitura()
+        with conn.cursor() as cursor:
+            cursor.execute(sql, tuple(valores))
+            linhas = [formatar_oportunidade(linha) for linha in cursor.fetchall()]
+        return fatiar_pagina(linhas, limite, lambda linha: (linha["data_publicacao"], linha["id"]))
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao consultar oportunidades")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
 
 @router.get("/", response_model=List[OportunidadeResponse]) # Rota espera '/oportunidades/'
-async def consultar_oportunidades():
+async def consultar_oportunidades(
+    request: Request,
+    status_vaga: Optional[str] = Query(None, pattern="^(ativa|inativa|encerrada|em_edicao)$"),
+    tipo_acao: Optional[str] = None,
+    ong_id: Optional[int] = None,
+    publicada_de: Optional[datetime] = None,
+    publicada_ate: Optional[datetime] = None,
+    inicio_de: Optional[date] = None,
+    inicio_ate: Optional[date] = None,
+    limite: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    campos: Optional[str] = Query(None, description="Campos da resposta separados por vírgula (ex.: titulo,ong_nome)"),
+    ids: Optional[str] = Query(None, description="Consulta em lote: ids separados por vírgula (ex.: 3,1,2)"),
+    incluir_arquivo: bool = Query(False, description="Inclui as oportunidades arquivadas (src/arquivo.py)"),
+):
     """
-    Endpoint GET para listar todas as oportunidades.
-    AGORA INCLUI OS NOVOS CAMPOS DE DATA E HORA E FAZ JOIN PARA ong_nome.
+    Endpoint GET para listar oportunidades, das mais recentes para as mais antigas.
+    Aceita filtros opcionais (status_vaga, tipo_acao, ong_id, faixa de data_publicacao
+    e de data_inicio). Com `limite`, a resposta é paginada por cursor: o cursor da
+    próxima página vem no header X-Proximo-Cursor e deve ser enviado em `cursor`.
+    Sem `limite`, devolve a lista completa como antes.
+    `campos` restringe o SELECT e a resposta aos campos pedidos (o `id` sempre vem).
+    `ids` busca várias oportunidades de uma vez (até LIMITE_MAXIMO), na ordem pedida;
+    ids inexistentes ficam de fora e filtros/paginação são ignorados.
+    Oportunidades arquivadas só aparecem com `incluir_arquivo=1`.
+    As linhas do banco são serializadas direto para JSON (src/serializacao.py), sem
+    passar de novo pela validação do response_model.
+    A resposta serializada fica no cache do processo e carrega um ETag forte;
+    If-None-Match com o mesmo ETag recebe 304.
+    """
+    filtros = {
+        "status_vaga": status_vaga,
+        "tipo_acao": tipo_acao,
+        "ong_id": ong_id,
+        "publicada_de": publicada_de,
+        "publicada_ate": publicada_ate,
+        "inicio_de": inicio_de,
+        "inicio_ate": inicio_ate,
+    }
+    campos_resposta = interpretar_campos(campos) or CAMPOS_OPORTUNIDADE
+    if ids is not None:
+        lote = interpretar_ids(ids)
+        chave = ("lote", lote, campos_resposta, incluir_arquivo)
+        entrada = cache_oportunidades.obter(chave)
+        if entrada is None:
+            geracao = cache_oportunidades.geracao
+            linhas = await run_db(_consultar_oportunidades_por_ids, lote, campos_resposta, incluir_arquivo)
+            entrada = cache_oportunidades.guardar(chave, serializar_linhas(linhas, campos_resposta), None, geracao)
+        return resposta_com_etag(request, entrada)
+    chave = ("lista", tuple(filtros.items()), limite, cursor, campos_resposta, incluir_arquivo)
+    entrada = cache_oportunidades.obter(chave)
+    if entrada is None:
+        geracao = cache_oportunidades.geracao
+        linhas, proximo_cursor = await run_db(
+            _consultar_oportunidades, filtros, limite, cursor, campos_resposta, incluir_arquivo)
+        headers = {HEADER_PROXIMO_CURSOR: proximo_cursor} if proximo_cursor else {}
+        entrada = cache_oportunidades.guardar(chave, serializar_linhas(linhas, campos_resposta), headers, geracao)
+    return resposta_com_etag(request, entrada)
+
+# =========================================================
+# Busca textual
+# =========================================================
+# A busca usa um índice invertido em memória (src/search.py) sobre titulo, descricao,
+# perfil_voluntario e o nome da ONG. Ele é carregado do banco na primeira busca e
+# mantido atualizado pelos endpoints de escrita abaixo.
+
+SQL_DOCUMENTOS_BUSCA = """
+    SELECT o.id, o.titulo, o.descricao, o.perfil_voluntario, ongs.nome AS ong_nome
+    FROM oportunidades o
+    JOIN ongs ON o.ong_id = ongs.id
+"""
+
+def _carregar_indice_busca(conn):
+    with conn.cursor() as cursor:
+        cursor.execute(SQL_DOCUMENTOS_BUSCA)
+        return [(linha["id"], linha) for linha in cursor.fetchall()]
+
+def _atualizar_indice_busca(cursor, oportunidade_id: int):
+    """
+    Reindexa uma oportunidade após uma escrita já commitada (ou remove, se não existir mais).
     """
+    if not indice_oportunidades.ativo:
+        return
+    cursor.execute(SQL_DOCUMENTOS_BUSCA + " WHERE o.id = %s", (oportunidade_id,))
+    documento = cursor.fetchone()
+    if documento:
+        indice_oportunidades.indexar(oportunidade_id, documento)
+    else:
+        indice_oportunidades.remover(oportunidade_id)
+
+def _buscar_oportunidades(q: str, limite: int, deslocamento: int):
     conn = None
     try:
         conn = get_connection()
+        indice_oportunidades.garantir_carregado(lambda: _carregar_indice_busca(conn))
+        total, resultados = indice_oportunidades.buscar(q, limite, deslocamento)
+        if not resultados:
+            return {"total": total, "itens": []}
+
+        ids = [oportunidade_id for oportunidade_id, _ in resultados]
         with conn.cursor() as cursor:
-            # CORRIGIDO: SELECT com JOIN para obter ong_nome
-            cursor.execute("""
-                SELECT
-                    o.id, o.data_publicacao, o.titulo, o.descricao, o.ong_id,
-                    ongs.nome AS ong_nome, -- Obtém o nome da ONG da tabela 'ongs'
-                    o.endereco,
-                    o.data_inicio, o.data_termino, o.hora_inicio, o.hora_termino,
-                    o.perfil_voluntario, o.num_vagas, o.status_vaga, o.tipo_acao
-                FROM oportunidades o
-                JOIN ongs ON o.ong_id = ongs.id
-            """)
-            return cursor.fetchall()
+            por_id = {item["id"]: item for item in carregar_oportunidades(cursor, ids)}
+
+        # Mantém a ordem do ranqueamento; ignora ids removidos entre a busca e a leitura
+        itens = [
+            {**por_id[oportunidade_id], "relevancia": relevancia}
+            for oportunidade_id, relevancia in resultados
+            if oportunidade_id in por_id
+        ]
+        return {"total": total, "itens": itens}
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        print(f"DEBUG BACKEND: Erro ao consultar oportunidades: {e}")
+        logger.exception("Erro ao buscar oportunidades")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.get("/busca", response_model=ResultadoBusca) # Rota: /oportunidades/busca?q=
+async def buscar_oportunidades(
+    q: str = Query(..., min_length=1, max_length=200),
+    limite: int = Query(20, ge=1, le=LIMITE_MAXIMO),
+    deslocamento: int = Query(0, ge=0),
+):
+    """
+    Endpoint GET de busca textual ranqueada por relevância.
+    Ignora acentos e maiúsculas e casa prefixos ("educ" encontra "Educação").
+    Todos os termos da consulta precisam aparecer na oportunidade.
+    """
+    return await run_db(_buscar_oportunidades, q, limite, deslocamento)
+
+# =========================================================
+# Busca por proximidade
+# =========================================================
+# Os endereços são geocodificados na gravação (src/geocoding.py) e as coordenadas
+# das oportunidades ficam numa grade em memória (src/spatial.py), uma por status_vaga,
+# carregada do banco na primeira consulta e mantida atualizada pelos endpoints de escrita.
+
+def _carregar_indice_proximidade(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT id, latitude, longitude, status_vaga FROM oportunidades WHERE latitude IS NOT NULL")
+        return [(linha["id"], linha["latitude"], linha["longitude"], linha["status_vaga"]) for linha in cursor.fetchall()]
+
+def _atualizar_indice_proximidade(cursor, oportunidade_id: int):
+    """
+    Reposiciona uma oportunidade após uma escrita já commitada (ou remove, se não existir mais).
+    """
+    if not indice_proximidade.ativo:
+        return
+    cursor.execute("SELECT latitude, longitude, status_vaga FROM oportunidades WHERE id = %s", (oportunidade_id,))
+    linha = cursor.fetchone()
+    if linha:
+        indice_proximidade.indexar(oportunidade_id, linha["latitude"], linha["longitude"], linha["status_vaga"])
+    else:
+        indice_proximidade.remover(oportunidade_id)
+
+def _oportunidades_proximas(lat: float, lon: float, raio_km: float, limite: int, status_vaga: Optional[str]):
+    conn = None
+    try:
+        conn = get_connection()
+        indice_proximidade.garantir_carregado(lambda: _carregar_indice_proximidade(conn))
+        # Com filtro de status, só a grade daquele status: os primeiros `limite` do índice já
+        # são a resposta nos dois casos
+        resultados = indice_proximidade.proximos(lat, lon, raio_km, limite, status_vaga)
+        if not resultados:
+            return []
+
+        ids = [oportunidade_id for oportunidade_id, _ in resultados]
+        # Mesmas colunas da listagem. O status é conferido de novo no banco: o índice de outro
+        # processo pode ainda não ter visto uma mudança de status
+        colunas = ", ".join(COLUNAS_LISTAGEM[campo] for campo in CAMPOS_OPORTUNIDADE)
+        sql = (f"SELECT {colunas}, o.ong_id, o.precisao_geo AS precisao FROM oportunidades o JOIN ongs ON o.ong_id = ongs.id"
+               f" WHERE o.id IN ({', '.join(['%s'] * len(ids))})")
+        valores = list(ids)
+        if status_vaga:
+            sql += " AND o.status_vaga = %s"
+            valores.append(status_vaga)
+        with conn.cursor() as cursor:
+            cursor.execute(sql, tuple(valores))
+            por_id = {linha["id"]: formatar_oportunidade(linha) for linha in cursor.fetchall()}
+
+        # Mantém a ordem por distância; ignora ids removidos ou fora do filtro
+        return [
+            {**por_id[oportunidade_id], "distancia_km": distancia}
+            for oportunidade_id, distancia in resultados
+            if oportunidade_id in por_id
+        ]
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao buscar oportunidades próximas")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.get("/proximas", response_model=List[OportunidadeProxima]) # Rota: /oportunidades/proximas?lat=&lon=&raio_km=
+async def oportunidades_proximas(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    raio_km: float = Query(10, gt=0, le=500),
+    limite: int = Query(50, ge=1, le=LIMITE_MAXIMO),
+    status_vaga: Optional[str] = Query(None, pattern="^(ativa|inativa|encerrada|em_edicao)$"),
+):
+    """
+    Endpoint GET com as oportunidades num raio de `raio_km` km do ponto (lat, lon),
+    da mais próxima para a mais distante. A precisão depende do geocodificador
+    (o padrão, offline, localiza o endereço pelo município, ou só pelo estado quando o
+    município não está no gazetteer) e vem em cada resultado (`precisao`).
+    """
+    return await run_db(_oportunidades_proximas, lat, lon, raio_km, limite, status_vaga)
+
+def _consultar_oportunidades_por_ids(ids, campos, incluir_arquivo: bool = False):
+    conn = None
+    try:
+        conn = _conexao_leitura()
+        with conn.cursor() as cursor:
+            return carregar_oportunidades(cursor, ids, campos, incluir_arquivo=incluir_arquivo)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao consultar oportunidades em lote")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+def _consultar_oportunidade(oportunidade_id: int, incluir_arquivo: bool = False):
+    conn = None
+    try:
+        conn = _conexao_leitura()
+        with conn.cursor() as cursor:
+            # Mesmo caminho da consulta em lote; ong_nome vem do carregador de ONGs
+            resultado = carregar_oportunidades(cursor, (oportunidade_id,), incluir_arquivo=incluir_arquivo)
+            if not resultado:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
+            return resultado[0]
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao consultar oportunidade por ID")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
 
 @router.get("/{oportunidade_id}/", response_model=OportunidadeResponse) # Rota espera '/oportunidades/{id}/'
-async def consultar_oportunidade(oportunidade_id: int):
+async def consultar_oportunidade(request: Request, oportunidade_id: int, incluir_arquivo: bool = False):
     """
     Endpoint GET para recuperar uma única oportunidade.
     AGORA INCLUI OS NOVOS CAMPOS DE DATA E HORA E FAZ JOIN PARA ong_nome.
+    Usa o mesmo cache com ETag da listagem; o ETag começa pela versão da linha e vale
+    como If-Match no PUT/PATCH. Oportunidade arquivada: 404, a menos que `incluir_arquivo=1`.
     """
+    chave = ("detalhe", oportunidade_id, incluir_arquivo)
+    entrada = cache_oportunidades.obter(chave)
+    if entrada is None:
+        geracao = cache_oportunidades.geracao
+        resultado = await run_db(_consultar_oportunidade, oportunidade_id, incluir_arquivo)
+        entrada = cache_oportunidades.guardar(chave, _serializar(_OPORTUNIDADE, resultado), None, geracao,
+                                              resultado.get("versao"))
+    return resposta_com_etag(request, entrada)
+
+# =========================================================
+# Feed de mudanças (Server-Sent Events)
+# =========================================================
+# Os endpoints de escrita publicam deltas compactos depois do commit; o broker e o
+# protocolo (sequência, retomada, buffer por cliente) estão em src/eventos.py.
+
+def _publicar_mudanca(cursor, tipo: str, ids: list, campos=CAMPOS_OPORTUNIDADE):
+    """
+    Publica no feed a oportunidade criada/atualizada, já no formato da listagem e
+    só com `campos` (além do id). "criadas" (importação em lote) leva todas num evento só.
+    Sem ninguém conectado não há consulta: fica só um `reset` no histórico, e quem
+    retomar de antes dele recarrega a lista.
+    """
+    if not broker_oportunidades.tem_assinantes:
+        broker_oportunidades.publicar(RESET, {"motivo": "lacuna"})
+        return
+    try:
+        selecionados = tuple(dict.fromkeys(("id", *campos)))
+        linhas = [
+            {campo: linha[campo] for campo in selecionados}
+            for linha in carregar_oportunidades(cursor, ids, selecionados)
+        ]
+    except Exception:
+        # A escrita já foi commitada: a falha aqui não pode virar erro da requisição
+        logger.exception("Erro ao publicar mudança de oportunidade no feed")
+        broker_oportunidades.publicar(RESET, {"motivo": "lacuna"})
+        return
+    if tipo == "criadas":
+        broker_oportunidades.publicar(tipo, {"itens": linhas})
+    elif linhas:
+        broker_oportunidades.publicar(tipo, linhas[0])
+
+@router.get("/eventos") # Rota: /oportunidades/eventos (text/event-stream)
+async def eventos_oportunidades(request: Request, desde: Optional[str] = None):
+    """
+    Endpoint SSE com as mudanças nas oportunidades: eventos `criada` e `atualizada`
+    (linha no formato da listagem; no PATCH, só os campos alterados), `criadas`
+    ({"itens": [...]}, importação em lote), `removida` ({"id": ...}) e `reset`
+    (recarregue a lista). Para retomar, o cliente envia o último id recebido no
+    header Last-Event-ID (o EventSource faz isso sozinho) ou em ?desde=.
+    """
+    ultimo_id = request.headers.get("last-event-id") or desde
+    try:
+        assinatura, pendentes = broker_oportunidades.assinar(ultimo_id)
+    except OverflowError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return StreamingResponse(
+        broker_oportunidades.transmitir(assinatura, pendentes),
+        media_type="text/event-stream",
+        headers=HEADERS_SSE,
+    )
+
+# =========================================================
+# Matching voluntário x oportunidade
+# =========================================================
+# Os vetores de voluntários e oportunidades ficam em memória (src/matching.py), são
+# carregados do banco na primeira consulta e atualizados pelos endpoints de escrita.
+
+def _candidatos_oportunidade(oportunidade_id: int, k: int):
     conn = None
     try:
         conn = get_connection()
+        carregar_motor(conn)
         with conn.cursor() as cursor:
-            # CORRIGIDO: SELECT com JOIN para obter ong_nome
-            cursor.execute("""
-                SELECT
-                    o.id, o.data_publicacao, o.titulo, o.descricao, o.ong_id,
-                    ongs.nome AS ong_nome, -- Obtém o nome da ONG da tabela 'ongs'
-                    o.endereco,
-                    o.data_inicio, o.data_termino, o.hora_inicio, o.hora_termino,
-                    o.perfil_voluntario, o.num_vagas, o.status_vaga, o.tipo_acao
-                FROM oportunidades o
-                JOIN ongs ON o.ong_id = ongs.id
-                WHERE o.id = %s
-            """, (oportunidade_id,))
-            resultado = cursor.fetchone()
-            if not resultado:
+            # Oportunidade criada por outro processo: entra no motor na primeira consulta
+            if oportunidade_id not in motor_matching.oportunidades and not atualizar_oportunidade_matching(cursor, oportunidade_id):
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
-            return resultado
+
+            # Quem já se inscreveu não é sugerido de novo
+            cursor.execute("SELECT voluntario_id FROM inscricoes WHERE oportunidade_id = %s", (oportunidade_id,))
+            inscritos = [linha["voluntario_id"] for linha in cursor.fetchall()]
+            resultados = motor_matching.candidatos(oportunidade_id, k, inscritos) or []
+            if not resultados:
+                return []
+
+            ids = [voluntario_id for voluntario_id, *_ in resultados]
+            cursor.execute(f"""
+                SELECT id, nome, email, telefone, interesses, disponibilidade
+                FROM voluntarios
+                WHERE id IN ({", ".join(["%s"] * len(ids))})
+            """, tuple(ids))
+            por_id = {linha["id"]: linha for linha in cursor.fetchall()}
+
+        # Mantém a ordem da pontuação; ignora voluntários removidos nesse meio-tempo
+        return [
+            {**por_id[voluntario_id], "pontuacao": pontuacao, "afinidade": afinidade,
+             "compatibilidade_horario": horario}
+            for voluntario_id, pontuacao, afinidade, horario in resultados
+            if voluntario_id in por_id
+        ]
     except HTTPException as he:
         raise he
     except Exception as e:
-        print(f"DEBUG BACKEND: Erro ao consultar oportunidade por ID: {e}")
+        logger.exception("Erro ao calcular candidatos da oportunidade")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
 
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED) # Rota espera '/oportunidades/'
-async def criar_oportunidade(dados: OportunidadeONG):
+@router.get("/{oportunidade_id}/candidatos") # Rota: /oportunidades/{id}/candidatos?k=
+async def candidatos_oportunidade(oportunidade_id: int, k: int = Query(20, ge=1, le=LIMITE_MAXIMO)):
     """
-    Endpoint POST para criar uma nova oportunidade.
-    AGORA INCLUI OS NOVOS CAMPOS DE DATA E HORA.
+    Endpoint GET com os k voluntários mais compatíveis com a oportunidade, combinando
+    interesses x perfil/tipo de ação e disponibilidade x dias e horários.
+    Voluntários já inscritos ficam de fora.
     """
+    return await run_db(_candidatos_oportunidade, oportunidade_id, k)
+
+def _criar_oportunidade(dados: OportunidadeONG):
     conn = None
     try:
         conn = get_connection()
@@ -106,6 +519,9 @@ async def criar_oportunidade(dados: OportunidadeONG):
             # O `dados.ong_nome` do Pydantic `OportunidadeONG` ainda é útil para
             # a lógica de `ON DUPLICATE KEY UPDATE` ou para verificar a existência da ONG.
             
+            # Coordenadas do endereço (a ONG criada abaixo usa o mesmo endereço)
+            latitude, longitude, precisao_geo = localizar_endereco(dados.endereco)
+
             # 1. Tenta encontrar a ONG pelo nome
             cursor.execute("SELECT id FROM ongs WHERE nome = %s", (dados.ong_nome,))
             existing_ong = cursor.fetchone()
@@ -133,11 +549,11 @@ async def criar_oportunidade(dados: OportunidadeONG):
                 # este INSERT abaixo falharia.
                 # O mais seguro é que a ONG seja criada ANTES, e você passe o ong_id ou um campo unico como email.
                 # Por ora, mantemos a lógica que tenta buscar/criar, mas ciente da limitação com o novo schema de ONGs.
-                print(f"DEBUG BACKEND: ONG '{dados.ong_nome}' não encontrada. Tentando inserção/duplicata.")
+                logger.info("ONG %r não encontrada; tentando inserção/duplicata", dados.ong_nome)
                 cursor.execute(
-                    "INSERT INTO ongs (nome, endereco, email, senha) VALUES (%s, %s, %s, %s) "
+                    "INSERT INTO ongs (nome, endereco, latitude, longitude, email, senha) VALUES (%s, %s, %s, %s, %s, %s) "
                     "ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), nome = VALUES(nome)",
-                    (dados.ong_nome, dados.endereco, f"{dados.ong_nome.lower().replace(' ', '')}@temp.com", "temp_pass") # Valores dummy para email/senha se a ONG não existe
+                    (dados.ong_nome, dados.endereco, latitude, longitude, f"{dados.ong_nome.lower().replace(' ', '')}@temp.com", "temp_pass") # Valores dummy para email/senha se a ONG não existe
                 )
                 ong_id = cursor.lastrowid
                 if not ong_id: # Caso não tenha inserido e nem pego ID
@@ -151,155 +567,388 @@ async def criar_oportunidade(dados: OportunidadeONG):
             # Insere a oportunidade com todos os campos
             cursor.execute(
                 """INSERT INTO oportunidades
-                (titulo, descricao, ong_id, endereco,
+                (titulo, descricao, ong_id, endereco, latitude, longitude, precisao_geo,
                  data_inicio, data_termino, hora_inicio, hora_termino,
                  perfil_voluntario, num_vagas, status_vaga, tipo_acao)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", # 12 %s agora
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""", # 15 %s agora
                 (
-                    dados.titulo, dados.descricao, ong_id, dados.endereco, # REMOVIDO dados.ong_nome daqui
-                    dados.data_inicio, dados.data_termino, dados.hora_inicio, dados.hora_termino,
+                    dados.titulo, dados.descricao, ong_id, dados.endereco, latitude, longitude, precisao_geo, # REMOVIDO dados.ong_nome daqui
+                    texto_para_data(dados.data_inicio), texto_para_data(dados.data_termino),
+                    texto_para_hora(dados.hora_inicio), texto_para_hora(dados.hora_termino),
                     dados.perfil_voluntario, dados.num_vagas, dados.status_vaga, dados.tipo_acao
                 )
             )
             conn.commit()
-            return {"success": True, "id": cursor.lastrowid}
+            cache_oportunidades.invalidar()
+            oportunidade_id = cursor.lastrowid
+            if indice_oportunidades.ativo:
+                indice_oportunidades.indexar(oportunidade_id, {
+                    "titulo": dados.titulo,
+                    "descricao": dados.descricao,
+                    "perfil_voluntario": dados.perfil_voluntario,
+                    "ong_nome": dados.ong_nome,
+                })
+            if motor_matching.ativo:
+                motor_matching.atualizar_oportunidade(oportunidade_id, parametros_oportunidade(dados.model_dump()))
+            if indice_proximidade.ativo:
+                indice_proximidade.indexar(oportunidade_id, latitude, longitude, dados.status_vaga)
+            _publicar_mudanca(cursor, "criada", [oportunidade_id])
+            return {"success": True, "id": oportunidade_id}
     except HTTPException as he:
         raise he
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"DEBUG BACKEND: Erro ao criar oportunidade: {e}")
+        logger.exception("Erro ao criar oportunidade")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
 
-@router.put("/{oportunidade_id}/", response_model=dict) # Rota espera '/oportunidades/{id}/'
-async def atualizar_oportunidade_completa(oportunidade_id: int, dados: OportunidadeONG):
+@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED) # Rota espera '/oportunidades/'
+async def criar_oportunidade(dados: OportunidadeONG):
     """
-    Endpoint PUT para atualizar oportunidade completa.
+    Endpoint POST para criar uma nova oportunidade.
     AGORA INCLUI OS NOVOS CAMPOS DE DATA E HORA.
     """
-    print(f"DEBUG BACKEND: Recebido PUT para oportunidade_id: {oportunidade_id}")
-    print(f"DEBUG BACKEND: Dados recebidos: {dados.model_dump()}")
+    return await run_db(_criar_oportunidade, dados)
+
+# =========================================================
+# Importação em lote
+# =========================================================
+
+MAX_LOTE = 5000
+
+def _email_temporario_ong(nome: str):
+    # Mesmo e-mail provisório usado por criar_oportunidade quando a ONG não existe
+    return f"{nome.lower().replace(' ', '')}@temp.com"
+
+def _fatias_por_tamanho(linhas, limite_bytes):
+    """
+    Divide as linhas em fatias cujo INSERT multi-linha cabe num único statement.
+    O tamanho de cada linha é estimado pelo pior caso do escape (todo byte escapado).
+    Assim o executemany do PyMySQL não quebra a fatia em vários statements e o
+    lastrowid continua correspondendo à primeira linha da fatia.
+    """
+    fatia, tamanho = [], 0
+    for linha in linhas:
+        estimado = 64 + sum(2 * len(str(valor).encode()) + 4 for valor in linha)
+        if fatia and tamanho + estimado > limite_bytes:
+            yield fatia
+            fatia, tamanho = [], 0
+        fatia.append(linha)
+        tamanho += estimado
+    if fatia:
+        yield fatia
 
+def _resolver_ongs(cursor, validas, coordenadas):
+    """
+    Resolve o ong_id de todos os nomes do lote com uma consulta; as ONGs que não
+    existem são criadas de uma vez com executemany (mesma regra de criar_oportunidade).
+    """
+    nomes = list(dict.fromkeys(dados.ong_nome for dados in validas))
+    marcadores = ", ".join(["%s"] * len(nomes))
+    cursor.execute(f"SELECT id, nome FROM ongs WHERE nome IN ({marcadores})", tuple(nomes))
+    ids_ongs = {}
+    for linha in cursor.fetchall():
+        ids_ongs.setdefault(linha["nome"], linha["id"])
+
+    faltantes = [nome for nome in nomes if nome not in ids_ongs]
+    if faltantes:
+        endereco_por_nome = {}
+        for dados in validas:
+            endereco_por_nome.setdefault(dados.ong_nome, dados.endereco)
+        cursor.executemany(
+            "INSERT INTO ongs (nome, endereco, latitude, longitude, email, senha) VALUES (%s, %s, %s, %s, %s, %s) "
+            "ON DUPLICATE KEY UPDATE id = id",
+            [
+                (nome, endereco_por_nome[nome], *coordenadas[endereco_por_nome[nome]][:2], _email_temporario_ong(nome), "temp_pass")
+                for nome in faltantes
+            ]
+        )
+        # O e-mail provisório é único: serve para achar tanto as ONGs recém-criadas
+        # quanto as que já existiam com o mesmo e-mail.
+        emails = {_email_temporario_ong(nome): nome for nome in faltantes}
+        marcadores = ", ".join(["%s"] * len(emails))
+        cursor.execute(f"SELECT id, email FROM ongs WHERE email IN ({marcadores})", tuple(emails))
+        for linha in cursor.fetchall():
+            ids_ongs[emails[linha["email"]]] = linha["id"]
+    return ids_ongs
+
+def _criar_oportunidades_lote(validas: list):
     conn = None
     try:
         conn = get_connection()
         with conn.cursor() as cursor:
-            # Primeiro, verificar se a oportunidade existe (para não confundir 404 com 0 rows updated)
-            cursor.execute("SELECT id FROM oportunidades WHERE id = %s", (oportunidade_id,))
-            if cursor.fetchone() is None:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
-
-            # CORRIGIDO: Inclui novos campos de data e hora no UPDATE
-            # REMOVIDO ong_nome do UPDATE, pois não é uma coluna em 'oportunidades'
-            cursor.execute(
-                """UPDATE oportunidades SET
-                titulo = %s, descricao = %s, endereco = %s,
-                data_inicio = %s, data_termino = %s, hora_inicio = %s, hora_termino = %s,
-                perfil_voluntario = %s, num_vagas = %s, status_vaga = %s, tipo_acao = %s
-                WHERE id = %s""", # 11 campos a atualizar agora
+            # Snapshot tirado antes de qualquer INSERT: na releitura dos ids (abaixo), as linhas
+            # de outras transações com id maior que o nosso primeiro nunca ficam visíveis
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+            cursor.execute("START TRANSACTION WITH CONSISTENT SNAPSHOT")
+            # Geocodifica cada endereço distinto uma única vez
+            coordenadas = {}
+            for dados in validas:
+                if dados.endereco not in coordenadas:
+                    coordenadas[dados.endereco] = localizar_endereco(dados.endereco)
+            ids_ongs = _resolver_ongs(cursor, validas, coordenadas)
+            linhas = [
                 (
-                    dados.titulo, dados.descricao, dados.endereco,
-                    dados.data_inicio, dados.data_termino, dados.hora_inicio, dados.hora_termino,
-                    dados.perfil_voluntario, dados.num_vagas, dados.status_vaga, dados.tipo_acao,
-                    oportunidade_id
+                    dados.titulo, dados.descricao, ids_ongs[dados.ong_nome], dados.endereco,
+                    *coordenadas[dados.endereco],
+                    texto_para_data(dados.data_inicio), texto_para_data(dados.data_termino),
+                    texto_para_hora(dados.hora_inicio), texto_para_hora(dados.hora_termino),
+                    dados.perfil_voluntario, dados.num_vagas, dados.status_vaga, dados.tipo_acao
                 )
+                for dados in validas
+            ]
+            primeiro_id = None
+            for fatia in _fatias_por_tamanho(linhas, cursor.max_stmt_length):
+                cursor.executemany(
+                    """INSERT INTO oportunidades
+                    (titulo, descricao, ong_id, endereco, latitude, longitude, precisao_geo,
+                     data_inicio, data_termino, hora_inicio, hora_termino,
+                     perfil_voluntario, num_vagas, status_vaga, tipo_acao)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                    fatia
+                )
+                if primeiro_id is None:
+                    primeiro_id = cursor.lastrowid # id da primeira linha do INSERT multi-linha
+            # Os ids não são necessariamente consecutivos (auto_increment_increment > 1,
+            # innodb_autoinc_lock_mode=2 com inserções concorrentes): relê os do lote.
+            # Em ordem de id, que é a ordem de inserção das linhas.
+            cursor.execute(
+                "SELECT id FROM oportunidades WHERE id >= %s ORDER BY id LIMIT %s",
+                (primeiro_id, len(linhas))
             )
-            print(f"DEBUG BACKEND: cursor.rowcount após UPDATE: {cursor.rowcount}")
-            
-            # Ajuste crucial: Se cursor.rowcount == 0, significa que nenhum dado foi alterado,
-            # mas a oportunidade EXISTE. Não deve ser um 404.
-            # Podemos retornar sucesso com uma mensagem específica ou apenas sucesso.
-            if cursor.rowcount == 0:
-                conn.commit() # Ainda commitamos para finalizar a transação, mesmo que nada mude
-                return {"success": True, "message": "Nenhuma alteração detectada no banco de dados, mas a operação foi registrada."}
-            
+            ids = [linha["id"] for linha in cursor.fetchall()]
+            if len(ids) != len(linhas):
+                raise RuntimeError(f"{len(linhas)} oportunidades inseridas, mas {len(ids)} ids relidos")
+            conn.commit()
+            _publicar_mudanca(cursor, "criadas", ids)
+
+        cache_oportunidades.invalidar()
+        if indice_oportunidades.ativo:
+            for oportunidade_id, dados in zip(ids, validas):
+                indice_oportunidades.indexar(oportunidade_id, {
+                    "titulo": dados.titulo,
+                    "descricao": dados.descricao,
+                    "perfil_voluntario": dados.perfil_voluntario,
+                    "ong_nome": dados.ong_nome,
+                })
+        if motor_matching.ativo:
+            for oportunidade_id, dados in zip(ids, validas):
+                motor_matching.atualizar_oportunidade(oportunidade_id, parametros_oportunidade(dados.model_dump()))
+        if indice_proximidade.ativo:
+            for oportunidade_id, dados in zip(ids, validas):
+                indice_proximidade.indexar(oportunidade_id, *coordenadas[dados.endereco][:2], dados.status_vaga)
+        return ids
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        logger.exception("Erro ao criar oportunidades em lote")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.post("/lote", response_model=dict, status_code=status.HTTP_201_CREATED) # Rota: /oportunidades/lote
+async def criar_oportunidades_lote(response: Response, itens: List[Any] = Body(..., max_length=MAX_LOTE)):
+    """
+    Endpoint POST para criar várias oportunidades de uma vez.
+    Cada item é validado como OportunidadeONG individualmente; os válidos são
+    inseridos numa única transação e o resultado é informado linha a linha.
+    """
+    resultados = []
+    validas = []
+    indices_validos = []
+    for indice, item in enumerate(itens):
+        try:
+            validas.append(OportunidadeONG.model_validate(item))
+            indices_validos.append(indice)
+            resultados.append(None)
+        except ValidationError as e:
+            erros = [
+                {"campo": ".".join(str(parte) for parte in erro["loc"]), "mensagem": erro["msg"]}
+                for erro in e.errors()
+            ]
+            resultados.append({"indice": indice, "success": False, "erros": erros})
+
+    ids = await run_db(_criar_oportunidades_lote, validas) if validas else []
+    for indice, oportunidade_id in zip(indices_validos, ids):
+        resultados[indice] = {"indice": indice, "success": True, "id": oportunidade_id}
+
+    if not ids:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    return {
+        "success": bool(ids),
+        "total": len(itens),
+        "inseridas": len(ids),
+        "falhas": len(itens) - len(ids),
+        "resultados": resultados,
+    }
+
+# =========================================================
+# Edição com controle de concorrência otimista
+# =========================================================
+# Cada edição é um único UPDATE que também faz versao = versao + 1 (migração 0008).
+# Com If-Match, o WHERE exige a versão que o cliente leu: se outra pessoa editou antes,
+# nenhuma linha é alterada e a resposta é 412 em vez de sobrescrever a edição dela.
+# Como a versão sempre muda, "linhas afetadas" é 1 exatamente quando a linha casou com
+# o WHERE (o mesmo que CLIENT.FOUND_ROWS daria, sem mudar o rowcount das outras rotas).
+# A nova versão volta no próprio pacote OK do UPDATE via LAST_INSERT_ID(expr).
+# Só quando nada é alterado uma segunda consulta distingue 404 de 412.
+
+MENSAGEM_VERSAO_DIVERGENTE = "A oportunidade foi alterada por outra pessoa depois de carregada. Recarregue e tente de novo."
+
+def _conferir_versao(cursor, oportunidade_id: int, versoes):
+    """
+    Versão atual da oportunidade; 404 se não existe, 412 se não é uma das `versoes` do If-Match.
+    """
+    cursor.execute("SELECT versao FROM oportunidades WHERE id = %s", (oportunidade_id,))
+    atual = cursor.fetchone()
+    if atual is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
+    if versoes not in (None, "*") and atual["versao"] not in versoes:
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=MENSAGEM_VERSAO_DIVERGENTE,
+                            headers={"ETag": etag_versao(atual["versao"])})
+    return atual["versao"]
+
+def _editar_oportunidade(cursor, oportunidade_id: int, campos: dict, versoes):
+    """
+    UPDATE condicional de `campos` (coluna -> valor). Devolve a nova versão da linha.
+    """
+    atribuicoes = "".join(f"{campo} = %s, " for campo in campos)
+    valores = [*campos.values(), oportunidade_id]
+    condicao = "id = %s"
+    if versoes not in (None, "*"):
+        if not versoes:
+            # Nenhum ETag reconhecível: não confere com nenhuma versão
+            return _conferir_versao(cursor, oportunidade_id, versoes)
+        condicao += f" AND versao IN ({', '.join(['%s'] * len(versoes))})"
+        valores += versoes
+    cursor.execute(
+        f"UPDATE oportunidades SET {atribuicoes}versao = LAST_INSERT_ID(versao + 1) WHERE {condicao}",
+        tuple(valores)
+    )
+    if cursor.rowcount == 1:
+        return cursor.lastrowid
+    if versoes is None or versoes == "*":
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
+    _conferir_versao(cursor, oportunidade_id, versoes)
+    # Outra edição chegou à versão pedida entre o UPDATE e o SELECT: continua divergente
+    raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail=MENSAGEM_VERSAO_DIVERGENTE)
+
+def _apos_edicao(cursor, oportunidade_id: int):
+    cache_oportunidades.invalidar()
+    controle_vagas.liberar(oportunidade_id) # num_vagas ou status_vaga podem ter mudado
+    indice_agenda.invalidar_oportunidade(oportunidade_id) # datas e horas podem ter mudado
+    _atualizar_indice_busca(cursor, oportunidade_id)
+    atualizar_oportunidade_matching(cursor, oportunidade_id)
+    _atualizar_indice_proximidade(cursor, oportunidade_id)
+
+def _atualizar_oportunidade_completa(oportunidade_id: int, dados: OportunidadeONG, if_match: Optional[str], response: Response):
+    logger.debug("PUT oportunidade %s", oportunidade_id)
+
+    conn = None
+    try:
+        conn = get_connection()
+        with conn.cursor() as cursor:
+            # REMOVIDO ong_nome do UPDATE, pois não é uma coluna em 'oportunidades'
+            latitude, longitude, precisao_geo = localizar_endereco(dados.endereco)
+            versao = _editar_oportunidade(cursor, oportunidade_id, {
+                "titulo": dados.titulo, "descricao": dados.descricao, "endereco": dados.endereco,
+                "latitude": latitude, "longitude": longitude, "precisao_geo": precisao_geo,
+                "data_inicio": texto_para_data(dados.data_inicio), "data_termino": texto_para_data(dados.data_termino),
+                "hora_inicio": texto_para_hora(dados.hora_inicio), "hora_termino": texto_para_hora(dados.hora_termino),
+                "perfil_voluntario": dados.perfil_voluntario, "num_vagas": dados.num_vagas,
+                "status_vaga": dados.status_vaga, "tipo_acao": dados.tipo_acao,
+            }, versoes_do_if_match(if_match))
             conn.commit()
-            return {"success": True, "message": "Oportunidade atualizada com sucesso."}
+            logger.debug("PUT oportunidade %s: versão %s", oportunidade_id, versao)
+
+            _apos_edicao(cursor, oportunidade_id)
+            _publicar_mudanca(cursor, "atualizada", [oportunidade_id])
+            response.headers["ETag"] = etag_versao(versao)
+            return {"success": True, "message": "Oportunidade atualizada com sucesso.", "versao": versao}
     except HTTPException as he:
+        if conn:
+            conn.rollback()
         raise he
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"DEBUG BACKEND: Erro ao atualizar oportunidade (PUT): {e}")
+        logger.exception("Erro ao atualizar oportunidade (PUT)")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
 
-@router.patch("/{oportunidade_id}/", response_model=dict) # Rota espera '/oportunidades/{id}/'
-async def atualizar_oportunidade_parcial(oportunidade_id: int, dados: OportunidadeUpdate):
+@router.put("/{oportunidade_id}/", response_model=dict) # Rota espera '/oportunidades/{id}/'
+async def atualizar_oportunidade_completa(oportunidade_id: int, dados: OportunidadeONG, response: Response,
+                                          if_match: Optional[str] = Header(None)):
     """
-    Endpoint PATCH para atualizar oportunidade parcial.
+    Endpoint PUT para atualizar oportunidade completa.
     AGORA INCLUI OS NOVOS CAMPOS DE DATA E HORA.
+    Com If-Match (ETag do detalhe ou da última edição), responde 412 se a oportunidade
+    mudou desde então. A resposta traz o ETag da nova versão.
     """
+    return await run_db(_atualizar_oportunidade_completa, oportunidade_id, dados, if_match, response)
+
+def _atualizar_oportunidade_parcial(oportunidade_id: int, dados: OportunidadeUpdate, if_match: Optional[str], response: Response):
     conn = None
     try:
         conn = get_connection()
         with conn.cursor() as cursor:
-            cursor.execute("SELECT * FROM oportunidades WHERE id = %s", (oportunidade_id,))
-            oportunidade_existente = cursor.fetchone()
-            if not oportunidade_existente:
-                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
-
             # Use .model_dump() com exclude_unset=True para Pydantic v2
-            updates = {k: v for k, v in dados.model_dump(exclude_unset=True).items()}
-            
-            if not updates:
-                # Se não há updates no payload, podemos considerar sucesso sem fazer nada no DB
-                # Ou, se o frontend está enviando ong_nome, que é ignorado para a tabela oportunidades
-                # E não há outros campos válidos, ainda podemos retornar sucesso.
-                return {"success": True, "message": "Nenhum campo válido para atualizar no banco de dados ou nenhuma alteração."}
-
-            set_clauses = []
-            values = []
-            for field, value in updates.items():
-                # Se o campo ong_nome for enviado no PATCH, ele não é uma coluna direta em 'oportunidades'.
-                # Precisaríamos de uma lógica separada para atualizar a ONG ou ignorá-lo aqui.
-                # Por enquanto, se ele aparecer no updates, será ignorado para o UPDATE na tabela 'oportunidades'.
-                if field == 'ong_nome':
-                    continue # Ignora ong_nome para o UPDATE da tabela oportunidades
-
-                set_clauses.append(f"{field} = %s")
-                values.append(value)
-            
-            if not set_clauses: # Caso só tenha enviado ong_nome e ele foi ignorado
-                # Se chegou aqui, é porque updates existia, mas set_clauses ficou vazio após ignorar ong_nome
-                return {"success": True, "message": "Nenhum campo válido para atualizar a oportunidade, apenas ong_nome ignorado."}
-
-            query = f"UPDATE oportunidades SET {', '.join(set_clauses)} WHERE id = %s"
-            values.append(oportunidade_id)
+            # Datas e horas chegam como texto e são gravadas como DATE/TIME
+            updates = parametros_oportunidade(dados.model_dump(exclude_unset=True))
+            # ong_nome não é uma coluna de 'oportunidades': é ignorado aqui
+            updates.pop("ong_nome", None)
+            if "endereco" in updates:
+                # Endereço novo: as coordenadas acompanham
+                updates["latitude"], updates["longitude"], updates["precisao_geo"] = localizar_endereco(updates["endereco"])
 
-            print(f"DEBUG BACKEND PATCH: Query gerada: {query}")
-            print(f"DEBUG BACKEND PATCH: Valores para query: {tuple(values)}")
-            cursor.execute(query, tuple(values))
-            
-            # No PATCH, se rowcount == 0, significa que a oportunidade existe, mas os valores são os mesmos.
-            # Não é um erro, então ainda é um sucesso.
-            if cursor.rowcount == 0:
-                conn.commit() # Commit para finalizar a transação
-                return {"success": True, "message": "Nenhuma alteração detectada no banco de dados para os campos fornecidos."}
+            versoes = versoes_do_if_match(if_match)
+            if not updates:
+                # Nada a gravar: só confere existência e versão, sem criar uma versão nova
+                versao = _conferir_versao(cursor, oportunidade_id, versoes)
+                response.headers["ETag"] = etag_versao(versao)
+                return {"success": True, "message": "Nenhum campo válido para atualizar no banco de dados ou nenhuma alteração.",
+                        "versao": versao}
 
+            logger.debug("PATCH oportunidade %s: campos %s", oportunidade_id, list(updates))
+            versao = _editar_oportunidade(cursor, oportunidade_id, updates, versoes)
             conn.commit()
-            return {"success": True, "message": "Oportunidade atualizada parcialmente com sucesso."}
+
+            _apos_edicao(cursor, oportunidade_id)
+            # Delta só com os campos alterados que fazem parte da resposta (e a versão nova)
+            _publicar_mudanca(cursor, "atualizada", [oportunidade_id],
+                              [campo for campo in (*updates, "versao") if campo in CAMPOS_OPORTUNIDADE])
+            response.headers["ETag"] = etag_versao(versao)
+            return {"success": True, "message": "Oportunidade atualizada parcialmente com sucesso.", "versao": versao}
     except HTTPException as he:
+        if conn:
+            conn.rollback()
         raise he
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"DEBUG BACKEND: Erro ao atualizar oportunidade (PATCH): {e}")
+        logger.exception("Erro ao atualizar oportunidade (PATCH)")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
 
-@router.delete("/{oportunidade_id}/", status_code=status.HTTP_204_NO_CONTENT) # Rota espera '/oportunidades/{id}/'
-async def deletar_oportunidade(oportunidade_id: int):
+@router.patch("/{oportunidade_id}/", response_model=dict) # Rota espera '/oportunidades/{id}/'
+async def atualizar_oportunidade_parcial(oportunidade_id: int, dados: OportunidadeUpdate, response: Response,
+                                         if_match: Optional[str] = Header(None)):
     """
-    Endpoint DELETE para deletar oportunidade.
+    Endpoint PATCH para atualizar oportunidade parcial.
+    AGORA INCLUI OS NOVOS CAMPOS DE DATA E HORA.
+    Aceita If-Match como o PUT (412 se a oportunidade mudou desde a leitura).
     """
+    return await run_db(_atualizar_oportunidade_parcial, oportunidade_id, dados, if_match, response)
+
+def _deletar_oportunidade(oportunidade_id: int):
     conn = None
     try:
         conn = get_connection()
@@ -308,6 +957,12 @@ async def deletar_oportunidade(oportunidade_id: int):
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Oportunidade não encontrada")
             conn.commit()
+            cache_oportunidades.invalidar()
+            indice_oportunidades.remover(oportunidade_id)
+            motor_matching.remover_oportunidade(oportunidade_id)
+            indice_proximidade.remover(oportunidade_id)
+            indice_agenda.invalidar_oportunidade(oportunidade_id)
+            broker_oportunidades.publicar("removida", {"id": oportunidade_id})
             # Retornar None para 204 No Content é o mais comum, mas {"success": True} também funciona
             return None
     except HTTPException as he:
@@ -315,8 +970,28 @@ async def deletar_oportunidade(oportunidade_id: int):
     except Exception as e:
         if conn:
             conn.rollback()
-        print(f"DEBUG BACKEND: Erro ao deletar oportunidade: {e}")
+        logger.exception("Erro ao deletar oportunidade")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+def remover_arquivadas(ids):
+    """
+    Chamado pelo arquivamento agendado (src/arquivo.py) depois de cada lote já commitado:
+    as oportunidades arquivadas saem do cache, dos índices em memória e do feed, como no DELETE.
+    """
+    cache_oportunidades.invalidar()
+    for oportunidade_id in ids:
+        indice_oportunidades.remover(oportunidade_id)
+        motor_matching.remover_oportunidade(oportunidade_id)
+        indice_proximidade.remover(oportunidade_id)
+        indice_agenda.invalidar_oportunidade(oportunidade_id)
+        broker_oportunidades.publicar("removida", {"id": oportunidade_id})
+
+@router.delete("/{oportunidade_id}/", status_code=status.HTTP_204_NO_CONTENT) # Rota espera '/oportunidades/{id}/'
+async def deletar_oportunidade(oportunidade_id: int):
+    """
+    Endpoint DELETE para deletar oportunidade.
+    """
+    return await run_db(_deletar_oportunidade, oportunidade_id)
@@ -1,10 +1,21 @@
 # backend/src/routes/volunteer_routes.py
 
-from fastapi import APIRouter, HTTPException, status
+import logging
+from fastapi import APIRouter, HTTPException, status, Query, Response
 from fastapi.responses import JSONResponse
-from ..database import get_connection # Importa função de conexão
+from typing import Optional
+from datetime import date
+from ..database import get_connection, run_db # Importa função de conexão e o executor do banco
+from ..replicas import get_connection_leitura # Leituras simples vão para uma réplica, se houver
+from ..arquivo import unir_com_arquivo
+from ..pagination import HEADER_PROXIMO_CURSOR, LIMITE_MAXIMO, decodificar_cursor, fatiar_pagina, interpretar_ids, na_ordem_dos_ids
+from ..matching import motor_matching, carregar_motor, atualizar_voluntario_matching
+from ..agenda import carregar_compromissos, indice_agenda
+from ..carregadores import COLUNAS_VOLUNTARIOS, carregar_oportunidades
 # from ..models import DadosInscricao # Não usado aqui, pode ser removido
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/voluntarios", # Prefixo para todas as rotas de voluntários
     tags=["Voluntários"]
@@ -13,36 +24,86 @@ router = APIRouter(
 # =========================================================
 # Endpoints de Voluntários
 # =========================================================
+# Cada endpoint `async` delega o trabalho com PyMySQL (bloqueante) para a função
+# síncrona `_<nome>` correspondente, executada via run_db() no executor do banco.
 
-@router.get("/") # Rota: /voluntarios/
-async def consultar_voluntarios():
-    """
-    Endpoint GET para listar todos os voluntários cadastrados.
-    """
+def _consultar_voluntarios(limite: Optional[int], cursor_pagina: Optional[str]):
     conn = None
     try:
-        conn = get_connection()
+        # Colunas explícitas (COLUNAS_VOLUNTARIOS): a senha não sai
+        sql = f"SELECT {', '.join(COLUNAS_VOLUNTARIOS)} FROM voluntarios"
+        valores = []
+        # Paginação por chave (keyset) no id, em ordem crescente
+        if cursor_pagina:
+            (ultimo_id,) = decodificar_cursor(cursor_pagina, (int,))
+            sql += " WHERE id > %s"
+            valores.append(ultimo_id)
+        sql += " ORDER BY id"
+        if limite is not None:
+            sql += " LIMIT %s"
+            valores.append(limite + 1) # Uma linha extra indica se existe próxima página
+
+        conn = get_connection_leitura()
         with conn.cursor() as cursor:
-            cursor.execute("SELECT * FROM voluntarios")
-            return cursor.fetchall()
+            cursor.execute(sql, tuple(valores))
+            linhas = cursor.fetchall()
+        return fatiar_pagina(linhas, limite, lambda linha: (linha["id"],))
+    except HTTPException as he:
+        raise he
     except Exception as e:
-        print(f"DEBUG BACKEND: Erro ao consultar voluntários: {e}")
-        return JSONResponse({"error": str(e)}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.exception("Erro ao consultar voluntários")
+        # Exceção em vez de resposta: a rota desempacota o retorno como (linhas, cursor)
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
 
-@router.get("/{voluntario_id}") # Rota: /voluntarios/{voluntario_id}
-async def consultar_voluntario(voluntario_id: int):
+def _consultar_voluntarios_por_ids(ids):
+    conn = None
+    try:
+        conn = get_connection_leitura()
+        with conn.cursor() as cursor:
+            marcadores = ", ".join(["%s"] * len(ids))
+            # Mesmas colunas da listagem e do detalhe
+            cursor.execute(
+                f"SELECT {', '.join(COLUNAS_VOLUNTARIOS)} FROM voluntarios WHERE id IN ({marcadores})", tuple(ids))
+            return na_ordem_dos_ids(cursor.fetchall(), ids)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao consultar voluntários em lote")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    finally:
+        if conn:
+            conn.close()
+
+@router.get("/") # Rota: /voluntarios/
+async def consultar_voluntarios(
+    response: Response,
+    limite: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    cursor: Optional[str] = None,
+    ids: Optional[str] = Query(None, description="Consulta em lote: ids separados por vírgula (ex.: 3,1,2)"),
+):
     """
-    Endpoint GET para retornar um único voluntário pelo ID.
-    Retorna os detalhes do voluntário se encontrado, ou HTTP 404 se não existir.
+    Endpoint GET para listar os voluntários cadastrados, em ordem de id.
+    Com `limite`, a resposta é paginada por cursor (header X-Proximo-Cursor).
+    Sem `limite`, devolve a lista completa como antes.
+    Com `ids`, devolve só esses voluntários (até LIMITE_MAXIMO), na ordem pedida, numa
+    única consulta; ids inexistentes ficam de fora. Substitui um GET /voluntarios/{id}/ por linha.
     """
+    if ids is not None:
+        return await run_db(_consultar_voluntarios_por_ids, interpretar_ids(ids))
+    linhas, proximo_cursor = await run_db(_consultar_voluntarios, limite, cursor)
+    if proximo_cursor:
+        response.headers[HEADER_PROXIMO_CURSOR] = proximo_cursor
+    return linhas
+
+def _consultar_voluntario(voluntario_id: int):
     conn = None
     try:
-        conn = get_connection()
+        conn = get_connection_leitura()
         with conn.cursor() as cursor:
-            cursor.execute("SELECT * FROM voluntarios WHERE id = %s", (voluntario_id,))
+            cursor.execute(f"SELECT {', '.join(COLUNAS_VOLUNTARIOS)} FROM voluntarios WHERE id = %s", (voluntario_id,))
             resultado = cursor.fetchone()
             if not resultado:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voluntário não encontrado")
@@ -50,20 +111,24 @@ async def consultar_voluntario(voluntario_id: int):
     except HTTPException as he:
         raise he
     except Exception as e:
-        print(f"DEBUG BACKEND: Erro ao consultar voluntário por ID: {e}")
+        logger.exception("Erro ao consultar voluntário por ID")
         return JSONResponse({"error": str(e)}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
     finally:
         if conn:
             conn.close()
 
-@router.get("/{voluntario_id}/inscricoes") # Rota: /voluntarios/{voluntario_id}/inscricoes
-async def consultar_inscricoes_por_voluntario(voluntario_id: int):
+@router.get("/{voluntario_id}") # Rota: /voluntarios/{voluntario_id}
+async def consultar_voluntario(voluntario_id: int):
     """
-    Endpoint GET para retornar todas as inscrições de um voluntário específico.
+    Endpoint GET para retornar um único voluntário pelo ID.
+    Retorna os detalhes do voluntário se encontrado, ou HTTP 404 se não existir.
     """
+    return await run_db(_consultar_voluntario, voluntario_id)
+
+def _consultar_inscricoes_por_voluntario(voluntario_id: int, incluir_arquivo: bool = False):
     conn = None
     try:
-        conn = get_connection()
+        conn = get_connection_leitura()
         with conn.cursor() as cursor:
             sql = """
                 SELECT
@@ -71,17 +136,121 @@ async def consultar_inscricoes_por_voluntario(voluntario_id: int):
                     i.oportunidade_id,
                     o.titulo AS oportunidade_titulo,
                     i.data_inscricao,
-                    i.status
+                    i.status_inscricao AS status
                 FROM inscricoes i
                 JOIN oportunidades o ON i.oportunidade_id = o.id
                 WHERE i.voluntario_id = %s
-                ORDER BY i.data_inscricao DESC
             """
-            cursor.execute(sql, (voluntario_id,))
+            if not incluir_arquivo:
+                cursor.execute(sql + " ORDER BY i.data_inscricao DESC", (voluntario_id,))
+                return cursor.fetchall()
+            # Inscrição arquivada pode ser de oportunidade quente (rejeitada/cancelada antiga) ou arquivada
+            sql_arquivo = """
+                SELECT
+                    i.id AS inscricao_id,
+                    i.oportunidade_id,
+                    COALESCE(o.titulo, oa.titulo) AS oportunidade_titulo,
+                    i.data_inscricao,
+                    i.status_inscricao AS status
+                FROM inscricoes_arquivo i
+                LEFT JOIN oportunidades o ON i.oportunidade_id = o.id
+                LEFT JOIN oportunidades_arquivo oa ON i.oportunidade_id = oa.id
+                WHERE i.voluntario_id = %s
+            """
+            sql, valores = unir_com_arquivo(
+                [(sql, [voluntario_id]), (sql_arquivo, [voluntario_id])], "data_inscricao DESC")
+            cursor.execute(sql, tuple(valores))
             return cursor.fetchall()
     except Exception as e:
-        print(f"DEBUG BACKEND: Erro ao consultar inscrições por voluntário: {e}")
+        logger.exception("Erro ao consultar inscrições por voluntário")
+        return JSONResponse({"error": str(e)}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    finally:
+        if conn:
+            conn.close()
+
+@router.get("/{voluntario_id}/inscricoes") # Rota: /voluntarios/{voluntario_id}/inscricoes
+async def consultar_inscricoes_por_voluntario(voluntario_id: int, incluir_arquivo: bool = False):
+    """
+    Endpoint GET para retornar todas as inscrições de um voluntário específico.
+    As inscrições arquivadas só vêm com `incluir_arquivo=1`.
+    """
+    return await run_db(_consultar_inscricoes_por_voluntario, voluntario_id, incluir_arquivo)
+
+def _agenda_voluntario(voluntario_id: int, de: Optional[date], ate: Optional[date]):
+    def carregar(vid):
+        # Primário, não réplica: a mesma agenda sustenta a verificação de conflito na inscrição
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                # Agenda vazia só para quem existe; como nas outras rotas do voluntário, 404
+                cursor.execute("SELECT id FROM voluntarios WHERE id = %s", (vid,))
+                if not cursor.fetchone():
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voluntário não encontrado")
+                return carregar_compromissos(cursor, vid)
+        finally:
+            conn.close()
+
+    try:
+        return indice_agenda.no_periodo(voluntario_id, de, ate, carregar)
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao consultar agenda do voluntário")
         return JSONResponse({"error": str(e)}, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@router.get("/{voluntario_id}/agenda") # Rota: /voluntarios/{voluntario_id}/agenda?de=&ate=
+async def agenda_voluntario(voluntario_id: int, de: Optional[date] = None, ate: Optional[date] = None):
+    """
+    Endpoint GET com as inscrições pendentes e aprovadas do voluntário cujo período toca
+    [de, ate] (datas AAAA-MM-DD; `de` padrão hoje, `ate` sem limite), em ordem cronológica.
+    Cada item traz em `conflitos` as oportunidades da agenda com horário sobreposto.
+    Voluntário inexistente: 404.
+    """
+    de = de or date.today()
+    if ate is not None and ate < de:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'de' deve ser anterior ou igual a 'ate'")
+    return await run_db(_agenda_voluntario, voluntario_id, de, ate)
+
+def _recomendacoes_voluntario(voluntario_id: int, k: int):
+    conn = None
+    try:
+        conn = get_connection()
+        carregar_motor(conn)
+        with conn.cursor() as cursor:
+            # Voluntário cadastrado por outro processo: entra no motor na primeira consulta
+            if voluntario_id not in motor_matching.voluntarios and not atualizar_voluntario_matching(cursor, voluntario_id):
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Voluntário não encontrado")
+
+            # Oportunidades em que o voluntário já se inscreveu não são recomendadas
+            cursor.execute("SELECT oportunidade_id FROM inscricoes WHERE voluntario_id = %s", (voluntario_id,))
+            inscritas = [linha["oportunidade_id"] for linha in cursor.fetchall()]
+            resultados = motor_matching.recomendacoes(voluntario_id, k, inscritas) or []
+            if not resultados:
+                return []
+
+            ids = [oportunidade_id for oportunidade_id, *_ in resultados]
+            por_id = {item["id"]: item for item in carregar_oportunidades(cursor, ids)}
+
+        # Mantém a ordem da pontuação; ignora oportunidades removidas nesse meio-tempo
+        return [
+            {**por_id[oportunidade_id], "pontuacao": pontuacao, "afinidade": afinidade,
+             "compatibilidade_horario": horario}
+            for oportunidade_id, pontuacao, afinidade, horario in resultados
+            if oportunidade_id in por_id
+        ]
+    except HTTPException as he:
+        raise he
+    except Exception as e:
+        logger.exception("Erro ao calcular recomendações do voluntário")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     finally:
         if conn:
             conn.close()
+
+@router.get("/{voluntario_id}/recomendacoes") # Rota: /voluntarios/{voluntario_id}/recomendacoes?k=
+async def recomendacoes_voluntario(voluntario_id: int, k: int = Query(20, ge=1, le=LIMITE_MAXIMO)):
+    """
+    Endpoint GET com as k oportunidades ativas mais compatíveis com os interesses e a
+    disponibilidade do voluntário. Oportunidades em que ele já se inscreveu ficam de fora.
+    """
+    return await run_db(_recomendacoes_voluntario, voluntario_id, k)
@@ -0,0 +1,247 @@
+# backend/src/search.py
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+# Peso de cada campo no ranqueamento: ocorrências no título contam mais que na descrição.
+PESOS_CAMPOS = {
+    "titulo": 3.0,
+    "ong_nome": 2.0,
+    "perfil_voluntario": 1.0,
+    "descricao": 1.0,
+}
+
+# Palavras muito comuns em português que não ajudam a diferenciar documentos.
+STOPWORDS = frozenset(
+    "a o as os e de da do das dos em na no nas nos um uma uns umas para por com sem "
+    "que se ao aos ou como mais".split()
+)
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Fator aplicado quando o termo da consulta só casa como prefixo (ex.: "educ" -> "educacao")
+PESO_PREFIXO = 0.7
+# Máximo de termos do vocabulário considerados na expansão de um prefixo
+MAX_EXPANSAO_PREFIXO = 64
+
+_NAO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+def normalizar(texto):
+    """
+    Minúsculas e sem acentos: "Educação" -> "educacao".
+    """
+    if not texto:
+        return ""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acentos = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return sem_acentos.lower()
+
+
+def tokenizar(texto):
+    return [
+        token
+        for token in _NAO_ALFANUMERICO.split(normalizar(texto))
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+class IndiceBusca:
+    """
+    Índice invertido em memória para busca textual ranqueada (BM25 com pesos por campo).
+
+    - Cada documento é um dict com os campos de PESOS_CAMPOS.
+    - Consulta com semântica E: todos os termos precisam casar, exatamente ou como prefixo.
+    - Atualizações (indexar/remover) são incrementais e thread-safe.
+    """
+
+    def __init__(self, pesos_campos=None):
+        self.pesos_campos = pesos_campos or PESOS_CAMPOS
+        self._postings = {}   # termo -> {doc_id: frequência ponderada}
+        self._docs = {}       # doc_id -> (termos do documento, comprimento ponderado)
+        self._vocabulario = []  # termos ordenados, para expansão de prefixos via bisect
+        self._comprimento_total = 0.0
+        self._lock = threading.RLock()
+        self.carregado = False
+        self._carregando = False
+
+    def __len__(self):
+        return len(self._docs)
+
+    # -----------------------------------------------------------------
+    # Escrita
+    # -----------------------------------------------------------------
+    def _frequencias(self, documento):
+        frequencias = {}
+        for campo, peso in self.pesos_campos.items():
+            for token in tokenizar(documento.get(campo)):
+                frequencias[token] = frequencias.get(token, 0.0) + peso
+        return frequencias
+
+    def _remover(self, doc_id):
+        anterior = self._docs.pop(doc_id, None)
+        if anterior is None:
+            return
+        termos, comprimento = anterior
+        self._comprimento_total -= comprimento
+        for termo in termos:
+            postings = self._postings.get(termo)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[termo]
+                posicao = bisect_left(self._vocabulario, termo)
+                if posicao < len(self._vocabulario) and self._vocabulario[posicao] == termo:
+                    del self._vocabulario[posicao]
+
+    def indexar(self, doc_id, documento):
+        """
+        Insere ou substitui um documento no índice.
+        """
+        frequencias = self._frequencias(documento)
+        comprimento = sum(frequencias.values())
+        with self._lock:
+            self._remover(doc_id)
+            for termo, frequencia in frequencias.items():
+                postings = self._postings.get(termo)
+                if postings is None:
+                    postings = self._postings[termo] = {}
+                    insort(self._vocabulario, termo)
+                postings[doc_id] = frequencia
+            self._docs[doc_id] = (tuple(frequencias), comprimento)
+            self._comprimento_total += comprimento
+
+    def remover(self, doc_id):
+        with self._lock:
+            self._remover(doc_id)
+
+    @property
+    def ativo(self):
+        """
+        Indica se as escritas devem atualizar o índice (já carregado ou carregando).
+        Antes da primeira carga não há o que manter: a carga lê o estado atual do banco.
+        """
+        return self.carregado or self._carregando
+
+    def garantir_carregado(self, carregar):
+        """
+        Na primeira chamada, carrega o índice com `carregar()` (iterável de pares
+        (doc_id, documento)). O lock fica retido durante a carga, então atualizações
+        concorrentes esperam e são aplicadas por cima do estado carregado.
+        """
+        if self.carregado:
+            return
+        with self._lock:
+            if self.carregado:
+                return
+            self._carregando = True
+            try:
+                self.recarregar(carregar())
+            finally:
+                self._carregando = False
+
+    def recarregar(self, documentos):
+        """
+        Reconstrói o índice do zero a partir de pares (doc_id, documento).
+        """
+        with self._lock:
+            self._postings = {}
+            self._docs = {}
+            self._vocabulario = []
+            self._comprimento_total = 0.0
+            for doc_id, documento in documentos:
+                self.indexar(doc_id, documento)
+            self.carregado = True
+
+    # -----------------------------------------------------------------
+    # Leitura
+    # -----------------------------------------------------------------
+    def _expandir(self, termo):
+        """
+        Termos do vocabulário que começam com `termo`, com o peso de cada casamento.
+        """
+        expansao = []
+        posicao = bisect_left(self._vocabulario, termo)
+        while posicao < len(self._vocabulario) and len(expansao) < MAX_EXPANSAO_PREFIXO:
+            candidato = self._vocabulario[posicao]
+            if not candidato.startswith(termo):
+                break
+            expansao.append((candidato, 1.0 if candidato == termo else PESO_PREFIXO))
+            posicao += 1
+        return expansao
+
+    def buscar(self, consulta, limite=20, deslocamento=0):
+        """
+        Retorna (total, [(doc_id, relevancia), ...]) ordenado por relevância.
+        """
+        termos = list(dict.fromkeys(tokenizar(consulta)))
+        if not termos:
+            return 0, []
+
+        with self._lock:
+            quantidade_docs = len(self._docs)
+            if not quantidade_docs:
+                return 0, []
+            comprimento_medio = self._comprimento_total / quantidade_docs
+
+            # Para cada termo da consulta: lista de (postings, idf, fator) dos termos que casam
+            expansoes = []
+            for termo in termos:
+                casamentos = []
+                for candidato, fator in self._expandir(termo):
+                    postings = self._postings[candidato]
+                    idf = math.log(1 + (quantidade_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                    casamentos.append((postings, idf, fator))
+                if not casamentos:
+                    return 0, []
+                expansoes.append(casamentos)
+            # Começa pelo termo mais seletivo; os demais só são consultados para os candidatos restantes
+            expansoes.sort(key=lambda casamentos: sum(len(p) for p, _, _ in casamentos))
+
+            # BM25: tf = f * (k1 + 1) / (f + k1 * (1 - b + b * comprimento / comprimento_medio))
+            docs = self._docs
+            constante = BM25_K1 * (1 - BM25_B)
+            proporcional = BM25_K1 * BM25_B / comprimento_medio
+
+            pontuacoes = {}
+            for postings, idf, fator in expansoes[0]:
+                peso = fator * idf * (BM25_K1 + 1)
+                for doc_id, frequencia in postings.items():
+                    valor = peso * frequencia / (frequencia + constante + proporcional * docs[doc_id][1])
+                    # Um termo da consulta conta uma vez por documento: vale o melhor casamento
+                    if valor > pontuacoes.get(doc_id, 0.0):
+                        pontuacoes[doc_id] = valor
+
+            for casamentos in expansoes[1:]:
+                restantes = {}
+                for doc_id, pontuacao in pontuacoes.items():
+                    melhor = 0.0
+                    for postings, idf, fator in casamentos:
+                        frequencia = postings.get(doc_id)
+                        if frequencia is not None:
+                            valor = fator * idf * (BM25_K1 + 1) * frequencia / (
+                                frequencia + constante + proporcional * docs[doc_id][1]
+                            )
+                            if valor > melhor:
+                                melhor = valor
+                    if melhor:
+                        restantes[doc_id] = pontuacao + melhor
+                pontuacoes = restantes
+                if not pontuacoes:
+                    return 0, []
+
+        melhores = heapq.nlargest(
+            deslocamento + limite, pontuacoes.items(), key=lambda item: (item[1], item[0])
+        )
+        pagina = melhores[deslocamento:]
+        return len(pontuacoes), [(doc_id, round(relevancia, 4)) for doc_id, relevancia in pagina]
+
+
+# Índice do processo para as oportunidades (carregado sob demanda pelas rotas)
+indice_oportunidades = IndiceBusca()
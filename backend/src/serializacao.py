@@ -0,0 +1,67 @@
+# backend/src/serializacao.py
+#
+# Caminho rápido de serialização para listas grandes vindas do banco e projeção
+# de campos (?campos=titulo,ong_nome). As linhas do banco já têm o formato da API
+# (formatar_oportunidade), então não passam de novo pela validação do Pydantic:
+# cada linha vira um dict só com os campos da resposta, na ordem do modelo, e o
+# JSON sai direto do orjson (ou do json da biblioteca padrão, se ele não estiver instalado).
+
+import json
+from datetime import date, datetime, time
+
+from fastapi import HTTPException, status
+
+from .models import OportunidadeResponse
+
+try:
+    import orjson
+except ImportError: # Dependência opcional: sem ela o resultado é o mesmo, só mais lento
+    orjson = None
+
+# Campos da resposta de oportunidade, na ordem em que o response_model os serializa
+CAMPOS_OPORTUNIDADE = tuple(OportunidadeResponse.model_fields)
+
+# Sempre presentes numa resposta projetada: identificam a linha no frontend
+CAMPOS_OBRIGATORIOS = ("id",)
+
+
+def _padrao_json(valor):
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+
+def dumps(dados):
+    """
+    JSON compacto em bytes, no mesmo formato que o Pydantic produziria para os
+    tipos usados nas respostas (datetime em ISO 8601, sem espaços).
+    """
+    if orjson is not None:
+        return orjson.dumps(dados)
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":"), default=_padrao_json).encode("utf-8")
+
+
+def interpretar_campos(texto, permitidos=CAMPOS_OPORTUNIDADE):
+    """
+    "titulo, ong_nome" -> ("id", "titulo", "ong_nome"), na ordem do modelo.
+    None ou vazio -> None (todos os campos). Campo desconhecido -> HTTP 422.
+    """
+    if not texto:
+        return None
+    pedidos = {campo.strip() for campo in texto.split(",") if campo.strip()}
+    desconhecidos = pedidos - set(permitidos)
+    if desconhecidos:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Campos desconhecidos em 'campos': {', '.join(sorted(desconhecidos))}. "
+                   f"Permitidos: {', '.join(permitidos)}",
+        )
+    pedidos.update(CAMPOS_OBRIGATORIOS)
+    return tuple(campo for campo in permitidos if campo in pedidos)
+
+
+def serializar_linhas(linhas, campos=CAMPOS_OPORTUNIDADE):
+    """
+    Lista de linhas do banco -> JSON com apenas `campos` (colunas extras, como ong_id, ficam de fora).
+    """
+    return dumps([{campo: linha.get(campo) for campo in campos} for linha in linhas])
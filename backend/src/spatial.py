@@ -0,0 +1,162 @@
+# backend/src/spatial.py
+
+import heapq
+import math
+import threading
+
+RAIO_TERRA_KM = 6371.0088
+KM_POR_GRAU_LATITUDE = 111.195
+
+# Lado das células da grade, em graus (~11 km na latitude). Raios de busca típicos
+# (1 a 50 km) percorrem de 1 a ~100 células, independentemente do total de pontos.
+TAMANHO_CELULA_GRAUS = 0.1
+
+
+def distancia_km(lat1, lon1, lat2, lon2):
+    """
+    Distância de grande círculo (fórmula de haversine).
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RAIO_TERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndiceEspacial:
+    """
+    Grade regular em memória (células de TAMANHO_CELULA_GRAUS) para busca por raio.
+
+    - Uma consulta visita só as células que intersectam a caixa envolvente do círculo
+      e calcula a distância exata apenas para os pontos dessas células.
+    - Atualizações (indexar/remover) são incrementais e thread-safe.
+    - Cada ponto pode ter um grupo (ex.: o status da oportunidade) com uma grade própria:
+      a consulta filtrada por grupo só visita os pontos dele.
+    """
+
+    def __init__(self, tamanho_celula=TAMANHO_CELULA_GRAUS):
+        self.tamanho_celula = tamanho_celula
+        self._grades = {}   # grupo -> {(linha, coluna) -> {ponto_id: (lat, lon)}}
+        self._pontos = {}   # ponto_id -> (grupo, célula)
+        self._lock = threading.RLock()
+        self.carregado = False
+        self._carregando = False
+
+    def __len__(self):
+        return len(self._pontos)
+
+    def _celula(self, latitude, longitude):
+        return (math.floor(latitude / self.tamanho_celula), math.floor(longitude / self.tamanho_celula))
+
+    # -----------------------------------------------------------------
+    # Escrita
+    # -----------------------------------------------------------------
+    def _remover(self, ponto_id):
+        posicao = self._pontos.pop(ponto_id, None)
+        if posicao is None:
+            return
+        grupo, celula = posicao
+        celulas = self._grades[grupo]
+        pontos = celulas[celula]
+        del pontos[ponto_id]
+        if not pontos:
+            del celulas[celula]
+            if not celulas:
+                del self._grades[grupo]
+
+    def indexar(self, ponto_id, latitude, longitude, grupo=None):
+        """
+        Insere ou move um ponto (também de um grupo para outro). Sem coordenadas, o ponto
+        sai do índice.
+        """
+        with self._lock:
+            self._remover(ponto_id)
+            if latitude is None or longitude is None:
+                return
+            latitude, longitude = float(latitude), float(longitude)
+            celula = self._celula(latitude, longitude)
+            self._grades.setdefault(grupo, {}).setdefault(celula, {})[ponto_id] = (latitude, longitude)
+            self._pontos[ponto_id] = (grupo, celula)
+
+    def remover(self, ponto_id):
+        with self._lock:
+            self._remover(ponto_id)
+
+    @property
+    def ativo(self):
+        # Mesma semântica de IndiceBusca.ativo
+        return self.carregado or self._carregando
+
+    def garantir_carregado(self, carregar):
+        """
+        Na primeira chamada, carrega o índice com `carregar()` (iterável de
+        (ponto_id, latitude, longitude[, grupo])). Como em IndiceBusca, o lock fica retido durante a carga.
+        """
+        if self.carregado:
+            return
+        with self._lock:
+            if self.carregado:
+                return
+            self._carregando = True
+            try:
+                self.recarregar(carregar())
+            finally:
+                self._carregando = False
+
+    def recarregar(self, pontos):
+        with self._lock:
+            self._grades = {}
+            self._pontos = {}
+            for ponto_id, latitude, longitude, *grupo in pontos:
+                self.indexar(ponto_id, latitude, longitude, *grupo)
+            self.carregado = True
+
+    # -----------------------------------------------------------------
+    # Leitura
+    # -----------------------------------------------------------------
+    def proximos(self, latitude, longitude, raio_km, limite=None, grupo=None):
+        """
+        Retorna [(ponto_id, distancia_km), ...] dentro do raio, do mais próximo ao mais distante.
+        Com `grupo`, só os pontos indexados nele (sem, todos os grupos).
+        """
+        delta_lat = raio_km / KM_POR_GRAU_LATITUDE
+        cos_lat = math.cos(math.radians(min(89.0, abs(latitude) + delta_lat)))
+        delta_lon = 180.0 if cos_lat * 180.0 * KM_POR_GRAU_LATITUDE < raio_km else raio_km / (KM_POR_GRAU_LATITUDE * cos_lat)
+        linha_min, coluna_min = self._celula(latitude - delta_lat, longitude - delta_lon)
+        linha_max, coluna_max = self._celula(latitude + delta_lat, longitude + delta_lon)
+
+        encontrados = []
+        with self._lock:
+            if grupo is None:
+                grades = list(self._grades.values())
+            else:
+                grades = [self._grades[grupo]] if grupo in self._grades else []
+            for grade in grades:
+                # Grade esparsa: com muitas células no retângulo, é mais barato percorrer as ocupadas
+                if (linha_max - linha_min + 1) * (coluna_max - coluna_min + 1) > len(grade):
+                    celulas = (
+                        pontos for (linha, coluna), pontos in grade.items()
+                        if linha_min <= linha <= linha_max and coluna_min <= coluna <= coluna_max
+                    )
+                else:
+                    celulas = (
+                        grade[(linha, coluna)]
+                        for linha in range(linha_min, linha_max + 1)
+                        for coluna in range(coluna_min, coluna_max + 1)
+                        if (linha, coluna) in grade
+                    )
+                for pontos in celulas:
+                    for ponto_id, (lat, lon) in pontos.items():
+                        distancia = distancia_km(latitude, longitude, lat, lon)
+                        if distancia <= raio_km:
+                            encontrados.append((distancia, ponto_id))
+
+        if limite is not None:
+            encontrados = heapq.nsmallest(limite, encontrados)
+        else:
+            encontrados.sort()
+        return [(ponto_id, round(distancia, 3)) for distancia, ponto_id in encontrados]
+
+
+# Índice do processo para as oportunidades (carregado sob demanda pelas rotas)
+indice_proximidade = IndiceEspacial()
@@ -0,0 +1,55 @@
+# backend/src/vagas.py
+
+import os
+import threading
+import time
+
+# Por quanto tempo uma oportunidade marcada como esgotada é recusada sem consultar o banco.
+# Escritas deste processo que liberam vagas limpam a marca na hora; o TTL cobre as
+# mudanças feitas por outros processos.
+VAGAS_ESGOTADAS_TTL = float(os.getenv("VAGAS_ESGOTADAS_TTL", 30))
+
+
+class ControleVagas:
+    """
+    Registro em memória das oportunidades sem vagas. Depois que uma reserva falha por
+    falta de vagas, as próximas inscrições naquela oportunidade são recusadas
+    imediatamente, sem ocupar conexão nem tocar no banco.
+    """
+
+    def __init__(self, ttl=VAGAS_ESGOTADAS_TTL):
+        self.ttl = ttl
+        self._esgotadas = {} # oportunidade_id -> instante (monotonic) em que a marca expira
+        self._lock = threading.Lock()
+        self.recusas_rapidas = 0
+
+    def esgotada(self, oportunidade_id):
+        with self._lock:
+            expira_em = self._esgotadas.get(oportunidade_id)
+            if expira_em is None:
+                return False
+            if expira_em <= time.monotonic():
+                del self._esgotadas[oportunidade_id]
+                return False
+            self.recusas_rapidas += 1
+            return True
+
+    def marcar_esgotada(self, oportunidade_id):
+        agora = time.monotonic()
+        with self._lock:
+            # Com TTL fixo e cada marca nova indo para o fim, o dict fica em ordem de expiração:
+            # as expiradas saem do começo, sem esperar que alguém consulte a oportunidade de novo
+            while self._esgotadas:
+                mais_antiga, expira_em = next(iter(self._esgotadas.items()))
+                if expira_em > agora:
+                    break
+                del self._esgotadas[mais_antiga]
+            self._esgotadas.pop(oportunidade_id, None)
+            self._esgotadas[oportunidade_id] = agora + self.ttl
+
+    def liberar(self, oportunidade_id):
+        with self._lock:
+            self._esgotadas.pop(oportunidade_id, None)
+
+
+controle_vagas = ControleVagas()
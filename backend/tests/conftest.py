@@ -0,0 +1,49 @@
+# backend/tests/conftest.py
+#
+# Testes automatizados (a partir da pasta backend):
+#   python -m pytest tests
+# Os que usam o fixture `banco` precisam de um MySQL: sobem um descartável com Docker
+# (benchmarks/banco.py) ou, com TESTES_BANCO=existente, usam o das variáveis MYSQL_*.
+# Sem nenhum dos dois, são pulados.
+
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# Os módulos leem o ambiente no import: sem migrações nem arquivamento no startup
+os.environ.setdefault("MIGRACOES_NO_STARTUP", "nenhum")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.banco import BancoExistente, MySQLDescartavel
+
+
+@pytest.fixture(scope="session")
+def banco():
+    """
+    MySQL com todas as migrações aplicadas; o pool da API (src/database.py) aponta para ele.
+    """
+    if os.getenv("TESTES_BANCO") == "existente":
+        contexto = BancoExistente()
+    elif shutil.which("docker"):
+        contexto = MySQLDescartavel()
+    else:
+        pytest.skip("sem MySQL para os testes: instale o Docker ou use TESTES_BANCO=existente")
+
+    from src import database
+    from src.migrations import aplicar_migracoes
+
+    with contexto as instancia:
+        variaveis = instancia.variaveis()
+        os.environ.update(variaveis)
+        # database.py leu as variáveis no import: aponta os globais e recria o pool
+        database.shutdown_db()
+        database._pool = None
+        for nome, valor in variaveis.items():
+            setattr(database, nome, int(valor) if nome == "MYSQL_PORT" else valor)
+        aplicar_migracoes()
+        yield instancia
+        database.shutdown_db()
+        database._pool = None
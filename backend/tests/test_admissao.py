@@ -0,0 +1,42 @@
+# backend/tests/test_admissao.py
+#
+# Controle de admissão (src/admissao.py) sem servidor: leituras ocupando todas as vagas
+# não podem fazer as escritas receberem 503 com a fila delas vazia.
+
+import asyncio
+
+from src.admissao import ESCRITA, LEITURA, PESADA, ControleAdmissao
+
+
+def _ocupar_leituras(controle, quantidade):
+    for _ in range(quantidade):
+        controle._ocupar(controle.classes[LEITURA])
+
+
+def test_escrita_espera_na_fila_quando_as_leituras_podem_ocupar_tudo():
+    async def cenario():
+        # Leituras com limite igual ao total: nenhuma reserva para as escritas
+        controle = ControleAdmissao(limite_total=4, limites={LEITURA: 4}, prazo=1)
+        _ocupar_leituras(controle, 4)
+        escrita = asyncio.create_task(controle.entrar(ESCRITA))
+        await asyncio.sleep(0.01)
+        assert not escrita.done() # Na fila, não recusada
+        assert len(controle.classes[ESCRITA].fila) == 1
+        controle.sair(LEITURA, 0.01)
+        assert await escrita is None
+        assert controle.classes[ESCRITA].em_andamento == 1
+
+    asyncio.run(cenario())
+
+
+def test_exportacao_sem_vaga_com_fila_ocupada_e_recusada():
+    async def cenario():
+        controle = ControleAdmissao(limite_total=4, limites={LEITURA: 4}, prazo=1)
+        _ocupar_leituras(controle, 4)
+        primeira = asyncio.create_task(controle.entrar(PESADA))
+        await asyncio.sleep(0.01)
+        motivo, _ = await controle.entrar(PESADA)
+        assert motivo == "prazo"
+        primeira.cancel()
+
+    asyncio.run(cenario())
@@ -0,0 +1,104 @@
+# backend/tests/test_executor.py
+#
+# O banco roda no executor de run_db() (src/database.py): uma consulta lenta ocupa uma
+# thread do executor, não o event loop. As outras requisições continuam com a latência
+# de uma consulta rápida. O banco aqui é uma conexão falsa que só dorme.
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src import database
+from src.cache import cache_oportunidades
+from src.pool import ConnectionPool
+
+CONSULTA_LENTA = 1.0
+CONSULTA_RAPIDA = 0.02
+REQUISICOES_RAPIDAS = 20
+
+
+class CursorFalso:
+    def __init__(self):
+        self.rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        pass
+
+    def execute(self, sql, parametros=()):
+        # Só a listagem de voluntários é lenta
+        time.sleep(CONSULTA_LENTA if "FROM voluntarios" in sql else CONSULTA_RAPIDA)
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+    def close(self):
+        pass
+
+
+class ConexaoFalsa:
+    open = True
+
+    def __init__(self, **_):
+        pass
+
+    def cursor(self, *_):
+        return CursorFalso()
+
+    def ping(self, reconnect=False):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def banco_falso(monkeypatch):
+    pool = ConnectionPool({}, min_size=0, max_size=database.MYSQL_POOL_MAX_SIZE, timeout=5, connect=ConexaoFalsa)
+    monkeypatch.setattr(database, "_pool", pool)
+    cache_oportunidades.invalidar()
+    yield
+    database.shutdown_db()
+
+
+def test_consulta_lenta_nao_atrasa_as_demais(banco_falso):
+    from main import api
+
+    inicio = time.perf_counter()
+
+    async def medir(cliente, caminho):
+        resposta = await cliente.get(caminho)
+        assert resposta.status_code == 200, resposta.text
+        # Contado desde o início do cenário: um loop bloqueado não escapa da conta
+        return time.perf_counter() - inicio
+
+    async def cenario():
+        transporte = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste") as cliente:
+            lenta = asyncio.create_task(medir(cliente, "/api/voluntarios/"))
+            await asyncio.sleep(0.05) # A consulta lenta já está ocupando uma thread
+            # Filtros diferentes: nenhuma resposta sai do cache
+            rapidas = await asyncio.gather(*(
+                medir(cliente, f"/api/oportunidades/?ong_id={i}") for i in range(REQUISICOES_RAPIDAS)
+            ))
+            return await lenta, rapidas
+
+    lenta, rapidas = asyncio.run(cenario())
+    assert lenta >= CONSULTA_LENTA
+    # Com o loop bloqueado, cada rápida esperaria a lenta (~1 s). Com o executor, as 20
+    # dividem as threads livres: poucas rodadas de uma consulta rápida cada.
+    rodadas = -(-REQUISICOES_RAPIDAS // (database.MYSQL_EXECUTOR_WORKERS - 1))
+    assert max(rapidas) < rodadas * CONSULTA_RAPIDA + 0.35, rapidas
@@ -0,0 +1,202 @@
+# backend/tests/test_inscricoes.py
+#
+# Concorrência das inscrições (POST /api/inscricoes/) contra um MySQL de verdade:
+# 500 envios simultâneos nunca passam de num_vagas e nunca criam duas inscrições do
+# mesmo voluntário na mesma oportunidade; reinscrições simultâneas depois de um
+# cancelamento ocupam uma vaga só; inscrições simultâneas do mesmo voluntário em
+# oportunidades com horários conflitantes não passam as duas (nem uma reativação que
+# conflita); reenvios continuam idempotentes depois que a oportunidade esgota.
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from benchmarks import dados
+from src import admissao
+
+ENVIOS = 500
+VOLUNTARIOS = 400 # Os 100 envios restantes repetem voluntários: reenvios simultâneos
+VAGAS = 50
+
+
+@pytest.fixture
+def api(banco, monkeypatch):
+    # Sem 503 do controle de admissão: todos os envios chegam ao banco
+    monkeypatch.setattr(admissao, "ADMISSAO_ATIVA", False)
+    from main import api
+    return api
+
+
+def _cenario(api, corpo):
+    async def executar():
+        transporte = httpx.ASGITransport(app=api)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://teste", timeout=120) as cliente:
+            return await corpo(cliente)
+    return asyncio.run(executar())
+
+
+async def _criar_oportunidade(cliente, vagas, **campos):
+    resposta = await cliente.post("/api/oportunidades/", json={
+        "titulo": f"Teste de concorrência {time.time_ns()}",
+        "descricao": "Oportunidade criada pelo teste de concorrência das inscrições.",
+        "ong_nome": "ONG Testes",
+        "endereco": "Rua dos Testes, 100 - São Paulo/SP",
+        "num_vagas": vagas,
+        "status_vaga": "ativa",
+        "tipo_acao": "educacao",
+        **campos,
+    })
+    assert resposta.status_code < 400, resposta.text
+    return resposta.json()["id"]
+
+
+def _inscricao(oportunidade_id, base_cpf, i):
+    return {
+        "nome": f"Voluntário Teste {i}",
+        "nascimento": "2000-01-01",
+        "cpf": f"{base_cpf:08d}{i:03d}",
+        "mensagem": "Inscrição do teste de concorrência",
+        "oportunidade_id": oportunidade_id,
+    }
+
+
+def _estado(oportunidade_id):
+    conn = dados.conectar()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT num_vagas, vagas_ocupadas FROM oportunidades WHERE id = %s", (oportunidade_id,))
+            oportunidade = cursor.fetchone()
+            cursor.execute(
+                "SELECT voluntario_id, COUNT(*) AS total, SUM(status_inscricao IN ('pendente', 'aprovada')) AS ativas "
+                "FROM inscricoes WHERE oportunidade_id = %s GROUP BY voluntario_id",
+                (oportunidade_id,)
+            )
+            return oportunidade, cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def test_500_inscricoes_simultaneas_sem_sobrelotacao(api):
+    base_cpf = time.time_ns() % 10**8
+
+    async def corpo(cliente):
+        oportunidade_id = await _criar_oportunidade(cliente, VAGAS)
+        envios = [_inscricao(oportunidade_id, base_cpf, i % VOLUNTARIOS) for i in range(ENVIOS)]
+        respostas = await asyncio.gather(*(cliente.post("/api/inscricoes/", json=envio) for envio in envios))
+        return oportunidade_id, respostas
+
+    oportunidade_id, respostas = _cenario(api, corpo)
+    codigos = [resposta.status_code for resposta in respostas]
+    assert set(codigos) <= {200, 201, 409}, [r.text for r in respostas if r.status_code not in (200, 201, 409)][:3]
+    assert codigos.count(201) == VAGAS
+
+    oportunidade, por_voluntario = _estado(oportunidade_id)
+    assert oportunidade["vagas_ocupadas"] <= oportunidade["num_vagas"]
+    assert oportunidade["vagas_ocupadas"] == sum(linha["ativas"] for linha in por_voluntario) == VAGAS
+    assert all(linha["total"] == 1 for linha in por_voluntario)
+
+
+def test_reinscricoes_simultaneas_ocupam_uma_vaga(api):
+    base_cpf = time.time_ns() % 10**8
+
+    async def corpo(cliente):
+        oportunidade_id = await _criar_oportunidade(cliente, 10)
+        envio = _inscricao(oportunidade_id, base_cpf, 1)
+        resposta = await cliente.post("/api/inscricoes/", json=envio)
+        assert resposta.status_code == 201, resposta.text
+        cancelamento = await cliente.patch(f"/api/inscricoes/{resposta.json()['id']}/", json={"status": "cancelada"})
+        assert cancelamento.status_code == 200, cancelamento.text
+        respostas = await asyncio.gather(*(cliente.post("/api/inscricoes/", json=envio) for _ in range(50)))
+        return oportunidade_id, respostas
+
+    oportunidade_id, respostas = _cenario(api, corpo)
+    assert all(resposta.status_code in (200, 201) for resposta in respostas)
+    assert [resposta.json()["ja_inscrito"] for resposta in respostas].count(False) == 1
+
+    oportunidade, por_voluntario = _estado(oportunidade_id)
+    assert oportunidade["vagas_ocupadas"] == 1
+    assert len(por_voluntario) == 1 and por_voluntario[0]["total"] == 1 and por_voluntario[0]["ativas"] == 1
+
+
+def test_reenvio_depois_de_esgotar_devolve_a_inscricao(api):
+    base_cpf = time.time_ns() % 10**8
+
+    async def corpo(cliente):
+        oportunidade_id = await _criar_oportunidade(cliente, 1)
+        primeira = await cliente.post("/api/inscricoes/", json=_inscricao(oportunidade_id, base_cpf, 1))
+        sem_vaga = await cliente.post("/api/inscricoes/", json=_inscricao(oportunidade_id, base_cpf, 2))
+        reenvio = await cliente.post("/api/inscricoes/", json=_inscricao(oportunidade_id, base_cpf, 1))
+        outra = await cliente.post("/api/inscricoes/", json=_inscricao(oportunidade_id, base_cpf, 3))
+        return primeira, sem_vaga, reenvio, outra
+
+    primeira, sem_vaga, reenvio, outra = _cenario(api, corpo)
+    assert primeira.status_code == 201, primeira.text
+    assert sem_vaga.status_code == 409 # Marca a oportunidade como esgotada
+    assert reenvio.status_code == 200, reenvio.text
+    assert reenvio.json()["ja_inscrito"] and reenvio.json()["id"] == primeira.json()["id"]
+    assert outra.status_code == 409
+
+
+def test_voluntario_inexistente_responde_404(api):
+    async def corpo(cliente):
+        oportunidade_id = await _criar_oportunidade(cliente, 5)
+        resposta = await cliente.post("/api/inscricoes/", json={
+            **_inscricao(oportunidade_id, 0, 0), "voluntario_id": 2_000_000_000,
+        })
+        return oportunidade_id, resposta
+
+    oportunidade_id, resposta = _cenario(api, corpo)
+    assert resposta.status_code == 404, resposta.text
+    oportunidade, _ = _estado(oportunidade_id)
+    assert oportunidade["vagas_ocupadas"] == 0
+
+
+def test_inscricoes_simultaneas_com_conflito_de_horario(api):
+    base_cpf = time.time_ns() % 10**8
+    horario = {"data_inicio": "10/03/2031", "data_termino": "10/03/2031"}
+
+    async def corpo(cliente):
+        manha = await _criar_oportunidade(cliente, 10, **horario, hora_inicio="09:00", hora_termino="12:00")
+        fim_da_manha = await _criar_oportunidade(cliente, 10, **horario, hora_inicio="11:00", hora_termino="13:00")
+        rodadas = []
+        for i in range(20): # Um voluntário novo por rodada, as duas inscrições ao mesmo tempo
+            rodadas.append(await asyncio.gather(
+                cliente.post("/api/inscricoes/", json=_inscricao(manha, base_cpf, i)),
+                cliente.post("/api/inscricoes/", json=_inscricao(fim_da_manha, base_cpf, i)),
+            ))
+        return (manha, fim_da_manha), rodadas
+
+    ids, rodadas = _cenario(api, corpo)
+    for respostas in rodadas:
+        assert sorted(resposta.status_code for resposta in respostas) == [201, 409], [r.text for r in respostas]
+
+    ocupadas = sum(_estado(oportunidade_id)[0]["vagas_ocupadas"] for oportunidade_id in ids)
+    assert ocupadas == len(rodadas)
+
+
+def test_reativacao_com_conflito_de_horario_e_recusada(api):
+    base_cpf = time.time_ns() % 10**8
+    horario = {"data_inicio": "10/03/2031", "data_termino": "10/03/2031"}
+
+    async def corpo(cliente):
+        manha = await _criar_oportunidade(cliente, 10, **horario, hora_inicio="09:00", hora_termino="12:00")
+        fim_da_manha = await _criar_oportunidade(cliente, 10, **horario, hora_inicio="11:00", hora_termino="13:00")
+        primeira = await cliente.post("/api/inscricoes/", json=_inscricao(manha, base_cpf, 1))
+        await cliente.patch(f"/api/inscricoes/{primeira.json()['id']}/", json={"status": "cancelada"})
+        segunda = await cliente.post("/api/inscricoes/", json=_inscricao(fim_da_manha, base_cpf, 1))
+        reativacao = await cliente.patch(f"/api/inscricoes/{primeira.json()['id']}/", json={"status": "pendente"})
+        return manha, segunda, reativacao
+
+    manha, segunda, reativacao = _cenario(api, corpo)
+    assert segunda.status_code == 201, segunda.text
+    assert reativacao.status_code == 409, reativacao.text
+    assert _estado(manha)[0]["vagas_ocupadas"] == 0
+
+
+def test_agenda_de_voluntario_inexistente_responde_404(api):
+    async def corpo(cliente):
+        return await cliente.get("/api/voluntarios/2000000000/agenda")
+
+    assert _cenario(api, corpo).status_code == 404
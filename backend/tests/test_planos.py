@@ -0,0 +1,33 @@
+# backend/tests/test_planos.py
+#
+# Os planos de execução (EXPLAIN) das consultas principais usam os índices esperados
+# (lista em benchmarks/planos.py). Roda sobre os dados sintéticos de benchmarks/dados.py:
+# em tabelas quase vazias o otimizador prefere varrer, e o teste não diria nada.
+
+import os
+
+import pytest
+
+from benchmarks import dados
+from benchmarks.planos import conferir_planos
+
+ESCALA = float(os.getenv("TESTES_ESCALA_PLANOS", 0.2))
+
+
+@pytest.fixture(scope="module")
+def conexao(banco):
+    conn = dados.conectar()
+    try:
+        dados.limpar(conn)
+        dados.gerar(conn, escala=ESCALA)
+        with conn.cursor() as cursor:
+            for tabela in ("ongs", "oportunidades", "voluntarios", "inscricoes", "atividade_ongs", "painel_ongs"):
+                cursor.execute(f"ANALYZE TABLE {tabela}")
+                cursor.fetchall()
+        yield conn
+    finally:
+        conn.close()
+
+
+def test_consultas_principais_usam_os_indices_esperados(conexao):
+    assert conferir_planos(conexao) == []
@@ -0,0 +1,45 @@
+# backend/tests/test_proximidade.py
+#
+# Grade de proximidade (src/spatial.py) sem banco: a consulta por status só visita a
+# grade daquele status e devolve os mesmos pontos que a varredura completa.
+
+import random
+
+from src.spatial import IndiceEspacial, distancia_km
+
+CENTRO = (-23.0, -46.0)
+
+
+def _varredura(pontos, raio_km, limite, grupo=None):
+    no_raio = sorted(
+        (round(distancia_km(*CENTRO, lat, lon), 3), ponto_id)
+        for ponto_id, lat, lon, status in pontos
+        if (grupo is None or status == grupo) and distancia_km(*CENTRO, lat, lon) <= raio_km
+    )
+    return [ponto_id for _, ponto_id in no_raio[:limite]]
+
+
+def test_consulta_por_status_igual_a_varredura():
+    aleatorio = random.Random(42)
+    pontos = [
+        (i, CENTRO[0] + aleatorio.uniform(-1, 1), CENTRO[1] + aleatorio.uniform(-1, 1),
+         aleatorio.choice(["ativa", "encerrada", "inativa"]))
+        for i in range(5000)
+    ]
+    indice = IndiceEspacial()
+    indice.recarregar(pontos)
+
+    for grupo in (None, "ativa", "inativa"):
+        encontrados = indice.proximos(*CENTRO, 40, 25, grupo)
+        assert [ponto_id for ponto_id, _ in encontrados] == _varredura(pontos, 40, 25, grupo)
+
+
+def test_mudanca_de_status_move_o_ponto_de_grade():
+    indice = IndiceEspacial()
+    indice.indexar(1, *CENTRO, "ativa")
+    indice.indexar(1, *CENTRO, "encerrada")
+
+    assert indice.proximos(*CENTRO, 1, None, "ativa") == []
+    assert [ponto_id for ponto_id, _ in indice.proximos(*CENTRO, 1, None, "encerrada")] == [1]
+    indice.remover(1)
+    assert indice.proximos(*CENTRO, 1) == [] and len(indice) == 0
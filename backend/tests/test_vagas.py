@@ -0,0 +1,31 @@
+# backend/tests/test_vagas.py
+#
+# Registro das oportunidades esgotadas (src/vagas.py) sem banco: as marcas vencidas saem
+# quando outra oportunidade é marcada, mesmo que ninguém volte a consultá-las.
+
+import time
+
+from src.vagas import ControleVagas
+
+
+def test_marcas_vencidas_saem_ao_marcar_outra():
+    controle = ControleVagas(ttl=0.05)
+    for oportunidade_id in range(1000):
+        controle.marcar_esgotada(oportunidade_id)
+    assert controle.esgotada(999)
+
+    time.sleep(0.06)
+    controle.marcar_esgotada(5000)
+    assert list(controle._esgotadas) == [5000]
+
+
+def test_remarcar_renova_a_validade():
+    controle = ControleVagas(ttl=0.05)
+    controle.marcar_esgotada(1)
+    controle.marcar_esgotada(2)
+    time.sleep(0.03)
+    controle.marcar_esgotada(1) # Vai para o fim: expira depois da 2
+    time.sleep(0.03)
+    controle.marcar_esgotada(3)
+    assert list(controle._esgotadas) == [1, 3]
+    assert controle.esgotada(1) and not controle.esgotada(2)
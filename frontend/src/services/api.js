@@ -6,17 +6,34 @@ const API = axios.create({
 });
 
 // Oportunidades
-export const fetchOpportunities = () => API.get('/oportunidades/');
+// Aceita filtros e paginação opcionais, ex.: { status_vaga: 'ativa', limite: 20, cursor }.
+// O cursor da próxima página vem no header 'x-proximo-cursor' da resposta.
+export const fetchOpportunities = (params) => API.get('/oportunidades/', { params });
+// Busca textual ranqueada no servidor: { q, limite, deslocamento } -> { total, itens }
+export const searchOpportunities = (params) => API.get('/oportunidades/busca', { params });
 export const createOpportunity = (data) => API.post('/oportunidades/', data);
 // NOVAS FUNÇÕES PARA EDIÇÃO E EXCLUSÃO
-export const updateOpportunity = (id, data) => API.put(`/oportunidades/${id}/`, data); // <<--- CORRIGIDO: ADICIONADA BARRA FINAL AQUI
+// Com a versão carregada, envia If-Match: se outra pessoa editou antes, o backend responde 412
+export const updateOpportunity = (id, data, versao) => API.put(`/oportunidades/${id}/`, data, // <<--- CORRIGIDO: ADICIONADA BARRA FINAL AQUI
+    versao != null ? { headers: { 'If-Match': `"v${versao}"` } } : undefined);
 // Se o backend tiver PATCH para atualização parcial, você pode usar:
 // export const updatePartialOpportunity = (id, data) => API.patch(`/oportunidades/${id}/`, data); // Já tinha barra final
 export const deleteOpportunity = (id) => API.delete(`/oportunidades/${id}/`); // <<--- CORRIGIDO: ADICIONADA BARRA FINAL AQUI
+// Feed de mudanças (Server-Sent Events): handlers por tipo de evento, ex.:
+// { criada, criadas, atualizada, removida, reset }, cada um recebendo o JSON do evento.
+// O EventSource reconecta sozinho e retoma do último evento recebido (Last-Event-ID).
+// Retorna o EventSource; chame .close() ao desmontar o componente.
+export const subscribeOpportunityEvents = (handlers) => {
+    const source = new EventSource('/api/oportunidades/eventos');
+    Object.entries(handlers).forEach(([tipo, handler]) => {
+        source.addEventListener(tipo, (event) => handler(JSON.parse(event.data)));
+    });
+    return source;
+};
 
 // Voluntários - Para consistência e evitar problemas futuros, adicionei barras finais aqui também,
 // ASSUMINDO que as rotas do backend em volunteer_routes.py esperam isso (e.g., router.get("/"))
-export const fetchVolunteers = () => API.get('/voluntarios/');
+export const fetchVolunteers = (params) => API.get('/voluntarios/', { params });
 export const fetchVolunteerById = (id) => API.get(`/voluntarios/${id}/`);
 
 // Inscrições - Para consistência e evitar problemas futuros, adicionei barras finais aqui também,
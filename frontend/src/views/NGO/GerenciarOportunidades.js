@@ -1,10 +1,11 @@
 // frontend/src/views/NGO/GerenciarOportunidades.js
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import {
     fetchOpportunities,
     createOpportunity,
     updateOpportunity,
-    deleteOpportunity
+    deleteOpportunity,
+    subscribeOpportunityEvents
 } from '../../services/api';
 import {
     Card, CardContent, Button, Typography, Grid,
@@ -68,6 +69,9 @@ export default function GerenciarOportunidades() {
     const [modalFormAlert, setModalFormAlert] = useState(null); 
     // Estado para exibir alertas FORA do modal (após fechar, ex: sucesso/erro de exclusão)
     const [mainPageAlert, setMainPageAlert] = useState(null);
+    // Conexão com o feed de mudanças (SSE): as alterações chegam como eventos e são
+    // aplicadas na lista, sem buscar todas as oportunidades de novo
+    const eventSourceRef = useRef(null);
 
 
     // --- Função para Carregar Oportunidades ---
@@ -101,7 +105,7 @@ export default function GerenciarOportunidades() {
                 let response;
                 if (modalInitialValues && modalInitialValues.id) {
                     // Lógica para atualização de oportunidade
-                    response = await updateOpportunity(modalInitialValues.id, values);
+                    response = await updateOpportunity(modalInitialValues.id, values, modalInitialValues.versao);
                     if (response.data && response.data.success) {
                         setModalFormAlert({ severity: 'success', message: 'Oportunidade atualizada com sucesso!' });
                         setMainPageAlert({ severity: 'success', message: 'Oportunidade atualizada com sucesso!' }); // Alerta na página principal
@@ -132,7 +136,8 @@ export default function GerenciarOportunidades() {
                 }
                 
                 // Se chegou até aqui, a operação foi bem-sucedida.
-                await loadOpportunities(); // Recarrega a lista de oportunidades
+                // A lista é atualizada pelo feed de mudanças; sem ele, recarrega tudo
+                await reloadIfFeedOffline();
                 resolve(response); // Resolve a promise para que o modal saiba que a submissão foi bem-sucedida
 
             } catch (error) {
@@ -164,7 +169,7 @@ export default function GerenciarOportunidades() {
             try {
                 await deleteOpportunity(opportunityId);
                 setMainPageAlert({ severity: 'success', message: 'Oportunidade excluída com sucesso!' });
-                await loadOpportunities(); // Recarrega a lista
+                await reloadIfFeedOffline(); // A remoção chega pelo feed de mudanças
             } catch (error) {
                 const msg = error.response?.data?.detail || error.response?.data?.error || error.message || 'Erro desconhecido.';
                 setMainPageAlert({ severity: 'error', message: `Erro ao excluir: ${msg}` });
@@ -173,9 +178,32 @@ export default function GerenciarOportunidades() {
         }
     };
 
-    // --- Efeito para carregar oportunidades ao montar o componente ---
+    // --- Recarrega a lista só se o feed de mudanças não estiver conectado ---
+    const reloadIfFeedOffline = async () => {
+        if (eventSourceRef.current?.readyState !== EventSource.OPEN) {
+            await loadOpportunities();
+        }
+    };
+
+    // --- Efeito para carregar oportunidades ao montar o componente e assinar o feed ---
     useEffect(() => {
         loadOpportunities();
+        eventSourceRef.current = subscribeOpportunityEvents({
+            // A listagem vem da mais recente para a mais antiga: novas entram no topo
+            criada: (opportunity) => setOpportunities((prev) =>
+                prev.some((o) => o.id === opportunity.id) ? prev : [opportunity, ...prev]),
+            criadas: ({ itens }) => setOpportunities((prev) => {
+                const ids = new Set(prev.map((o) => o.id));
+                return [...itens.filter((o) => !ids.has(o.id)).reverse(), ...prev];
+            }),
+            // Só os campos alterados vêm no evento
+            atualizada: (changes) => setOpportunities((prev) =>
+                prev.map((o) => (o.id === changes.id ? { ...o, ...changes } : o))),
+            removida: ({ id }) => setOpportunities((prev) => prev.filter((o) => o.id !== id)),
+            // Eventos perdidos (reconexão tardia ou reinício do servidor): recarrega tudo
+            reset: () => loadOpportunities(),
+        });
+        return () => eventSourceRef.current?.close();
     }, []);
 
     // --- Renderização do Componente ---